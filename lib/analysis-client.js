@@ -0,0 +1,189 @@
+/**
+ * analysis-client.js — Python 분석 서버(tools/analysis-server.py) 클라이언트
+ *
+ * 문서마다 `python -X utf8 tools/...py`를 execSync로 새로 띄우는 대신,
+ * 서버 프로세스 하나를 띄워 두고 stdin/stdout 줄 단위 JSON-RPC로 요청한다.
+ * 배치(score --batch, audit --batch)에서는 연결 하나를 끝까지 재사용한다.
+ *
+ * 사용법:
+ *   const { withAnalysisClient } = require('./analysis-client');
+ *   await withAnalysisClient(async (analysis) => {
+ *     const report = await analysis.validate('output/문서.docx');
+ *     const review = await analysis.review('output/문서.docx', 'doc-configs/문서.json');
+ *     // 메모리의 DOCX 패키지(Buffer)도 그대로 보낼 수 있다 (디스크에서 다시 읽지 않음)
+ *     const fromBuffer = await analysis.validate(buffer, { name: '문서.docx' });
+ *   });
+ */
+
+const path = require('path');
+const readline = require('readline');
+const { spawn } = require('child_process');
+
+const PROJECT_ROOT = path.resolve(__dirname, '..');
+const SERVER_SCRIPT = path.join(PROJECT_ROOT, 'tools', 'analysis-server.py');
+
+/**
+ * DOCX 입력 → 요청 파라미터. 경로 문자열은 {path}, Buffer는 {data(base64), name}
+ * @param {string|Buffer} docx
+ * @param {string} [name] - Buffer 입력의 리포트 파일명
+ * @param {string} [pathKey='path']
+ * @param {string} [dataKey='data']
+ */
+function docxParams(docx, name, pathKey = 'path', dataKey = 'data') {
+  if (Buffer.isBuffer(docx)) {
+    const params = { [dataKey]: docx.toString('base64') };
+    if (name) params.name = name;
+    return params;
+  }
+  return { [pathKey]: docx };
+}
+
+class AnalysisClient {
+  /**
+   * @param {object} [options]
+   * @param {string} [options.python='python'] - Python 실행 파일
+   * @param {string} [options.cwd] - 서버 작업 디렉토리 (기본: 프로젝트 루트)
+   * @param {boolean} [options.quiet=false] - 서버 stderr(도구 경고/트레이스백) 숨김
+   */
+  constructor(options = {}) {
+    this.python = options.python || 'python';
+    this.cwd = options.cwd || PROJECT_ROOT;
+    this.quiet = !!options.quiet;
+    this.proc = null;
+    this.nextId = 1;
+    this.pending = new Map();
+    this.exitPromise = null;
+  }
+
+  /** 서버 프로세스 시작 (call()이 필요할 때 자동 호출) */
+  start() {
+    if (this.proc) return;
+
+    const proc = spawn(this.python, ['-X', 'utf8', SERVER_SCRIPT], {
+      cwd: this.cwd,
+      stdio: ['pipe', 'pipe', this.quiet ? 'ignore' : 'inherit'],
+      windowsHide: true,
+    });
+    this.proc = proc;
+    proc.stdin.on('error', () => {}); // 서버가 먼저 죽은 경우 — exit 핸들러에서 reject
+
+    readline.createInterface({ input: proc.stdout }).on('line', line => this._onLine(line));
+
+    this.exitPromise = new Promise(resolve => {
+      const fail = (err) => {
+        this._rejectAll(err);
+        this.proc = null;
+        resolve();
+      };
+      proc.on('error', err => fail(new Error(`분석 서버 실행 실패: ${err.message}`)));
+      proc.on('exit', code => fail(new Error(`분석 서버 종료 (exit ${code})`)));
+    });
+  }
+
+  _onLine(line) {
+    if (!line.trim()) return;
+    let msg;
+    try {
+      msg = JSON.parse(line);
+    } catch (err) {
+      return; // 프로토콜 외 출력은 무시
+    }
+    const entry = this.pending.get(msg.id);
+    if (!entry) return;
+    this.pending.delete(msg.id);
+
+    if (msg.error) {
+      const err = new Error(msg.error.message);
+      err.code = msg.error.code;
+      entry.reject(err);
+    } else {
+      entry.resolve(msg.result);
+    }
+  }
+
+  _rejectAll(err) {
+    for (const entry of this.pending.values()) entry.reject(err);
+    this.pending.clear();
+  }
+
+  /**
+   * JSON-RPC 요청 하나 전송
+   * @param {string} method - validate | review | lint | diff | ping
+   * @param {object} [params]
+   * @returns {Promise<any>} result (오류 응답이면 reject, err.code = JSON-RPC 코드)
+   */
+  call(method, params = {}) {
+    this.start();
+    const id = this.nextId++;
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      this.proc.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    });
+  }
+
+  /**
+   * validate-docx.py --json 결과
+   * @param {string|Buffer} docx - DOCX 경로 또는 패키지 바이트
+   * @param {{stream?: boolean, name?: string, theme?: string}} [options] - name: Buffer 입력의 리포트 파일명,
+   *   theme: 레이아웃 프로필(profiles/layout-profile.json)에서 높이 계수를 고를 테마
+   */
+  validate(docx, options = {}) {
+    const params = { ...docxParams(docx, options.name), stream: !!options.stream };
+    if (options.theme) params.theme = options.theme;
+    return this.call('validate', params);
+  }
+
+  /**
+   * review-docx.py --json [--config] 결과
+   * @param {string|Buffer} docx - DOCX 경로 또는 패키지 바이트
+   * @param {string} [configPath]
+   * @param {{name?: string}} [options]
+   */
+  review(docx, configPath, options = {}) {
+    return this.call('review', { ...docxParams(docx, options.name), config: configPath || null });
+  }
+
+  /** lint-md.py --json 결과 (단일 파일) */
+  lint(mdPath) {
+    return this.call('lint', { path: mdPath });
+  }
+
+  /**
+   * diff-docx.py --json 결과 (각 입력은 경로 또는 Buffer)
+   * @param {{only?: string|string[]}} [options] - 비교할 카테고리 (diff-docx.py --only)
+   */
+  diff(ref, gen, options = {}) {
+    const params = { ...docxParams(ref, null, 'ref', 'refData'), ...docxParams(gen, null, 'gen', 'genData') };
+    if (options.only) params.only = options.only;
+    return this.call('diff', params);
+  }
+
+  /** 서버 종료 (대기 중인 요청은 처리 후 종료) */
+  async close() {
+    if (!this.proc) return;
+    const exited = this.exitPromise;
+    try {
+      await this.call('shutdown');
+    } catch (err) {
+      // 이미 종료된 경우
+    }
+    if (this.proc) this.proc.stdin.end();
+    await exited;
+  }
+}
+
+/**
+ * 클라이언트를 열어 fn(client)을 실행하고, 끝나면(예외 포함) 서버를 닫는다.
+ * @param {(client: AnalysisClient) => Promise<any>} fn
+ * @param {object} [options] - AnalysisClient 옵션
+ */
+async function withAnalysisClient(fn, options = {}) {
+  const client = new AnalysisClient(options);
+  try {
+    return await fn(client);
+  } finally {
+    await client.close();
+  }
+}
+
+module.exports = { AnalysisClient, withAnalysisClient, SERVER_SCRIPT };
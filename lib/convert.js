@@ -13,6 +13,7 @@ const fs = require('fs');
 const path = require('path');
 const core = require('./converter-core');
 const xlsx = require('./converter-xlsx');
+const { withAnalysisClient } = require('./analysis-client');
 
 async function main() {
   const args = process.argv.slice(2);
@@ -92,12 +93,13 @@ async function main() {
         console.error('[ERROR] 검증 실패:', err.message);
       }
     } else {
-      // DOCX 검증
-      const validateCmd = `python -X utf8 tools/validate-docx.py "${result.outputPath}" --json`;
-      console.log(`\nValidating: ${validateCmd}`);
+      // DOCX 검증 (Python 분석 서버)
+      console.log(`\nValidating: ${result.outputPath}`);
       try {
-        const output = execSync(validateCmd, { cwd: projectRoot, encoding: 'utf-8' });
-        const report = JSON.parse(output);
+        // 방금 저장한 패키지 바이트를 그대로 넘긴다 (출력 볼륨에서 다시 읽지 않음)
+        const report = await withAnalysisClient(analysis => (result.buffer
+          ? analysis.validate(result.buffer, { name: path.basename(result.outputPath), theme: config.theme })
+          : analysis.validate(result.outputPath, { theme: config.theme })));
 
         const warns = report.issues.filter(i => i.severity === 'WARN');
         const infos = report.issues.filter(i => i.severity === 'INFO');
@@ -797,7 +797,7 @@ function createCoverPage(docInfo, baseDir, t, logoPath) {
  * config JSON으로 DOCX 빌드 + 저장
  * @param {Object} config - doc-config JSON
  * @param {string} [projectRoot] - 프로젝트 루트 (기본: lib/../)
- * @returns {Promise<{outputPath: string}>}
+ * @returns {Promise<{outputPath: string, buffer?: Buffer}>} buffer: 저장한 DOCX 바이트 (템플릿이 반환하는 경우)
  */
 async function buildAndSave(config, projectRoot) {
   const baseDir = projectRoot || path.resolve(__dirname, '..');
@@ -916,10 +916,10 @@ async function buildAndSave(config, projectRoot) {
     fs.mkdirSync(outputDir, { recursive: true });
   }
 
-  await t.saveDocument(doc, outputPath);
+  const buffer = await t.saveDocument(doc, outputPath);
   console.log(`Done! → ${outputPath}`);
 
-  return { outputPath };
+  return { outputPath, buffer: Buffer.isBuffer(buffer) ? buffer : undefined };
 }
 
 // ============================================================
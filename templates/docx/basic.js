@@ -262,6 +262,7 @@ function createTemplate(theme = {}) {
     const buffer = await Packer.toBuffer(doc);
     fs.writeFileSync(filepath, buffer);
     console.log(`Document saved: ${filepath}`);
+    return buffer;
   }
 
   // ============================================================
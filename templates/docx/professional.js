@@ -888,6 +888,7 @@ function createTemplate(theme = {}) {
       }
     }
     console.log(`Document saved: ${filepath}`);
+    return buffer;
   }
 
   function _applyDocSettings(docxBuffer) {
@@ -0,0 +1,135 @@
+"""
+Python 분석 도구 테스트 공용 픽스처 — tools/ 모듈 로드, 합성 코퍼스, CLI 실행.
+
+실행: python -m pytest tests/python   (npm run test:py)
+
+리포트 캐시는 세션마다 임시 폴더(GENDOCS_CACHE_DIR)를 쓰므로 프로젝트의 .cache를 건드리지 않는다.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOOLS_DIR = os.path.join(ROOT, 'tools')
+sys.path.insert(0, TOOLS_DIR)
+
+import synth_corpus  # noqa: E402
+from tool_loader import load_tool  # noqa: E402,F401  (테스트 모듈이 conftest에서 가져다 쓴다)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+    """리포트 캐시를 세션 임시 폴더로 (하위 프로세스에도 환경 변수로 전달)"""
+    cache_dir = str(tmp_path_factory.mktemp('report-cache'))
+    previous = os.environ.get('GENDOCS_CACHE_DIR')
+    os.environ['GENDOCS_CACHE_DIR'] = cache_dir
+    yield cache_dir
+    if previous is None:
+        os.environ.pop('GENDOCS_CACHE_DIR', None)
+    else:
+        os.environ['GENDOCS_CACHE_DIR'] = previous
+
+
+@pytest.fixture(scope='session')
+def corpus(tmp_path_factory):
+    """small/medium 합성 코퍼스 — 규모 → manifest 항목 (docx, peer, md, config ...)"""
+    out_dir = tmp_path_factory.mktemp('corpus')
+    return {entry['scale']: entry for entry in synth_corpus.generate_corpus(str(out_dir), ['small', 'medium'])}
+
+
+@pytest.fixture(scope='session')
+def multi_section_docx(tmp_path_factory):
+    """가로/세로 섹션이 번갈아 나오는 다중 섹션 DOCX"""
+    path = tmp_path_factory.mktemp('sections') / 'sections.docx'
+    synth_corpus.render_docx(synth_corpus.make_plan(12), str(path), section_every=3)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def sample_docx(corpus, multi_section_docx):
+    """스트리밍/백엔드 비교 등에 쓰는 샘플 DOCX 경로 목록"""
+    return [corpus['small']['docx'], corpus['medium']['docx'], multi_section_docx]
+
+
+def run_tool(script, *args, env=None, stdin=None):
+    """tools/<script>를 별도 프로세스로 실행 → CompletedProcess (stdout/stderr는 문자열)
+
+    env: 현재 환경에 덧붙일 변수. stdin: 표준 입력으로 보낼 bytes
+    """
+    full_env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    full_env.update(env or {})
+    proc = subprocess.run([sys.executable, '-X', 'utf8', os.path.join(TOOLS_DIR, script), *args],
+                          input=stdin, capture_output=True, env=full_env, cwd=ROOT)
+    proc.stdout = proc.stdout.decode('utf-8')
+    proc.stderr = proc.stderr.decode('utf-8', errors='replace')
+    return proc
+
+
+def run_json(script, *args, env=None):
+    """run_tool + stdout JSON 파싱"""
+    proc = run_tool(script, *args, env=env)
+    assert proc.stdout, proc.stderr
+    return json.loads(proc.stdout)
+
+
+# ============================================================
+# 레이아웃 요소 (LayoutSimulator/VectorLayout 단위 테스트용, analyze_document 요소와 같은 모양)
+# ============================================================
+
+def para(height, lines=1, **props):
+    return {'type': 'paragraph', 'text': '본문', 'lines': lines, 'est_height': height, **props}
+
+
+def heading(height, **props):
+    return {'type': 'heading', 'level': 2, 'text': '제목', 'est_height': height, **props}
+
+
+def table(row_heights, **props):
+    return {'type': 'table', 'tbl_type': 'data_table', 'rows': len(row_heights), 'cols': 2, 'headers': [],
+            'after': '(문서 시작)', 'row_heights': row_heights, 'est_height': sum(row_heights), **props}
+
+
+def image(height):
+    return {'type': 'image', 'width_pt': 200, 'height_pt': height, 'section': '(문서 시작)', 'est_height': height}
+
+
+def section(usable, new_page=False):
+    return {'type': 'section_break', 'section': 2, 'orientation': 'landscape', 'usable_height_pt': usable,
+            'new_page': new_page, 'est_height': 0}
+
+
+def random_layout_elements(rng, keeps=True):
+    """제목/단락/표/이미지/페이지·섹션 나누기가 섞인 요소 목록 (keeps: keepNext/keepLines/widowControl 포함)"""
+    elements = []
+    for _ in range(rng.randint(5, 40)):
+        r = rng.random()
+        if r < 0.4:
+            n = rng.choice([1, 1, 2, 3, 5, 12, 37])
+            e = para(round(rng.uniform(10, 40) * n / 2 + 10, 1), n)
+            for prop, chance in (('keep_lines', 0.3), ('widow_control', 0.4), ('keep_next', 0.2)):
+                if keeps and rng.random() < chance:
+                    e[prop] = True
+        elif r < 0.55:
+            e = {'type': 'heading', 'level': rng.randint(1, 3), 'text': f'제목 {rng.randrange(5)}',
+                 'est_height': round(rng.uniform(20, 40), 1), 'keep_next': keeps and rng.random() < 0.8}
+        elif r < 0.7:
+            rows = rng.randint(1, 8)
+            heights = [round(rng.uniform(15, 120), 1) for _ in range(rows)]
+            e = {'type': 'table', 'tbl_type': rng.choice(['data_table', 'code_dark']), 'rows': rows, 'cols': 2,
+                 'headers': [], 'after': '(문서 시작)', 'row_heights': heights, 'est_height': round(sum(heights), 1)}
+            if rng.random() < 0.3:
+                e['row_lines'] = [rng.randint(1, 4) for _ in range(rows)]
+            if rng.random() < 0.3:
+                e['cant_split'] = [rng.random() < 0.5 for _ in range(rows)]
+        elif r < 0.78:
+            e = image(round(rng.uniform(50, 420), 1))
+        elif r < 0.86:
+            e = {'type': 'page_break', 'after': '(문서 시작)', 'est_height': 0}
+        else:
+            e = section(rng.choice([300, 457, 600]), new_page=rng.random() < 0.5)
+        elements.append(e)
+    return elements
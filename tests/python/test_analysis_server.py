@@ -0,0 +1,91 @@
+"""analysis-server.py JSON-RPC — 정상 응답과 오류 경로 (파싱/요청/메서드/파라미터/도구 오류)"""
+
+import json
+import base64
+
+import pytest
+
+from conftest import run_tool
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+TOOL_ERROR = -32000
+
+
+def serve(*requests):
+    """요청(dict 또는 원문 문자열)들을 한 줄씩 보내고 → 응답 dict 목록"""
+    lines = [r if isinstance(r, str) else json.dumps(r, ensure_ascii=False) for r in requests]
+    proc = run_tool('analysis-server.py', stdin=('\n'.join(lines) + '\n').encode('utf-8'))
+    assert proc.returncode == 0, proc.stderr
+    return [json.loads(line) for line in proc.stdout.splitlines() if line.strip()]
+
+
+def call(method, params=None, req_id=1):
+    return {'jsonrpc': '2.0', 'id': req_id, 'method': method, 'params': params}
+
+
+def test_ping_and_shutdown():
+    ping, bye, *rest = serve(call('ping'), call('shutdown', req_id=2), call('ping', req_id=3))
+    assert {'validate', 'review', 'lint', 'diff', 'ping'} <= set(ping['result']['methods'])
+    assert bye == {'jsonrpc': '2.0', 'id': 2, 'result': None}
+    assert rest == []  # shutdown 이후 요청은 처리하지 않는다
+
+
+def test_validate_matches_cli(corpus):
+    path = corpus['small']['docx']
+    [resp] = serve(call('validate', {'path': path, 'cache': False}))
+    cli = json.loads(run_tool('validate-docx.py', path, '--json', '--no-cache').stdout)
+    assert resp['result'] == cli
+
+
+def test_validate_from_base64_bytes(corpus):
+    with open(corpus['small']['docx'], 'rb') as f:
+        data = base64.b64encode(f.read()).decode('ascii')
+    [by_path, by_data] = serve(call('validate', {'path': corpus['small']['docx'], 'cache': False}),
+                               call('validate', {'data': data, 'name': 'small.docx', 'cache': False}, req_id=2))
+    assert by_data['result'] == by_path['result']
+
+
+@pytest.mark.parametrize('raw, code', [
+    ('{not json', PARSE_ERROR),
+    ('[1, 2]', INVALID_REQUEST),
+    ('{"jsonrpc": "2.0", "id": 5}', INVALID_REQUEST),
+])
+def test_malformed_requests(raw, code):
+    [resp] = serve(raw)
+    assert resp['error']['code'] == code
+    assert 'result' not in resp
+
+
+def test_unknown_method():
+    [resp] = serve(call('explode', req_id=7))
+    assert resp['id'] == 7
+    assert resp['error']['code'] == METHOD_NOT_FOUND
+
+
+@pytest.mark.parametrize('params', [
+    [1, 2],                                   # params가 객체가 아님
+    {},                                       # path 누락
+    {'data': 123},                            # data가 문자열이 아님
+    {'data': '@@not-base64@@'},               # base64 디코드 실패
+])
+def test_invalid_params(params):
+    [resp] = serve(call('validate', params))
+    assert resp['error']['code'] == INVALID_PARAMS
+
+
+def test_missing_file_is_tool_error(tmp_path):
+    [resp] = serve(call('validate', {'path': str(tmp_path / 'nope.docx')}))
+    assert resp['error']['code'] == TOOL_ERROR
+    assert 'nope.docx' in resp['error']['message']
+
+
+def test_corrupt_docx_is_tool_error_and_server_keeps_running(tmp_path):
+    bad = tmp_path / 'bad.docx'
+    bad.write_bytes(b'not a zip file')
+    err, ping = serve(call('validate', {'path': str(bad)}), call('ping', req_id=2))
+    assert err['error']['code'] == TOOL_ERROR
+    assert 'pid' in ping['result']
+
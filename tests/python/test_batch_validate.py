@@ -0,0 +1,106 @@
+"""batch-validate.py — 파일 목록/결과 순서, 실패 문서와 죽은 워커 처리, 종료 코드, 요약 파일"""
+
+import os
+import json
+import shutil
+
+import pytest
+
+import batch_runner
+from conftest import run_tool, load_tool
+
+ALL = ['medium.docx', 'medium.peer.docx', 'small.docx', 'small.peer.docx']
+
+
+@pytest.fixture
+def batch(tmp_path, corpus):
+    """small/medium 문서와 그 peer 4개가 든 폴더"""
+    for scale in ('small', 'medium'):
+        shutil.copy(corpus[scale]['docx'], tmp_path / f'{scale}.docx')
+        shutil.copy(corpus[scale]['peer'], tmp_path / f'{scale}.peer.docx')
+    return tmp_path
+
+
+def run_batch(*args):
+    """--jsonl 실행 → (CompletedProcess, 결과 행 목록, 요약)"""
+    proc = run_tool('batch-validate.py', *args, '--jsonl', '--no-cache')
+    *rows, summary = [json.loads(line) for line in proc.stdout.splitlines()]
+    return proc, rows, summary
+
+
+def _per_file(rows):
+    return {os.path.basename(r['file']): (r['ok'], r.get('pages'), r.get('warn'), r.get('info')) for r in rows}
+
+
+# ============================================================
+# 파일 목록과 결과 순서
+# ============================================================
+
+def test_patterns_are_deduplicated_and_sorted(batch):
+    files = batch_runner.collect_docx_files([str(batch / '*.docx'), str(batch / 'small.docx'),
+                                             str(batch / '**' / '*.peer.docx'), str(batch / 'notes.txt')])
+    assert [os.path.basename(f) for f in files] == ALL
+
+
+def test_sequential_run_keeps_file_order_and_parallel_run_gives_the_same_results(batch):
+    proc, rows, summary = run_batch(str(batch / '*.docx'), '--workers', '1')
+    assert proc.returncode == 0
+    assert [os.path.basename(r['file']) for r in rows] == ALL
+
+    proc, parallel_rows, parallel_summary = run_batch(str(batch / '*.docx'), '--workers', '3')
+    assert proc.returncode == 0
+    assert _per_file(parallel_rows) == _per_file(rows)  # 완료 순서로 나오지만 파일별 결과는 같다
+    assert parallel_summary['workers'] == 3
+    for key in ('files', 'ok', 'failed', 'pages', 'warn', 'info', 'filesWithWarn'):
+        assert parallel_summary[key] == summary[key], key
+
+
+def test_results_match_validate_docx(batch):
+    _, rows, _ = run_batch(str(batch / 'small.docx'), '--workers', '1', '--full')
+    [row] = rows
+    report = json.loads(run_tool('validate-docx.py', str(batch / 'small.docx'), '--json', '--no-cache').stdout)
+    assert row['report'] == report
+    assert row['pages'] == report['stats']['estimatedPages']
+    assert row['warn'] == sum(1 for i in report['issues'] if i['severity'] == 'WARN')
+
+
+# ============================================================
+# 실패 처리와 종료 코드
+# ============================================================
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_broken_document_is_reported_and_fails_the_batch(batch, workers):
+    (batch / 'broken.docx').write_bytes(b'not a zip file')
+    summary_path = batch / 'out' / 'summary.json'
+    proc, rows, summary = run_batch(str(batch / '*.docx'), '--workers', workers, '--summary', str(summary_path))
+    assert proc.returncode == 1
+    broken = [r for r in rows if r['file'].endswith('broken.docx')]
+    assert len(broken) == 1 and not broken[0]['ok'] and broken[0]['error']
+    assert summary['files'] == 5 and summary['ok'] == 4 and summary['failed'] == 1
+    assert summary['errors'] == [{'file': broken[0]['file'], 'error': broken[0]['error']}]
+    with open(summary_path, encoding='utf-8') as f:
+        assert json.load(f) == summary
+
+
+def test_no_matching_files_is_not_an_error(tmp_path):
+    proc, rows, summary = run_batch(str(tmp_path / '*.docx'))
+    assert proc.returncode == 0
+    assert rows == [] and summary['files'] == 0
+
+
+def test_validate_one_converts_failures_to_rows(tmp_path):
+    bv = load_tool('batch-validate.py')
+    missing = bv.validate_one(str(tmp_path / 'missing.docx'))
+    assert missing['ok'] is False and 'missing.docx' in missing['error']
+    (tmp_path / 'broken.docx').write_bytes(b'PK\x03\x04 truncated')
+    broken = bv.validate_one(str(tmp_path / 'broken.docx'))
+    assert broken['ok'] is False and broken['error'] and broken['seconds'] is not None
+
+
+def test_dead_worker_becomes_an_error_row():
+    """워커 프로세스가 죽으면 (BrokenProcessPool) 남은 작업마다 on_crash 행이 나온다"""
+    tasks = [(3,), (4,), (5,)]
+    rows = list(batch_runner.iter_results(os._exit, tasks, 2,
+                                          lambda task, e: {'file': task[0], 'error': type(e).__name__}))
+    assert sorted(r['file'] for r in rows) == [3, 4, 5]
+    assert {r['error'] for r in rows} == {'BrokenProcessPool'}
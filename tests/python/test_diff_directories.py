@@ -0,0 +1,108 @@
+"""diff-docx.py 폴더 쌍 비교 — 상태 판정(identical/same_xml/changed/only_in_*), --jsonl/--csv, 종료 코드"""
+
+import csv
+import io
+import json
+import shutil
+import zipfile
+
+import pytest
+
+from conftest import run_tool
+
+
+def rewrite_docx(src, dst, replace):
+    """src를 다시 압축해 dst로 — replace: {파트 이름: 새 bytes}"""
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            zout.writestr(info.filename, replace.get(info.filename, zin.read(info.filename)))
+
+
+@pytest.fixture(scope='module')
+def build_dirs(tmp_path_factory, corpus):
+    """이전/새 빌드 폴더 — 파일 이름이 곧 기대 상태"""
+    small = corpus['small']
+    root = tmp_path_factory.mktemp('builds')
+    a, b = root / 'a', root / 'b'
+    for d in (a / 'nested', b / 'nested'):
+        d.mkdir(parents=True)
+
+    for d in (a, b):
+        shutil.copy(small['docx'], d / 'identical.docx')
+        shutil.copy(small['docx'], d / '~$identical.docx')  # Word 잠금 파일은 무시
+    shutil.copy(small['docx'], a / 'nested' / 'same_xml.docx')
+    with zipfile.ZipFile(small['docx']) as zf:
+        core = zf.read('docProps/core.xml').replace(b'</cp:coreProperties>',
+                                                    b'<dc:title>rebuilt</dc:title></cp:coreProperties>')
+    rewrite_docx(small['docx'], b / 'nested' / 'same_xml.docx', {'docProps/core.xml': core})
+    shutil.copy(small['docx'], a / 'changed.docx')
+    shutil.copy(small['peer'], b / 'changed.docx')
+    shutil.copy(small['docx'], a / 'nested' / 'only_in_a.docx')
+    shutil.copy(small['peer'], b / 'only_in_b.docx')
+    return str(a), str(b)
+
+
+EXPECTED = {
+    'changed.docx': 'changed',
+    'identical.docx': 'identical',
+    'nested/only_in_a.docx': 'only_in_a',
+    'nested/same_xml.docx': 'same_xml',
+    'only_in_b.docx': 'only_in_b',
+}
+
+
+def jsonl(*args):
+    proc = run_tool('diff-docx.py', *args, '--jsonl')
+    lines = [json.loads(line) for line in proc.stdout.splitlines()]
+    *rows, summary = lines
+    return proc, rows, summary
+
+
+@pytest.mark.parametrize('workers', ['1', '3'])
+def test_jsonl_statuses_and_summary(build_dirs, workers):
+    proc, rows, summary = jsonl(*build_dirs, '--workers', workers)
+    assert proc.returncode == 1
+    assert {r['file']: r['status'] for r in rows} == EXPECTED
+    assert all(r['type'] == 'result' for r in rows)
+    assert summary['type'] == 'summary' and summary['files'] == len(EXPECTED)
+    assert summary['byStatus'] == {'identical': 1, 'same_xml': 1, 'changed': 1,
+                                   'only_in_a': 1, 'only_in_b': 1, 'error': 0}
+
+    [changed] = [r for r in rows if r['status'] == 'changed']
+    assert changed['totalDiffs'] == sum(changed['byCategory'].values()) > 0
+    assert changed['changedCategories'] == [c for c, n in changed['byCategory'].items() if n]
+    assert 'word/document.xml' in changed['changedParts']
+    assert not any(p.startswith('docProps/') for p in changed['changedParts'])
+    assert summary['changedByCategory'] == {c: int(n > 0) for c, n in changed['byCategory'].items()}
+
+
+def test_csv_output(build_dirs):
+    proc = run_tool('diff-docx.py', *build_dirs, '--csv', '--workers', '1')
+    assert proc.returncode == 1
+    header, *rows = list(csv.reader(io.StringIO(proc.stdout)))
+    assert header[:3] == ['file', 'status', 'totalDiffs']
+    assert {r[0]: r[1] for r in rows} == EXPECTED
+    assert all(len(r) == len(header) for r in rows)
+
+
+def test_unchanged_builds_exit_zero(build_dirs, tmp_path):
+    a, _ = build_dirs
+    copy = shutil.copytree(a, tmp_path / 'copy')
+    proc, rows, summary = jsonl(a, str(copy))
+    assert proc.returncode == 0
+    assert {r['status'] for r in rows} == {'identical'}
+
+    text = run_tool('diff-docx.py', a, str(copy))
+    assert text.returncode == 0
+    assert 'identical=4' in text.stdout
+
+
+def test_corrupt_document_is_an_error_row(build_dirs, tmp_path):
+    a, _ = build_dirs
+    b = shutil.copytree(a, tmp_path / 'broken')
+    (b / 'changed.docx').write_bytes(b'not a zip file')
+    proc, rows, summary = jsonl(a, str(b))
+    assert proc.returncode == 1
+    [err] = [r for r in rows if r['status'] == 'error']
+    assert err['file'] == 'changed.docx' and err['error'].startswith('Invalid DOCX')
+    assert summary['byStatus']['error'] == 1
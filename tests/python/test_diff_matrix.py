@@ -0,0 +1,72 @@
+"""diff-docx.py 레퍼런스 1 : N 매트릭스 — 순위 정렬, --workers 결과 동일, 오류 행, 1:1 비교와 일치"""
+
+import json
+
+import pytest
+
+from conftest import run_tool, run_json
+
+VOLATILE = ('seconds', 'wallSeconds', 'workers')
+
+
+def stable(matrix):
+    """실행마다 달라지는 시간/워커 수를 뺀 매트릭스"""
+    def strip(row):
+        return {k: v for k, v in row.items() if k not in VOLATILE}
+    out = strip(matrix)
+    out['rows'] = [strip(r) for r in matrix['rows']]
+    out['errors'] = [strip(r) for r in matrix['errors']]
+    return out
+
+
+@pytest.fixture(scope='module')
+def gen_paths(corpus):
+    return [corpus['medium']['docx'], corpus['small']['peer'], corpus['small']['docx']]
+
+
+def test_rows_are_ranked_by_total_diffs(corpus, gen_paths):
+    matrix = run_json('diff-docx.py', corpus['small']['docx'], *gen_paths, '--json', '--workers', '1')
+    rows = matrix['rows']
+    assert [r['rank'] for r in rows] == [1, 2, 3]
+    assert [r['totalDiffs'] for r in rows] == sorted(r['totalDiffs'] for r in rows)
+    assert rows[0]['file'] == corpus['small']['docx'] and rows[0]['totalDiffs'] == 0
+    assert {r['file'] for r in rows} == set(gen_paths)
+    assert matrix['errors'] == []
+    for r in rows:
+        assert set(r['byCategory']) == set(matrix['categories'])
+        assert sum(r['byCategory'].values()) == r['totalDiffs']
+
+
+def test_workers_give_the_same_matrix(corpus, gen_paths):
+    ref = corpus['small']['docx']
+    serial = run_json('diff-docx.py', ref, *gen_paths, '--json', '--workers', '1')
+    parallel = run_json('diff-docx.py', ref, *gen_paths, '--json', '--workers', '3')
+    assert parallel['workers'] == 3
+    assert stable(parallel) == stable(serial)
+
+
+def test_matrix_row_matches_pairwise_diff(corpus):
+    ref, peer = corpus['small']['docx'], corpus['small']['peer']
+    matrix = run_json('diff-docx.py', ref, peer, ref, '--json', '--workers', '1')
+    pair = run_json('diff-docx.py', ref, peer, '--json')
+    [row] = [r for r in matrix['rows'] if r['file'] == peer]
+    assert row['totalDiffs'] == pair['summary']['totalDiffs']
+
+
+def test_bad_document_becomes_an_error_row(tmp_path, corpus):
+    bad = tmp_path / 'bad.docx'
+    bad.write_bytes(b'not a zip file')
+    ref = corpus['small']['docx']
+    proc = run_tool('diff-docx.py', ref, ref, str(bad), '--json', '--workers', '2')
+    assert proc.returncode == 1
+    matrix = json.loads(proc.stdout)
+    assert [r['file'] for r in matrix['rows']] == [ref]
+    [err] = matrix['errors']
+    assert err['file'] == str(bad) and err['error'].startswith('Invalid DOCX')
+
+
+def test_glob_expands_generated_documents(corpus):
+    ref = corpus['small']['docx']
+    pattern = ref.replace('small.docx', 'small*.docx')
+    matrix = run_json('diff-docx.py', ref, pattern, '--json', '--workers', '1')
+    assert sorted(r['file'] for r in matrix['rows']) == sorted([ref, corpus['small']['peer']])
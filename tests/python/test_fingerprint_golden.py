@@ -0,0 +1,118 @@
+"""fingerprint-docx.py 골든 파일 — --update 후 --check 통과, 변경 문서의 요소 단위 차이, 변동 메타데이터 무시"""
+
+import os
+import json
+import shutil
+import zipfile
+
+import pytest
+
+from conftest import run_tool
+
+TITLE_PARA = '<w:p><w:pPr><w:pStyle w:val="Title"/></w:pPr><w:r><w:t xml:space="preserve">합성 문서</w:t></w:r></w:p>'
+
+
+def rewrite_docx(src, dst, edit):
+    """src를 다시 압축해 dst로 — edit(파트 이름, 텍스트) → 새 텍스트 (XML 파트만)"""
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename.endswith('.xml'):
+                data = edit(info.filename, data.decode('utf-8')).encode('utf-8')
+            zout.writestr(info.filename, data)
+
+
+def fingerprint(*args):
+    """--jsonl 실행 → (CompletedProcess, {파일 이름: 결과}, 요약)"""
+    proc = run_tool('fingerprint-docx.py', *args, '--jsonl', '--workers', '1')
+    *rows, summary = [json.loads(line) for line in proc.stdout.splitlines()]
+    return proc, {os.path.basename(r['file']): r for r in rows}, summary
+
+
+@pytest.fixture
+def golden(tmp_path, corpus):
+    """build/에 small·medium 문서, golden/에 그 골든 파일"""
+    build = tmp_path / 'build'
+    build.mkdir()
+    shutil.copy(corpus['small']['docx'], build / 'small.docx')
+    shutil.copy(corpus['medium']['docx'], build / 'medium.docx')
+    golden_dir = tmp_path / 'golden'
+    proc, results, _ = fingerprint(str(build / '*.docx'), '--update', str(golden_dir))
+    assert proc.returncode == 0, proc.stderr
+    assert {r['status'] for r in results.values()} == {'written'}
+    return build, golden_dir
+
+
+def test_update_then_check_matches(golden):
+    build, golden_dir = golden
+    assert sorted(p.name for p in golden_dir.iterdir()) == ['medium.docx.fp.json', 'small.docx.fp.json']
+
+    proc, results, summary = fingerprint(str(build / '*.docx'), '--check', str(golden_dir))
+    assert proc.returncode == 0
+    assert all(r['status'] == 'match' and r['fast'] for r in results.values())
+    assert summary['byStatus'] == {'match': 2}
+
+    proc, results, _ = fingerprint(str(build / '*.docx'), '--update', str(golden_dir))
+    assert {r['status'] for r in results.values()} == {'unchanged'}
+
+
+def test_docprops_and_rsid_changes_are_ignored(golden):
+    build, golden_dir = golden
+    original = build / 'small.docx'
+    shutil.move(original, build / 'orig.tmp')
+
+    def edit(name, xml):
+        if name == 'docProps/core.xml':
+            return xml.replace('</cp:coreProperties>', '<dc:title>rebuilt</dc:title></cp:coreProperties>')
+        if name == 'word/document.xml':
+            return (xml.replace('<w:p>', '<w:p w:rsidR="00A1B2C3" w:rsidRDefault="00A1B2C3">')
+                       .replace('<w:r>', '<w:r w:rsidRPr="00D4E5F6">'))
+        return xml
+
+    rewrite_docx(build / 'orig.tmp', original, edit)
+    proc, results, _ = fingerprint(str(original), '--check', str(golden_dir))
+    assert proc.returncode == 0
+    assert results['small.docx']['status'] == 'match'
+    assert results['small.docx']['fast'] is False  # 파트 해시는 달라 정규화 지문으로 확인
+
+
+def test_changed_document_reports_element_diffs(golden):
+    build, golden_dir = golden
+    original = build / 'small.docx'
+    shutil.move(original, build / 'orig.tmp')
+
+    def edit(name, xml):
+        if name != 'word/document.xml':
+            return xml
+        assert TITLE_PARA in xml and '1.1 처리 JSON' in xml
+        return xml.replace(TITLE_PARA, '', 1).replace('1.1 처리 JSON', '1.1 처리 XML', 1)
+
+    rewrite_docx(build / 'orig.tmp', original, edit)
+    proc, results, summary = fingerprint(str(build / '*.docx'), '--check', str(golden_dir))
+    assert proc.returncode == 1
+    assert results['medium.docx']['status'] == 'match'
+    small = results['small.docx']
+    assert small['status'] == 'mismatch'
+    assert set(small['details']) == {'elements', 'styles'}  # 섹션은 그대로
+    assert small['details']['styles'] == {'added': [], 'removed': ['Title'], 'changed': []}
+    elements = small['details']['elements']
+    assert [d['type'] for d in elements] == ['removed', 'text_changed']
+    assert elements[0]['index'] == 0 and elements[0]['style'] == 'Title'
+    assert elements[1]['element'] == 'heading'
+    assert summary['byStatus'] == {'match': 1, 'mismatch': 1}
+
+    text = run_tool('fingerprint-docx.py', str(original), '--check', str(golden_dir), '--workers', '1')
+    assert text.returncode == 1
+    assert 'MISMATCH' in text.stdout and 'text_changed' in text.stdout
+
+
+def test_missing_golden_and_corrupt_document_fail(golden):
+    build, golden_dir = golden
+    shutil.copy(build / 'small.docx', build / 'new.docx')
+    (build / 'bad.docx').write_bytes(b'not a zip file')
+    (golden_dir / 'bad.docx.fp.json').write_text('{}', encoding='utf-8')
+    proc, results, _ = fingerprint(str(build / '*.docx'), '--check', str(golden_dir))
+    assert proc.returncode == 1
+    assert results['new.docx']['status'] == 'missing_golden'
+    assert results['bad.docx']['status'] == 'error'
+    assert results['bad.docx']['error'].startswith('Invalid DOCX')
@@ -0,0 +1,72 @@
+"""font_metrics — 글자 폭 표/줄바꿈 빠른 경로가 단어 단위 시뮬레이션과 같은지, 글꼴 폴더 목록 재사용"""
+
+import random
+
+import pytest
+
+import font_metrics as fm
+from layout_profile import table_wrap_lines
+
+
+@pytest.fixture
+def font_env(tmp_path, monkeypatch):
+    """빈 글꼴 폴더 하나만 보는 환경 (시스템 글꼴 폴더 제외, 캐시도 임시 폴더)"""
+    fonts = tmp_path / 'fonts'
+    fonts.mkdir()
+    monkeypatch.setenv('GENDOCS_FONT_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(fm, 'font_dirs', lambda: [str(fonts)])
+    scans = []
+    scan = fm._scan_font_dirs
+    monkeypatch.setattr(fm, '_scan_font_dirs', lambda roots: (scans.append(roots), scan(roots))[1])
+    fm.clear_font_cache()
+    yield fonts, scans
+    fm.clear_font_cache()
+
+
+def _random_text(rng):
+    words = ['주문', 'API', 'request', '식별자', 'id', 'customer_name', '2026-01-15', '가나다라마바사아자차카타파하']
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+
+
+def test_count_lines_fast_path_matches_word_wrap():
+    rng = random.Random(3)
+    for _ in range(300):
+        text = _random_text(rng)
+        width = rng.choice([600, 1500, 3000, 6000, 12000])
+        limit = width / 20 / 9 * fm.EM
+        assert fm.count_lines(text, width, 'Malgun Gothic', 9) == \
+            fm._count_lines(text, limit, 'Malgun Gothic', 'Malgun Gothic', False)
+
+
+def test_batch_widths_match_single_widths():
+    texts = ['가나다', 'abc', 'x' * 40, '주문 API', '', '😀 emoji']
+    singles = [fm.text_width_pt(t, 'Consolas', 9, east_asia='Malgun Gothic') for t in texts]
+    assert fm.text_widths_pt(texts, 'Consolas', 9, east_asia='Malgun Gothic') == pytest.approx(singles)
+
+
+def test_table_wrap_lines_uses_widest_cell():
+    fonts = (('Malgun Gothic', 'Malgun Gothic', 9, True), ('Malgun Gothic', 'Malgun Gothic', 9, False))
+    long_text = '긴 설명 ' * 40
+    rows = [[['항목'], ['설명']], [['id'], [long_text]], [['name'], ['짧음', '두 번째 단락']]]
+    widths = [[2000, 4000], [0, 0], [2000, 4000]]
+    lines = table_wrap_lines(rows, widths, fonts, 12720)
+    assert lines[0] == 1
+    assert lines[1] == fm.count_lines(long_text, 4000 - 216, 'Malgun Gothic', 9) > 1
+    assert lines[2] == 2  # 단락마다 새 줄
+
+
+def test_font_index_is_reused_until_a_folder_changes(font_env):
+    fonts, scans = font_env
+    assert fm.find_font_file('Malgun Gothic') is None
+    assert len(scans) == 1
+
+    fm.clear_font_cache()  # 새 프로세스처럼: 메모리 목록 없이 저장된 목록부터
+    assert fm.find_font_file('Malgun Gothic') is None
+    assert len(scans) == 1
+
+    (fonts / 'malgun.ttf').write_bytes(b'not really a font')
+    fm.clear_font_cache()
+    assert fm.find_font_file('Malgun Gothic') == str(fonts / 'malgun.ttf')
+    assert len(scans) == 2
+    # 파싱할 수 없는 파일이면 내장 메트릭으로
+    assert fm.get_font_metrics('Malgun Gothic').source == 'builtin'
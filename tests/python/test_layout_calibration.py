@@ -0,0 +1,79 @@
+"""레이아웃 계수 보정 — 최소제곱 맞춤, 페이지 경계 → 보정 식, 프로필 조회 순서"""
+
+import random
+
+import pytest
+
+import layout_profile as lp
+from conftest import load_tool
+
+TRUE_COEFFICIENTS = dict(lp.DEFAULT_COEFFICIENTS, h2=50, paragraph=18.5, table_row=25, code_row=14)
+
+
+def synthetic_samples(n=60, seed=5):
+    """참 계수로 만든 페이지 관측 (요소 항 → 정확한 목표 높이)"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n):
+        counts = {'h2': rng.randint(0, 2), 'paragraph': rng.randint(5, 25),
+                  'table_row': rng.randint(0, 12), 'code_row': rng.randint(0, 15)}
+        samples.append((counts, lp.estimate_height((counts, 0), TRUE_COEFFICIENTS)))
+    return samples
+
+
+def test_fit_recovers_coefficients_from_exact_pages():
+    fitted = lp.fit_coefficients(synthetic_samples(), ridge=1e-6)
+    for key in ('h2', 'paragraph', 'table_row', 'code_row'):
+        assert fitted[key] == pytest.approx(TRUE_COEFFICIENTS[key], abs=0.1)
+    # 관측에 없는 계수는 prior 그대로
+    assert fitted['info_box'] == lp.DEFAULT_COEFFICIENTS['info_box']
+    assert lp.fit_error(synthetic_samples(), fitted) < 1.0 < lp.fit_error(synthetic_samples(), lp.DEFAULT_COEFFICIENTS)
+
+
+def test_ridge_pulls_toward_prior_and_min_value_clamps():
+    samples = synthetic_samples(n=4)
+    weak = lp.fit_coefficients(samples, ridge=1e-6)
+    strong = lp.fit_coefficients(samples, ridge=1e6)
+    assert strong['paragraph'] == pytest.approx(lp.DEFAULT_COEFFICIENTS['paragraph'], abs=0.1)
+    assert abs(weak['paragraph'] - 18.5) < abs(strong['paragraph'] - 18.5)
+
+    negative = lp.fit_coefficients([({'empty': 1}, -50.0)] * 10, ridge=1e-6, min_value=1.0)
+    assert negative['empty'] == 1.0
+
+
+def test_fit_without_observations_returns_prior():
+    prior = dict(lp.DEFAULT_COEFFICIENTS, h3=99)
+    assert lp.fit_coefficients([], prior) == prior
+
+
+def test_page_samples_groups_split_elements_into_one_equation():
+    calibrate = load_tool('calibrate-layout.py')
+    para = {'type': 'paragraph', 'lines': 1, 'text': 'p'}
+    long_para = {'type': 'paragraph', 'lines': 6, 'text': 'long'}
+    elements = [para, para, long_para, para, para, para, para]
+    # 0쪽: 0~1, 1쪽: 2(나뉘는 긴 단락)~, 2쪽: 3~4, 3쪽: 5~ → 1~2쪽은 두 쪽짜리 식 하나
+    samples = calibrate.page_samples(elements, {0: 0, 1: 2, 2: 3, 3: 5}, 500.0)
+    # 마지막 쪽의 남은 공간 = 들어가지 못한 다음 요소 높이의 절반
+    assert samples == [({'paragraph': 1 + 1 + 6 * 0.5}, 500.0),
+                       ({'paragraph': 6 + 1 + 1 + 0.5}, 1000.0)]
+
+
+def test_page_samples_skip_explicit_page_breaks():
+    calibrate = load_tool('calibrate-layout.py')
+    para = {'type': 'paragraph', 'lines': 1, 'text': 'p'}
+    elements = [para, {'type': 'page_break'}, para, para]
+    assert calibrate.page_samples(elements, {0: 0, 1: 2}, 500.0) == []
+
+
+def test_profile_lookup_order(tmp_path):
+    path = str(tmp_path / 'layout-profile.json')
+    lp.save_layout_profile({'profiles': {
+        'office-modern/landscape': {'coefficients': {'h2': 60}},
+        '*/landscape': {'coefficients': {'h2': 50, 'paragraph': 21, 'bogus': 3, 'h3': -1}},
+    }}, path)
+    assert lp.layout_coefficients('office-modern', 'landscape', path)['h2'] == 60
+    assert lp.layout_coefficients('office-modern', 'landscape', path)['paragraph'] == lp.DEFAULT_COEFFICIENTS['paragraph']
+    other = lp.layout_coefficients('other', 'landscape', path)
+    assert (other['h2'], other['paragraph'], other['h3']) == (50, 21, lp.DEFAULT_COEFFICIENTS['h3'])
+    assert 'bogus' not in other
+    assert lp.layout_coefficients('other', 'portrait', path) == lp.DEFAULT_COEFFICIENTS
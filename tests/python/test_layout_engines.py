@@ -0,0 +1,118 @@
+"""레이아웃 시뮬레이션 — 페이지 나누기 규칙(keepNext/keepLines/widowControl/cantSplit)과
+LayoutSimulator(순차)·VectorLayout(배열)이 섹션이 있는 문서에서도 같은 페이지를 내는지"""
+
+import random
+
+import pytest
+
+from conftest import load_tool, para, heading, table, image, section, random_layout_elements
+
+vd = load_tool('validate-docx.py')
+np = pytest.importorskip('numpy')
+
+
+def numbered(elements):
+    return [dict(e, index=i) for i, e in enumerate(elements)]
+
+
+def sequential(elements, usable):
+    simulator = vd.LayoutSimulator(usable)
+    for elem in elements:
+        simulator.feed(elem)
+    return simulator.finish()
+
+
+def both(elements, usable):
+    """두 엔진의 결과가 같은지 확인하고 그 layout을 반환"""
+    elements = numbered(elements)
+    layout = sequential(elements, usable)
+    assert vd.VectorLayout(elements, usable).simulate() == layout
+    return layout
+
+
+def used(layout):
+    return [p['used_height'] for p in layout['pages']]
+
+
+# ============================================================
+# 섹션
+# ============================================================
+
+def test_continuous_section_break_after_overflowing_element_stays_on_the_page():
+    layout = both([image(380.5), section(300)], 300)
+    assert used(layout) == [380.5]
+
+    layout = both([image(380.5), section(300), para(40)], 300)
+    assert used(layout) == [380.5, 40.0]
+    assert layout['page_starts'][1][0] == 2
+
+
+def test_new_page_section_uses_the_new_usable_height():
+    layout = both([para(200), section(600, new_page=True), para(250), para(250), para(250)], 300)
+    assert used(layout) == [200.0, 500.0, 250.0]
+    assert [p['fill_pct'] for p in layout['pages']][:2] == [66.7, 83.3]
+
+
+def test_multi_section_document_gives_the_same_pages(multi_section_docx):
+    report = vd.analyze_document(multi_section_docx)
+    assert any(e['type'] == 'section_break' for e in report['elements'])
+    usable = report['page']['usable_height_pt']
+    assert vd.VectorLayout(report['elements'], usable).simulate() == sequential(report['elements'], usable)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_engines_agree_on_random_sectioned_documents(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        both(random_layout_elements(rng, keeps=False), rng.choice([300, 457, 600]))
+
+
+# ============================================================
+# 페이지 나누기 규칙 (keepNext / keepLines / widowControl / cantSplit)
+# ============================================================
+
+def test_keep_next_moves_the_heading_with_the_next_element():
+    assert used(both([para(250), heading(30), para(100)], 300)) == [280.0, 100.0]
+    layout = both([para(250), heading(30, keep_next=True), para(100)], 300)
+    assert used(layout) == [250.0, 130.0]
+    assert layout['page_starts'][1][0] == 1
+
+
+def test_keep_next_chain_longer_than_a_page_splits_before_the_overflowing_piece():
+    layout = both([para(150), heading(28.4, keep_next=True), table([320.0]), para(80)], 300)
+    assert used(layout) == [150.0, 28.4, 320.0, 80.0]
+
+
+def test_keep_lines_moves_the_whole_paragraph():
+    assert used(both([para(200), para(150, lines=10)], 300)) == [290.0, 60.0]
+    assert used(both([para(200), para(150, lines=10, keep_lines=True)], 300)) == [200.0, 150.0]
+
+
+def test_widow_control_keeps_two_lines_at_each_end():
+    # 첫 줄만 들어가면 단락째 넘긴다
+    assert used(both([para(280), para(150, lines=10)], 300)) == [295.0, 135.0]
+    assert used(both([para(280), para(150, lines=10, widow_control=True)], 300)) == [280.0, 150.0]
+    # 마지막 한 줄만 넘어가면 두 줄을 함께 넘긴다
+    assert used(both([para(50), para(260, lines=10)], 300)) == [284.0, 26.0]
+    assert used(both([para(50), para(260, lines=10, widow_control=True)], 300)) == [258.0, 52.0]
+
+
+def test_cant_split_keeps_a_multi_line_row_together():
+    rows = {'row_lines': [1, 3, 1]}
+    assert used(both([para(220), table([30.0, 90.0, 30.0], **rows)], 300)) == [280.0, 90.0]
+    layout = both([para(220), table([30.0, 90.0, 30.0], cant_split=[False, True, False], **rows)], 300)
+    assert used(layout) == [250.0, 120.0]
+
+
+def test_carried_block_is_split_again_on_a_shorter_page():
+    """앞 페이지에서 넘긴 keepLines 묶음이 새 (더 작은) 페이지보다 길면 그 페이지에서 다시 나뉜다"""
+    layout = both([para(318), section(300), para(185.2), para(588.5, lines=37, keep_lines=True)], 457)
+    assert used(layout) == [318.0, 185.2, 286.3, 286.3, 15.9]
+    assert all(p['fill_pct'] <= 100 for p in layout['pages'])
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_engines_agree_on_random_documents_with_keep_rules(seed):
+    rng = random.Random(100 + seed)
+    for _ in range(500):
+        both(random_layout_elements(rng), rng.choice([300, 457, 600]))
@@ -0,0 +1,125 @@
+"""프로세스 내 DocxModel 공유 — LRU 개수/메모리 상한, 파일 변경 감지, 여러 스레드의 동시 분석"""
+
+import io
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import docx_model
+from conftest import load_tool
+
+vd = load_tool('validate-docx.py')
+rd = load_tool('review-docx.py')
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    docx_model.clear_model_cache()
+    yield
+    docx_model.clear_model_cache()
+
+
+@pytest.fixture
+def copies(tmp_path, corpus):
+    """서로 다른 경로의 small 문서 사본 세 개"""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'copy{i}.docx'
+        shutil.copy(corpus['small']['docx'], path)
+        paths.append(str(path))
+    return paths
+
+
+def cached_paths():
+    return [key[0] for key in docx_model._MODEL_CACHE]
+
+
+# ============================================================
+# 캐시 키와 상한
+# ============================================================
+
+def test_same_file_shares_one_model_until_it_changes(copies, corpus):
+    path = copies[0]
+    model = docx_model.load_docx(path)
+    assert docx_model.load_docx(path) is model
+    assert docx_model.load_docx(path, name='other.docx') is not model  # 리포트 이름이 다르면 별도 모델
+
+    shutil.copy(corpus['small']['peer'], path)
+    changed = docx_model.load_docx(path)
+    assert changed is not model
+    assert changed.sha256 != model.sha256
+
+
+def test_bytes_and_file_objects_are_not_cached(corpus):
+    with open(corpus['small']['docx'], 'rb') as f:
+        data = f.read()
+    assert docx_model.load_docx(data) is not docx_model.load_docx(data)
+    docx_model.load_docx(io.BytesIO(data))
+    assert not docx_model._MODEL_CACHE
+    model = docx_model.load_docx(data)
+    assert docx_model.load_docx(model) is model
+
+
+def test_least_recently_used_model_is_evicted(copies, monkeypatch):
+    monkeypatch.setattr(docx_model, '_MODEL_CACHE_SIZE', 2)
+    first = docx_model.load_docx(copies[0])
+    docx_model.load_docx(copies[1])
+    assert docx_model.load_docx(copies[0]) is first   # 다시 쓰면 가장 최근으로
+    docx_model.load_docx(copies[2])
+    assert cached_paths() == [copies[0], copies[2]]
+    assert docx_model.load_docx(copies[0]) is first
+
+
+def test_memory_bound_counts_parsed_trees(copies, monkeypatch):
+    model = docx_model.load_docx(copies[0])
+    unparsed = model.memory_estimate()
+    model.elements
+    parsed = model.memory_estimate()
+    assert parsed > unparsed
+
+    # 파싱된 모델 하나와 파싱 전 모델 하나까지만 들어가는 상한
+    monkeypatch.setattr(docx_model, '_MODEL_CACHE_MAX_BYTES', parsed + unparsed)
+    docx_model.load_docx(copies[1]).elements
+    docx_model.load_docx(copies[2])
+    assert cached_paths() == [copies[1], copies[2]]
+
+
+# ============================================================
+# 여러 스레드
+# ============================================================
+
+def test_first_access_from_many_threads_sees_one_consistent_model(corpus):
+    model = docx_model.load_docx(corpus['medium']['docx'])
+    barrier = threading.Barrier(8)
+
+    def read():
+        barrier.wait()
+        return [(el.tag, el.kind, el.text) for el in model.elements]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: read(), range(8)))
+    assert all(r == results[0] for r in results)
+    assert len(results[0]) == len(docx_model.DocxModel(corpus['medium']['docx']).elements)
+
+
+def test_concurrent_validate_and_review_match_serial_runs(corpus, multi_section_docx, monkeypatch):
+    """세로/가로 문서를 섞어 여러 스레드가 같은 공유 모델로 분석해도 순차 결과와 같다"""
+    monkeypatch.setattr(docx_model, '_MODEL_CACHE_SIZE', 2)   # 분석 도중 모델이 밀려나는 경우도 포함
+    paths = [corpus['small']['docx'], corpus['medium']['docx'], multi_section_docx]
+    jobs = [(kind, path) for path in paths for kind in ('validate', 'review')] * 4
+
+    def run(job):
+        kind, path = job
+        if kind == 'validate':
+            return vd.validate_json(path, use_cache=False)
+        return rd.review_json(path, use_cache=False)
+
+    serial = {job: run(job) for job in set(jobs)}
+    docx_model.clear_model_cache()
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(run, jobs))
+    for job, result in zip(jobs, results):
+        assert result == serial[job], job
+    assert len(docx_model._MODEL_CACHE) <= 2
@@ -0,0 +1,143 @@
+"""--only styles,pageSetup,headingStyles 빠른 경로 — 전체 실행의 같은 항목과 일치, 본문 트리를 만들지 않음, 서버 diff와 CLI 일치"""
+
+import json
+import shutil
+import zipfile
+
+import pytest
+
+from conftest import run_tool, run_json, load_tool
+
+ONLY = 'styles,pageSetup,headingStyles'
+DIFF_CATEGORIES = ('pageSetup', 'docDefaults', 'headingStyles')
+SPEC_SECTIONS = ('pageSetup', 'docDefaults', 'headingStyles', 'tableStyles')
+
+
+@pytest.fixture(scope='module')
+def restyled(tmp_path_factory, corpus):
+    """small과 본문은 같고 docDefaults/Heading1 글자 크기만 다른 문서"""
+    src = corpus['small']['docx']
+    dst = tmp_path_factory.mktemp('restyled') / 'restyled.docx'
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == 'word/styles.xml':
+                data = data.replace(b'<w:sz w:val="20"/>', b'<w:sz w:val="22"/>')
+                data = data.replace(b'<w:sz w:val="32"/>', b'<w:sz w:val="36"/>')
+            zout.writestr(info.filename, data)
+    return str(dst)
+
+
+@pytest.fixture(scope='module')
+def pairs(corpus, restyled, multi_section_docx):
+    small = corpus['small']['docx']
+    return [(small, restyled), (small, multi_section_docx), (small, corpus['small']['peer'])]
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# ============================================================
+# 전체 실행과 일치
+# ============================================================
+
+def test_diff_only_matches_full_run(pairs):
+    seen = 0
+    for ref, gen in pairs:
+        full = run_json('diff-docx.py', ref, gen, '--json')
+        only = run_json('diff-docx.py', ref, gen, '--json', '--only', ONLY)
+        assert set(only) == set(DIFF_CATEGORIES) | {'summary'}
+        for cat in DIFF_CATEGORIES:
+            assert only[cat] == full[cat], (gen, cat)
+            assert only['summary']['byCategory'][cat] == full['summary']['byCategory'][cat]
+        assert only['summary']['totalDiffs'] == sum(full['summary']['byCategory'][c] for c in DIFF_CATEGORIES)
+        seen += only['summary']['totalDiffs']
+    assert seen  # 적어도 한 쌍은 스타일/페이지 차이가 있어야 비교가 의미 있다
+
+
+def test_diff_only_directories_ignore_body_changes(tmp_path, corpus, restyled):
+    """폴더 쌍: --only 스타일이면 본문만 바뀐 문서는 same_xml, 스타일이 바뀐 문서만 changed"""
+    a, b = tmp_path / 'a', tmp_path / 'b'
+    a.mkdir()
+    b.mkdir()
+    shutil.copy(corpus['small']['docx'], a / 'body.docx')
+    shutil.copy(corpus['small']['peer'], b / 'body.docx')
+    shutil.copy(corpus['small']['docx'], a / 'styles.docx')
+    shutil.copy(restyled, b / 'styles.docx')
+    proc = run_tool('diff-docx.py', str(a), str(b), '--jsonl', '--workers', '1', '--only', 'styles')
+    *rows, summary = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert proc.returncode == 1
+    assert {r['file']: r['status'] for r in rows} == {'body.docx': 'same_xml', 'styles.docx': 'changed'}
+    [changed] = [r for r in rows if r['status'] == 'changed']
+    assert changed['changedParts'] == ['word/styles.xml']
+    assert set(changed['byCategory']) == {'docDefaults', 'headingStyles'}
+    assert set(summary['changedByCategory']) == {'docDefaults', 'headingStyles'}
+
+
+@pytest.mark.parametrize('which', ['restyled', 'sections'])
+def test_extract_spec_only_matches_full_run(which, restyled, multi_section_docx):
+    path = restyled if which == 'restyled' else multi_section_docx
+    full = run_json('extract-docx-spec.py', path, '--json', '--no-cache')
+    only = run_json('extract-docx-spec.py', path, '--json', '--no-cache', '--only', ONLY)
+    assert set(only) == {'file', *SPEC_SECTIONS}
+    for section in SPEC_SECTIONS:
+        assert only[section] == full[section], section
+
+
+def test_unknown_category_is_rejected(corpus):
+    small = corpus['small']['docx']
+    diff = run_tool('diff-docx.py', small, small, '--json', '--only', 'styles,fonts')
+    assert diff.returncode == 1 and 'unknown category: fonts' in diff.stdout
+    spec = run_tool('extract-docx-spec.py', small, '--json', '--only', 'fonts')
+    assert spec.returncode == 2 and 'fonts' in spec.stderr
+
+
+# ============================================================
+# 본문 트리를 만들지 않음
+# ============================================================
+
+def test_diff_only_does_not_parse_the_body(corpus):
+    dd = load_tool('diff-docx.py')
+    model = dd.open_docx(read_bytes(corpus['small']['docx']))
+    features = dd.extract_features(model, dd.parse_categories(ONLY))
+    assert features['categories'] == list(DIFF_CATEGORIES)
+    assert 'word/document.xml' not in model._parts
+    assert model._parts.get('word/styles.xml') is not None
+
+    dd.extract_features(model, dd.parse_categories('elementStructure'))
+    assert model._parts.get('word/document.xml') is not None
+
+
+def test_extract_spec_only_does_not_parse_the_body(corpus):
+    es = load_tool('extract-docx-spec.py')
+    model = es.load_docx(read_bytes(corpus['small']['docx']))
+    spec = es.extract_spec(model, es.parse_sections(ONLY))
+    assert set(spec) == {'file', *SPEC_SECTIONS}
+    assert 'word/document.xml' not in model._parts
+
+
+# ============================================================
+# analysis-server diff
+# ============================================================
+
+def serve(*requests):
+    lines = [json.dumps(r, ensure_ascii=False) for r in requests]
+    proc = run_tool('analysis-server.py', stdin=('\n'.join(lines) + '\n').encode('utf-8'))
+    assert proc.returncode == 0, proc.stderr
+    return [json.loads(line) for line in proc.stdout.splitlines() if line.strip()]
+
+
+def test_server_diff_only_matches_cli(corpus, restyled):
+    ref = corpus['small']['docx']
+    cli = run_json('diff-docx.py', ref, restyled, '--json', '--only', ONLY)
+    as_string, as_list, bad = serve(
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'diff', 'params': {'ref': ref, 'gen': restyled, 'only': ONLY}},
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'diff',
+         'params': {'ref': ref, 'gen': restyled, 'only': ONLY.split(',')}},
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'diff', 'params': {'ref': ref, 'gen': restyled, 'only': 'fonts'}},
+    )
+    assert as_string['result'] == cli
+    assert as_list['result'] == cli
+    assert bad['error']['code'] == -32602
@@ -0,0 +1,49 @@
+"""선택 의존성(numpy) 없이도 validate/review가 같은 결과를 내는지 — import를 막은 하위 프로세스로 확인"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+from conftest import TOOLS_DIR, run_tool
+
+
+@pytest.fixture(scope='module')
+def without_numpy(tmp_path_factory):
+    """PYTHONPATH 앞에 ImportError를 내는 numpy 모듈을 둔 환경"""
+    blocker = tmp_path_factory.mktemp('no-numpy')
+    (blocker / 'numpy.py').write_text("raise ImportError('numpy disabled for test')\n", encoding='utf-8')
+    return {'PYTHONPATH': str(blocker)}
+
+
+@pytest.mark.parametrize('script', ['validate-docx.py', 'review-docx.py'])
+@pytest.mark.parametrize('which', ['small', 'medium'])
+def test_results_match_without_numpy(script, which, corpus, without_numpy):
+    path = corpus[which]['docx']
+    with_np = run_tool(script, path, '--json', '--no-cache')
+    without_np = run_tool(script, path, '--json', '--no-cache', env=without_numpy)
+    assert without_np.returncode == with_np.returncode, without_np.stderr
+    assert with_np.stdout and without_np.stdout == with_np.stdout
+
+
+def _imports_numpy(code):
+    """code를 tools/가 경로에 있는 하위 프로세스에서 실행한 뒤 numpy가 import됐는지"""
+    env = dict(os.environ, PYTHONPATH=TOOLS_DIR)
+    proc = subprocess.run([sys.executable, '-X', 'utf8', '-c', code + '; import sys; print("numpy" in sys.modules)'],
+                          capture_output=True, env=env, cwd=TOOLS_DIR)
+    assert proc.returncode == 0, proc.stderr.decode('utf-8', errors='replace')
+    return proc.stdout.decode('utf-8').split()[-1] == 'True'
+
+
+def test_shared_modules_import_numpy_lazily():
+    """공유 모듈과 validate 도구 로드(캐시 적중 경로)는 numpy를 불러오지 않는다"""
+    assert not _imports_numpy('import docx_model, font_metrics, layout_profile, report_cache, theme_colors')
+    assert not _imports_numpy("from tool_loader import load_tool; load_tool('validate-docx.py')")
+
+
+def test_validate_skips_numpy_below_the_vector_layout_threshold(corpus):
+    """중간 크기 문서의 캐시 없는 검증은 numpy import 비용을 들이지 않는다 (순차 시뮬레이션)"""
+    path = corpus['medium']['docx']
+    assert not _imports_numpy("from tool_loader import load_tool; vd = load_tool('validate-docx.py'); "
+                              f"vd.simulate_layout(vd.analyze_document({path!r}))")
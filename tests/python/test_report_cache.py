@@ -0,0 +1,203 @@
+"""report_cache — 키 무효화(도구 소스/테마/config·MD), --no-cache, 인덱스 기반 크기 정리"""
+
+import os
+import glob
+import json
+import shutil
+
+import pytest
+
+import report_cache
+from conftest import run_tool
+
+
+def report_files(cache_dir):
+    """캐시된 리포트 파일 (증분 상태 제외)"""
+    return [p for p in glob.glob(os.path.join(cache_dir, '*', '*.json'))
+            if os.path.basename(os.path.dirname(p)) != 'state']
+
+
+@pytest.fixture
+def fresh_stamps(monkeypatch):
+    """tool_stamp의 프로세스 캐시를 비운 채로 시작 (소스를 바꾼 뒤 clear()로 다시 계산)"""
+    stamps = {}
+    monkeypatch.setattr(report_cache, '_STAMPS', stamps)
+    return stamps
+
+
+# ============================================================
+# 키 무효화
+# ============================================================
+
+def test_key_changes_with_tool_source(tmp_path, corpus, fresh_stamps):
+    tool = tmp_path / 'fake-tool.py'
+    tool.write_text('VERSION = 1\n', encoding='utf-8')
+    cache = report_cache.ReportCache(str(tmp_path / 'cache'))
+    key = cache.key(str(tool), corpus['small']['docx'])
+    assert cache.key(str(tool), corpus['small']['docx']) == key
+
+    tool.write_text('VERSION = 2\n', encoding='utf-8')
+    fresh_stamps.clear()
+    assert cache.key(str(tool), corpus['small']['docx']) != key
+
+
+@pytest.mark.parametrize('shared', report_cache._SHARED_SOURCES)
+def test_stamp_changes_with_each_shared_module(tmp_path, fresh_stamps, monkeypatch, shared):
+    tools = tmp_path / 'tools'
+    tools.mkdir()
+    for name in report_cache._SHARED_SOURCES:
+        shutil.copy(os.path.join(report_cache.TOOLS_DIR, name), tools / name)
+    tool = tools / 'validate-docx.py'
+    tool.write_text('', encoding='utf-8')
+    monkeypatch.setattr(report_cache, 'TOOLS_DIR', str(tools))
+    stamp = report_cache.tool_stamp(str(tool))
+
+    with open(tools / shared, 'a', encoding='utf-8') as f:
+        f.write('\n# changed\n')
+    fresh_stamps.clear()
+    assert report_cache.tool_stamp(str(tool)) != stamp
+
+
+def test_layout_profile_is_a_shared_source():
+    assert 'layout_profile.py' in report_cache._SHARED_SOURCES
+
+
+def test_key_changes_with_theme_json(tmp_path, corpus, fresh_stamps, monkeypatch):
+    themes = tmp_path / 'project' / 'themes'
+    themes.mkdir(parents=True)
+    (themes / 'a.json').write_text('{"colors": {"primary": "112233"}}', encoding='utf-8')
+    monkeypatch.setattr(report_cache, 'PROJECT_ROOT', str(tmp_path / 'project'))
+    cache = report_cache.ReportCache(str(tmp_path / 'cache'))
+    tool = os.path.join(report_cache.TOOLS_DIR, 'validate-docx.py')
+    key = cache.key(tool, corpus['small']['docx'])
+
+    (themes / 'a.json').write_text('{"colors": {"primary": "445566"}}', encoding='utf-8')
+    fresh_stamps.clear()
+    changed = cache.key(tool, corpus['small']['docx'])
+    assert changed != key
+
+    (themes / 'b.json').write_text('{}', encoding='utf-8')
+    fresh_stamps.clear()
+    assert cache.key(tool, corpus['small']['docx']) not in (key, changed)
+
+
+def test_key_changes_with_extra_files_and_options(tmp_path, corpus):
+    md = tmp_path / 'source.md'
+    md.write_text('# 제목\n', encoding='utf-8')
+    cache = report_cache.ReportCache(str(tmp_path / 'cache'))
+    tool = os.path.join(report_cache.TOOLS_DIR, 'review-docx.py')
+    docx = corpus['small']['docx']
+    key = cache.key(tool, docx, extra_files=[str(md)])
+
+    md.write_text('# 제목\n\n## 새 절\n', encoding='utf-8')
+    edited = cache.key(tool, docx, extra_files=[str(md)])
+    md.unlink()
+    missing = cache.key(tool, docx, extra_files=[str(md)])
+    assert len({key, edited, missing}) == 3
+    assert cache.key(tool, docx, options={'only': ['pageSetup']}) != cache.key(tool, docx)
+
+
+def test_review_cache_follows_config_source_md(tmp_path, corpus):
+    """review --config: 소스 MD가 바뀌면 다른 키로 다시 분석하고, 그대로면 캐시를 쓴다"""
+    small = corpus['small']
+    work = tmp_path / 'work'
+    work.mkdir()
+    docx = shutil.copy(small['docx'], work / 'small.docx')
+    md = shutil.copy(small['md'], work / 'small.md')
+    config = work / 'small.config.json'
+    config.write_text(json.dumps({'source': str(md), 'output': str(docx)}), encoding='utf-8')
+    env = {'GENDOCS_CACHE_DIR': str(tmp_path / 'cache')}
+
+    def review():
+        proc = run_tool('review-docx.py', str(docx), '--config', str(config), '--json', env=env)
+        assert proc.stdout, proc.stderr
+        return proc.stdout
+
+    first = review()
+    assert len(report_files(env['GENDOCS_CACHE_DIR'])) == 1
+    assert review() == first
+    assert len(report_files(env['GENDOCS_CACHE_DIR'])) == 1
+
+    with open(md, 'a', encoding='utf-8') as f:
+        f.write('\n## 추가된 절\n\n추가 내용\n')
+    after_edit = review()
+    assert len(report_files(env['GENDOCS_CACHE_DIR'])) == 2
+    assert after_edit != first
+
+
+@pytest.mark.parametrize('script', ['validate-docx.py', 'review-docx.py', 'extract-docx-spec.py'])
+def test_no_cache_reads_and_writes_nothing(tmp_path, corpus, script):
+    docx = corpus['small']['docx']
+    cache_dir = tmp_path / 'cache'
+    env = {'GENDOCS_CACHE_DIR': str(cache_dir)}
+    uncached = run_tool(script, docx, '--json', '--no-cache', env=env)
+    assert uncached.stdout, uncached.stderr
+    assert not cache_dir.exists() or not any(cache_dir.rglob('*.json'))
+
+    cached = run_tool(script, docx, '--json', env=env)
+    assert report_files(str(cache_dir))
+    assert cached.stdout == uncached.stdout
+
+
+def test_no_cache_ignores_a_stale_entry(tmp_path, corpus):
+    """--no-cache는 잘못된 캐시 항목이 있어도 읽지 않는다"""
+    docx = corpus['small']['docx']
+    env = {'GENDOCS_CACHE_DIR': str(tmp_path / 'cache')}
+    expected = run_tool('validate-docx.py', docx, '--json', env=env).stdout
+    [path] = report_files(env['GENDOCS_CACHE_DIR'])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'poisoned': True}, f)
+    assert json.loads(run_tool('validate-docx.py', docx, '--json', env=env).stdout) == {'poisoned': True}
+    assert run_tool('validate-docx.py', docx, '--json', '--no-cache', env=env).stdout == expected
+
+
+# ============================================================
+# 크기 정리 (인덱스)
+# ============================================================
+
+def _report(n, size=400):
+    return {'n': n, 'pad': 'x' * size}
+
+
+def test_store_does_not_rescan_cache_under_the_limit(tmp_path, monkeypatch):
+    cache = report_cache.ReportCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    scans = []
+    original = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: (scans.append(1), original()))
+    for n in range(50):
+        cache.put(f'{n:064x}', _report(n))
+    assert len(scans) == 1  # 인덱스가 없던 첫 저장만
+    total = sum(os.path.getsize(p) for p in report_files(str(tmp_path)))
+    assert cache._read_index() == (total, 49)
+
+
+def test_rescans_periodically(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, '_RESCAN_EVERY', 5)
+    cache = report_cache.ReportCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    scans = []
+    original = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: (scans.append(1), original()))
+    for n in range(11):
+        cache.put(f'{n:064x}', _report(n))
+    assert len(scans) == 3  # 첫 저장 + 5번마다
+
+
+def test_evicts_oldest_when_over_the_limit(tmp_path):
+    cache = report_cache.ReportCache(str(tmp_path), max_bytes=4000)
+    keys = [f'{n:064x}' for n in range(30)]
+    for n, key in enumerate(keys):
+        cache.put(key, _report(n))
+        os.utime(cache._path(key), (n, n))  # 저장 순서 = mtime 순서
+    total = sum(os.path.getsize(p) for p in report_files(str(tmp_path)))
+    assert total <= 4000
+    assert cache.get(keys[-1]) == _report(29)
+    assert cache.get(keys[0]) is None
+    assert cache._read_index()[0] <= 4000
+
+
+def test_overwrite_accounts_only_the_size_change(tmp_path):
+    cache = report_cache.ReportCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    key = '0' * 64
+    cache.put(key, _report(0, size=100))
+    cache.put(key, _report(0, size=300))
+    assert cache._read_index()[0] == os.path.getsize(cache._path(key))
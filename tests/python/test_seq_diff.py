@@ -0,0 +1,156 @@
+"""seq_diff(Myers 차분)과 diff-docx 요소 정렬 — LCS 길이 최소성, 일치 쌍 유효성, 제목 앵커, 구간 상한"""
+
+import random
+
+import pytest
+
+import seq_diff
+from conftest import load_tool
+
+
+def lcs_length(a, b):
+    """기준값: O(NM) 동적 계획법 LCS 길이"""
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def assert_valid(matches, a, b):
+    """일치 쌍은 양쪽 모두 엄격히 증가하고 값이 같아야 한다"""
+    for i, j in matches:
+        assert a[i] == b[j]
+    for (i0, j0), (i1, j1) in zip(matches, matches[1:]):
+        assert i0 < i1 and j0 < j1
+
+
+def random_pairs(count, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.randint(1, 6)
+        a = [rng.randrange(alphabet) for _ in range(rng.randint(0, 25))]
+        b = [rng.randrange(alphabet) for _ in range(rng.randint(0, 25))]
+        yield a, b
+
+
+# ============================================================
+# Myers 차분
+# ============================================================
+
+@pytest.mark.parametrize('func', [seq_diff.myers_matches, seq_diff.diff_matches])
+def test_matches_are_a_longest_common_subsequence(func):
+    for a, b in random_pairs(300):
+        matches = func(a, b)
+        assert_valid(matches, a, b)
+        assert len(matches) == lcs_length(a, b), (a, b)
+
+
+def test_docstring_example():
+    assert seq_diff.diff_matches([1, 2, 3, 4], [1, 3, 4, 5]) == [(0, 0), (2, 1), (3, 2)]
+
+
+@pytest.mark.parametrize('a, b', [([], []), ([1, 2], []), ([], [1, 2]), ([1, 2, 3], [1, 2, 3])])
+def test_edge_cases(a, b):
+    expected = [(k, k) for k in range(len(a))] if a == b else []
+    assert seq_diff.myers_matches(a, b) == expected
+    assert seq_diff.diff_matches(a, b) == expected
+
+
+def test_edit_distance_cap_still_returns_valid_matches(monkeypatch):
+    """편집 거리가 상한을 넘으면 최소성 대신 유효한 일치 쌍을 끝까지 이어서 낸다"""
+    monkeypatch.setattr(seq_diff, '_MYERS_MAX_D', 3)
+    rng = random.Random(3)
+    a = [rng.randrange(4) for _ in range(200)]
+    b = [rng.randrange(4) for _ in range(200)]
+    matches = seq_diff.myers_matches(a, b)
+    assert_valid(matches, a, b)
+    assert max(matches[-1]) >= 190  # 상한에서 멈추지 않고 나머지 구간을 다시 정렬했다
+
+    shared = list(range(50))
+    assert seq_diff.myers_matches(shared, shared) == [(k, k) for k in range(50)]  # 스네이크는 거리 0
+
+
+# ============================================================
+# 제목 앵커
+# ============================================================
+
+def test_anchors_keep_sections_from_bleeding():
+    """앞 절의 문단이 뒤 절의 같은 문단과 짝지어지지 않는다"""
+    H1, H2, P, Q = 100, 200, 1, 2
+    a = [H1, P, P, H2, Q]
+    b = [H1, H2, P, P, Q]      # 첫 절의 문단이 두 번째 절로 옮겨감
+    matches = seq_diff.anchored_matches(a, b, [0, 3], [0, 1])
+    assert_valid(matches, a, b)
+    assert (0, 0) in matches and (3, 1) in matches
+    assert all(not (i < 3 and j > 1) for i, j in matches)
+
+
+def test_anchors_with_inserted_section():
+    H, P = 9, 1
+    a = [H, P, H, P]
+    b = [H, P, H, P, H, P]
+    matches = seq_diff.anchored_matches(a, b, [0, 2], [0, 2, 4])
+    assert matches == [(0, 0), (1, 1), (2, 2), (3, 3)]
+
+
+def test_anchored_matches_without_anchors_equals_diff():
+    for a, b in random_pairs(50, seed=11):
+        assert seq_diff.anchored_matches(a, b, [], []) == seq_diff.diff_matches(a, b)
+
+
+# ============================================================
+# diff-docx 순서 차이
+# ============================================================
+
+@pytest.fixture(scope='module')
+def diff_docx():
+    return load_tool('diff-docx.py')
+
+
+def elements(diff_docx, *specs):
+    """(type, text[, extra]) → _build_element_list 형식의 요소 (_sig 포함)"""
+    els = []
+    for t, text, *extra in specs:
+        e = {'type': t, 'text': text, **(extra[0] if extra else {})}
+        e['_sig'] = (t, diff_docx._text_digest(text))
+        els.append(e)
+    return els
+
+
+def test_sequence_diffs_missing_extra_and_type_mismatch(diff_docx):
+    ref = elements(diff_docx,
+                   ('heading1', '개요'), ('paragraph', '첫 문단'), ('paragraph', '빠진 문단'),
+                   ('heading1', '설계'), ('bullet', '항목'), ('paragraph', '끝'))
+    gen = elements(diff_docx,
+                   ('heading1', '개요'), ('paragraph', '첫 문단'),
+                   ('heading1', '설계'), ('paragraph', '항목'), ('paragraph', '끝'),
+                   ('data_table', '', {'rows': 2, 'cols': 2}))
+    diffs = list(diff_docx.iter_sequence_diffs(ref, gen))
+    assert [(d['type'], d['index']) for d in diffs] == [
+        ('missing_in_gen', 2), ('type_mismatch', 4), ('extra_in_gen', 5)]
+    assert diffs[0]['text'] == '빠진 문단'
+    assert (diffs[1]['ref'], diffs[1]['gen']) == ('bullet', 'paragraph')
+    assert diffs[2]['element'] == 'data_table'
+
+
+def test_sequence_diffs_table_shape_and_identical(diff_docx):
+    ref = elements(diff_docx, ('heading1', '표'), ('data_table', '헤더', {'rows': 3, 'cols': 2, 'header': '헤더'}))
+    gen = elements(diff_docx, ('heading1', '표'), ('data_table', '헤더', {'rows': 4, 'cols': 2, 'header': '헤더'}))
+    assert list(diff_docx.iter_sequence_diffs(ref, ref)) == []
+    [diff] = diff_docx.iter_sequence_diffs(ref, gen)
+    assert (diff['type'], diff['ref'], diff['gen']) == ('table_shape', '3x2', '4x2')
+
+
+def test_sequence_diffs_on_real_documents(diff_docx, corpus):
+    """합성 문서와 피어(같은 계획의 변형) — 자기 자신과는 차이가 없다"""
+    small = corpus['small']
+    els = diff_docx._build_element_list(diff_docx.open_docx(small['docx']))
+    assert list(diff_docx.iter_sequence_diffs(els, els)) == []
+    peer = diff_docx._build_element_list(diff_docx.open_docx(small['peer']))
+    result = diff_docx.compare_element_structure(els, peer)
+    for d in result['sequenceDiffs']:
+        limit = len(peer) if d['type'] == 'extra_in_gen' else len(els)
+        assert 0 <= d['index'] < limit
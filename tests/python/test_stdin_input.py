@@ -0,0 +1,87 @@
+"""'-' 인자로 stdin에서 DOCX 바이트 받기 — 경로 입력과 같은 결과 (파일 이름만 '<stdin>'), 캐시, diff 제약"""
+
+import json
+
+import pytest
+
+from conftest import run_tool
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def from_path_and_stdin(script, path, *args):
+    """(경로 입력 JSON, stdin 입력 JSON)"""
+    by_path = run_tool(script, path, *args)
+    by_stdin = run_tool(script, '-', *args, stdin=read_bytes(path))
+    assert by_path.returncode == by_stdin.returncode, by_stdin.stderr
+    return json.loads(by_path.stdout), json.loads(by_stdin.stdout)
+
+
+@pytest.mark.parametrize('script', ['validate-docx.py', 'review-docx.py', 'extract-docx-spec.py'])
+@pytest.mark.parametrize('which', ['medium', 'sections'])
+def test_reports_match_path_input(script, which, corpus, multi_section_docx):
+    path = multi_section_docx if which == 'sections' else corpus['medium']['docx']
+    by_path, by_stdin = from_path_and_stdin(script, path, '--json', '--no-cache')
+    assert by_stdin.pop('file') == '<stdin>'
+    by_path.pop('file')
+    assert by_stdin == by_path
+
+
+def test_extract_elements_match_path_input(corpus):
+    by_path, by_stdin = from_path_and_stdin('extract-docx.py', corpus['small']['docx'], '--json')
+    assert by_stdin == by_path
+
+
+def test_validate_stream_mode_reads_stdin(corpus):
+    by_path, by_stdin = from_path_and_stdin('validate-docx.py', corpus['small']['docx'], '--json', '--no-cache', '--stream')
+    assert by_stdin.pop('file') == '<stdin>'
+    by_path.pop('file')
+    assert by_stdin == by_path
+
+
+def test_cached_report_is_keyed_by_content(corpus):
+    """같은 바이트를 다시 보내면 캐시된 리포트가 나오고, 경로 입력과도 같다 (이름만 다름)"""
+    data = read_bytes(corpus['small']['docx'])
+    first = run_tool('validate-docx.py', '-', '--json', stdin=data)
+    second = run_tool('validate-docx.py', '-', '--json', stdin=data)
+    assert first.returncode == 0 and second.stdout == first.stdout
+    by_path = json.loads(run_tool('validate-docx.py', corpus['small']['docx'], '--json').stdout)
+    by_stdin = json.loads(second.stdout)
+    assert by_stdin.pop('file') == '<stdin>' and by_path.pop('file') == 'small.docx'
+    assert by_stdin == by_path
+
+
+def test_text_report_reads_stdin(corpus):
+    proc = run_tool('validate-docx.py', '-', stdin=read_bytes(corpus['small']['docx']))
+    assert proc.returncode == 0
+    assert '<stdin>' in proc.stdout
+
+
+# ============================================================
+# diff-docx
+# ============================================================
+
+@pytest.mark.parametrize('side', ['ref', 'gen'])
+def test_diff_accepts_stdin_for_one_side(side, corpus):
+    ref, gen = corpus['small']['docx'], corpus['small']['peer']
+    expected = json.loads(run_tool('diff-docx.py', ref, gen, '--json').stdout)
+    if side == 'ref':
+        proc = run_tool('diff-docx.py', '-', gen, '--json', stdin=read_bytes(ref))
+    else:
+        proc = run_tool('diff-docx.py', ref, '-', '--json', stdin=read_bytes(gen))
+    result = json.loads(proc.stdout)
+    assert result['summary'].pop(f'{side}File') == '<stdin>'
+    expected['summary'].pop(f'{side}File')
+    assert result == expected
+    assert expected['summary']['totalDiffs']
+
+
+def test_diff_rejects_stdin_for_both_sides_and_matrix_rows(corpus):
+    small = corpus['small']['docx']
+    both = run_tool('diff-docx.py', '-', '-', '--json', stdin=read_bytes(small))
+    assert both.returncode == 1 and 'only one of the two files' in both.stdout
+    matrix = run_tool('diff-docx.py', small, '-', corpus['medium']['docx'], '--json', stdin=read_bytes(small))
+    assert matrix.returncode == 1 and 'only for the reference' in matrix.stdout
@@ -0,0 +1,32 @@
+"""synth_corpus.py CLI — argparse 옵션 처리 (--help가 폴더를 만들지 않는지, 규모 검사, 시드 재현성)"""
+
+import os
+import zipfile
+
+from conftest import ROOT, run_tool
+
+
+def test_help_does_not_create_output():
+    proc = run_tool('synth_corpus.py', '--help')
+    assert proc.returncode == 0
+    assert 'out_dir' in proc.stdout
+    assert not os.path.exists(os.path.join(ROOT, '--help'))  # run_tool은 ROOT에서 실행한다
+
+
+def test_unknown_scale_is_rejected(tmp_path):
+    proc = run_tool('synth_corpus.py', str(tmp_path / 'out'), 'huge')
+    assert proc.returncode == 2
+    assert 'huge' in proc.stderr
+    assert not (tmp_path / 'out').exists()
+
+
+def test_seed_is_reproducible(tmp_path):
+    for name, seed in (('a', '7'), ('b', '7'), ('c', '8')):
+        assert run_tool('synth_corpus.py', str(tmp_path / name), 'small', '--seed', seed).returncode == 0
+
+    def parts(name):
+        with zipfile.ZipFile(tmp_path / name / 'small.docx') as z:
+            return {n: z.read(n) for n in z.namelist()}
+
+    assert parts('a') == parts('b')
+    assert parts('a') != parts('c')
@@ -0,0 +1,44 @@
+"""테이블 배경색 분류 — 다크 코드 근사 일치는 1컬럼 테이블에만 (진회색 헤더 데이터 테이블 오분류 방지)"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import synth_corpus
+from docx_model import NS, classify_table, classify_table_color
+from conftest import run_json
+
+DARK_GREY_HEADERS = ['333333', '262626', '2B2B2B']
+
+
+def parse_table(rows, **fills):
+    xml = synth_corpus._table(rows, **fills)
+    return ET.fromstring(xml.replace('<w:tbl>', f'<w:tbl xmlns:w="{NS["w"]}">', 1))
+
+
+@pytest.mark.parametrize('header', DARK_GREY_HEADERS)
+def test_multi_column_dark_grey_header_is_data_table(header):
+    tbl = parse_table([['항목', '타입', '설명'], ['id', 'int', '식별자']], header_fill=header)
+    assert classify_table(tbl) == 'data_table'
+
+
+@pytest.mark.parametrize('fill', DARK_GREY_HEADERS)
+def test_single_column_near_dark_is_still_code_dark(fill):
+    assert classify_table(parse_table([['{"a": 1}']], fill=fill)) == 'code_dark'
+
+
+def test_exact_dark_code_color_keeps_column_independence():
+    exact = synth_corpus._palette()['code_dark']
+    assert classify_table_color(exact, 3) == 'code_dark'
+    assert classify_table_color(exact, 1) == 'code_dark'
+
+
+def test_validate_counts_dark_header_table_as_table(tmp_path, monkeypatch):
+    palette = dict(synth_corpus._palette(), header='333333')
+    monkeypatch.setattr(synth_corpus, '_palette', lambda: palette)
+    path = tmp_path / 'dark-header.docx'
+    plan = [('heading', 2, '1. 개요'),
+            ('table', [['항목', '타입', '설명'], ['id', 'int', '식별자'], ['name', 'str', '이름']])]
+    synth_corpus.render_docx(plan, str(path))
+    stats = run_json('validate-docx.py', str(path), '--json', '--no-cache')['stats']
+    assert (stats['tables'], stats['codeBlocks']) == (1, 0)
@@ -0,0 +1,160 @@
+"""테마 색상 인덱스 — 컴파일/저장, 바뀐 테마만 다시 파생, 프로세스 내 메모이즈와 재확인, 근사 조회"""
+
+import os
+import json
+
+import pytest
+
+import theme_colors
+
+
+def write_theme(themes_dir, name, **colors):
+    path = themes_dir / name
+    path.write_text(json.dumps({'colors': colors}), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def themes(tmp_path, monkeypatch):
+    """v1 테마 두 개가 든 임시 테마 폴더. 프로세스 캐시는 매 테스트 비우고 재확인 간격은 0"""
+    write_theme(tmp_path, 'alpha.json', codeDarkBg='1E1E1E', jsonBg='ABCDEF', infoBox='123456',
+                warningBox='FEDCBA', primary='0A0B0C', secondary='0D0E0F')
+    write_theme(tmp_path, 'beta.json', codeDarkBg='1E1E1E', codeBlock='EEEEEE', primary='224466')
+    monkeypatch.setattr(theme_colors, 'RECHECK_SECONDS', 0)
+    theme_colors.clear_theme_color_cache()
+    yield tmp_path
+    theme_colors.clear_theme_color_cache()
+
+
+@pytest.fixture
+def derived(monkeypatch):
+    """_theme_roles 호출(테마 JSON 파싱 + 파생)을 파일 이름으로 기록"""
+    calls = []
+    original = theme_colors._theme_roles
+
+    def counting(path):
+        calls.append(os.path.basename(path))
+        return original(path)
+    monkeypatch.setattr(theme_colors, '_theme_roles', counting)
+    return calls
+
+
+def reload(themes_dir):
+    theme_colors.clear_theme_color_cache()
+    return theme_colors.load_theme_color_index(str(themes_dir))
+
+
+# ============================================================
+# 컴파일과 저장
+# ============================================================
+
+def test_index_maps_colors_to_roles_in_priority_order(themes):
+    index = theme_colors.load_theme_color_index(str(themes))
+    assert index['1E1E1E'] == ('dark_codes',)
+    assert index['ABCDEF'] == ('light_codes',)
+    assert index['123456'] == ('info_boxes',)
+    assert index['FEDCBA'] == ('warning_boxes',)
+    assert index['224466'] == ('header_bgs',)
+    assert index['F5F5F5'] == ('light_codes',)  # 하드코딩 폴백은 항상 포함
+    sets = theme_colors.load_theme_color_sets(str(themes))
+    assert all(isinstance(values, frozenset) for values in sets.values())
+    assert {color for values in sets.values() for color in values} == set(index)
+
+
+def test_index_is_persisted_next_to_the_themes(themes):
+    theme_colors.load_theme_color_index(str(themes))
+    with open(themes / theme_colors.INDEX_FILENAME, encoding='utf-8') as f:
+        stored = json.load(f)
+    assert stored['version'] == theme_colors.INDEX_VERSION
+    assert sorted(stored['themes']) == ['alpha.json', 'beta.json']
+    assert stored['themes']['beta.json']['roles'] == {
+        'dark_codes': ['1E1E1E'], 'light_codes': ['EEEEEE'], 'header_bgs': ['224466']}
+
+
+def test_unchanged_themes_are_not_derived_again(themes, derived):
+    first = reload(themes)
+    assert sorted(derived) == ['alpha.json', 'beta.json']
+    derived.clear()
+    assert reload(themes) == first
+    assert derived == []
+
+
+def test_touched_theme_with_same_content_is_not_derived_again(themes, derived):
+    reload(themes)
+    derived.clear()
+    st = os.stat(themes / 'alpha.json')
+    os.utime(themes / 'alpha.json', ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    reload(themes)
+    assert derived == []
+    with open(themes / theme_colors.INDEX_FILENAME, encoding='utf-8') as f:
+        assert json.load(f)['themes']['alpha.json']['mtimeNs'] == st.st_mtime_ns + 10 ** 9
+
+
+def test_edited_added_and_removed_themes_update_the_index(themes, derived):
+    reload(themes)
+    derived.clear()
+    write_theme(themes, 'beta.json', codeDarkBg='1E1E1E', codeBlock='DDDDDD', primary='224466', secondary='00FF00')
+    write_theme(themes, 'gamma.json', infoBox='C0FFEE')
+    os.remove(themes / 'alpha.json')
+    index = reload(themes)
+    assert sorted(derived) == ['beta.json', 'gamma.json']
+    assert index['DDDDDD'] == ('light_codes',) and 'EEEEEE' not in index
+    assert index['C0FFEE'] == ('info_boxes',)
+    assert 'ABCDEF' not in index and '123456' not in index
+
+
+def test_corrupt_or_outdated_index_is_rebuilt(themes, derived):
+    (themes / theme_colors.INDEX_FILENAME).write_text('{not json', encoding='utf-8')
+    assert reload(themes)['ABCDEF'] == ('light_codes',)
+    derived.clear()
+    (themes / theme_colors.INDEX_FILENAME).write_text(json.dumps({'version': -1, 'themes': {}}), encoding='utf-8')
+    reload(themes)
+    assert sorted(derived) == ['alpha.json', 'beta.json']
+
+
+def test_broken_theme_file_only_contributes_fallback_colors(themes):
+    (themes / 'broken.json').write_text('{"colors": ', encoding='utf-8')
+    index = reload(themes)
+    assert index['ABCDEF'] == ('light_codes',)
+    assert index['1A1A1A'] == ('dark_codes',)
+
+
+# ============================================================
+# 프로세스 내 메모이즈
+# ============================================================
+
+def test_index_is_memoized_until_the_recheck_interval(themes, monkeypatch, derived):
+    monkeypatch.setattr(theme_colors, 'RECHECK_SECONDS', 3600)
+    first = theme_colors.load_theme_color_index(str(themes))
+    write_theme(themes, 'gamma.json', infoBox='C0FFEE')
+    assert theme_colors.load_theme_color_index(str(themes)) is first  # 간격 안에서는 stat도 보지 않음
+
+    monkeypatch.setattr(theme_colors, 'RECHECK_SECONDS', 0)
+    derived.clear()
+    updated = theme_colors.load_theme_color_index(str(themes))
+    assert derived == ['gamma.json']
+    assert updated['C0FFEE'] == ('info_boxes',)
+    assert theme_colors.load_theme_color_index(str(themes)) is updated  # stat이 같으면 그대로
+
+
+# ============================================================
+# 근사 색상 조회
+# ============================================================
+
+def test_near_colors_match_within_tolerance(themes):
+    match = theme_colors.match_color_roles
+    assert match('abcdef', str(themes), tolerance=0) == ('light_codes',)   # 대소문자 무관 정확 일치
+    assert match('ABCDEE', str(themes), tolerance=0) == ()
+    assert match('ABCDEE', str(themes), tolerance=5) == ('light_codes',)
+    assert match('FEFEFE', str(themes), tolerance=5) == ()                 # 흰색 기준점에 더 가까움
+    assert match('not-a-color', str(themes), tolerance=5) == ()
+    assert match(None, str(themes), tolerance=5) == ()
+
+
+def test_tolerance_comes_from_the_environment(monkeypatch):
+    monkeypatch.setenv('GENDOCS_COLOR_TOLERANCE', '2.5')
+    assert theme_colors.color_tolerance() == 2.5
+    monkeypatch.setenv('GENDOCS_COLOR_TOLERANCE', 'wide')
+    assert theme_colors.color_tolerance() == theme_colors.DEFAULT_COLOR_TOLERANCE
+    monkeypatch.setenv('GENDOCS_COLOR_TOLERANCE', '-1')
+    assert theme_colors.color_tolerance() == 0.0
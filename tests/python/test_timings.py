@@ -0,0 +1,24 @@
+"""--timings — 측정을 끄면 timed()가 원래 함수 그대로, review 순회는 방문자별 구간을 기록"""
+
+import timings
+from conftest import run_json
+
+
+def test_timed_is_a_no_op_without_a_session():
+    def visit():
+        return 1
+    assert timings.timed('visit', visit) is visit
+
+    with timings.TimingSession(timings=True) as session:
+        wrapped = timings.timed('visit', visit)
+        with timings.phase('walk'):
+            assert [wrapped() for _ in range(3)] == [1, 1, 1]
+    phases = {p['name']: p for p in session.report()['phases']}
+    assert phases['walk/visit']['count'] == 3
+
+
+def test_review_reports_each_visitor_inside_walk(corpus):
+    report = run_json('review-docx.py', corpus['small']['docx'], '--json', '--timings')
+    names = {p['name'] for p in report['timings']['phases']}
+    for visitor in ('FlowVisitor', 'TableWidthVisitor', 'CodeIntegrityVisitor', 'ImageAspectVisitor'):
+        assert f'walk/{visitor}' in names
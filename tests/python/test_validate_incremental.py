@@ -0,0 +1,148 @@
+"""validate 증분 재분석 — 편집한 문서의 증분 결과가 전체 분석과 같은지, 슬롯 없는 입력은 상태를 쓰지 않는지"""
+
+import os
+import json
+import random
+
+import pytest
+
+import report_cache
+import synth_corpus
+from conftest import load_tool, para, heading, table, random_layout_elements
+
+vd = load_tool('validate-docx.py')
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """테스트마다 빈 리포트 캐시 (프로세스 공용 캐시를 교체)"""
+    fresh = report_cache.ReportCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(report_cache, '_CACHE', fresh)
+    return fresh
+
+
+def state_files(cache):
+    state_dir = os.path.join(cache.cache_dir, 'state')
+    return sorted(os.listdir(state_dir)) if os.path.isdir(state_dir) else []
+
+
+def _insert_paragraph(plan):
+    i = plan.index(('page_break',), 10)
+    return plan[:i + 2] + [('para', '삽입된 단락 ' * 60)] + plan[i + 2:]
+
+
+def _drop_page_break(plan):
+    i = plan.index(('page_break',), 10)
+    return plan[:i] + plan[i + 1:]
+
+
+def _grow_table(plan):
+    i = next(k for k, block in enumerate(plan) if block[0] == 'table' and k > 5)
+    rows = plan[i][1] + [['긴 셀 내용 ' * 12] * len(plan[i][1][0])] * 3
+    return plan[:i] + [('table', rows)] + plan[i + 1:]
+
+
+def _edit_tail(plan):
+    return plan[:-1] + [('para', '마지막 단락 수정')]
+
+
+@pytest.mark.parametrize('edit', [_insert_paragraph, _drop_page_break, _grow_table, _edit_tail])
+def test_edited_document_matches_full_analysis(tmp_path, cache, monkeypatch, edit):
+    path = str(tmp_path / 'doc.docx')
+    plan = synth_corpus.make_plan(10, seed=4)
+    synth_corpus.render_docx(plan, path)
+    vd.validate_json(path)
+    assert len(state_files(cache)) == 1
+
+    edited = edit(plan)
+    synth_corpus.render_docx(edited, path)
+    classified = []
+    analyze_element = vd._analyze_element
+    monkeypatch.setattr(vd, '_analyze_element', lambda *a: classified.append(1) or analyze_element(*a))
+    incremental = vd.validate_json(path)
+    monkeypatch.undo()
+
+    assert incremental == vd.validate_json(path, use_cache=False)
+    # 바뀌지 않은 요소는 저장된 분류를 다시 쓴다 (body 요소 = plan 블록)
+    assert len(classified) < len(edited) // 4
+
+
+def test_unnamed_bytes_do_not_use_incremental_state(tmp_path, cache):
+    a, b = tmp_path / 'a.docx', tmp_path / 'b.docx'
+    synth_corpus.render_docx(synth_corpus.make_plan(3, seed=1), str(a))
+    synth_corpus.render_docx(synth_corpus.make_plan(5, seed=2), str(b))
+
+    for doc in (a, b):
+        report = vd.validate_json(doc.read_bytes())
+        assert report == vd.validate_json(str(doc), use_cache=False) | {'file': report['file']}
+    assert state_files(cache) == []
+
+    vd.validate_json(a.read_bytes(), name='a.docx')
+    vd.validate_json(b.read_bytes(), name='b.docx')
+    assert len(state_files(cache)) == 2
+
+
+# ============================================================
+# 증분 레이아웃 (요소 단위 편집)
+# ============================================================
+
+def _records(elements):
+    """레이아웃 요소 하나 = body 요소 하나인 상태 레코드 [지문, 섹션, 요소들]"""
+    records, section = [], 0
+    for elem in elements:
+        fingerprint = json.dumps({k: v for k, v in elem.items() if k != 'index'}, sort_keys=True)
+        records.append([fingerprint, section, [elem]])
+        section += elem['type'] == 'section_break'
+    return records
+
+
+def _full_layout(elements, usable):
+    simulator = vd.LayoutSimulator(usable)
+    for elem in elements:
+        simulator.feed(elem)
+    return simulator.finish()
+
+
+def assert_incremental_matches_full(old, new, usable):
+    old = [dict(e, index=i) for i, e in enumerate(old)]
+    new = [dict(e, index=i) for i, e in enumerate(new)]
+    layout = _full_layout(old, usable)
+    previous = {'records': _records(old), 'idx': len(old), 'layout': layout,
+                'headings': vd._page_headings(old, layout['page_starts'])}
+    report = {'elements': new, 'page': {'usable_height_pt': usable}}
+    assert vd._incremental_layout(report, _records(new), previous, len(new)) == _full_layout(new, usable)
+
+
+def test_edit_inside_a_keep_chain_longer_than_a_page():
+    """제목(keepNext)에 붙은 코드 블록이 줄어들면 두 페이지 앞의 경계가 바뀐다"""
+    old = [para(150), heading(28.4, keep_next=True), table([320.0], tbl_type='code_dark'), para(80)]
+    new = old[:2] + [table([100.0], tbl_type='code_dark'), para(80)]
+    assert_incremental_matches_full(old, new, 300)
+    assert [p['used_height'] for p in _full_layout(new, 300)['pages']] == [278.4, 80.0]
+
+
+def _random_edit(rng, elements):
+    elements = [dict(e) for e in elements]
+    k = rng.randrange(len(elements))
+    op = rng.random()
+    if op < 0.4 and elements[k]['type'] not in ('page_break', 'section_break'):
+        elem = elements[k]
+        if elem.get('row_heights'):
+            elem['row_heights'] = [round(h * rng.uniform(0.2, 2), 1) for h in elem['row_heights']]
+            elem['est_height'] = round(sum(elem['row_heights']), 1)
+        else:
+            elem['est_height'] = round(elem['est_height'] * rng.uniform(0.2, 2), 1)
+    elif op < 0.7:
+        elements.insert(k, random_layout_elements(rng)[0])
+    else:
+        del elements[k]
+    return elements
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_edits_with_keep_chains_match_full_layout(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        usable = rng.choice([300, 457, 600])
+        old = random_layout_elements(rng)
+        assert_incremental_matches_full(old, _random_edit(rng, old), usable)
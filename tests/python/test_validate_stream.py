@@ -0,0 +1,63 @@
+"""validate-docx.py --stream (iterparse) 결과가 트리 모드와 같은지"""
+
+import os
+import json
+import zipfile
+
+import pytest
+
+import docx_model
+from conftest import run_tool
+
+# 변경 추적: 각 sectPr 안에 이전 속성을 담은 w:sectPrChange/w:sectPr (페이지 크기가 다름)
+SECT_PR_CHANGE = ('<w:sectPrChange w:id="90" w:author="reviewer" w:date="2026-01-01T00:00:00Z">'
+                  '<w:sectPr><w:pgSz w:w="100" w:h="200"/></w:sectPr></w:sectPrChange>')
+
+
+@pytest.mark.parametrize('which', ['small', 'medium', 'sections'])
+def test_stream_json_matches_tree_mode(which, corpus, multi_section_docx):
+    path = multi_section_docx if which == 'sections' else corpus[which]['docx']
+    tree = run_tool('validate-docx.py', path, '--json', '--no-cache')
+    stream = run_tool('validate-docx.py', path, '--json', '--no-cache', '--stream')
+    assert tree.returncode == stream.returncode
+    assert tree.stdout and stream.stdout == tree.stdout
+
+
+def test_multi_section_document_reports_every_section(multi_section_docx):
+    report = json.loads(run_tool('validate-docx.py', multi_section_docx, '--json', '--no-cache', '--stream').stdout)
+    orientations = [s['orientation'] for s in report['sections']]
+    assert len(orientations) > 2
+    assert orientations[:2] == ['landscape', 'portrait']
+    assert os.path.basename(multi_section_docx) == report['file']
+
+
+@pytest.fixture(scope='module')
+def tracked_sections_docx(tmp_path_factory, multi_section_docx):
+    """모든 sectPr에 w:sectPrChange가 중첩된 다중 섹션 문서"""
+    dst = tmp_path_factory.mktemp('tracked') / 'tracked.docx'
+    with zipfile.ZipFile(multi_section_docx) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == 'word/document.xml':
+                assert data.count(b'</w:sectPr>') > 2
+                data = data.replace(b'</w:sectPr>', SECT_PR_CHANGE.encode('utf-8') + b'</w:sectPr>')
+            zout.writestr(info.filename, data)
+    return str(dst)
+
+
+def test_scanned_sections_skip_nested_sect_pr_change(tracked_sections_docx):
+    # 모델마다 새로 열어야 트리 없이 훑는 경로를 탄다 (load_docx는 파싱된 모델을 재사용)
+    tree = docx_model.DocxModel(tracked_sections_docx)
+    expected = [docx_model.get_page_geometry(sp) for sp in tree.section_sect_prs]
+    assert len(expected) > 2 and all(g['width'] != 100 for g in expected)
+
+    scanned = docx_model.DocxModel(tracked_sections_docx).scan_section_sect_prs()
+    assert [docx_model.get_page_geometry(sp) for sp in scanned] == expected
+    body = docx_model.DocxModel(tracked_sections_docx).scan_body_sect_pr()
+    assert docx_model.get_page_geometry(body) == expected[-1]
+
+
+def test_stream_matches_tree_mode_with_tracked_section_changes(tracked_sections_docx):
+    tree = run_tool('validate-docx.py', tracked_sections_docx, '--json', '--no-cache')
+    stream = run_tool('validate-docx.py', tracked_sections_docx, '--json', '--no-cache', '--stream')
+    assert tree.stdout and stream.stdout == tree.stdout
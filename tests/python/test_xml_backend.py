@@ -0,0 +1,55 @@
+"""XML 백엔드 — 기본은 etree이고, 선택 백엔드 lxml로 돌려도 validate/review/diff JSON이 같은지"""
+
+import os
+import sys
+import importlib.util
+import subprocess
+
+import pytest
+
+from conftest import TOOLS_DIR, run_tool
+
+HAS_LXML = importlib.util.find_spec('lxml') is not None
+needs_lxml = pytest.mark.skipif(not HAS_LXML, reason='lxml 미설치 — 백엔드 비교 생략')
+
+
+def selected_backend(env_value):
+    """GENDOCS_XML_BACKEND 값 → xml_backend.BACKEND (새 프로세스)"""
+    env = dict(os.environ, PYTHONPATH=TOOLS_DIR)
+    env.pop('GENDOCS_XML_BACKEND', None)
+    if env_value is not None:
+        env['GENDOCS_XML_BACKEND'] = env_value
+    proc = subprocess.run([sys.executable, '-c', 'import sys, xml_backend; '
+                           'print(xml_backend.BACKEND, "lxml" in sys.modules)'],
+                          capture_output=True, text=True, env=env)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.split()
+
+
+def test_default_backend_is_etree_without_importing_lxml():
+    assert selected_backend(None) == ['etree', 'False']
+    assert selected_backend('etree') == ['etree', 'False']
+
+
+def test_lxml_is_opt_in():
+    assert selected_backend(' LXML ')[0] == ('lxml' if HAS_LXML else 'etree')
+
+
+def _cases(corpus, multi_section_docx):
+    small, medium = corpus['small'], corpus['medium']
+    for path in (small['docx'], medium['docx'], multi_section_docx):
+        yield 'validate-docx.py', (path, '--json', '--no-cache')
+        yield 'validate-docx.py', (path, '--json', '--no-cache', '--stream')
+        yield 'review-docx.py', (path, '--json', '--no-cache')
+    yield 'review-docx.py', (medium['docx'], '--config', medium['config'], '--json', '--no-cache')
+    yield 'diff-docx.py', (medium['docx'], medium['peer'], '--json')
+    yield 'diff-docx.py', (medium['docx'], medium['peer'], '--json', '--only', 'styles,pageSetup')
+
+
+@needs_lxml
+def test_backends_produce_identical_json(corpus, multi_section_docx):
+    for script, args in _cases(corpus, multi_section_docx):
+        etree = run_tool(script, *args, env={'GENDOCS_XML_BACKEND': 'etree'})
+        lxml = run_tool(script, *args, env={'GENDOCS_XML_BACKEND': 'lxml'})
+        assert etree.stdout, (script, args, etree.stderr)
+        assert (lxml.returncode, lxml.stdout) == (etree.returncode, etree.stdout), (script, args)
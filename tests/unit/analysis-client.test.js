@@ -0,0 +1,49 @@
+const assert = require('assert');
+const path = require('path');
+const { AnalysisClient } = require('../../lib/analysis-client');
+
+const SAMPLE_MD = path.resolve(__dirname, '../../examples/sample-api/source.md');
+
+(async () => {
+  const client = new AnalysisClient({ quiet: true });
+  try {
+    // ============================================================
+    // 서버 하나로 여러 요청 처리
+    // ============================================================
+
+    const first = await client.call('ping');
+    assert.ok(first.pid > 0);
+    assert.ok(first.methods.includes('validate'));
+    assert.ok(first.methods.includes('review'));
+    assert.ok(first.methods.includes('lint'));
+    assert.ok(first.methods.includes('diff'));
+
+    const lint = await client.lint(SAMPLE_MD);
+    assert.ok(Array.isArray(lint.issues));
+    assert.ok(lint.summary);
+
+    // 동시 요청도 id로 짝지어 응답
+    const [a, b] = await Promise.all([client.lint(SAMPLE_MD), client.lint(SAMPLE_MD)]);
+    assert.deepStrictEqual(a, b);
+
+    const second = await client.call('ping');
+    assert.strictEqual(second.pid, first.pid);
+
+    // ============================================================
+    // 오류 응답 (서버는 계속 살아 있음)
+    // ============================================================
+
+    await assert.rejects(client.validate('__missing__.docx'), err => err.code === -32000);
+    await assert.rejects(client.call('nope'), err => err.code === -32601);
+    await assert.rejects(client.call('lint', {}), err => err.code === -32602);
+
+    const third = await client.call('ping');
+    assert.strictEqual(third.pid, first.pid);
+  } finally {
+    await client.close();
+  }
+  assert.strictEqual(client.proc, null);
+})().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,201 @@
+"""
+DOCX/MD 분석 서버 — validate/review/lint/diff를 한 프로세스에서 반복 실행
+
+Node 도구(convert.js --validate, score-docx.js, pipeline-audit.js)가 문서마다
+python 프로세스를 새로 띄우면 인터프리터 시작 + 모듈 import + 테마 색상 glob 비용을
+매번 치른다. 이 서버는 한 번 띄워 두고 stdin/stdout으로 줄 단위 JSON-RPC 요청을
+받아 처리하므로, 문서당 비용은 분석 시간 자체만 남는다.
+
+사용법: python -X utf8 tools/analysis-server.py
+        (Node에서는 lib/analysis-client.js가 띄우고 관리한다)
+
+프로토콜 (한 줄에 JSON 하나, UTF-8):
+  요청: {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"path": "output/문서.docx"}}
+  응답: {"jsonrpc": "2.0", "id": 1, "result": {...}}
+        {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "..."}}
+
+메서드:
+  validate {path, stream?, cache?, theme?}  → validate-docx.py --json [--theme] 과 같은 결과
+  review   {path, config?, cache?}   → review-docx.py --json [--config] 과 같은 결과
+    (cache: false 이면 --no-cache 와 같음. 기본은 리포트 캐시 사용)
+  lint     {path}             → lint-md.py --json 과 같은 결과 (단일 파일)
+  diff     {ref, gen, only?}  → diff-docx.py --json [--only] 과 같은 결과
+    (only: 'styles,pageSetup' 같은 쉼표 구분 문자열 또는 카테고리 목록)
+  DOCX 입력은 path 대신 {data, name?} (base64 DOCX 바이트, name은 리포트 파일명)로 보낼 수 있다.
+  diff는 refData/genData. 변환기가 메모리의 패키지를 디스크에서 다시 읽지 않고 바로 검증할 때 쓴다.
+  ping                        → {"pid", "methods"}
+  shutdown                    → 응답 후 종료 (stdin EOF도 종료)
+"""
+
+import sys
+import os
+import io
+import json
+import base64
+import binascii
+import contextlib
+import traceback
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TOOLS_DIR)
+from tool_loader import load_tool
+
+# 도구 모듈이 import 시 sys.stdout을 바꿀 수 있으므로 (Windows UTF-8 래핑)
+# 응답 채널은 시작 시점의 바이너리 스트림을 잡아 둔다.
+_IN = sys.stdin.buffer
+_OUT = sys.stdout.buffer
+
+# JSON-RPC 오류 코드
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+TOOL_ERROR = -32000
+
+
+class InvalidParams(Exception):
+    """요청 파라미터 누락/형식 오류"""
+
+
+# ============================================================
+# 메서드
+# ============================================================
+
+def _require(params, key):
+    value = params.get(key)
+    if not value:
+        raise InvalidParams(f"'{key}' 파라미터가 필요합니다")
+    return value
+
+
+def _docx_source(params, key, data_key):
+    """DOCX 입력 → 경로(params[key]) 또는 base64 디코드한 bytes(params[data_key])"""
+    data = params.get(data_key)
+    if data is None:
+        return _require(params, key)
+    if not isinstance(data, str):
+        raise InvalidParams(f"'{data_key}'는 base64 문자열이어야 합니다")
+    try:
+        return base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidParams(f"'{data_key}' base64 디코드 실패: {e}")
+
+
+def method_validate(params):
+    vd = load_tool('validate-docx.py')
+    return vd.validate_json(_docx_source(params, 'path', 'data'), stream=bool(params.get('stream')),
+                            use_cache=params.get('cache', True) is not False,
+                            name=params.get('name'), theme=params.get('theme'))
+
+
+def method_review(params):
+    rd = load_tool('review-docx.py')
+    return rd.review_json(_docx_source(params, 'path', 'data'), params.get('config'),
+                          use_cache=params.get('cache', True) is not False,
+                          name=params.get('name'))
+
+
+def method_lint(params):
+    lm = load_tool('lint-md.py')
+    return lm.lint_md(_require(params, 'path'))
+
+
+def method_diff(params):
+    dd = load_tool('diff-docx.py')
+    only = params.get('only')
+    categories = None
+    if only:
+        try:
+            categories = dd.parse_categories(only if isinstance(only, str) else ','.join(only))
+        except (TypeError, ValueError) as e:
+            raise InvalidParams(f"'only' 파라미터 오류: {e}")
+    results = dd.compare_docx(_docx_source(params, 'ref', 'refData'),
+                              _docx_source(params, 'gen', 'genData'), categories)
+    return dd.format_json_output(results)
+
+
+def method_ping(params):
+    return {'pid': os.getpid(), 'methods': sorted(METHODS)}
+
+
+METHODS = {
+    'validate': method_validate,
+    'review': method_review,
+    'lint': method_lint,
+    'diff': method_diff,
+    'ping': method_ping,
+}
+
+
+# ============================================================
+# 요청 처리
+# ============================================================
+
+def _error(req_id, code, message):
+    return {'jsonrpc': '2.0', 'id': req_id, 'error': {'code': code, 'message': message}}
+
+
+def handle_request(request):
+    """요청 dict 하나 처리 → 응답 dict"""
+    if not isinstance(request, dict) or 'method' not in request:
+        return _error(None, INVALID_REQUEST, 'method가 없는 요청')
+
+    req_id = request.get('id')
+    method = METHODS.get(request['method'])
+    if method is None:
+        return _error(req_id, METHOD_NOT_FOUND, f"알 수 없는 메서드: {request['method']}")
+
+    params = request.get('params') or {}
+    if not isinstance(params, dict):
+        return _error(req_id, INVALID_PARAMS, 'params는 객체여야 합니다')
+
+    # 도구가 출력하는 안내/오류 메시지가 응답 채널을 오염시키지 않도록 가로채서
+    # stderr로 넘기고, sys.exit()로 끝난 경우 마지막 메시지를 오류 내용으로 쓴다
+    captured = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(captured):
+            result = method(params)
+    except SystemExit as e:
+        lines = [ln for ln in captured.getvalue().splitlines() if ln.strip()]
+        message = lines[-1].strip() if lines else f'도구가 종료됨 (exit {e.code})'
+        return _error(req_id, TOOL_ERROR, message)
+    except FileNotFoundError as e:
+        # 분석 함수는 없는 입력 파일을 예외로 알린다 (예상된 오류라 traceback 생략)
+        return _error(req_id, TOOL_ERROR, f'[ERROR] {e}')
+    except InvalidParams as e:
+        return _error(req_id, INVALID_PARAMS, str(e))
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        return _error(req_id, TOOL_ERROR, f'{type(e).__name__}: {e}')
+    finally:
+        if captured.getvalue():
+            sys.stderr.write(captured.getvalue())
+
+    return {'jsonrpc': '2.0', 'id': req_id, 'result': result}
+
+
+def send(response):
+    _OUT.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+    _OUT.flush()
+
+
+def serve():
+    for raw in _IN:
+        line = raw.decode('utf-8', errors='replace').strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            send(_error(None, PARSE_ERROR, f'JSON 파싱 실패: {e}'))
+            continue
+
+        if isinstance(request, dict) and request.get('method') == 'shutdown':
+            send({'jsonrpc': '2.0', 'id': request.get('id'), 'result': None})
+            break
+
+        send(handle_request(request))
+
+
+if __name__ == '__main__':
+    serve()
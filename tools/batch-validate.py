@@ -1,41 +1,179 @@
 #!/usr/bin/env python3
-"""Batch validate DOCX files and print summary."""
-import subprocess
-import json
+"""
+DOCX 일괄 검증 — validate-docx.py 분석 함수를 프로세스 풀에서 병렬 실행
+
+파일마다 python 서브프로세스를 띄우고 stdout에서 JSON을 찾는 대신, 워커 프로세스가
+validate-docx.py를 한 번 import해 두고 validate_json()을 직접 호출한다.
+결과는 파일 하나가 끝날 때마다 바로 출력한다 (완료 순서).
+
+사용법:
+  python -X utf8 tools/batch-validate.py                               # output/*_v1.0.docx
+  python -X utf8 tools/batch-validate.py "output/*.docx" --workers 8
+  python -X utf8 tools/batch-validate.py "output/*.docx" --jsonl > results.jsonl
+  python -X utf8 tools/batch-validate.py "output/**/*.docx" --summary output/batch-summary.json
+
+--jsonl: 결과 1건당 JSON 한 줄 ({"type": "result", ...}), 마지막 줄은 {"type": "summary", ...}
+--full: JSONL 결과 줄에 validate-docx.py --json 전체 리포트 포함
+--summary <경로>: 요약(페이지/WARN/INFO 합계, 실패 목록, 소요 시간)을 JSON 파일로 저장
+--stream / --no-cache: validate-docx.py와 같은 의미
+"""
+
 import sys
 import os
-import glob
+import io
+import json
+import time
+import argparse
+import contextlib
+
+# Windows 터미널 한글 출력 보장
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tool_loader import load_tool
+from batch_runner import collect_docx_files, iter_results
 
-output_dir = "output"
-files = sorted(glob.glob(os.path.join(output_dir, "*_v1.0.docx")))
+DEFAULT_GLOB = os.path.join('output', '*_v1.0.docx')
 
-print(f"Found {len(files)} files to validate\n")
-print(f"{'File':<45} {'Pages':>5} {'WARN':>5} {'INFO':>5}")
-print("-" * 65)
 
-for f in files:
-    name = os.path.basename(f)
+# ============================================================
+# 워커 (load_tool: 프로세스당 validate-docx.py 1회 로드)
+# ============================================================
+
+def summarize_report(data):
+    """validate JSON → 페이지/WARN/INFO 카운트"""
+    issues = data.get('issues', [])
+    return {
+        'pages': data.get('stats', {}).get('estimatedPages'),
+        'warn': sum(1 for i in issues if i.get('severity') == 'WARN'),
+        'info': sum(1 for i in issues if i.get('severity') == 'INFO'),
+    }
+
+
+def validate_one(path, stream=False, use_cache=True, full=False):
+    """파일 하나 검증 → 결과 dict (예외/종료는 error 필드로 변환)"""
+    start = time.perf_counter()
+    result = {'type': 'result', 'file': path}
+    captured = io.StringIO()
     try:
-        result = subprocess.run(
-            ["python", "-X", "utf8", "tools/validate-docx.py", f, "--json"],
-            capture_output=True, text=True, timeout=30,
-            env={**os.environ, "PYTHONUTF8": "1"}
-        )
-        # Find JSON in stdout
-        stdout = result.stdout.strip()
-        if not stdout:
-            stdout = result.stderr.strip()
-
-        # Try to find JSON start
-        json_start = stdout.find('{')
-        if json_start >= 0:
-            data = json.loads(stdout[json_start:])
-            pages = data.get('stats', {}).get('estimatedPages', '?')
-            issues = data.get('issues', [])
-            warns = sum(1 for i in issues if i.get('severity') == 'WARN')
-            infos = sum(1 for i in issues if i.get('severity') == 'INFO')
-            print(f"{name:<45} {pages:>5} {warns:>5} {infos:>5}")
-        else:
-            print(f"{name:<45} {'ERR':>5} {'?':>5} {'?':>5}")
+        vd = load_tool('validate-docx.py')
+        with contextlib.redirect_stdout(captured):
+            data = vd.validate_json(path, stream=stream, use_cache=use_cache)
+        result['ok'] = True
+        result.update(summarize_report(data))
+        if full:
+            result['report'] = data
+    except SystemExit as e:
+        lines = [ln.strip() for ln in captured.getvalue().splitlines() if ln.strip()]
+        result['ok'] = False
+        result['error'] = lines[-1] if lines else f'검증 종료 (exit {e.code})'
+    except FileNotFoundError as e:
+        result['ok'] = False
+        result['error'] = f'[ERROR] {e}'
     except Exception as e:
-        print(f"{name:<45} {'ERR':>5} {str(e)[:20]}")
+        result['ok'] = False
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+# ============================================================
+# 실행
+# ============================================================
+
+def _crashed(task, e):
+    """워커 프로세스 자체가 죽은 경우(BrokenProcessPool 등)의 결과 행"""
+    return {'type': 'result', 'file': task[0], 'ok': False,
+            'error': f'{type(e).__name__}: {e}', 'seconds': None}
+
+
+def build_summary(results, workers, wall_seconds):
+    """배치 요약 (machine-readable)"""
+    ok = [r for r in results if r.get('ok')]
+    failed = [r for r in results if not r.get('ok')]
+    file_seconds = sum(r['seconds'] for r in results if r.get('seconds'))
+    slowest = sorted(ok, key=lambda r: r['seconds'], reverse=True)[:5]
+    return {
+        'type': 'summary',
+        'files': len(results),
+        'ok': len(ok),
+        'failed': len(failed),
+        'pages': sum(r['pages'] or 0 for r in ok),
+        'warn': sum(r['warn'] for r in ok),
+        'info': sum(r['info'] for r in ok),
+        'filesWithWarn': sum(1 for r in ok if r['warn']),
+        'workers': workers,
+        'wallSeconds': round(wall_seconds, 3),
+        'fileSeconds': round(file_seconds, 3),
+        'slowest': [{'file': r['file'], 'seconds': r['seconds']} for r in slowest],
+        'errors': [{'file': r['file'], 'error': r['error']} for r in failed],
+    }
+
+
+def _print_row(r):
+    name = os.path.basename(r['file'])
+    if r.get('ok'):
+        pages = r['pages'] if r['pages'] is not None else '?'
+        print(f"{name:<45} {pages:>5} {r['warn']:>5} {r['info']:>5} {r['seconds']:>7.2f}s", flush=True)
+    else:
+        print(f"{name:<45} {'ERR':>5} {r['error'][:40]}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DOCX 일괄 검증 (validate-docx.py 병렬 실행)')
+    parser.add_argument('patterns', nargs='*', default=[DEFAULT_GLOB],
+                        help=f'검증할 DOCX glob 패턴 (기본: {DEFAULT_GLOB})')
+    parser.add_argument('--glob', dest='extra_globs', action='append', default=[],
+                        help='추가 glob 패턴 (여러 번 지정 가능)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='워커 프로세스 수 (기본: CPU 코어 수, 1이면 순차 실행)')
+    parser.add_argument('--jsonl', action='store_true', help='결과를 JSON Lines로 출력')
+    parser.add_argument('--full', action='store_true', help='JSONL 결과에 전체 리포트 포함')
+    parser.add_argument('--summary', metavar='PATH', help='요약 JSON 저장 경로')
+    parser.add_argument('--stream', action='store_true', help='iterparse 스트리밍 분석 (대용량 문서)')
+    parser.add_argument('--no-cache', action='store_true', help='리포트 캐시 사용 안 함')
+    args = parser.parse_args()
+
+    files = collect_docx_files(args.patterns + args.extra_globs)
+    workers = max(1, min(args.workers, len(files) or 1))
+
+    if not args.jsonl:
+        print(f"Found {len(files)} files to validate (workers: {workers})\n")
+        print(f"{'File':<45} {'Pages':>5} {'WARN':>5} {'INFO':>5} {'Time':>8}")
+        print("-" * 74)
+
+    start = time.perf_counter()
+    results = []
+    tasks = [(path, args.stream, not args.no_cache, args.full) for path in files]
+    for r in iter_results(validate_one, tasks, workers, _crashed):
+        results.append(r)
+        if args.jsonl:
+            print(json.dumps(r, ensure_ascii=False), flush=True)
+        else:
+            _print_row(r)
+
+    summary = build_summary(results, workers, time.perf_counter() - start)
+
+    if args.jsonl:
+        print(json.dumps(summary, ensure_ascii=False), flush=True)
+    else:
+        print("-" * 74)
+        print(f"{'Total':<45} {summary['pages']:>5} {summary['warn']:>5} {summary['info']:>5} "
+              f"{summary['wallSeconds']:>7.2f}s")
+        print(f"\n  성공 {summary['ok']} / 실패 {summary['failed']} / 전체 {summary['files']}"
+              f"  (파일별 합계 {summary['fileSeconds']:.2f}s)")
+
+    if args.summary:
+        summary_dir = os.path.dirname(args.summary)
+        if summary_dir:
+            os.makedirs(summary_dir, exist_ok=True)
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if summary['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+여러 DOCX를 한 번에 처리하는 도구(batch-validate, fingerprint-docx, diff-docx 매트릭스/폴더 쌍)의 공유 헬퍼.
+
+사용법:
+    from batch_runner import VOLATILE_PART_PREFIXES, collect_docx_files, iter_results
+
+    files = collect_docx_files(['output/**/*.docx'])
+    for r in iter_results(validate_one, [(path,) for path in files], workers,
+                          lambda task, e: {'file': task[0], 'ok': False, 'error': str(e)}):
+        ...
+"""
+
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 빌드마다 달라지는 메타데이터 파트 (생성 시각 등) — 변경 판정/지문에서 제외
+VOLATILE_PART_PREFIXES = ('docProps/',)
+
+
+def collect_docx_files(patterns):
+    """glob 패턴 목록 → 정렬된 .docx 경로 (중복 제거, ** 지원, 패턴이 아닌 파일 경로도 허용)"""
+    files = set()
+    for pattern in patterns:
+        matched = glob.glob(pattern, recursive=True)
+        if not matched and os.path.isfile(pattern):
+            matched = [pattern]
+        files.update(p for p in matched if p.lower().endswith('.docx'))
+    return sorted(files)
+
+
+def iter_results(func, tasks, workers, on_crash, initializer=None, initargs=()):
+    """func(*task) 결과를 완료 순서대로 yield. workers=1이거나 작업이 하나면 현재 프로세스에서 순차 실행
+
+    on_crash(task, exc): 워커 프로세스 자체가 죽은 경우(BrokenProcessPool 등)의 결과 행.
+        func 안의 예외는 func가 결과 행으로 바꿔 돌려준다고 가정한다.
+    initializer/initargs: 워커마다 한 번 실행 (병렬 실행에서만 — 순차 실행에 같은 상태가
+        필요하면 호출자가 task에 직접 넘긴다).
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        futures = {pool.submit(func, *task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield on_crash(futures[future], e)
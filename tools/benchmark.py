@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+분석 도구 벤치마크 — 합성 코퍼스로 처리량/메모리를 측정하고 기준선과 비교
+
+synth_corpus.py로 규모별(small/medium/large/xlarge) DOCX·MD를 만든 뒤
+validate / review / diff / extract / spec / lint-md 분석 함수를 도구×규모마다
+별도 프로세스에서 반복 실행한다 (리포트 캐시·모델 캐시 없이, 최솟값 기준).
+
+측정 항목: docs/sec, elements/sec, 프로세스 최대 RSS
+기준선(JSON)과 비교해 docs/sec가 --threshold % 넘게 떨어진 항목이 있으면 exit 1.
+
+사용법:
+  python -X utf8 tools/benchmark.py                                  # small, medium
+  python -X utf8 tools/benchmark.py --scales small,medium,large --repeat 5
+  python -X utf8 tools/benchmark.py --update-baseline                # 현재 결과를 기준선으로 저장
+  python -X utf8 tools/benchmark.py --threshold 15 --json > bench.json
+
+--tools validate,review,...: 측정할 도구 (기본: 전체)
+--corpus <폴더>: 코퍼스 위치 (기본: .cache/bench/corpus, 없으면 생성)
+--baseline <경로>: 기준선 JSON (기본: .cache/bench/baseline.json — 머신별 값이라 커밋하지 않음)
+--output <경로>: 이번 결과 JSON 저장
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+
+# Windows 터미널 한글 출력 보장
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, TOOLS_DIR)
+from synth_corpus import SCALES, generate_corpus
+from report_cache import file_sha256
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.join(PROJECT_ROOT, '.cache', 'bench')
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, 'corpus')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_SCALES = 'small,medium'
+DEFAULT_THRESHOLD = 20.0
+
+# 작은 문서는 한 번이 수 ms라 잡음이 크다 — 측정 합계가 이 시간에 이를 때까지 반복
+MIN_MEASURE_SECONDS = 0.5
+MAX_REPEAT = 200
+
+
+# ============================================================
+# 측정 대상 (워커 프로세스에서 실행)
+# ============================================================
+
+def _run_validate(entry):
+    from tool_loader import load_tool
+    vd = load_tool('validate-docx.py')
+    return json.dumps(vd.validate_json(entry['docx'], use_cache=False), ensure_ascii=False)
+
+
+def _run_validate_stream(entry):
+    from tool_loader import load_tool
+    vd = load_tool('validate-docx.py')
+    return json.dumps(vd.validate_json(entry['docx'], stream=True, use_cache=False), ensure_ascii=False)
+
+
+def _run_review(entry):
+    from tool_loader import load_tool
+    rd = load_tool('review-docx.py')
+    return json.dumps(rd.review_json(entry['docx'], entry['config'], use_cache=False), ensure_ascii=False)
+
+
+def _run_diff(entry):
+    from tool_loader import load_tool
+    dd = load_tool('diff-docx.py')
+    return dd.format_json_output(dd.compare_docx(entry['docx'], entry['peer']))
+
+
+def _run_extract(entry):
+    from tool_loader import load_tool
+    ed = load_tool('extract-docx.py')
+    return json.dumps(ed.extract_document(entry['docx']), ensure_ascii=False)
+
+
+def _run_spec(entry):
+    from tool_loader import load_tool
+    sd = load_tool('extract-docx-spec.py')
+    return json.dumps(sd.extract_spec(entry['docx']), ensure_ascii=False)
+
+
+def _run_lint(entry):
+    from tool_loader import load_tool
+    lm = load_tool('lint-md.py')
+    return json.dumps(lm.lint_md(entry['md']), ensure_ascii=False)
+
+
+# 도구 → (실행 함수, 처리 요소 수)
+BENCHMARKS = {
+    'validate': (_run_validate, lambda e: e['elements']),
+    'validate-stream': (_run_validate_stream, lambda e: e['elements']),
+    'review': (_run_review, lambda e: e['elements'] + e['mdElements']),
+    'diff': (_run_diff, lambda e: e['elements'] + e['peerElements']),
+    'extract': (_run_extract, lambda e: e['elements']),
+    'spec': (_run_spec, lambda e: e['elements']),
+    'lint': (_run_lint, lambda e: e['mdElements']),
+}
+
+
+def _max_rss_kb():
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss // 1024 if sys.platform == 'darwin' else maxrss
+
+
+def run_worker(tool, entry, repeat):
+    """한 도구×규모 측정 → {'runs', 'seconds': [...], 'maxRssKB'}
+
+    첫 실행은 모듈 import·테마 로드 비용이 섞이므로 워밍업으로 버린다.
+    매 실행 전에 docx_model의 프로세스 내 모델 캐시를 비워 파싱부터 다시 하게 한다.
+    """
+    from docx_model import clear_model_cache
+    run, _ = BENCHMARKS[tool]
+    sink = io.StringIO()
+    seconds = []
+    with contextlib.redirect_stdout(sink):
+        clear_model_cache()
+        run(entry)
+        total = 0.0
+        while len(seconds) < repeat or (total < MIN_MEASURE_SECONDS and len(seconds) < MAX_REPEAT):
+            clear_model_cache()
+            start = time.perf_counter()
+            run(entry)
+            elapsed = time.perf_counter() - start
+            seconds.append(elapsed)
+            total += elapsed
+            sink.seek(0)
+            sink.truncate()
+    return {'runs': len(seconds), 'seconds': seconds, 'maxRssKB': _max_rss_kb()}
+
+
+# ============================================================
+# 실행
+# ============================================================
+
+def measure(tool, entry, repeat):
+    """워커 서브프로세스에서 측정 (도구끼리 메모리·캐시가 섞이지 않게)"""
+    cmd = [sys.executable, '-X', 'utf8', os.path.abspath(__file__),
+           '--worker', tool, '--entry', json.dumps(entry, ensure_ascii=False),
+           '--repeat', str(repeat)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
+    if proc.returncode != 0:
+        lines = [ln for ln in proc.stderr.splitlines() if ln.strip()]
+        raise RuntimeError(lines[-1] if lines else f'워커 종료 (exit {proc.returncode})')
+    data = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    _, count_elements = BENCHMARKS[tool]
+    best = min(data['seconds'])
+    elements = count_elements(entry)
+    return {
+        'tool': tool,
+        'scale': entry['scale'],
+        'elements': elements,
+        'runs': data['runs'],
+        'bestSeconds': round(best, 5),
+        'medianSeconds': round(statistics.median(data['seconds']), 5),
+        'docsPerSec': round(1 / best, 3) if best > 0 else None,
+        'elementsPerSec': round(elements / best, 1) if best > 0 else None,
+        'maxRssKB': data['maxRssKB'],
+    }
+
+
+def prepare_corpus(corpus_dir, scales):
+    """코퍼스 manifest — 생성기 코드와 규모가 같으면 기존 파일 재사용"""
+    manifest_path = os.path.join(corpus_dir, 'manifest.json')
+    generator = file_sha256(os.path.join(TOOLS_DIR, 'synth_corpus.py'))
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('generator') == generator:
+            entries = {e['scale']: e for e in cached['entries']}
+            if all(s in entries and os.path.isfile(entries[s]['docx']) for s in scales):
+                return [entries[s] for s in scales]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    manifest = generate_corpus(corpus_dir, scales)
+    from docx_model import load_docx
+    for entry in manifest:
+        entry['peerElements'] = len(load_docx(entry['peer']).elements)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'generator': generator, 'entries': manifest}, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def machine_info():
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpuCount': os.cpu_count(),
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """기준선 대비 변화 → 항목별 deltaPct(+면 느려짐), 회귀 목록"""
+    base_results = {f"{r['tool']}:{r['scale']}": r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        base = base_results.get(f"{r['tool']}:{r['scale']}")
+        if not base or not base.get('docsPerSec') or not r.get('docsPerSec'):
+            r['baselineDocsPerSec'] = None
+            r['deltaPct'] = None
+            continue
+        r['baselineDocsPerSec'] = base['docsPerSec']
+        # 처리량 감소율: 기준선보다 20% 느리면 +20.0
+        r['deltaPct'] = round((1 - r['docsPerSec'] / base['docsPerSec']) * 100, 1)
+        if r['deltaPct'] > threshold:
+            regressions.append(r)
+    return regressions
+
+
+def _print_table(results, threshold):
+    print(f"{'Tool':<16} {'Scale':<7} {'Elems':>7} {'Runs':>5} {'Best(ms)':>9} {'docs/s':>9} "
+          f"{'elems/s':>11} {'RSS(MB)':>8} {'Δ':>8}")
+    print('-' * 90)
+    for r in results:
+        rss = f"{r['maxRssKB'] / 1024:.1f}" if r.get('maxRssKB') else '-'
+        if r.get('error'):
+            print(f"{r['tool']:<16} {r['scale']:<7} {'ERR':>7} {r['error'][:50]}")
+            continue
+        delta = '-'
+        if r.get('deltaPct') is not None:
+            delta = f"{-r['deltaPct']:+.1f}%"
+            if r['deltaPct'] > threshold:
+                delta += ' ✗'
+        print(f"{r['tool']:<16} {r['scale']:<7} {r['elements']:>7} {r['runs']:>5} "
+              f"{r['bestSeconds'] * 1000:>9.1f} {r['docsPerSec']:>9.2f} {r['elementsPerSec']:>11,.0f} "
+              f"{rss:>8} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='분석 도구 벤치마크 (합성 코퍼스, 기준선 회귀 검사)')
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f'쉼표 구분 규모 ({", ".join(SCALES)}; 기본: {DEFAULT_SCALES})')
+    parser.add_argument('--tools', default=','.join(BENCHMARKS),
+                        help='쉼표 구분 도구 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='최소 반복 횟수 (기본: 3, 최솟값 기준)')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='코퍼스 폴더')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준선 JSON 경로')
+    parser.add_argument('--update-baseline', action='store_true', help='이번 결과를 기준선으로 저장')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'회귀 판정 처리량 감소율 %% (기본: {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--output', metavar='PATH', help='이번 결과 JSON 저장 경로')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    # 내부용: 도구×규모 하나를 측정하는 워커 프로세스
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--entry', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, json.loads(args.entry), max(1, args.repeat))
+        print(json.dumps(result))
+        return
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    tools = [t.strip() for t in args.tools.split(',') if t.strip()]
+    for scale in scales:
+        if scale not in SCALES:
+            print(f'[ERROR] 알 수 없는 규모: {scale} ({", ".join(SCALES)})')
+            sys.exit(1)
+    for tool in tools:
+        if tool not in BENCHMARKS:
+            print(f'[ERROR] 알 수 없는 도구: {tool} ({", ".join(BENCHMARKS)})')
+            sys.exit(1)
+
+    manifest = prepare_corpus(args.corpus, scales)
+    if not args.json:
+        print(f"코퍼스: {args.corpus}")
+        for entry in manifest:
+            print(f"  {entry['scale']:<7} {entry['elements']:>7} elements  {entry['docxBytes']:>10,} bytes")
+        print()
+
+    results = []
+    for entry in manifest:
+        for tool in tools:
+            try:
+                results.append(measure(tool, entry, args.repeat))
+            except (RuntimeError, ValueError, IndexError) as e:
+                results.append({'tool': tool, 'scale': entry['scale'], 'error': str(e)})
+
+    baseline = None
+    if os.path.isfile(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    measured = [r for r in results if not r.get('error')]
+    regressions = compare_to_baseline(measured, baseline, args.threshold) if baseline else []
+    errors = [r for r in results if r.get('error')]
+
+    output = {
+        'machine': machine_info(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'threshold': args.threshold,
+        'results': results,
+        'regressions': [f"{r['tool']}:{r['scale']}" for r in regressions],
+    }
+
+    if args.json:
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    else:
+        _print_table(results, args.threshold)
+        print()
+        if baseline is None and not args.update_baseline:
+            print(f'  기준선 없음: {args.baseline} (--update-baseline으로 생성)')
+        elif baseline is not None:
+            if baseline.get('machine') != output['machine']:
+                print('  [WARN] 기준선과 측정 환경이 다릅니다 — 비교 결과는 참고용')
+            if regressions:
+                print(f"  [FAIL] 처리량 {args.threshold:g}% 이상 감소: {', '.join(output['regressions'])}")
+            else:
+                print(f'  [PASS] 기준선 대비 회귀 없음 (허용 {args.threshold:g}%)')
+
+    for path in filter(None, [args.output, args.baseline if args.update_baseline else None]):
+        out_dir = os.path.dirname(path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        if not args.json:
+            print(f'  저장: {path}')
+
+    sys.exit(1 if regressions or errors else 0)
+
+
+if __name__ == '__main__':
+    main()
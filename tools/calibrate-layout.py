@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+레이아웃 높이 계수 보정 — 실제 렌더링 페이지 경계에 요소별 높이 계수를 맞춰 프로필로 저장
+
+validate-docx의 페이지 추정은 요소별 높이 계수(layout_profile.DEFAULT_COEFFICIENTS)에 달려 있다.
+이 도구는 코퍼스의 DOCX를 LibreOffice로 한 번씩 렌더링(visual-verify.py와 같은 경로)하고,
+PDF 페이지 텍스트에서 각 페이지가 어느 요소로 시작하는지 찾아 페이지 경계마다 식 하나를 만든다:
+
+    Σ(페이지 요소의 항 × 계수) + ½ × (들어가지 못한 다음 요소) ≈ 가용 높이
+
+  - 페이지가 나뉠 수 있는 요소(여러 줄 단락, 3행 이상 표)로 끝나면 다음 페이지와 묶어
+    n페이지 × 가용 높이 식 하나로 만든다 (나뉜 위치를 몰라도 된다).
+  - 명시적 페이지 나누기로 끝난 페이지는 "가용 높이 이하"만 알려 주므로 식에서 뺀다.
+
+테마·방향("<테마>/<방향>")별로, 그리고 테마 구분 없이("*/<방향>") 능선 최소제곱으로 계수를 맞춘다.
+관측이 적은 계수는 기존 값(프로필 또는 기본값) 쪽에 머문다. 결과는 profiles/layout-profile.json에
+합쳐 저장하며 validate-docx.py --theme / review-docx.py --config(theme)가 읽는다.
+보정 후에는 문서마다 LibreOffice를 돌릴 필요 없이 visual-verify.py를 주기적 스팟 체크로만 쓰면 된다.
+
+사용법:
+  python -X utf8 tools/calibrate-layout.py "output/*.docx" --theme office-modern
+  python -X utf8 tools/calibrate-layout.py doc-configs/*.json                 # config의 output/theme 사용
+  python -X utf8 tools/calibrate-layout.py "output/*.docx" --pdf-dir output/pdf --dry-run --json
+
+--pdf-dir <경로>: 렌더링한 PDF를 저장/재사용할 디렉토리 (<이름>.pdf가 있으면 LibreOffice 생략)
+--dry-run: 프로필을 저장하지 않고 맞춘 결과만 출력
+--ridge <값>: 기존 계수 쪽으로 당기는 세기 (기본 10), --min-samples <n>: 그룹별 최소 식 수 (기본 5)
+--output <경로>: 프로필 경로 (기본: GENDOCS_LAYOUT_PROFILE 또는 profiles/layout-profile.json)
+
+의존성:
+  - LibreOffice (soffice), PDF 텍스트 추출: PyMuPDF(fitz) 또는 Poppler pdftotext
+"""
+
+import sys
+import os
+import io
+import json
+import glob
+import shutil
+import argparse
+import datetime
+import subprocess
+import tempfile
+
+# Windows 터미널 한글 출력 보장
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tool_loader import load_tool
+from layout_profile import (ANY_THEME, element_terms, estimate_height, fit_coefficients, fit_error,
+                            layout_coefficients, load_layout_profile, profile_key, profile_path,
+                            save_layout_profile)
+
+# 의존성 체크 플래그
+HAS_FITZ = False
+
+try:
+    import fitz  # PyMuPDF
+    HAS_FITZ = True
+except ImportError:
+    pass
+
+DEFAULT_THEME = 'office-modern'   # converter-core.js DEFAULT_THEME (config.theme 미지정 시)
+MIN_SNIPPET = 4                   # 페이지 매칭에 쓰는 요소 텍스트 최소 길이 (공백 제외)
+LOOKAHEAD_PAGES = 3               # 요소 텍스트를 찾을 때 현재 페이지에서 앞으로 볼 페이지 수
+
+
+# ============================================================
+# 입력 수집
+# ============================================================
+
+def _config_output(config_path):
+    """doc-config → (DOCX 경로, 테마). output의 {version}은 docInfo.version으로 채움"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    output = config.get('output')
+    if not output:
+        return None, None
+    version = config.get('docInfo', {}).get('version', '')
+    return output.replace('{version}', version), config.get('theme') or DEFAULT_THEME
+
+
+def collect_inputs(patterns, theme=None):
+    """glob 패턴(DOCX 또는 doc-config JSON) → [(docx 경로, 테마)] (중복 제거, 정렬)"""
+    inputs = {}
+    for pattern in patterns:
+        matched = glob.glob(pattern, recursive=True) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in matched:
+            lower = path.lower()
+            if lower.endswith('.docx'):
+                inputs[path] = theme
+            elif lower.endswith('.json'):
+                try:
+                    docx_path, config_theme = _config_output(path)
+                except (OSError, ValueError, AttributeError):
+                    continue
+                if docx_path:
+                    inputs[docx_path] = theme or config_theme
+    return sorted(inputs.items())
+
+
+# ============================================================
+# 렌더링 + PDF 페이지 텍스트
+# ============================================================
+
+def render_pdf(docx_path, pdf_dir):
+    """DOCX → PDF 경로 (pdf_dir에 같은 이름 PDF가 있으면 재사용). 실패 시 (None, 오류)"""
+    stem = os.path.splitext(os.path.basename(docx_path))[0]
+    cached = os.path.join(pdf_dir, stem + '.pdf')
+    if os.path.isfile(cached) and os.path.getmtime(cached) >= os.path.getmtime(docx_path):
+        return cached, None
+    vv = load_tool('visual-verify.py')
+    return vv.convert_docx_to_pdf(docx_path, pdf_dir)
+
+
+def pdf_page_texts(pdf_path):
+    """PDF → 페이지별 텍스트 목록 (PyMuPDF, 없으면 pdftotext). 추출 도구가 없으면 RuntimeError"""
+    if HAS_FITZ:
+        doc = fitz.open(pdf_path)
+        try:
+            return [page.get_text('text') for page in doc]
+        finally:
+            doc.close()
+    pdftotext = shutil.which('pdftotext')
+    if not pdftotext:
+        raise RuntimeError('PDF 텍스트 추출 도구가 없습니다 (pip install pymupdf 또는 Poppler pdftotext)')
+    result = subprocess.run([pdftotext, '-enc', 'UTF-8', pdf_path, '-'],
+                            capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f'pdftotext 실패: {result.stderr.decode("utf-8", "replace").strip()}')
+    pages = result.stdout.decode('utf-8', 'replace').split('\f')
+    if pages and not pages[-1].strip():
+        pages.pop()   # 마지막 폼피드 뒤 빈 조각
+    return pages
+
+
+# ============================================================
+# 페이지 경계 → 보정 식
+# ============================================================
+
+def _norm(text):
+    """PDF 줄바꿈/공백 차이를 없앤 비교용 텍스트"""
+    return ''.join(text.split())
+
+
+def _snippet(elem):
+    """요소를 PDF 페이지에서 찾을 때 쓰는 텍스트 (짧으면 None)"""
+    etype = elem['type']
+    if etype in ('heading', 'paragraph', 'bullet'):
+        text = elem.get('text', '')
+    elif etype == 'table':
+        # 헤더 행 셀을 이어 붙임 (PDF에서도 셀 텍스트가 행 순서대로 나온다)
+        text = ''.join(h.replace('|', '') for h in elem.get('headers') or [])
+    else:
+        return None
+    text = _norm(text)
+    return text if len(text) >= MIN_SNIPPET else None
+
+
+def locate_page_starts(elements, page_texts):
+    """렌더링 페이지별 첫 요소 인덱스 → {페이지(0부터): 요소 인덱스}
+
+    요소 텍스트를 문서 순서대로, 현재 페이지의 직전 매칭 위치 뒤 → 다음 LOOKAHEAD_PAGES 페이지 순으로
+    찾는다 (되돌아가지 않으므로 반복되는 문구도 순서대로 소비된다). 텍스트가 없는 요소(이미지,
+    빈 단락)는 매칭에 쓰지 않으므로 앞 페이지 쪽에 붙고, 어떤 요소도 찾지 못한 페이지는 결과에 없다.
+    """
+    pages = [_norm(t) for t in page_texts]
+    starts = {}
+    current, pos = 0, 0
+    for i, elem in enumerate(elements):
+        snippet = _snippet(elem)
+        if snippet is None or current >= len(pages):
+            continue
+        k = pages[current].find(snippet, pos)
+        if k >= 0:
+            pos = k + len(snippet)
+            starts.setdefault(current, i)
+            continue
+        for q in range(current + 1, min(current + 1 + LOOKAHEAD_PAGES, len(pages))):
+            k = pages[q].find(snippet)
+            if k >= 0:
+                current, pos = q, k + len(snippet)
+                starts.setdefault(q, i)
+                break
+    return starts
+
+
+def _splittable(elem):
+    """페이지 끝에서 나뉠 수 있는 요소 (Word는 단락 줄/표 행 단위로 넘김)
+
+    keepLines 단락은 나뉘지 않고, widowControl 단락은 앞뒤 두 줄씩 남겨야 하므로 4줄 이상만 나뉜다.
+    """
+    if elem['type'] == 'paragraph':
+        if elem.get('keep_lines'):
+            return False
+        return elem.get('lines', 1) > (3 if elem.get('widow_control') else 1)
+    if elem['type'] == 'table':
+        return elem.get('rows', 0) > 2 and elem.get('tbl_type') != 'info_box'
+    return False
+
+
+def _ambiguous_boundary(elements, start):
+    """페이지 첫 매칭 요소 바로 앞이 찾을 수 없는 큰 요소(이미지/표)면 경계가 불확실"""
+    if start <= 0:
+        return False
+    prev = elements[start - 1]
+    return prev['type'] in ('image', 'table') and _snippet(prev) is None
+
+
+def _add_terms(acc, terms, weight=1.0):
+    counts, base = terms
+    for key, n in counts.items():
+        acc[key] = acc.get(key, 0) + n * weight
+    return base * weight
+
+
+def page_samples(elements, starts, usable_height_pt):
+    """찾은 페이지 경계로 보정 식 목록 → [({계수: 배수}, 목표 높이 pt)]
+
+    나뉜 요소로 이어진 연속 페이지(q..r)는 한 식으로 묶는다 — 요소가 어디서 나뉘었는지는 몰라도
+    묶음 전체 높이는 (r - q + 1) × 가용 높이에서 마지막 페이지의 남은 공간만큼 모자란다.
+    남은 공간은 들어가지 못한 다음 요소 높이의 절반으로 본다.
+    가용 높이는 묶음이 시작하는 섹션의 값 (section_break 요소가 바꾼다).
+    """
+    samples = []
+    usable_at = []
+    for e in elements:
+        usable_at.append(usable_height_pt)
+        if e['type'] == 'section_break':
+            usable_height_pt = e['usable_height_pt']
+    pages = sorted(starts)
+    run_begin, run_pages = None, 0
+    for q, nxt in zip(pages, pages[1:]):
+        begin, end = starts[q], starts[nxt]
+        if (nxt != q + 1 or end <= begin or _ambiguous_boundary(elements, end)
+                or any(e['type'] in ('page_break', 'section_break') for e in elements[begin:end])):
+            run_begin = None   # 경계를 모르거나 명시적/섹션 나누기로 끝난 페이지 (가용 높이 이하라는 것만 앎)
+            continue
+        if run_begin is None:
+            if begin > 0 and (_splittable(elements[begin - 1]) or _ambiguous_boundary(elements, begin)):
+                continue       # 앞 페이지에서 넘어온 조각으로 시작 — 묶음의 시작점을 모름
+            run_begin, run_pages = begin, 0
+        run_pages += 1
+        if _splittable(elements[end - 1]):
+            continue           # 다음 페이지로 이어짐
+        counts = {}
+        fixed = 0.0
+        for e in elements[run_begin:end]:
+            fixed += _add_terms(counts, element_terms(e))
+        fixed += _add_terms(counts, element_terms(elements[end]), 0.5)
+        samples.append((counts, run_pages * usable_at[run_begin] - fixed))
+        run_begin = None
+    return samples
+
+
+def estimated_pages(vd, elements, usable_height_pt, coefficients):
+    """계수를 바꿔 다시 쌓은 추정 페이지 수 (validate-docx LayoutSimulator)"""
+    simulator = vd.LayoutSimulator(usable_height_pt)
+    for elem in elements:
+        if elem['type'] != 'page_break':
+            elem = dict(elem, est_height=round(estimate_height(element_terms(elem), coefficients), 1))
+        simulator.feed(elem)
+    return simulator.finish()['total_pages_estimated']
+
+
+# ============================================================
+# 보정
+# ============================================================
+
+def measure_document(docx_path, theme, pdf_dir):
+    """문서 하나 → 측정 dict (elements, 페이지 정보, 보정 식) 또는 error"""
+    vd = load_tool('validate-docx.py')
+    result = {'file': docx_path, 'theme': theme or ANY_THEME}
+    try:
+        report = vd.analyze_document(docx_path)
+        pdf_path, error = render_pdf(docx_path, pdf_dir)
+        if error:
+            result['error'] = error
+            return result
+        page_texts = pdf_page_texts(pdf_path)
+    except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+        return result
+
+    page = report['page']
+    starts = locate_page_starts(report['elements'], page_texts)
+    result.update({
+        'orientation': page['orientation'],
+        'usable_height_pt': page['usable_height_pt'],
+        'elements': report['elements'],
+        'renderedPages': len(page_texts),
+        'matchedPages': len(starts),
+        'samples': page_samples(report['elements'], starts, page['usable_height_pt']),
+    })
+    return result
+
+
+def fit_groups(measurements, ridge=10.0, min_samples=5, profile_file=None):
+    """측정 결과 → {프로필 키: 맞춘 항목}. 테마별 그룹 + 방향별 공통(*) 그룹"""
+    vd = load_tool('validate-docx.py')
+    groups = {}
+    for m in measurements:
+        if 'error' in m:
+            continue
+        keys = {profile_key(None, m['orientation'])}
+        if m['theme'] != ANY_THEME:
+            keys.add(profile_key(m['theme'], m['orientation']))
+        for key in keys:
+            groups.setdefault(key, []).append(m)
+
+    fitted = {}
+    for key, docs in sorted(groups.items()):
+        theme, orientation = key.split('/', 1)
+        samples = [s for m in docs for s in m['samples']]
+        if len(samples) < min_samples:
+            fitted[key] = {'skipped': f'보정 식 {len(samples)}개 (< {min_samples})',
+                           'documents': len(docs), 'samples': len(samples)}
+            continue
+        prior = layout_coefficients(None if theme == ANY_THEME else theme, orientation, profile_file)
+        coefficients = fit_coefficients(samples, prior, ridge)
+
+        def page_error(coeffs):
+            diffs = [abs(estimated_pages(vd, m['elements'], m['usable_height_pt'], coeffs) - m['renderedPages'])
+                     for m in docs]
+            return round(sum(diffs) / len(diffs), 2)
+
+        fitted[key] = {
+            'coefficients': coefficients,
+            'documents': len(docs),
+            'samples': len(samples),
+            'rmsePt': {'before': round(fit_error(samples, prior), 1),
+                       'after': round(fit_error(samples, coefficients), 1)},
+            'pageError': {'before': page_error(prior), 'after': page_error(coefficients)},
+        }
+    return fitted
+
+
+def merge_profile(profile, fitted):
+    """기존 프로필에 맞춘 그룹을 덮어써 새 프로필 dict"""
+    merged = dict(profile)
+    merged['_generator'] = 'calibrate-layout.py v1'
+    merged['_unit'] = 'pt'
+    profiles = dict(merged.get('profiles', {}))
+    today = datetime.date.today().isoformat()
+    for key, entry in fitted.items():
+        if 'coefficients' in entry:
+            profiles[key] = dict(entry, calibratedAt=today)
+    merged['profiles'] = dict(sorted(profiles.items()))
+    return merged
+
+
+# ============================================================
+# 출력
+# ============================================================
+
+def _document_summary(m):
+    """JSON 출력용 측정 요약 (요소 목록 대신 식 개수)"""
+    summary = {k: v for k, v in m.items() if k not in ('elements', 'samples')}
+    if 'samples' in m:
+        summary['samples'] = len(m['samples'])
+    return summary
+
+
+def print_summary(measurements, fitted, saved_path):
+    print('=' * 70)
+    print('  레이아웃 계수 보정')
+    print('=' * 70)
+    for m in measurements:
+        name = os.path.basename(m['file'])
+        if 'error' in m:
+            print(f"  {name:<40} ERR  {m['error'][:60]}")
+        else:
+            print(f"  {name:<40} {m['renderedPages']:>4}p  매칭 {m['matchedPages']:>4}p  "
+                  f"식 {len(m['samples']):>4}  ({m['theme']}/{m['orientation']})")
+
+    for key, entry in fitted.items():
+        print(f'\n[{key}] 문서 {entry["documents"]}개, 식 {entry["samples"]}개')
+        if 'skipped' in entry:
+            print(f'  건너뜀: {entry["skipped"]}')
+            continue
+        rmse, pages = entry['rmsePt'], entry['pageError']
+        print(f'  RMSE {rmse["before"]}pt → {rmse["after"]}pt, '
+              f'페이지 오차 평균 {pages["before"]}p → {pages["after"]}p')
+        print('  ' + ', '.join(f'{k}={v:g}' for k, v in entry['coefficients'].items()))
+
+    print()
+    if saved_path:
+        print(f'  프로필 저장: {saved_path}')
+    else:
+        print('  --dry-run: 프로필을 저장하지 않음')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='렌더링 페이지 경계로 레이아웃 높이 계수 보정')
+    parser.add_argument('patterns', nargs='+', help='DOCX 또는 doc-config JSON glob 패턴')
+    parser.add_argument('--theme', help='DOCX 입력의 테마 이름 (config 입력은 config의 theme)')
+    parser.add_argument('--pdf-dir', help='렌더링 PDF 저장/재사용 디렉토리 (기본: 임시 디렉토리)')
+    parser.add_argument('--output', help=f'프로필 경로 (기본: {os.path.relpath(profile_path())})')
+    parser.add_argument('--ridge', type=float, default=10.0, help='기존 계수 쪽 정규화 세기 (기본 10)')
+    parser.add_argument('--min-samples', type=int, default=5, help='그룹별 최소 보정 식 수 (기본 5)')
+    parser.add_argument('--dry-run', action='store_true', help='프로필을 저장하지 않음')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    inputs = [(path, theme) for path, theme in collect_inputs(args.patterns, args.theme) if os.path.isfile(path)]
+    if not inputs:
+        print('[ERROR] 보정할 DOCX가 없습니다')
+        sys.exit(1)
+
+    output_path = args.output or profile_path()
+    pdf_dir = args.pdf_dir or tempfile.mkdtemp(prefix='gendocs-calibrate-')
+    os.makedirs(pdf_dir, exist_ok=True)
+    try:
+        measurements = []
+        for path, theme in inputs:
+            if not args.json:
+                print(f'렌더링: {path}', file=sys.stderr, flush=True)
+            measurements.append(measure_document(path, theme, pdf_dir))
+    finally:
+        if not args.pdf_dir:
+            shutil.rmtree(pdf_dir, ignore_errors=True)
+
+    fitted = fit_groups(measurements, args.ridge, args.min_samples, output_path)
+    saved_path = None
+    if not args.dry_run and any('coefficients' in e for e in fitted.values()):
+        save_layout_profile(merge_profile(load_layout_profile(output_path), fitted), output_path)
+        saved_path = output_path
+
+    if args.json:
+        print(json.dumps({
+            'documents': [_document_summary(m) for m in measurements],
+            'profiles': fitted,
+            'saved': saved_path,
+        }, ensure_ascii=False, indent=2))
+    else:
+        print_summary(measurements, fitted, saved_path)
+
+    sys.exit(0 if any('coefficients' in e for e in fitted.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
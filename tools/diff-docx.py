@@ -6,45 +6,83 @@ DOCX XML-level 비교 도구
 
 사용법: python -X utf8 tools/diff-docx.py <reference.docx> <generated.docx>
         python -X utf8 tools/diff-docx.py <reference.docx> <generated.docx> --json
+        python -X utf8 tools/diff-docx.py <reference.docx> <generated.docx> --timings [--profile out.prof]
+        python -X utf8 tools/diff-docx.py <reference.docx> - --json < generated.docx   (한쪽은 stdin 가능)
+        python -X utf8 tools/diff-docx.py <reference.docx> "output/*.docx" [--workers 8] [--json]
 
-순수 Python (zipfile + xml.etree.ElementTree), 외부 의존성 없음.
+생성 문서를 둘 이상 주면 레퍼런스를 한 번만 파싱해 특징을 뽑아 두고, 각 문서와의 비교를
+프로세스 풀에서 병렬로 돌려 카테고리별 차이 수 매트릭스(총 차이 오름차순 순위)를 출력한다.
+
+        python -X utf8 tools/diff-docx.py <이전 빌드 폴더> <새 빌드 폴더> [--workers 8] [--jsonl | --csv]
+
+두 폴더를 주면 하위 .docx를 상대 경로로 짝짓고, 바이트나 XML 파트 해시가 같은 쌍은 건너뛰고
+나머지만 프로세스 풀에서 비교해 문서별로 바뀐 카테고리를 출력한다 (바뀐 문서가 있으면 종료 코드 1).
+
+--only styles,pageSetup,headingStyles: 고른 카테고리만 비교한다 (모든 모드 공통). 그 카테고리가 읽는
+파트만 파싱하므로 스타일/페이지 설정만 비교하면 styles.xml과 document.xml 꼬리(sectPr)만 읽는다.
+카테고리: pageSetup, docDefaults, headingStyles, elementStructure, tableStructure, runProperties, spacing
+묶음: styles(docDefaults+headingStyles), document(요소/테이블/런/간격)
+
+파싱은 공유 문서 모델(docx_model)이 한다. 필수 외부 의존성은 없고, requirements-optional.txt의 선택 의존성
+(numpy, GENDOCS_XML_BACKEND=lxml일 때 lxml)은 공유 모듈이 사용한다.
 """
 
 import sys
 import os
 import io
+import csv
 import json
+import glob
+import time
+import filecmp
+import hashlib
 import zipfile
-import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from docx_model import (NS, STDIN_ARG, load_docx, is_path_source, cli_docx_source,
+                        W_PPR, W_PGSZ, W_PGMAR, W_R, W_RPR, W_T, W_RFONTS, W_SZ, W_B, W_TC, W_TCPR,
+                        W_TCW, W_SHD, W_STYLE, W_STYLEID, W_VAL, W_FILL, W_W, W_H, W_ORIENT)
+from timings import phase, TimingSession, parse_timing_argv
+from seq_diff import anchored_matches
+from batch_runner import VOLATILE_PART_PREFIXES, iter_results
 
 # Windows UTF-8 출력
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# ============================================================
-# XML 네임스페이스
-# ============================================================
-NS = {
-    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
-    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
-}
-
 W = NS['w']
 A = NS['a']
 WP = NS['wp']
 
-# ============================================================
-# 특수 블록 판별용 배경색
-# ============================================================
-DARK_CODE_COLORS = {'1E1E1E', '2D2D2D'}
-LIGHT_CODE_COLORS = {'F5F5F5', 'F0F0F0', 'F5F7FA'}
-INFO_BOX_COLORS = {'E8F0F7'}
-WARNING_BOX_COLORS = {'FEF6E6'}
-SPECIAL_BG_COLORS = DARK_CODE_COLORS | LIGHT_CODE_COLORS | INFO_BOX_COLORS | WARNING_BOX_COLORS
+# 네임스페이스 태그/속성 이름 (Clark 표기) — 단락마다 f-string을 만들지 않도록 미리 계산
+W_DOCDEFAULTS = f'{{{W}}}docDefaults'
+W_RPRDEFAULT = f'{{{W}}}rPrDefault'
+W_PPRDEFAULT = f'{{{W}}}pPrDefault'
+W_NAME = f'{{{W}}}name'
+W_SZCS = f'{{{W}}}szCs'
+W_I = f'{{{W}}}i'
+W_COLOR = f'{{{W}}}color'
+W_SPACING = f'{{{W}}}spacing'
+W_BEFORE = f'{{{W}}}before'
+W_AFTER = f'{{{W}}}after'
+W_LINE = f'{{{W}}}line'
+W_TBLPR = f'{{{W}}}tblPr'
+W_TBLCELLMAR = f'{{{W}}}tblCellMar'
+W_TBLBORDERS = f'{{{W}}}tblBorders'
+WP_INLINE = f'{{{WP}}}inline'
+WP_ANCHOR = f'{{{WP}}}anchor'
+WP_EXTENT = f'{{{WP}}}extent'
+
+# 이름 → 태그/속성 (비교 결과 키는 로컬 이름)
+_FONT_ATTRS = {name: f'{{{W}}}{name}' for name in ('ascii', 'hAnsi', 'eastAsia')}
+_DEFAULT_FONT_ATTRS = {name: f'{{{W}}}{name}' for name in ('ascii', 'hAnsi', 'eastAsia', 'cs')}
+_DEFAULT_SPACING_ATTRS = {name: f'{{{W}}}{name}' for name in ('before', 'after', 'line', 'lineRule')}
+_HEADING_SPACING_ATTRS = {name: f'{{{W}}}{name}' for name in ('before', 'after')}
+_PG_MAR_ATTRS = {name: f'{{{W}}}{name}'
+                 for name in ('top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter')}
+_CELL_MARGIN_TAGS = {name: f'{{{W}}}{name}' for name in ('top', 'left', 'bottom', 'right', 'start', 'end')}
+_BORDER_TAGS = {name: f'{{{W}}}{name}' for name in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV')}
 
 EMU_TO_DXA = 1 / 635  # 1 DXA = 635 EMU (approx)
 EMU_TO_PT = 1 / 12700
@@ -55,52 +93,23 @@ HALF_PT_TO_PT = 0.5  # half-point to point
 # XML 유틸리티
 # ============================================================
 
-def _read_xml(z, path):
-    """ZIP에서 XML 파싱. 없으면 None 반환."""
-    if path in z.namelist():
-        return ET.parse(z.open(path)).getroot()
-    return None
-
-
-def _attr(el, attr_name):
-    """w:xxx 네임스페이스 속성 읽기."""
+def _attr(el, attr):
+    """w:xxx 네임스페이스 속성 읽기 (attr: W_* 상수)."""
     if el is None:
         return None
-    return el.get(f'{{{W}}}{attr_name}')
+    return el.get(attr)
 
 
 def _find(el, *tags):
-    """중첩 w:xxx 태그를 순서대로 탐색."""
+    """중첩 w:xxx 태그를 순서대로 탐색 (tags: W_* 상수)."""
     cur = el
     for tag in tags:
         if cur is None:
             return None
-        cur = cur.find(f'{{{W}}}{tag}')
+        cur = cur.find(tag)
     return cur
 
 
-def _extract_text(element):
-    """w:p 요소에서 텍스트 추출."""
-    texts = []
-    for t in element.iter(f'{{{W}}}t'):
-        if t.text:
-            texts.append(t.text)
-    return ''.join(texts).strip()
-
-
-def _get_style(p):
-    """w:p 스타일명."""
-    pStyle = _find(p, 'pPr', 'pStyle')
-    return _attr(pStyle, 'val') or '' if pStyle is not None else ''
-
-
-def _has_page_break(p):
-    for br in p.iter(f'{{{W}}}br'):
-        if br.get(f'{{{W}}}type') == 'page':
-            return True
-    return False
-
-
 def _is_bold(val_str):
     """
     Bold 판정. <w:b/> 또는 <w:b val="true"|"1"> → True.
@@ -126,13 +135,13 @@ def _is_italic(val_str):
 
 
 def _get_bool_prop(rPr, tag):
-    """rPr에서 bool 속성 추출. 태그 없으면 None, 있으면 val 반환."""
+    """rPr에서 bool 속성 추출 (tag: W_* 상수). 태그 없으면 None, 있으면 val 반환."""
     if rPr is None:
         return None
-    el = rPr.find(f'{{{W}}}{tag}')
+    el = rPr.find(tag)
     if el is None:
         return None
-    return el.get(f'{{{W}}}val', 'true')  # <w:b/> → val 없으면 "true"
+    return el.get(W_VAL, 'true')  # <w:b/> → val 없으면 "true"
 
 
 def _normalize_bool(val_str):
@@ -149,56 +158,27 @@ def _get_shading_color(el):
     """요소(tcPr 또는 pPr)에서 shading fill 색상 추출."""
     if el is None:
         return None
-    shd = el.find(f'{{{W}}}shd')
+    shd = el.find(W_SHD)
     if shd is not None:
-        fill = shd.get(f'{{{W}}}fill', '')
+        fill = shd.get(W_FILL, '')
         if fill and fill.upper() != 'AUTO':
             return fill.upper()
     return None
 
 
-def _table_first_cell_bg(tbl):
-    """테이블 첫 셀 배경색."""
-    for tc in tbl.iter(f'{{{W}}}tc'):
-        tcPr = tc.find(f'{{{W}}}tcPr')
-        c = _get_shading_color(tcPr)
-        if c:
-            return c
-        break
-    return None
-
-
-def _classify_table(tbl):
-    """테이블 유형: code_dark, code_light, info_box, warning_box, data_table."""
-    bg = (_table_first_cell_bg(tbl) or '').upper()
-    rows = tbl.findall(f'{{{W}}}tr')
-    first_row = rows[0] if rows else None
-    cols = len(first_row.findall(f'{{{W}}}tc')) if first_row is not None else 0
-
-    if bg in DARK_CODE_COLORS:
-        return 'code_dark'
-    if cols == 1 and bg in LIGHT_CODE_COLORS:
-        return 'code_light'
-    if cols == 1 and bg in INFO_BOX_COLORS:
-        return 'info_box'
-    if cols == 1 and bg in WARNING_BOX_COLORS:
-        return 'warning_box'
-    return 'data_table'
-
-
 def _has_image(p):
     """단락에 이미지가 포함되어 있는지."""
-    for _ in p.iter(f'{{{WP}}}inline'):
+    for _ in p.iter(WP_INLINE):
         return True
-    for _ in p.iter(f'{{{WP}}}anchor'):
+    for _ in p.iter(WP_ANCHOR):
         return True
     return False
 
 
 def _get_image_size(p):
     """이미지 크기 (EMU → pt)."""
-    for drawing in [*p.iter(f'{{{WP}}}inline'), *p.iter(f'{{{WP}}}anchor')]:
-        extent = drawing.find(f'{{{WP}}}extent')
+    for drawing in [*p.iter(WP_INLINE), *p.iter(WP_ANCHOR)]:
+        extent = drawing.find(WP_EXTENT)
         if extent is not None:
             cx = int(extent.get('cx', 0))
             cy = int(extent.get('cy', 0))
@@ -210,53 +190,62 @@ def _get_image_size(p):
 # DOCX 열기
 # ============================================================
 
-def open_docx(path):
-    """DOCX 파일을 열어 (zipfile, document_root, styles_root) 반환."""
-    if not os.path.isfile(path):
-        raise FileNotFoundError(f"File not found: {path}")
-    z = zipfile.ZipFile(path, 'r')
-    doc = _read_xml(z, 'word/document.xml')
-    styles = _read_xml(z, 'word/styles.xml')
-    return z, doc, styles
+def open_docx(source):
+    """DOCX를 공유 문서 모델(docx_model.DocxModel)로 연다.
+
+    source: 경로, bytes, 바이너리 파일 객체 또는 DocxModel
+    """
+    if is_path_source(source) and not os.path.isfile(source):
+        raise FileNotFoundError(f"File not found: {source}")
+    return load_docx(source)
 
 
 # ============================================================
 # 1. Page Setup 비교
 # ============================================================
 
-def compare_page_setup(doc_ref, doc_gen):
-    """sectPr에서 페이지 설정 비교."""
-    diffs = []
-    matches = []
-
-    def get_sect_pr(doc_root):
-        body = doc_root.find(f'{{{W}}}body')
-        if body is None:
-            return None
-        return body.find(f'{{{W}}}sectPr')
-
-    sp_ref = get_sect_pr(doc_ref)
-    sp_gen = get_sect_pr(doc_gen)
-
-    if sp_ref is None and sp_gen is None:
-        matches.append({'field': 'sectPr', 'note': 'Both missing'})
-        return {'diffs': diffs, 'matches': matches}
+def _page_setup_features(sp):
+    """body 직계 sectPr의 pgSz/pgMar (sectPr이 없으면 None)."""
+    if sp is None:
+        return None
 
     # pgSz
     def get_pg_sz(sp):
-        if sp is None:
-            return {}
-        pgSz = sp.find(f'{{{W}}}pgSz')
+        pgSz = sp.find(W_PGSZ)
         if pgSz is None:
             return {}
         return {
-            'width': pgSz.get(f'{{{W}}}w'),
-            'height': pgSz.get(f'{{{W}}}h'),
-            'orient': pgSz.get(f'{{{W}}}orient', 'portrait'),
+            'width': pgSz.get(W_W),
+            'height': pgSz.get(W_H),
+            'orient': pgSz.get(W_ORIENT, 'portrait'),
         }
 
-    sz_ref = get_pg_sz(sp_ref)
-    sz_gen = get_pg_sz(sp_gen)
+    # pgMar
+    def get_pg_mar(sp):
+        pgMar = sp.find(W_PGMAR)
+        if pgMar is None:
+            return {}
+        result = {}
+        for attr, qname in _PG_MAR_ATTRS.items():
+            val = pgMar.get(qname)
+            if val:
+                result[attr] = val
+        return result
+
+    return {'pgSz': get_pg_sz(sp), 'pgMar': get_pg_mar(sp)}
+
+
+def compare_page_setup(ps_ref, ps_gen):
+    """sectPr에서 페이지 설정 비교 (_page_setup_features 결과끼리)."""
+    diffs = []
+    matches = []
+
+    if ps_ref is None and ps_gen is None:
+        matches.append({'field': 'sectPr', 'note': 'Both missing'})
+        return {'diffs': diffs, 'matches': matches}
+
+    sz_ref = (ps_ref or {}).get('pgSz', {})
+    sz_gen = (ps_gen or {}).get('pgSz', {})
 
     for field in ['width', 'height', 'orient']:
         vr = sz_ref.get(field)
@@ -267,22 +256,8 @@ def compare_page_setup(doc_ref, doc_gen):
         else:
             diffs.append(entry)
 
-    # pgMar
-    def get_pg_mar(sp):
-        if sp is None:
-            return {}
-        pgMar = sp.find(f'{{{W}}}pgMar')
-        if pgMar is None:
-            return {}
-        result = {}
-        for attr in ['top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter']:
-            val = pgMar.get(f'{{{W}}}{attr}')
-            if val:
-                result[attr] = val
-        return result
-
-    mar_ref = get_pg_mar(sp_ref)
-    mar_gen = get_pg_mar(sp_gen)
+    mar_ref = (ps_ref or {}).get('pgMar', {})
+    mar_gen = (ps_gen or {}).get('pgMar', {})
     all_keys = sorted(set(list(mar_ref.keys()) + list(mar_gen.keys())))
     for k in all_keys:
         vr = mar_ref.get(k)
@@ -300,46 +275,46 @@ def compare_page_setup(doc_ref, doc_gen):
 # 2. Document Defaults 비교
 # ============================================================
 
-def compare_doc_defaults(styles_ref, styles_gen):
+def _doc_default_features(styles_root):
+    """docDefaults의 기본 폰트/크기/간격."""
+    if styles_root is None:
+        return {}
+    dd = styles_root.find(W_DOCDEFAULTS)
+    if dd is None:
+        return {}
+    result = {}
+    # rPrDefault
+    rPrDefault = _find(dd, W_RPRDEFAULT, W_RPR)
+    if rPrDefault is not None:
+        rFonts = rPrDefault.find(W_RFONTS)
+        if rFonts is not None:
+            for attr, qname in _DEFAULT_FONT_ATTRS.items():
+                v = rFonts.get(qname)
+                if v:
+                    result[f'font.{attr}'] = v
+        sz = rPrDefault.find(W_SZ)
+        if sz is not None:
+            result['fontSize'] = _attr(sz, W_VAL)
+        szCs = rPrDefault.find(W_SZCS)
+        if szCs is not None:
+            result['fontSizeCs'] = _attr(szCs, W_VAL)
+    # pPrDefault
+    pPrDefault = _find(dd, W_PPRDEFAULT, W_PPR)
+    if pPrDefault is not None:
+        spacing = pPrDefault.find(W_SPACING)
+        if spacing is not None:
+            for attr, qname in _DEFAULT_SPACING_ATTRS.items():
+                v = spacing.get(qname)
+                if v:
+                    result[f'spacing.{attr}'] = v
+    return result
+
+
+def compare_doc_defaults(def_ref, def_gen):
     """docDefaults 비교 (기본 폰트, 크기)."""
     diffs = []
     matches = []
 
-    def get_defaults(styles_root):
-        if styles_root is None:
-            return {}
-        dd = styles_root.find(f'{{{W}}}docDefaults')
-        if dd is None:
-            return {}
-        result = {}
-        # rPrDefault
-        rPrDefault = _find(dd, 'rPrDefault', 'rPr')
-        if rPrDefault is not None:
-            rFonts = rPrDefault.find(f'{{{W}}}rFonts')
-            if rFonts is not None:
-                for attr in ['ascii', 'hAnsi', 'eastAsia', 'cs']:
-                    v = rFonts.get(f'{{{W}}}{attr}')
-                    if v:
-                        result[f'font.{attr}'] = v
-            sz = rPrDefault.find(f'{{{W}}}sz')
-            if sz is not None:
-                result['fontSize'] = _attr(sz, 'val')
-            szCs = rPrDefault.find(f'{{{W}}}szCs')
-            if szCs is not None:
-                result['fontSizeCs'] = _attr(szCs, 'val')
-        # pPrDefault
-        pPrDefault = _find(dd, 'pPrDefault', 'pPr')
-        if pPrDefault is not None:
-            spacing = pPrDefault.find(f'{{{W}}}spacing')
-            if spacing is not None:
-                for attr in ['before', 'after', 'line', 'lineRule']:
-                    v = spacing.get(f'{{{W}}}{attr}')
-                    if v:
-                        result[f'spacing.{attr}'] = v
-        return result
-
-    def_ref = get_defaults(styles_ref)
-    def_gen = get_defaults(styles_gen)
     all_keys = sorted(set(list(def_ref.keys()) + list(def_gen.keys())))
 
     for k in all_keys:
@@ -358,60 +333,66 @@ def compare_doc_defaults(styles_ref, styles_gen):
 # 3. Heading Styles 비교
 # ============================================================
 
-def compare_heading_styles(styles_ref, styles_gen):
-    """Heading1~6 스타일 비교."""
-    diffs = []
-    matches = []
+def _heading_style_features(styles_root):
+    """Heading1~6 스타일 속성 {styleId: props 또는 None}."""
 
     def get_heading_props(styles_root, style_id):
         if styles_root is None:
             return None
-        for style in styles_root.findall(f'{{{W}}}style'):
-            sid = style.get(f'{{{W}}}styleId', '')
+        for style in styles_root.findall(W_STYLE):
+            sid = style.get(W_STYLEID, '')
             if sid.lower() == style_id.lower():
                 props = {}
                 # name
-                name_el = style.find(f'{{{W}}}name')
+                name_el = style.find(W_NAME)
                 if name_el is not None:
-                    props['name'] = _attr(name_el, 'val')
+                    props['name'] = _attr(name_el, W_VAL)
 
                 # rPr
-                rPr = style.find(f'{{{W}}}rPr')
+                rPr = style.find(W_RPR)
                 if rPr is not None:
-                    rFonts = rPr.find(f'{{{W}}}rFonts')
+                    rFonts = rPr.find(W_RFONTS)
                     if rFonts is not None:
-                        for attr in ['ascii', 'hAnsi', 'eastAsia']:
-                            v = rFonts.get(f'{{{W}}}{attr}')
+                        for attr, qname in _FONT_ATTRS.items():
+                            v = rFonts.get(qname)
                             if v:
                                 props[f'font.{attr}'] = v
-                    sz = rPr.find(f'{{{W}}}sz')
+                    sz = rPr.find(W_SZ)
                     if sz is not None:
-                        props['size'] = _attr(sz, 'val')
-                    color = rPr.find(f'{{{W}}}color')
+                        props['size'] = _attr(sz, W_VAL)
+                    color = rPr.find(W_COLOR)
                     if color is not None:
-                        props['color'] = (_attr(color, 'val') or '').upper()
-                    b_val = _get_bool_prop(rPr, 'b')
+                        props['color'] = (_attr(color, W_VAL) or '').upper()
+                    b_val = _get_bool_prop(rPr, W_B)
                     props['bold'] = _normalize_bool(b_val)
-                    i_val = _get_bool_prop(rPr, 'i')
+                    i_val = _get_bool_prop(rPr, W_I)
                     props['italic'] = _normalize_bool(i_val)
 
                 # pPr spacing
-                pPr = style.find(f'{{{W}}}pPr')
+                pPr = style.find(W_PPR)
                 if pPr is not None:
-                    spacing = pPr.find(f'{{{W}}}spacing')
+                    spacing = pPr.find(W_SPACING)
                     if spacing is not None:
-                        for attr in ['before', 'after']:
-                            v = spacing.get(f'{{{W}}}{attr}')
+                        for attr, qname in _HEADING_SPACING_ATTRS.items():
+                            v = spacing.get(qname)
                             if v:
                                 props[f'spacing.{attr}'] = v
 
                 return props
         return None
 
+    return {f'Heading{level}': get_heading_props(styles_root, f'Heading{level}') for level in range(1, 7)}
+
+
+def compare_heading_styles(hs_ref, hs_gen):
+    """Heading1~6 스타일 비교."""
+    diffs = []
+    matches = []
+
     for level in range(1, 7):
         style_id = f'Heading{level}'
-        p_ref = get_heading_props(styles_ref, style_id)
-        p_gen = get_heading_props(styles_gen, style_id)
+        p_ref = hs_ref.get(style_id)
+        p_gen = hs_gen.get(style_id)
 
         if p_ref is None and p_gen is None:
             continue
@@ -439,24 +420,29 @@ def compare_heading_styles(styles_ref, styles_gen):
 # 4. Element Structure 비교
 # ============================================================
 
-def _build_element_list(doc_root):
-    """문서 body에서 순서대로 요소 목록 생성."""
-    body = doc_root.find(f'{{{W}}}body')
-    if body is None:
-        return []
+def _first_text(paragraphs):
+    """셀 단락 텍스트 목록에서 첫 번째 비어있지 않은 텍스트."""
+    for t in paragraphs:
+        if t:
+            return t
+    return ''
+
 
+def _build_element_list(model):
+    """문서 body에서 순서대로 요소 목록 생성 (정렬용 시그니처 '_sig' 포함)."""
     elements = []
-    for child in body:
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+    for el in model.elements:
+        tag = el.tag
+        before = len(elements)
 
         if tag == 'p':
-            style = _get_style(child)
-            text = _extract_text(child)
-            has_break = _has_page_break(child)
-            has_img = _has_image(child)
+            style = el.style
+            text = el.text
+            has_break = el.has_page_break
+            has_img = _has_image(el.node)
 
             if has_img:
-                w, h = _get_image_size(child)
+                w, h = _get_image_size(el.node)
                 elements.append({
                     'type': 'image',
                     'text': text[:60],
@@ -489,48 +475,26 @@ def _build_element_list(doc_root):
                     elements[-1]['has_page_break'] = True
 
         elif tag == 'tbl':
-            tbl_type = _classify_table(child)
-            rows = child.findall(f'{{{W}}}tr')
-            first_row = rows[0] if rows else None
-            cols = len(first_row.findall(f'{{{W}}}tc')) if first_row is not None else 0
+            tbl_type = el.tbl_type
 
             # Extract header text for data tables
             header_text = ''
-            if tbl_type == 'data_table' and first_row is not None:
-                cells = first_row.findall(f'{{{W}}}tc')
-                hdrs = []
-                for tc in cells:
-                    ct = []
-                    for p in tc.findall(f'{{{W}}}p'):
-                        t = _extract_text(p)
-                        if t:
-                            ct.append(t)
-                    hdrs.append('|'.join(ct) if ct else '')
+            if tbl_type == 'data_table' and el.rows:
+                hdrs = ['|'.join(t for t in cell if t) for cell in el.header_paragraphs]
                 header_text = '|'.join(hdrs)[:80]
 
             text_preview = ''
-            if tbl_type in ('code_dark', 'code_light'):
-                # Get first line of code
-                for tr in rows[:1]:
-                    for tc in tr.findall(f'{{{W}}}tc'):
-                        for p in tc.findall(f'{{{W}}}p'):
-                            t = _extract_text(p)
-                            if t:
-                                text_preview = t[:60]
-                                break
-            elif tbl_type in ('info_box', 'warning_box'):
-                for tr in rows[:1]:
-                    for tc in tr.findall(f'{{{W}}}tc'):
-                        for p in tc.findall(f'{{{W}}}p'):
-                            t = _extract_text(p)
-                            if t:
-                                text_preview = t[:60]
-                                break
+            if tbl_type in ('code_dark', 'code_light', 'info_box', 'warning_box'):
+                # First line of code / box text (last non-empty cell wins)
+                for cell in el.header_paragraphs:
+                    t = _first_text(cell)
+                    if t:
+                        text_preview = t[:60]
 
             elements.append({
                 'type': tbl_type,
-                'rows': len(rows),
-                'cols': cols,
+                'rows': el.row_count,
+                'cols': el.col_count,
                 'header': header_text,
                 'text': text_preview,
             })
@@ -540,14 +504,108 @@ def _build_element_list(doc_root):
         else:
             elements.append({'type': f'unknown:{tag}', 'text': ''})
 
+        if len(elements) > before:
+            e = elements[-1]
+            sig_text = el.text if tag == 'p' else e.get('header', '') + '\n' + e['text']
+            e['_sig'] = (e['type'], _text_digest(sig_text))
+
     return elements
 
 
-def compare_element_structure(doc_ref, doc_gen):
-    """요소 목록 순차 비교."""
-    els_ref = _build_element_list(doc_ref)
-    els_gen = _build_element_list(doc_gen)
+# 요소 시그니처 = (유형, 정규화 텍스트 해시). 같은 시그니처끼리만 정렬의 일치로 본다
+_SIG_TEXT_DIGEST = 8
+
+
+def _text_digest(text):
+    """공백을 정규화한 텍스트의 짧은 해시."""
+    norm = ' '.join(text.split())
+    return hashlib.blake2b(norm.encode('utf-8'), digest_size=_SIG_TEXT_DIGEST).digest()
+
+
+def _heading_positions(els, lo, hi):
+    return [i - lo for i in range(lo, hi) if els[i]['type'].startswith('heading')]
+
+
+def _align_elements(els_ref, els_gen):
+    """요소 목록 정렬 — 시그니처(유형+텍스트)가 같은 쌍 [(i, j)], 제목 앵커 기준."""
+    ids = {}
+    sig_ref = [ids.setdefault(e['_sig'], len(ids)) for e in els_ref]
+    sig_gen = [ids.setdefault(e['_sig'], len(ids)) for e in els_gen]
+    return anchored_matches(sig_ref, sig_gen,
+                             _heading_positions(els_ref, 0, len(els_ref)),
+                             _heading_positions(els_gen, 0, len(els_gen)))
+
+
+def _pair_diffs(i, j, er, eg):
+    """정렬된 같은 유형 요소 쌍의 세부 차이."""
+    if er['type'] == 'data_table' and (er.get('rows') != eg.get('rows') or er.get('cols') != eg.get('cols')):
+        yield {
+            'index': i,
+            'type': 'table_shape',
+            'ref': f"{er.get('rows')}x{er.get('cols')}",
+            'gen': f"{eg.get('rows')}x{eg.get('cols')}",
+            'header': er.get('header', ''),
+        }
+
+
+def _gap_diffs(els_ref, els_gen, i0, i1, j0, j1):
+    """시그니처가 맞지 않는 구간 — 유형만으로 다시 정렬해 같은 유형은 쌍으로 보고,
+    남은 삭제/삽입 묶음은 앞에서부터 type_mismatch로 짝짓고 나머지를 missing/extra로 낸다."""
+    types = {}
+    tr = [types.setdefault(els_ref[i]['type'], len(types)) for i in range(i0, i1)]
+    tg = [types.setdefault(els_gen[j]['type'], len(types)) for j in range(j0, j1)]
+    pairs = [(i0 + i, j0 + j) for i, j in anchored_matches(
+        tr, tg, _heading_positions(els_ref, i0, i1), _heading_positions(els_gen, j0, j1))]
+    pairs.append((i1, j1))
+
+    i, j = i0, j0
+    for pi, pj in pairs:
+        run = min(pi - i, pj - j)
+        for k in range(run):
+            er, eg = els_ref[i + k], els_gen[j + k]
+            yield {
+                'index': i + k,
+                'type': 'type_mismatch',
+                'ref': er['type'],
+                'gen': eg['type'],
+                'ref_text': er.get('text', ''),
+                'gen_text': eg.get('text', ''),
+            }
+        for k in range(i + run, pi):
+            yield {
+                'index': k,
+                'type': 'missing_in_gen',
+                'element': els_ref[k]['type'],
+                'text': els_ref[k].get('text', ''),
+            }
+        for k in range(j + run, pj):
+            yield {
+                'index': k,
+                'type': 'extra_in_gen',
+                'element': els_gen[k]['type'],
+                'text': els_gen[k].get('text', ''),
+            }
+        if pi < i1:
+            yield from _pair_diffs(pi, pj, els_ref[pi], els_gen[pj])
+        i, j = pi + 1, pj + 1
+
+
+def iter_sequence_diffs(els_ref, els_gen):
+    """요소 순서 차이를 문서 순서대로 하나씩 내보낸다 (개수 제한 없음).
+
+    index는 missing/type_mismatch/table_shape면 REF 위치, extra_in_gen이면 GEN 위치.
+    """
+    i = j = 0
+    for mi, mj in _align_elements(els_ref, els_gen) + [(len(els_ref), len(els_gen))]:
+        if mi > i or mj > j:
+            yield from _gap_diffs(els_ref, els_gen, i, mi, j, mj)
+        if mi < len(els_ref):
+            yield from _pair_diffs(mi, mj, els_ref[mi], els_gen[mj])
+        i, j = mi + 1, mj + 1
+
 
+def compare_element_structure(els_ref, els_gen):
+    """요소 목록(_build_element_list) 비교 — 유형별 개수와 시그니처 정렬(Myers 차분) 기반 순서 차이."""
     # Count by type
     def count_by_type(els):
         counts = {}
@@ -571,92 +629,7 @@ def compare_element_structure(doc_ref, doc_gen):
         else:
             count_diffs.append(entry)
 
-    # Sequential comparison (LCS-like diff)
-    seq_diffs = []
-    i, j = 0, 0
-    max_report = 50
-    while i < len(els_ref) and j < len(els_gen) and len(seq_diffs) < max_report:
-        er = els_ref[i]
-        eg = els_gen[j]
-
-        if er['type'] == eg['type']:
-            # Same type — check details
-            if er['type'] == 'data_table':
-                if er.get('rows') != eg.get('rows') or er.get('cols') != eg.get('cols'):
-                    seq_diffs.append({
-                        'index': i,
-                        'type': 'table_shape',
-                        'ref': f"{er.get('rows')}x{er.get('cols')}",
-                        'gen': f"{eg.get('rows')}x{eg.get('cols')}",
-                        'header': er.get('header', ''),
-                    })
-            i += 1
-            j += 1
-        else:
-            # Type mismatch — try to find alignment
-            # Look ahead in gen for matching ref element
-            found_in_gen = None
-            for k in range(j + 1, min(j + 5, len(els_gen))):
-                if els_gen[k]['type'] == er['type']:
-                    found_in_gen = k
-                    break
-
-            found_in_ref = None
-            for k in range(i + 1, min(i + 5, len(els_ref))):
-                if els_ref[k]['type'] == eg['type']:
-                    found_in_ref = k
-                    break
-
-            if found_in_gen is not None and (found_in_ref is None or (found_in_gen - j) <= (found_in_ref - i)):
-                # Extra elements in gen before match
-                for k in range(j, found_in_gen):
-                    seq_diffs.append({
-                        'index': k,
-                        'type': 'extra_in_gen',
-                        'element': els_gen[k]['type'],
-                        'text': els_gen[k].get('text', ''),
-                    })
-                j = found_in_gen
-            elif found_in_ref is not None:
-                # Missing elements in gen
-                for k in range(i, found_in_ref):
-                    seq_diffs.append({
-                        'index': k,
-                        'type': 'missing_in_gen',
-                        'element': els_ref[k]['type'],
-                        'text': els_ref[k].get('text', ''),
-                    })
-                i = found_in_ref
-            else:
-                seq_diffs.append({
-                    'index': i,
-                    'type': 'type_mismatch',
-                    'ref': er['type'],
-                    'gen': eg['type'],
-                    'ref_text': er.get('text', ''),
-                    'gen_text': eg.get('text', ''),
-                })
-                i += 1
-                j += 1
-
-    # Remaining elements
-    while i < len(els_ref) and len(seq_diffs) < max_report:
-        seq_diffs.append({
-            'index': i,
-            'type': 'missing_in_gen',
-            'element': els_ref[i]['type'],
-            'text': els_ref[i].get('text', ''),
-        })
-        i += 1
-
-    while j < len(els_gen) and len(seq_diffs) < max_report:
-        seq_diffs.append({
-            'index': j,
-            'type': 'extra_in_gen',
-            'element': els_gen[j]['type'],
-            'text': els_gen[j].get('text', ''),
-        })
-        j += 1
+    seq_diffs = list(iter_sequence_diffs(els_ref, els_gen))
 
     return {
         'refCount': len(els_ref),
@@ -673,73 +646,61 @@ def compare_element_structure(doc_ref, doc_gen):
 # 5. Table Structure 비교
 # ============================================================
 
-def _extract_tables(doc_root):
+def _extract_tables(model):
     """문서에서 데이터 테이블만 추출 (특수 블록 제외)."""
-    body = doc_root.find(f'{{{W}}}body')
-    if body is None:
-        return []
-
     tables = []
-    for tbl in body.findall(f'{{{W}}}tbl'):
-        tbl_type = _classify_table(tbl)
-        if tbl_type != 'data_table':
+    for el in model.elements:
+        if el.tag != 'tbl' or el.tbl_type != 'data_table':
             continue
 
-        rows = tbl.findall(f'{{{W}}}tr')
+        tbl = el.node
+        rows = el.rows
         first_row = rows[0] if rows else None
-        cols = len(first_row.findall(f'{{{W}}}tc')) if first_row is not None else 0
+        cols = el.col_count
 
         # Column widths
         col_widths = []
         if first_row is not None:
-            for tc in first_row.findall(f'{{{W}}}tc'):
-                tcPr = tc.find(f'{{{W}}}tcPr')
-                tcW = _find(tcPr, 'tcW') if tcPr is not None else None
-                w = _attr(tcW, 'w') if tcW is not None else None
+            for tc in first_row.findall(W_TC):
+                tcPr = tc.find(W_TCPR)
+                tcW = _find(tcPr, W_TCW) if tcPr is not None else None
+                w = _attr(tcW, W_W) if tcW is not None else None
                 col_widths.append(w)
 
         # Header text
-        header_cells = []
-        if first_row is not None:
-            for tc in first_row.findall(f'{{{W}}}tc'):
-                ct = []
-                for p in tc.findall(f'{{{W}}}p'):
-                    t = _extract_text(p)
-                    if t:
-                        ct.append(t)
-                header_cells.append(' '.join(ct))
+        header_cells = [' '.join(t for t in cell if t) for cell in el.header_paragraphs]
 
         # Header fill colors
         header_fills = []
         if first_row is not None:
-            for tc in first_row.findall(f'{{{W}}}tc'):
-                tcPr = tc.find(f'{{{W}}}tcPr')
+            for tc in first_row.findall(W_TC):
+                tcPr = tc.find(W_TCPR)
                 c = _get_shading_color(tcPr)
                 header_fills.append(c)
 
         # Cell margins (from tblPr)
-        tblPr = tbl.find(f'{{{W}}}tblPr')
+        tblPr = tbl.find(W_TBLPR)
         cell_margins = {}
         if tblPr is not None:
-            cm = tblPr.find(f'{{{W}}}tblCellMar')
+            cm = tblPr.find(W_TBLCELLMAR)
             if cm is not None:
-                for side in ['top', 'left', 'bottom', 'right', 'start', 'end']:
-                    s = cm.find(f'{{{W}}}{side}')
+                for side, tag in _CELL_MARGIN_TAGS.items():
+                    s = cm.find(tag)
                     if s is not None:
-                        cell_margins[side] = _attr(s, 'w')
+                        cell_margins[side] = _attr(s, W_W)
 
         # Borders (tblBorders)
         borders = {}
         if tblPr is not None:
-            tblBorders = tblPr.find(f'{{{W}}}tblBorders')
+            tblBorders = tblPr.find(W_TBLBORDERS)
             if tblBorders is not None:
-                for btype in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-                    b = tblBorders.find(f'{{{W}}}{btype}')
+                for btype, tag in _BORDER_TAGS.items():
+                    b = tblBorders.find(tag)
                     if b is not None:
                         borders[btype] = {
-                            'val': _attr(b, 'val'),
-                            'sz': _attr(b, 'sz'),
-                            'color': (_attr(b, 'color') or '').upper(),
+                            'val': _attr(b, W_VAL),
+                            'sz': _attr(b, W_SZ),
+                            'color': (_attr(b, W_COLOR) or '').upper(),
                         }
 
         tables.append({
@@ -755,11 +716,8 @@ def _extract_tables(doc_root):
     return tables
 
 
-def compare_table_structure(doc_ref, doc_gen):
-    """데이터 테이블 구조 비교."""
-    tbls_ref = _extract_tables(doc_ref)
-    tbls_gen = _extract_tables(doc_gen)
-
+def compare_table_structure(tbls_ref, tbls_gen):
+    """데이터 테이블(_extract_tables) 구조 비교."""
     diffs = []
     matches = []
 
@@ -843,55 +801,58 @@ def compare_table_structure(doc_ref, doc_gen):
 
 def _extract_run_props(p_element):
     """단락의 첫 번째 런에서 속성 추출."""
-    runs = p_element.findall(f'{{{W}}}r')
+    runs = p_element.findall(W_R)
     if not runs:
         return None
 
     # Use first non-empty run
     for r in runs:
         text = ''
-        for t in r.findall(f'{{{W}}}t'):
+        for t in r.findall(W_T):
             if t.text:
                 text += t.text
         if not text.strip():
             continue
 
-        rPr = r.find(f'{{{W}}}rPr')
+        rPr = r.find(W_RPR)
         props = {}
         if rPr is not None:
-            rFonts = rPr.find(f'{{{W}}}rFonts')
+            rFonts = rPr.find(W_RFONTS)
             if rFonts is not None:
-                for attr in ['ascii', 'hAnsi', 'eastAsia']:
-                    v = rFonts.get(f'{{{W}}}{attr}')
+                for attr, qname in _FONT_ATTRS.items():
+                    v = rFonts.get(qname)
                     if v:
                         props[f'font.{attr}'] = v
-            sz = rPr.find(f'{{{W}}}sz')
+            sz = rPr.find(W_SZ)
             if sz is not None:
-                props['size'] = _attr(sz, 'val')
-            color = rPr.find(f'{{{W}}}color')
+                props['size'] = _attr(sz, W_VAL)
+            color = rPr.find(W_COLOR)
             if color is not None:
-                props['color'] = (_attr(color, 'val') or '').upper()
-            b_val = _get_bool_prop(rPr, 'b')
+                props['color'] = (_attr(color, W_VAL) or '').upper()
+            b_val = _get_bool_prop(rPr, W_B)
             props['bold'] = _normalize_bool(b_val)
-            i_val = _get_bool_prop(rPr, 'i')
+            i_val = _get_bool_prop(rPr, W_I)
             props['italic'] = _normalize_bool(i_val)
         return props
 
     return None
 
 
-def compare_run_properties(doc_ref, doc_gen):
+def _run_prop_features(model):
+    """body 직계 단락별 (스타일, 첫 런 속성, 텍스트 앞부분). body가 없으면 None."""
+    if model.body is None:
+        return None
+    return [{'style': el.style, 'props': _extract_run_props(el.node), 'text': el.text[:50]}
+            for el in model.elements if el.tag == 'p']
+
+
+def compare_run_properties(paras_ref, paras_gen):
     """요소별 런 속성 비교 (순차 매칭)."""
     diffs = []
 
-    body_ref = doc_ref.find(f'{{{W}}}body')
-    body_gen = doc_gen.find(f'{{{W}}}body')
-    if body_ref is None or body_gen is None:
+    if paras_ref is None or paras_gen is None:
         return {'diffs': diffs}
 
-    paras_ref = body_ref.findall(f'{{{W}}}p')
-    paras_gen = body_gen.findall(f'{{{W}}}p')
-
     max_compare = min(len(paras_ref), len(paras_gen))
     max_report = 40
 
@@ -902,20 +863,19 @@ def compare_run_properties(doc_ref, doc_gen):
         pr = paras_ref[idx]
         pg = paras_gen[idx]
 
-        style_r = _get_style(pr)
-        style_g = _get_style(pg)
+        style_r = pr['style']
 
         # Only compare if same type
-        if style_r != style_g:
+        if style_r != pg['style']:
             continue
 
-        rp_ref = _extract_run_props(pr)
-        rp_gen = _extract_run_props(pg)
+        rp_ref = pr['props']
+        rp_gen = pg['props']
 
         if rp_ref is None or rp_gen is None:
             continue
 
-        text_ref = _extract_text(pr)[:50]
+        text_ref = pr['text']
 
         all_keys = sorted(set(list(rp_ref.keys()) + list(rp_gen.keys())))
         for k in all_keys:
@@ -938,44 +898,46 @@ def compare_run_properties(doc_ref, doc_gen):
 # 7. Spacing 비교
 # ============================================================
 
-def compare_spacing(doc_ref, doc_gen):
+def _spacing_features(model):
+    """body 직계 단락별 간격/spacer 여부. body가 없으면 None."""
+    if model.body is None:
+        return None
+
+    result = []
+    for el in model.elements:
+        if el.tag != 'p':
+            continue
+        style = el.style
+        text = el.text
+        pPr = el.node.find(W_PPR)
+        spacing_before = None
+        spacing_after = None
+        spacing_line = None
+        if pPr is not None:
+            sp = pPr.find(W_SPACING)
+            if sp is not None:
+                spacing_before = sp.get(W_BEFORE)
+                spacing_after = sp.get(W_AFTER)
+                spacing_line = sp.get(W_LINE)
+        is_spacer = not text and not el.has_page_break
+        result.append({
+            'style': style,
+            'text': text[:50],
+            'before': spacing_before,
+            'after': spacing_after,
+            'line': spacing_line,
+            'isSpacer': is_spacer,
+        })
+    return result
+
+
+def compare_spacing(sp_ref, sp_gen):
     """단락 간격 비교 + spacer 감지."""
     diffs = []
 
-    body_ref = doc_ref.find(f'{{{W}}}body')
-    body_gen = doc_gen.find(f'{{{W}}}body')
-    if body_ref is None or body_gen is None:
+    if sp_ref is None or sp_gen is None:
         return {'diffs': diffs}
 
-    def extract_spacing_list(body):
-        result = []
-        for p in body.findall(f'{{{W}}}p'):
-            style = _get_style(p)
-            text = _extract_text(p)
-            pPr = p.find(f'{{{W}}}pPr')
-            spacing_before = None
-            spacing_after = None
-            spacing_line = None
-            if pPr is not None:
-                sp = pPr.find(f'{{{W}}}spacing')
-                if sp is not None:
-                    spacing_before = sp.get(f'{{{W}}}before')
-                    spacing_after = sp.get(f'{{{W}}}after')
-                    spacing_line = sp.get(f'{{{W}}}line')
-            is_spacer = not text and not _has_page_break(p)
-            result.append({
-                'style': style,
-                'text': text[:50],
-                'before': spacing_before,
-                'after': spacing_after,
-                'line': spacing_line,
-                'isSpacer': is_spacer,
-            })
-        return result
-
-    sp_ref = extract_spacing_list(body_ref)
-    sp_gen = extract_spacing_list(body_gen)
-
     # Count spacers
     spacer_ref = sum(1 for s in sp_ref if s['isSpacer'])
     spacer_gen = sum(1 for s in sp_gen if s['isSpacer'])
@@ -1023,46 +985,342 @@ def compare_spacing(doc_ref, doc_gen):
 # 전체 비교 실행
 # ============================================================
 
-def compare_docx(ref_path, gen_path):
-    """두 DOCX 파일 전체 비교."""
-    z_ref, doc_ref, styles_ref = open_docx(ref_path)
-    z_gen, doc_gen, styles_gen = open_docx(gen_path)
+MATRIX_CATEGORIES = ('pageSetup', 'docDefaults', 'headingStyles', 'elementStructure',
+                     'tableStructure', 'runProperties', 'spacing')
+
+# --only에 쓸 수 있는 묶음 이름
+CATEGORY_GROUPS = {
+    'styles': ('docDefaults', 'headingStyles'),
+    'document': ('elementStructure', 'tableStructure', 'runProperties', 'spacing'),
+}
+
+# 카테고리 → (특징 키, 특징 추출 함수(model), 비교 함수)
+# pageSetup은 document.xml 꼬리만 스캔하고 (이미 파싱된 트리가 있으면 그것을 쓴다),
+# 스타일 카테고리는 styles.xml만, 나머지는 document.xml 전체 트리를 읽는다.
+_CATEGORY_SPECS = {
+    'pageSetup': ('pageSetup', lambda m: _page_setup_features(m.scan_body_sect_pr()), compare_page_setup),
+    'docDefaults': ('docDefaults', lambda m: _doc_default_features(m.styles), compare_doc_defaults),
+    'headingStyles': ('headingStyles', lambda m: _heading_style_features(m.styles), compare_heading_styles),
+    'elementStructure': ('elements', _build_element_list, compare_element_structure),
+    'tableStructure': ('tables', _extract_tables, compare_table_structure),
+    'runProperties': ('runProperties', _run_prop_features, compare_run_properties),
+    'spacing': ('spacing', _spacing_features, compare_spacing),
+}
+
+# 카테고리 → 읽는 ZIP 파트 (폴더 쌍 비교에서 변경 판정 범위)
+CATEGORY_PARTS = {
+    'pageSetup': ('word/document.xml',),
+    'docDefaults': ('word/styles.xml',),
+    'headingStyles': ('word/styles.xml',),
+    'elementStructure': ('word/document.xml',),
+    'tableStructure': ('word/document.xml',),
+    'runProperties': ('word/document.xml',),
+    'spacing': ('word/document.xml',),
+}
+
+
+def parse_categories(value):
+    """--only 값 ('styles,pageSetup' 등, 쉼표 구분) → MATRIX_CATEGORIES 순서의 카테고리 튜플
+
+    모르는 이름이 있거나 비어 있으면 ValueError.
+    """
+    selected = set()
+    for name in (n.strip() for n in value.split(',')):
+        if not name:
+            continue
+        if name in CATEGORY_GROUPS:
+            selected.update(CATEGORY_GROUPS[name])
+        elif name in _CATEGORY_SPECS:
+            selected.add(name)
+        else:
+            choices = ', '.join(MATRIX_CATEGORIES + tuple(CATEGORY_GROUPS))
+            raise ValueError(f'unknown category: {name} (choose from {choices})')
+    if not selected:
+        raise ValueError('no categories given')
+    return tuple(cat for cat in MATRIX_CATEGORIES if cat in selected)
+
+
+def extract_features(source, categories=None):
+    """비교에 쓰는 문서 특징을 한 번에 추출 — 레퍼런스는 한 번만 추출해 여러 문서와 비교할 수 있다.
+
+    source: 경로, bytes, 바이너리 파일 객체 또는 DocxModel. 결과는 일반 dict/list라 프로세스 간에 넘길 수 있다.
+    categories: 추출할 카테고리 (기본: 전체). 고른 카테고리가 읽는 파트만 파싱하므로
+    스타일/페이지 설정만 고르면 document.xml 전체 트리를 만들지 않는다.
+    """
+    categories = tuple(categories or MATRIX_CATEGORIES)
+    with phase('open_docx'):
+        model = open_docx(source)
+        # 필요한 파트의 파싱 시간은 open_docx 단계로 집계 (pageSetup은 트리가 없으면 꼬리 스캔)
+        if not set(categories).isdisjoint(CATEGORY_GROUPS['document']):
+            model.document
+        if not set(categories).isdisjoint(CATEGORY_GROUPS['styles']):
+            model.styles
+    features = {'name': model.name, 'categories': list(categories)}
+    with phase('extract_features'):
+        for cat in categories:
+            key, extract, _ = _CATEGORY_SPECS[cat]
+            features[key] = extract(model)
+    return features
+
+
+def compare_features(feat_ref, feat_gen):
+    """extract_features 결과 두 개를 비교 (compare_docx와 같은 결과). 양쪽에 모두 있는 카테고리만 비교한다."""
+    results = {}
+    for cat in feat_ref['categories']:
+        if cat not in feat_gen['categories']:
+            continue
+        key, _, compare = _CATEGORY_SPECS[cat]
+        with phase(compare.__name__):
+            results[cat] = compare(feat_ref[key], feat_gen[key])
+
+    # Summary
+    total_diffs = 0
+    by_category = {}
+    for cat, data in results.items():
+        if cat.startswith('_'):
+            continue
+        count = 0
+        if 'diffs' in data:
+            count = len(data['diffs'])
+        elif 'countDiffs' in data:
+            count = len(data.get('countDiffs', [])) + len(data.get('sequenceDiffs', []))
+        total_diffs += count
+        by_category[cat] = count
+
+    results['summary'] = {
+        'totalDiffs': total_diffs,
+        'byCategory': by_category,
+        'refFile': feat_ref['name'],
+        'genFile': feat_gen['name'],
+    }
+
+    return results
+
+
+def compare_docx(ref_path, gen_path, categories=None):
+    """두 DOCX 파일 비교. 각 입력은 경로, bytes, 바이너리 파일 객체 모두 가능.
+
+    categories: 비교할 카테고리 (기본: 전체, parse_categories 참조)
+    """
+    return compare_features(extract_features(ref_path, categories), extract_features(gen_path, categories))
+
+
+# ============================================================
+# 레퍼런스 1 : 생성 문서 N 비교 (차이 매트릭스)
+# ============================================================
+
+# 워커 프로세스마다 initializer로 한 번 받는 레퍼런스 특징
+_REF_FEATURES = None
+
+
+def _init_ref_worker(feat_ref):
+    global _REF_FEATURES
+    _REF_FEATURES = feat_ref
 
+
+def diff_against_ref(gen_path, feat_ref=None):
+    """생성 문서 하나를 레퍼런스 특징과 비교 → 매트릭스 행 (예외는 error 필드로 변환)
+
+    레퍼런스 특징에 있는 카테고리만 추출/비교한다.
+    """
+    start = time.perf_counter()
+    row = {'file': gen_path}
     try:
-        results = {}
-        results['pageSetup'] = compare_page_setup(doc_ref, doc_gen)
-        results['docDefaults'] = compare_doc_defaults(styles_ref, styles_gen)
-        results['headingStyles'] = compare_heading_styles(styles_ref, styles_gen)
-        results['elementStructure'] = compare_element_structure(doc_ref, doc_gen)
-        results['tableStructure'] = compare_table_structure(doc_ref, doc_gen)
-        results['runProperties'] = compare_run_properties(doc_ref, doc_gen)
-        results['spacing'] = compare_spacing(doc_ref, doc_gen)
-
-        # Summary
-        total_diffs = 0
-        by_category = {}
-        for cat, data in results.items():
-            if cat.startswith('_'):
+        feat_ref = feat_ref or _REF_FEATURES
+        categories = feat_ref['categories']
+        summary = compare_features(feat_ref, extract_features(gen_path, categories))['summary']
+        row['ok'] = True
+        row['totalDiffs'] = summary['totalDiffs']
+        row['byCategory'] = {cat: summary['byCategory'].get(cat, 0) for cat in categories}
+    except zipfile.BadZipFile as e:
+        row['ok'] = False
+        row['error'] = f'Invalid DOCX: {e}'
+    except Exception as e:
+        row['ok'] = False
+        row['error'] = f'{type(e).__name__}: {e}'
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def iter_matrix_rows(feat_ref, gen_paths, workers=1):
+    """행을 완료 순서대로 yield. workers=1이면 현재 프로세스에서 순차 실행
+
+    병렬 실행은 레퍼런스 특징을 워커마다 한 번만 넘기고 워커가 diff-docx.py를 스크립트로
+    import할 수 있어야 하므로 CLI에서 쓴다 (tool_loader로 로드한 모듈은 workers=1).
+    """
+    if workers <= 1 or len(gen_paths) <= 1:
+        tasks = [(path, feat_ref) for path in gen_paths]
+    else:
+        tasks = [(path,) for path in gen_paths]  # 레퍼런스 특징은 워커 초기화로 전달
+    yield from iter_results(diff_against_ref, tasks, workers, _crashed_matrix_row,
+                            _init_ref_worker, (feat_ref,))
+
+
+def _crashed_matrix_row(task, e):
+    """워커 프로세스 자체가 죽은 경우(BrokenProcessPool 등)의 결과 행"""
+    return {'file': task[0], 'ok': False, 'error': f'{type(e).__name__}: {e}', 'seconds': None}
+
+
+def diff_matrix(ref_source, gen_paths, workers=1, categories=None):
+    """레퍼런스 하나와 생성 문서 여러 개 비교 → 총 차이 오름차순으로 순위를 매긴 매트릭스"""
+    start = time.perf_counter()
+    feat_ref = extract_features(ref_source, categories)
+    rows = list(iter_matrix_rows(feat_ref, gen_paths, workers))
+    ok = sorted((r for r in rows if r['ok']), key=lambda r: (r['totalDiffs'], r['file']))
+    for rank, r in enumerate(ok, 1):
+        r['rank'] = rank
+    return {
+        'refFile': feat_ref['name'],
+        'categories': feat_ref['categories'],
+        'rows': ok,
+        'errors': sorted((r for r in rows if not r['ok']), key=lambda r: r['file']),
+        'workers': workers,
+        'wallSeconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def expand_gen_paths(patterns):
+    """생성 문서 인자 → 경로 목록 (glob 패턴 확장, 순서 유지, 중복 제거)"""
+    paths = []
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matched:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+# ============================================================
+# 폴더 쌍 비교 (빌드 간 회귀 확인)
+# ============================================================
+
+_HASH_DIGEST = 16
+
+
+def pair_directories(dir_a, dir_b):
+    """두 폴더의 .docx를 상대 경로로 짝지음 → [(상대 경로, A 경로 또는 None, B 경로 또는 None)]"""
+    def collect(root):
+        found = {}
+        for path in glob.glob(os.path.join(root, '**', '*.docx'), recursive=True):
+            name = os.path.basename(path)
+            if name.startswith('~$'):  # Word 잠금 파일
                 continue
-            count = 0
-            if 'diffs' in data:
-                count = len(data['diffs'])
-            elif 'countDiffs' in data:
-                count = len(data.get('countDiffs', [])) + len(data.get('sequenceDiffs', []))
-            total_diffs += count
-            by_category[cat] = count
-
-        results['summary'] = {
-            'totalDiffs': total_diffs,
-            'byCategory': by_category,
-            'refFile': os.path.basename(ref_path),
-            'genFile': os.path.basename(gen_path),
-        }
+            found[os.path.relpath(path, root).replace(os.sep, '/')] = path
+        return found
+
+    files_a, files_b = collect(dir_a), collect(dir_b)
+    return [(rel, files_a.get(rel), files_b.get(rel)) for rel in sorted(set(files_a) | set(files_b))]
+
+
+def _xml_part_entries(zf):
+    return {info.filename: info for info in zf.infolist()
+            if info.filename.endswith(('.xml', '.rels'))
+            and not info.filename.startswith(VOLATILE_PART_PREFIXES)}
+
+
+def changed_xml_parts(path_a, path_b, only_parts=None):
+    """변동 메타데이터를 뺀 XML 파트 중 내용이 다른 파트 목록 (빈 목록이면 같은 문서).
+
+    중앙 디렉터리의 CRC-32/크기가 다르면 압축을 풀지 않고 바로 다르다고 보고,
+    같을 때만 풀어서 해시로 확인한다. only_parts를 주면 그 파트들만 본다.
+    """
+    with zipfile.ZipFile(path_a) as za, zipfile.ZipFile(path_b) as zb:
+        parts_a, parts_b = _xml_part_entries(za), _xml_part_entries(zb)
+        names = set(parts_a) | set(parts_b)
+        if only_parts is not None:
+            names &= set(only_parts)
+        changed = []
+        for name in sorted(names):
+            ia, ib = parts_a.get(name), parts_b.get(name)
+            if ia is None or ib is None or ia.CRC != ib.CRC or ia.file_size != ib.file_size:
+                changed.append(name)
+                continue
+            ha = hashlib.blake2b(za.read(name), digest_size=_HASH_DIGEST).digest()
+            hb = hashlib.blake2b(zb.read(name), digest_size=_HASH_DIGEST).digest()
+            if ha != hb:
+                changed.append(name)
+        return changed
+
+
+def diff_pair(rel, path_a, path_b, categories=None):
+    """폴더 쌍 하나 비교 → 결과 행 (예외는 error 필드로 변환)
+
+    status: identical(바이트 같음) | same_xml(메타데이터만 다름) | changed | only_in_a | only_in_b | error
+    categories를 주면 그 카테고리가 읽는 파트만 변경 판정하고 그 카테고리만 비교한다.
+    """
+    categories = tuple(categories or MATRIX_CATEGORIES)
+    only_parts = None
+    if categories != MATRIX_CATEGORIES:
+        only_parts = {part for cat in categories for part in CATEGORY_PARTS[cat]}
+    start = time.perf_counter()
+    row = {'type': 'result', 'file': rel}
+    try:
+        if path_b is None:
+            row['status'] = 'only_in_a'
+        elif path_a is None:
+            row['status'] = 'only_in_b'
+        elif filecmp.cmp(path_a, path_b, shallow=False):
+            row['status'] = 'identical'
+        else:
+            parts = changed_xml_parts(path_a, path_b, only_parts)
+            if not parts:
+                row['status'] = 'same_xml'
+            else:
+                summary = compare_docx(path_a, path_b, categories)['summary']
+                by_category = {cat: summary['byCategory'].get(cat, 0) for cat in categories}
+                row['status'] = 'changed'
+                row['changedCategories'] = [cat for cat in categories if by_category[cat]]
+                row['totalDiffs'] = summary['totalDiffs']
+                row['byCategory'] = by_category
+                row['changedParts'] = parts
+    except zipfile.BadZipFile as e:
+        row['status'] = 'error'
+        row['error'] = f'Invalid DOCX: {e}'
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = f'{type(e).__name__}: {e}'
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def iter_pair_rows(pairs, workers=1, categories=None):
+    """폴더 쌍 결과를 완료 순서대로 yield. workers=1이면 현재 프로세스에서 순차 실행"""
+    tasks = [(*pair, categories) for pair in pairs]
+    yield from iter_results(diff_pair, tasks, workers, _crashed_pair_row)
+
+
+def _crashed_pair_row(task, e):
+    """워커 프로세스 자체가 죽은 경우(BrokenProcessPool 등)의 결과 행"""
+    return {'type': 'result', 'file': task[0], 'status': 'error',
+            'error': f'{type(e).__name__}: {e}', 'seconds': None}
+
+
+PAIR_STATUSES = ('identical', 'same_xml', 'changed', 'only_in_a', 'only_in_b', 'error')
+
 
-        return results
-    finally:
-        z_ref.close()
-        z_gen.close()
+def build_pair_summary(rows, workers, wall_seconds, categories=MATRIX_CATEGORIES):
+    """폴더 쌍 비교 요약 — 상태별 문서 수, 카테고리별로 바뀐 문서 수"""
+    changed = [r for r in rows if r['status'] == 'changed']
+    return {
+        'type': 'summary',
+        'files': len(rows),
+        'byStatus': {st: sum(1 for r in rows if r['status'] == st) for st in PAIR_STATUSES},
+        'changedByCategory': {cat: sum(1 for r in changed if r['byCategory'][cat]) for cat in categories},
+        'workers': workers,
+        'wallSeconds': round(wall_seconds, 3),
+    }
+
+
+CSV_COLUMNS = ('file', 'status', 'totalDiffs') + MATRIX_CATEGORIES + ('changedParts', 'error', 'seconds')
+
+
+def pair_csv_row(row):
+    """결과 행 → CSV 열 값 (CSV_COLUMNS 순서)"""
+    by_category = row.get('byCategory', {})
+    values = [row['file'], row['status'], row.get('totalDiffs', '')]
+    values += [by_category.get(cat, '') for cat in MATRIX_CATEGORIES]
+    values += [' '.join(row.get('changedParts', [])), row.get('error', ''), row.get('seconds', '')]
+    return values
 
 
 # ============================================================
@@ -1083,97 +1341,104 @@ def format_text_report(results):
     lines.append('')
 
     # Page Setup
-    lines.append('[Page Setup]')
-    ps = results['pageSetup']
-    for m in ps['matches']:
-        lines.append(f'  OK    {m["field"]}: {m["ref"]}')
-    for d in ps['diffs']:
-        lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
-    lines.append('')
+    if 'pageSetup' in results:
+        lines.append('[Page Setup]')
+        ps = results['pageSetup']
+        for m in ps['matches']:
+            lines.append(f'  OK    {m["field"]}: {m["ref"]}')
+        for d in ps['diffs']:
+            lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
+        lines.append('')
 
     # Doc Defaults
-    lines.append('[Document Defaults]')
-    dd = results['docDefaults']
-    for m in dd['matches']:
-        lines.append(f'  OK    {m["field"]}: {m["ref"]}')
-    for d in dd['diffs']:
-        lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
-    lines.append('')
+    if 'docDefaults' in results:
+        lines.append('[Document Defaults]')
+        dd = results['docDefaults']
+        for m in dd['matches']:
+            lines.append(f'  OK    {m["field"]}: {m["ref"]}')
+        for d in dd['diffs']:
+            lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
+        lines.append('')
 
     # Heading Styles
-    lines.append('[Heading Styles]')
-    hs = results['headingStyles']
-    for m in hs['matches']:
-        lines.append(f'  OK    {m["field"]}: {m["ref"]}')
-    for d in hs['diffs']:
-        lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
-    lines.append('')
+    if 'headingStyles' in results:
+        lines.append('[Heading Styles]')
+        hs = results['headingStyles']
+        for m in hs['matches']:
+            lines.append(f'  OK    {m["field"]}: {m["ref"]}')
+        for d in hs['diffs']:
+            lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}')
+        lines.append('')
 
     # Element Structure
-    lines.append('[Element Structure]')
-    es = results['elementStructure']
-    lines.append(f'  REF: {es["refCount"]} elements, GEN: {es["genCount"]} elements')
-    if es['countDiffs']:
-        lines.append('  Type count differences:')
-        for d in es['countDiffs']:
-            lines.append(f'    {d["type"]}: REF={d["ref"]} vs GEN={d["gen"]}')
-    if es['sequenceDiffs']:
-        lines.append(f'  Sequence differences ({len(es["sequenceDiffs"])}):')
-        for d in es['sequenceDiffs'][:20]:
-            dt = d['type']
-            if dt == 'missing_in_gen':
-                lines.append(f'    [{d["index"]}] MISSING: {d["element"]} "{d.get("text", "")}"')
-            elif dt == 'extra_in_gen':
-                lines.append(f'    [{d["index"]}] EXTRA:   {d["element"]} "{d.get("text", "")}"')
-            elif dt == 'type_mismatch':
-                lines.append(f'    [{d["index"]}] MISMATCH: REF={d["ref"]} vs GEN={d["gen"]}')
-            elif dt == 'table_shape':
-                lines.append(f'    [{d["index"]}] TABLE SHAPE: REF={d["ref"]} vs GEN={d["gen"]} ({d.get("header", "")})')
-        if len(es['sequenceDiffs']) > 20:
-            lines.append(f'    ... and {len(es["sequenceDiffs"]) - 20} more')
-    lines.append('')
+    if 'elementStructure' in results:
+        lines.append('[Element Structure]')
+        es = results['elementStructure']
+        lines.append(f'  REF: {es["refCount"]} elements, GEN: {es["genCount"]} elements')
+        if es['countDiffs']:
+            lines.append('  Type count differences:')
+            for d in es['countDiffs']:
+                lines.append(f'    {d["type"]}: REF={d["ref"]} vs GEN={d["gen"]}')
+        if es['sequenceDiffs']:
+            lines.append(f'  Sequence differences ({len(es["sequenceDiffs"])}):')
+            for d in es['sequenceDiffs'][:20]:
+                dt = d['type']
+                if dt == 'missing_in_gen':
+                    lines.append(f'    [{d["index"]}] MISSING: {d["element"]} "{d.get("text", "")}"')
+                elif dt == 'extra_in_gen':
+                    lines.append(f'    [{d["index"]}] EXTRA:   {d["element"]} "{d.get("text", "")}"')
+                elif dt == 'type_mismatch':
+                    lines.append(f'    [{d["index"]}] MISMATCH: REF={d["ref"]} vs GEN={d["gen"]}')
+                elif dt == 'table_shape':
+                    lines.append(f'    [{d["index"]}] TABLE SHAPE: REF={d["ref"]} vs GEN={d["gen"]} ({d.get("header", "")})')
+            if len(es['sequenceDiffs']) > 20:
+                lines.append(f'    ... and {len(es["sequenceDiffs"]) - 20} more')
+        lines.append('')
 
     # Table Structure
-    lines.append('[Table Structure]')
-    ts = results['tableStructure']
-    for m in ts['matches']:
-        extra = f' ({m["header"]})' if m.get('header') else ''
-        lines.append(f'  OK    {m["field"]}: {m["ref"]}{extra}')
-    for d in ts['diffs']:
-        extra = f' ({d["header"]})' if d.get('header') else ''
-        lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}{extra}')
-    lines.append('')
+    if 'tableStructure' in results:
+        lines.append('[Table Structure]')
+        ts = results['tableStructure']
+        for m in ts['matches']:
+            extra = f' ({m["header"]})' if m.get('header') else ''
+            lines.append(f'  OK    {m["field"]}: {m["ref"]}{extra}')
+        for d in ts['diffs']:
+            extra = f' ({d["header"]})' if d.get('header') else ''
+            lines.append(f'  DIFF  {d["field"]}: REF={d["ref"]} vs GEN={d["gen"]}{extra}')
+        lines.append('')
 
     # Run Properties
-    lines.append('[Run Properties]')
-    rp = results['runProperties']
-    lines.append(f'  REF paragraphs: {rp.get("refParagraphs", "?")}, GEN paragraphs: {rp.get("genParagraphs", "?")}')
-    if rp['diffs']:
-        lines.append(f'  Differences ({len(rp["diffs"])}):')
-        for d in rp['diffs'][:20]:
-            lines.append(f'    [{d["elementIndex"]}] {d["style"]} "{d["text"]}" — {d["property"]}: REF={d["ref"]} vs GEN={d["gen"]}')
-        if len(rp['diffs']) > 20:
-            lines.append(f'    ... and {len(rp["diffs"]) - 20} more')
-    else:
-        lines.append('  No run property differences found.')
-    lines.append('')
+    if 'runProperties' in results:
+        lines.append('[Run Properties]')
+        rp = results['runProperties']
+        lines.append(f'  REF paragraphs: {rp.get("refParagraphs", "?")}, GEN paragraphs: {rp.get("genParagraphs", "?")}')
+        if rp['diffs']:
+            lines.append(f'  Differences ({len(rp["diffs"])}):')
+            for d in rp['diffs'][:20]:
+                lines.append(f'    [{d["elementIndex"]}] {d["style"]} "{d["text"]}" — {d["property"]}: REF={d["ref"]} vs GEN={d["gen"]}')
+            if len(rp['diffs']) > 20:
+                lines.append(f'    ... and {len(rp["diffs"]) - 20} more')
+        else:
+            lines.append('  No run property differences found.')
+        lines.append('')
 
     # Spacing
-    lines.append('[Spacing]')
-    sp = results['spacing']
-    lines.append(f'  REF spacers: {sp.get("refSpacers", "?")}, GEN spacers: {sp.get("genSpacers", "?")}')
-    if sp['diffs']:
-        lines.append(f'  Differences ({len(sp["diffs"])}):')
-        for d in sp['diffs'][:20]:
-            if d['type'] == 'spacer_count':
-                lines.append(f'    Spacer count: REF={d["ref"]} vs GEN={d["gen"]}')
-            else:
-                lines.append(f'    [{d.get("elementIndex", "?")}] {d.get("style", "")} "{d.get("text", "")}" — {d.get("property", "")}: REF={d.get("ref")} vs GEN={d.get("gen")}')
-        if len(sp['diffs']) > 20:
-            lines.append(f'    ... and {len(sp["diffs"]) - 20} more')
-    else:
-        lines.append('  No spacing differences found.')
-    lines.append('')
+    if 'spacing' in results:
+        lines.append('[Spacing]')
+        sp = results['spacing']
+        lines.append(f'  REF spacers: {sp.get("refSpacers", "?")}, GEN spacers: {sp.get("genSpacers", "?")}')
+        if sp['diffs']:
+            lines.append(f'  Differences ({len(sp["diffs"])}):')
+            for d in sp['diffs'][:20]:
+                if d['type'] == 'spacer_count':
+                    lines.append(f'    Spacer count: REF={d["ref"]} vs GEN={d["gen"]}')
+                else:
+                    lines.append(f'    [{d.get("elementIndex", "?")}] {d.get("style", "")} "{d.get("text", "")}" — {d.get("property", "")}: REF={d.get("ref")} vs GEN={d.get("gen")}')
+            if len(sp['diffs']) > 20:
+                lines.append(f'    ... and {len(sp["diffs"]) - 20} more')
+        else:
+            lines.append('  No spacing differences found.')
+        lines.append('')
 
     # Summary
     lines.append('[Summary]')
@@ -1184,6 +1449,44 @@ def format_text_report(results):
     return '\n'.join(lines)
 
 
+_MATRIX_LABELS = {
+    'pageSetup': 'Page', 'docDefaults': 'Dflt', 'headingStyles': 'Head', 'elementStructure': 'Elem',
+    'tableStructure': 'Tbl', 'runProperties': 'Run', 'spacing': 'Spc',
+}
+
+
+def format_matrix_report(matrix):
+    """차이 매트릭스를 텍스트 표로 포맷 (순위 순)."""
+    cats = matrix['categories']
+    lines = ['=== DOCX Diff Matrix ===', f'  REF: {matrix["refFile"]}', '']
+    lines.append(f"{'Rank':>4}  {'File':<40} {'Total':>6} " + ' '.join(f'{_MATRIX_LABELS[c]:>5}' for c in cats))
+    lines.append('-' * (53 + 6 * len(cats)))
+    for r in matrix['rows']:
+        name = os.path.basename(r['file'])
+        lines.append(f"{r['rank']:>4}  {name:<40} {r['totalDiffs']:>6} "
+                     + ' '.join(f"{r['byCategory'][c]:>5}" for c in cats))
+    for r in matrix['errors']:
+        lines.append(f"{'ERR':>4}  {os.path.basename(r['file']):<40} {r['error'][:60]}")
+    lines.append('')
+    lines.append(f"  {len(matrix['rows'])} compared, {len(matrix['errors'])} failed"
+                 f" (workers: {matrix['workers']}, {matrix['wallSeconds']:.2f}s)")
+    lines.append('  ' + ', '.join(f'{_MATRIX_LABELS[c]}={c}' for c in cats))
+    return '\n'.join(lines)
+
+
+def format_pair_row(row):
+    """폴더 쌍 결과 한 줄 (텍스트 모드)."""
+    status = row['status']
+    if status == 'changed':
+        detail = ', '.join(f'{cat}={row["byCategory"][cat]}' for cat in row['changedCategories'])
+        detail = detail or f'no diff-docx differences (parts: {", ".join(row["changedParts"][:3])})'
+    elif status == 'error':
+        detail = row['error'][:60]
+    else:
+        detail = ''
+    return f'{row["file"]:<45} {status:<10} {detail}'
+
+
 def format_json_output(results):
     """결과를 JSON으로 포맷 (내부 요소 목록 제거)."""
     output = {}
@@ -1203,42 +1506,163 @@ def format_json_output(results):
 def main():
     args = sys.argv[1:]
     use_json = '--json' in args
-    args = [a for a in args if a != '--json']
+    output_format = 'jsonl' if '--jsonl' in args else 'csv' if '--csv' in args else 'text'
+    timings, profile_path = parse_timing_argv(args)
+    args = [a for a in args if a not in ('--json', '--jsonl', '--csv', '--timings', '--profile', profile_path)]
+    workers = os.cpu_count() or 1
+    if '--workers' in args:
+        idx = args.index('--workers')
+        try:
+            workers = int(args[idx + 1])
+        except (IndexError, ValueError):
+            print('ERROR: --workers requires a number')
+            sys.exit(1)
+        del args[idx:idx + 2]
+    categories = None
+    if '--only' in args:
+        idx = args.index('--only')
+        try:
+            categories = parse_categories(args[idx + 1])
+        except IndexError:
+            print('ERROR: --only requires a comma-separated category list')
+            sys.exit(1)
+        except ValueError as e:
+            print(f'ERROR: --only: {e}')
+            sys.exit(1)
+        del args[idx:idx + 2]
 
     if len(args) < 2:
-        print('Usage: python -X utf8 tools/diff-docx.py <reference.docx> <generated.docx> [--json]')
+        print('Usage: python -X utf8 tools/diff-docx.py <reference.docx> <generated.docx> [--json] [--timings] [--profile <path>]')
+        print('       python -X utf8 tools/diff-docx.py <reference.docx> <gen1.docx> <gen2.docx|glob>... [--workers N] [--json]')
+        print('       python -X utf8 tools/diff-docx.py <old-dir> <new-dir> [--workers N] [--jsonl | --csv]')
+        print('       ... [--only styles,pageSetup,headingStyles]   (compare only these categories)')
         print('')
         print('Compare two DOCX files at XML level:')
         print('  - Page setup, document defaults, heading styles')
-        print('  - Element structure (sequential + count)')
+        print('  - Element structure (count + Myers alignment anchored on headings)')
         print('  - Table structure (widths, borders, fills)')
         print('  - Run properties (font, size, color, bold)')
         print('  - Spacing (before/after, spacers)')
         sys.exit(1)
 
-    ref_path = args[0]
-    gen_path = args[1]
-
-    try:
-        results = compare_docx(ref_path, gen_path)
-    except FileNotFoundError as e:
-        if use_json:
-            print(json.dumps({'error': str(e)}, ensure_ascii=False))
-        else:
-            print(f'ERROR: {e}')
+    if len(args) == 2 and os.path.isdir(args[0]) and os.path.isdir(args[1]):
+        run_directories(args[0], args[1], workers, output_format, use_json, categories)
+        return
+    if os.path.isdir(args[0]):
+        print(f'ERROR: {args[0]} is a directory — give two directories to compare builds')
         sys.exit(1)
-    except zipfile.BadZipFile as e:
-        if use_json:
-            print(json.dumps({'error': f'Invalid DOCX: {e}'}, ensure_ascii=False))
-        else:
-            print(f'ERROR: Invalid DOCX file — {e}')
+
+    gen_paths = expand_gen_paths(args[1:])
+    if len(gen_paths) > 1 or glob.has_magic(args[1]):
+        run_matrix(args[0], gen_paths, workers, use_json, timings, profile_path, categories)
+        return
+
+    ref_path = args[0]
+    gen_path = gen_paths[0] if gen_paths else args[1]
+    if ref_path == STDIN_ARG and gen_path == STDIN_ARG:
+        print('ERROR: stdin (-) can be used for only one of the two files')
         sys.exit(1)
 
-    if use_json:
-        output = format_json_output(results)
-        print(json.dumps(output, ensure_ascii=False, indent=2))
-    else:
-        print(format_text_report(results))
+    with TimingSession(timings, profile_path) as session:
+        try:
+            results = compare_docx(cli_docx_source(ref_path), cli_docx_source(gen_path), categories)
+        except FileNotFoundError as e:
+            if use_json:
+                print(json.dumps({'error': str(e)}, ensure_ascii=False))
+            else:
+                print(f'ERROR: {e}')
+            sys.exit(1)
+        except zipfile.BadZipFile as e:
+            if use_json:
+                print(json.dumps({'error': f'Invalid DOCX: {e}'}, ensure_ascii=False))
+            else:
+                print(f'ERROR: Invalid DOCX file — {e}')
+            sys.exit(1)
+
+        with phase('serialization'):
+            if use_json:
+                output = format_json_output(results)
+                text = json.dumps(output, ensure_ascii=False, indent=2)
+            else:
+                text = format_text_report(results)
+
+    if use_json and session.enabled:
+        output['timings'] = session.report()
+        text = json.dumps(output, ensure_ascii=False, indent=2)
+    print(text)
+    if not use_json:
+        session.print_report()
+
+
+def run_matrix(ref_path, gen_paths, workers, use_json, timings, profile_path, categories=None):
+    """레퍼런스 1 : N 모드 CLI"""
+    if STDIN_ARG in gen_paths:
+        print('ERROR: stdin (-) can be used only for the reference in matrix mode')
+        sys.exit(1)
+    workers = max(1, min(workers, len(gen_paths) or 1))
+
+    with TimingSession(timings, profile_path) as session:
+        try:
+            matrix = diff_matrix(cli_docx_source(ref_path), gen_paths, workers, categories)
+        except (FileNotFoundError, zipfile.BadZipFile) as e:
+            if use_json:
+                print(json.dumps({'error': str(e)}, ensure_ascii=False))
+            else:
+                print(f'ERROR: {e}')
+            sys.exit(1)
+
+        with phase('serialization'):
+            if use_json:
+                if session.enabled:
+                    matrix['timings'] = session.report()
+                text = json.dumps(matrix, ensure_ascii=False, indent=2)
+            else:
+                text = format_matrix_report(matrix)
+
+    print(text)
+    if not use_json:
+        session.print_report()
+    sys.exit(1 if matrix['errors'] else 0)
+
+
+def run_directories(dir_a, dir_b, workers, output_format, use_json, categories=None):
+    """폴더 쌍 모드 CLI — 결과는 완료 순서대로 한 줄씩, 마지막에 요약"""
+    pairs = pair_directories(dir_a, dir_b)
+    workers = max(1, min(workers, len(pairs) or 1))
+    if output_format == 'text' and use_json:
+        output_format = 'jsonl'
+
+    writer = None
+    if output_format == 'csv':
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        writer.writerow(CSV_COLUMNS)
+    elif output_format == 'text':
+        print(f'Comparing {len(pairs)} documents: {dir_a} → {dir_b} (workers: {workers})\n', flush=True)
+
+    start = time.perf_counter()
+    rows = []
+    for row in iter_pair_rows(pairs, workers, categories):
+        rows.append(row)
+        if output_format == 'jsonl':
+            print(json.dumps(row, ensure_ascii=False), flush=True)
+        elif writer is not None:
+            writer.writerow(pair_csv_row(row))
+            sys.stdout.flush()
+        elif row['status'] not in ('identical', 'same_xml'):
+            print(format_pair_row(row), flush=True)
+
+    summary = build_pair_summary(rows, workers, time.perf_counter() - start, categories or MATRIX_CATEGORIES)
+    if output_format == 'jsonl':
+        print(json.dumps(summary, ensure_ascii=False), flush=True)
+    elif output_format == 'text':
+        by_status = ', '.join(f'{st}={n}' for st, n in summary['byStatus'].items() if n)
+        by_category = ', '.join(f'{cat}={n}' for cat, n in summary['changedByCategory'].items() if n)
+        print(f'\n  {summary["files"]} documents: {by_status or "(none)"}')
+        print(f'  Changed by category: {by_category or "(none)"}')
+        print(f'  {summary["wallSeconds"]:.2f}s')
+
+    unchanged = summary['byStatus']['identical'] + summary['byStatus']['same_xml']
+    sys.exit(0 if unchanged == summary['files'] else 1)
 
 
 if __name__ == '__main__':
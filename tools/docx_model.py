@@ -0,0 +1,1039 @@
+"""
+DOCX 단일 파싱 문서 모델 — validate/review/diff/extract/spec 도구가 공유하는 모듈.
+
+ZIP을 한 번 열고 word/document.xml을 한 번 파싱한 뒤, body 직계 자식을 순서대로
+BodyElement로 감싼다. 텍스트·스타일·이미지 크기·테이블 분류 같은 파생 값은 처음
+접근할 때 한 번만 계산되어 캐시되므로, 같은 프로세스 안에서 여러 도구/검사가 같은
+문서를 다뤄도 파싱과 분류는 한 번뿐이다.
+
+사용법:
+    from docx_model import load_docx
+    model = load_docx('output/문서.docx')       # 경로, bytes, 바이너리 파일 객체 모두 가능
+    model = load_docx(cli_docx_source('-'))     # CLI 인자 '-': stdin으로 받은 DOCX 바이트
+    for el in model.elements:
+        if el.kind == 'heading':
+            print(el.heading_level, el.text)
+        elif el.kind == 'table':
+            print(el.tbl_type, el.row_count, el.col_count)
+    model.styles          # word/styles.xml 루트 (없으면 None)
+    model.page_geometry() # 마지막 sectPr의 pgSz/pgMar (없으면 None)
+    model.section_sect_prs  # 섹션별 sectPr (단락 pPr/sectPr들 + body 직계 sectPr)
+
+대용량 문서는 트리 전체를 만들지 않고 iter_body()로 body 자식을 하나씩 받아
+처리할 수 있다 (iterparse, 처리 후 노드 해제).
+
+같은 파일을 다시 열면 프로세스 내 LRU 캐시(개수와 추정 메모리 상한)의 모델을 재사용한다.
+
+XML 파싱은 xml_backend를 거친다 (기본 ElementTree, GENDOCS_XML_BACKEND=lxml이면 lxml).
+"""
+
+import os
+import io
+import atexit
+import re
+import sys
+import copy
+import hashlib
+import zipfile
+import threading
+from collections import OrderedDict
+
+from theme_colors import match_color_roles
+from font_metrics import DEFAULT_FONT, DEFAULT_SIZE_PT
+from timings import phase
+import xml_backend
+
+# ============================================================
+# XML 네임스페이스
+# ============================================================
+NS = {
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dcterms': 'http://purl.org/dc/terms/',
+    'ap': 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties',
+}
+
+W = NS['w']
+R = NS['r']
+WP = NS['wp']
+A = NS['a']
+PIC = NS['pic']
+
+# 네임스페이스를 포함한 태그/속성 이름 ('{ns}name') — 반복문에서 매번 문자열을 만들지 않도록 미리 계산
+W_BODY = f'{{{W}}}body'
+W_P = f'{{{W}}}p'
+W_PPR = f'{{{W}}}pPr'
+W_PSTYLE = f'{{{W}}}pStyle'
+W_NUMPR = f'{{{W}}}numPr'
+W_R = f'{{{W}}}r'
+W_RPR = f'{{{W}}}rPr'
+W_T = f'{{{W}}}t'
+W_BR = f'{{{W}}}br'
+W_RFONTS = f'{{{W}}}rFonts'
+W_SZ = f'{{{W}}}sz'
+W_B = f'{{{W}}}b'
+W_TBL = f'{{{W}}}tbl'
+W_TR = f'{{{W}}}tr'
+W_TC = f'{{{W}}}tc'
+W_TCPR = f'{{{W}}}tcPr'
+W_TCW = f'{{{W}}}tcW'
+W_SHD = f'{{{W}}}shd'
+W_SDT = f'{{{W}}}sdt'
+W_SECTPR = f'{{{W}}}sectPr'
+W_PGSZ = f'{{{W}}}pgSz'
+W_PGMAR = f'{{{W}}}pgMar'
+W_STYLE = f'{{{W}}}style'
+W_STYLEID = f'{{{W}}}styleId'
+W_BASEDON = f'{{{W}}}basedOn'
+W_DEFAULT = f'{{{W}}}default'
+W_VAL = f'{{{W}}}val'
+W_TYPE = f'{{{W}}}type'
+W_FILL = f'{{{W}}}fill'
+W_W = f'{{{W}}}w'
+W_H = f'{{{W}}}h'
+W_ORIENT = f'{{{W}}}orient'
+W_ASCII = f'{{{W}}}ascii'
+W_HANSI = f'{{{W}}}hAnsi'
+W_EASTASIA = f'{{{W}}}eastAsia'
+WP_EXTENT = f'{{{WP}}}extent'
+W_PPR_SECTPR = f'{W_PPR}/{W_SECTPR}'
+W_TRPR_CANTSPLIT = f'{{{W}}}trPr/{{{W}}}cantSplit'
+W_RPR_DEFAULT_PATH = f'{{{W}}}docDefaults/{{{W}}}rPrDefault/{W_RPR}'
+W_PPR_DEFAULT_PATH = f'{{{W}}}docDefaults/{{{W}}}pPrDefault/{W_PPR}'
+
+EMU_TO_PT = 1 / 12700   # EMU → pt 변환
+DXA_TO_PT = 1 / 20      # DXA → pt 변환
+
+# pgSz/pgMar 속성이 빠졌을 때 쓰는 기본값 (Landscape Letter, DXA)
+DEFAULT_PAGE_WIDTH = 15840
+DEFAULT_PAGE_HEIGHT = 12240
+DEFAULT_MARGIN_TOP = 1080
+DEFAULT_MARGIN_BOTTOM = 1080
+DEFAULT_MARGIN_LEFT = 1440
+DEFAULT_MARGIN_RIGHT = 1440
+
+# 스트리밍 모드에서 body 직계 sectPr을 찾기 위해 훑는 document.xml 꼬리 크기 (bytes)
+SECT_PR_TAIL_BYTES = 64 * 1024
+_TREE_BYTES_PER_XML_BYTE = 10   # 파싱된 트리 메모리 / XML 바이트 (ElementTree, lxml 모두 약 10배)
+_STREAM_CHUNK_BYTES = 1 << 20
+
+_SECT_PR_START_RE = re.compile(rb'<([A-Za-z_][\w.-]*:)?sectPr[\s/>]')
+_SECT_PR_TOKEN_RES = {}   # 접두사 → sectPr 여닫는 태그 정규식 (_sect_pr_token_re)
+
+# 원본 바이트 구간으로 지문을 만드는 body 직계 자식 (중첩 깊이도 이 태그들로만 센다)
+_SPAN_TAGS = ('p', 'tbl', 'sdt')
+
+
+# ============================================================
+# XML 파싱 유틸리티
+# ============================================================
+
+def local_name(tag):
+    """'{ns}tag' → 'tag'"""
+    return tag.split('}')[-1] if '}' in tag else tag
+
+
+def _iter_text(element):
+    return [t.text for t in element.iter(W_T) if t.text]
+
+
+def _has_page_break_iter(p):
+    for br in p.iter(W_BR):
+        if br.get(W_TYPE) == 'page':
+            return True
+    return False
+
+
+# 컴파일된 XPath (lxml), ElementTree에서는 같은 결과의 iter 순회
+_XPATH_NS = {'w': W}
+_text_nodes = xml_backend.xpath('.//w:t/text()', _XPATH_NS, _iter_text)
+_page_break_xpath = xml_backend.xpath('boolean(.//w:br[@w:type="page"])', _XPATH_NS, _has_page_break_iter)
+
+
+def extract_text(element):
+    """w:p 요소에서 텍스트 추출"""
+    return ''.join(_text_nodes(element)).strip()
+
+
+def get_paragraph_style(p):
+    """w:p 요소에서 스타일명 추출"""
+    pPr = p.find(W_PPR)
+    if pPr is not None:
+        pStyle = pPr.find(W_PSTYLE)
+        if pStyle is not None:
+            return pStyle.get(W_VAL, '')
+    return ''
+
+
+KEEP_PROPS = ('keepNext', 'keepLines', 'widowControl')
+_KEEP_PROP_TAGS = {name: f'{{{W}}}{name}' for name in KEEP_PROPS}
+
+
+def get_keep_props(ppr):
+    """w:pPr → {keepNext, keepLines, widowControl: bool} — 지정된 속성만 담는다 (상속 해석용)"""
+    props = {}
+    if ppr is None:
+        return props
+    for name in KEEP_PROPS:
+        node = ppr.find(_KEEP_PROP_TAGS[name])
+        if node is not None:
+            props[name] = node.get(W_VAL, 'true') not in ('0', 'false', 'off')
+    return props
+
+
+def has_page_break(p):
+    """명시적 페이지 나누기 (w:br type=page) 존재 여부"""
+    return _page_break_xpath(p)
+
+
+def get_image_size_pt(p):
+    """단락에서 이미지 크기(pt) 추출 (wp:extent 기준). 없으면 None"""
+    for extent in p.iter(WP_EXTENT):
+        cx = int(extent.get('cx', '0'))
+        cy = int(extent.get('cy', '0'))
+        if cx > 0 and cy > 0:
+            return (cx * EMU_TO_PT, cy * EMU_TO_PT)
+    return None
+
+
+def get_table_shading(tbl):
+    """테이블 첫 번째 셀의 배경색"""
+    for tc in tbl.iter(W_TC):
+        tcPr = tc.find(W_TCPR)
+        if tcPr is not None:
+            shd = tcPr.find(W_SHD)
+            if shd is not None:
+                return shd.get(W_FILL, '')
+        break
+    return ''
+
+
+def get_row_paragraphs(tr):
+    """w:tr의 셀별 단락 텍스트 목록 — [[p_text, ...], ...] (빈 단락 포함)"""
+    return [
+        [extract_text(p) for p in tc.findall(W_P)]
+        for tc in tr.findall(W_TC)
+    ]
+
+
+def get_cell_width(tc):
+    """w:tc의 tcW 너비 (DXA). 없거나 dxa 단위가 아니면 0"""
+    tcPr = tc.find(W_TCPR)
+    if tcPr is None:
+        return 0
+    tcW = tcPr.find(W_TCW)
+    if tcW is None or tcW.get(W_TYPE, 'dxa') != 'dxa':
+        return 0
+    try:
+        return int(tcW.get(W_W, '0'))
+    except ValueError:
+        return 0
+
+
+def get_table_fonts(rows, default_font, size_pt):
+    """테이블 헤더/데이터 글꼴 — 각 행 첫 텍스트 런 기준 (헤더는 볼드 지정이 없어도 볼드로 봄)
+
+    rows: w:tr 노드 목록, size_pt: 런에 크기가 없을 때 쓰는 테이블 텍스트 크기
+    """
+    default = default_font[:2] + (size_pt, False)
+    header = get_run_font(rows[0])
+    if header[3] is None:
+        header = header[:3] + (True,)
+    data = get_run_font(rows[1]) if len(rows) > 1 else header
+    return resolve_run_font(header, default), resolve_run_font(data, default)
+
+
+def classify_table_color(bg, cols):
+    """첫 셀 배경색 + 컬럼 수로 테이블 유형 판별 (동적 테마 색상, 근사 색상 허용 — 다크 코드는 1컬럼만)
+
+    Returns: code_dark, code_light, info_box, warning_box, data_table
+    """
+    if not bg:
+        return 'data_table'
+    # 테마 색상 인덱스는 첫 분류 때 로드된다 (import 시점 아님)
+    roles = match_color_roles(bg)
+    # 다크 코드블록 — 여러 컬럼 테이블은 정확 일치만 (진회색 헤더 333333 등이 근사로 걸리지 않게)
+    if 'dark_codes' in roles and (cols == 1 or 'dark_codes' in match_color_roles(bg, tolerance=0)):
+        return 'code_dark'
+    if cols != 1:
+        return 'data_table'
+    # 라이트 코드블록 / JSON
+    if 'light_codes' in roles:
+        return 'code_light'
+    # 정보 박스
+    if 'info_boxes' in roles:
+        return 'info_box'
+    # 경고 박스
+    if 'warning_boxes' in roles:
+        return 'warning_box'
+    return 'data_table'
+
+
+def classify_table(tbl):
+    """테이블 유형: code_dark, code_light, info_box, warning_box, data_table"""
+    first_row = tbl.find(W_TR)
+    cols = len(first_row.findall(W_TC)) if first_row is not None else 0
+    return classify_table_color(get_table_shading(tbl), cols)
+
+
+def _rpr_font(rpr):
+    """w:rPr → (라틴 글꼴, 동아시아 글꼴, 크기 pt, 볼드). 지정 없는 항목은 None"""
+    font = east_asia = size_pt = bold = None
+    if rpr is None:
+        return font, east_asia, size_pt, bold
+    fonts = rpr.find(W_RFONTS)
+    if fonts is not None:
+        font = fonts.get(W_ASCII) or fonts.get(W_HANSI)
+        east_asia = fonts.get(W_EASTASIA)
+    sz = rpr.find(W_SZ)
+    if sz is not None:
+        try:
+            size_pt = int(sz.get(W_VAL, '')) / 2
+        except ValueError:
+            pass
+    b = rpr.find(W_B)
+    if b is not None:
+        bold = b.get(W_VAL, 'true') not in ('0', 'false', 'off')
+    return font, east_asia, size_pt, bold
+
+
+def get_run_font(node):
+    """node(단락/행/셀) 안 첫 텍스트 런의 글꼴 → (라틴, 동아시아, 크기 pt, 볼드). 지정 없는 항목은 None"""
+    for r in node.iter(W_R):
+        t = r.find(W_T)
+        if t is not None and t.text:
+            return _rpr_font(r.find(W_RPR))
+    return None, None, None, None
+
+
+def resolve_run_font(run_font, default):
+    """런 글꼴의 빈 항목을 문서 기본값으로 채움 → (라틴, 동아시아, 크기 pt, 볼드)"""
+    font, east_asia, size_pt, bold = run_font
+    d_font, d_east_asia, d_size_pt, d_bold = default
+    # rFonts 속성은 하나씩 상속된다 (ascii만 지정한 런의 한글은 기본 eastAsia 글꼴)
+    return (font or d_font, east_asia or d_east_asia,
+            size_pt or d_size_pt, d_bold if bold is None else bold)
+
+
+_PG_MAR_ATTRS = {side: f'{{{W}}}{side}' for side in ('top', 'bottom', 'left', 'right')}
+
+
+def get_page_geometry(sect_pr):
+    """w:sectPr의 pgSz/pgMar를 DXA 정수 dict로 반환. pgSz가 없으면 None
+
+    Returns: {'width', 'height', 'orient', 'margins': {'top', 'bottom', 'left', 'right'}}
+    """
+    if sect_pr is None:
+        return None
+    pg_sz = sect_pr.find(W_PGSZ)
+    if pg_sz is None:
+        return None
+
+    margins = {
+        'top': DEFAULT_MARGIN_TOP,
+        'bottom': DEFAULT_MARGIN_BOTTOM,
+        'left': DEFAULT_MARGIN_LEFT,
+        'right': DEFAULT_MARGIN_RIGHT,
+    }
+    pg_mar = sect_pr.find(W_PGMAR)
+    if pg_mar is not None:
+        for side in margins:
+            margins[side] = int(pg_mar.get(_PG_MAR_ATTRS[side], str(margins[side])))
+
+    return {
+        'width': int(pg_sz.get(W_W, str(DEFAULT_PAGE_WIDTH))),
+        'height': int(pg_sz.get(W_H, str(DEFAULT_PAGE_HEIGHT))),
+        'orient': pg_sz.get(W_ORIENT),
+        'margins': margins,
+    }
+
+
+# ============================================================
+# 요소 모델
+# ============================================================
+
+class cached_property:
+    """잠금 없는 functools.cached_property — 첫 접근 때 한 번 계산해 인스턴스 __dict__에 넣는다.
+
+    Python 3.11까지의 functools.cached_property는 첫 접근마다 클래스 단위 RLock을 잡으므로
+    요소 수만큼 속성을 처음 읽는 body 순회에서 눈에 띄는 비용이 된다. 여기 속성들은 같은 입력에서
+    항상 같은 값이라 두 스레드가 동시에 계산해도 같은 값을 넣을 뿐이다.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.attrname = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.attrname] = self.func(instance)
+        return value
+
+
+class BodyElement:
+    """body 직계 자식 하나 (w:p, w:tbl, w:sectPr ...).
+
+    node는 원본 ElementTree 노드, position은 body 내 순번.
+    나머지 속성은 처음 접근할 때 한 번 계산되어 캐시된다.
+    """
+
+    def __init__(self, node, position):
+        self.node = node
+        self.position = position
+        self.tag = local_name(node.tag)
+
+    def __repr__(self):
+        return f'<BodyElement {self.position} {self.kind}>'
+
+    # ── 단락 (w:p) ──
+
+    @cached_property
+    def style(self):
+        return get_paragraph_style(self.node) if self.tag == 'p' else ''
+
+    @cached_property
+    def text(self):
+        return extract_text(self.node)
+
+    @cached_property
+    def has_page_break(self):
+        return self.tag == 'p' and has_page_break(self.node)
+
+    @cached_property
+    def image_size_pt(self):
+        """(width_pt, height_pt) 또는 None"""
+        return get_image_size_pt(self.node) if self.tag == 'p' else None
+
+    @cached_property
+    def run_font(self):
+        """첫 텍스트 런의 (라틴, 동아시아, 크기 pt, 볼드) — 지정 없는 항목은 None (resolve_run_font 참조)"""
+        return get_run_font(self.node)
+
+    @cached_property
+    def section_pr(self):
+        """단락 pPr의 w:sectPr — 이 단락에서 끝나는 섹션의 속성 (섹션 나누기). 없으면 None"""
+        if self.tag != 'p':
+            return None
+        return self.node.find(W_PPR_SECTPR)
+
+    @cached_property
+    def direct_keep_props(self):
+        """단락 pPr에 직접 지정된 keepNext/keepLines/widowControl (get_keep_props). 스타일 상속은 DocxModel.keep_props"""
+        if self.tag != 'p':
+            return {}
+        return get_keep_props(self.node.find(W_PPR))
+
+    @cached_property
+    def is_numbered(self):
+        """pPr/numPr 존재 (불릿/번호 목록)"""
+        pPr = self.node.find(W_PPR)
+        return pPr is not None and pPr.find(W_NUMPR) is not None
+
+    @property
+    def is_heading(self):
+        return self.style.startswith('Heading')
+
+    @cached_property
+    def heading_level(self):
+        """HeadingN 스타일의 N. 제목이 아니거나 숫자가 아니면 0"""
+        if not self.is_heading:
+            return 0
+        level_str = self.style.replace('Heading', '')
+        return int(level_str) if level_str.isdigit() else 0
+
+    @cached_property
+    def kind(self):
+        """요소 유형: image, heading, bullet, empty, paragraph, table, sectPr, ...
+
+        한 단락에 이미지와 페이지 나누기가 함께 있을 수 있으므로
+        페이지 나누기는 kind와 별개로 has_page_break로 확인한다.
+        """
+        if self.tag == 'p':
+            if self.image_size_pt:
+                return 'image'
+            if self.is_heading:
+                return 'heading'
+            if self.is_numbered:
+                return 'bullet'
+            if not self.text:
+                return 'empty'
+            return 'paragraph'
+        if self.tag == 'tbl':
+            return 'table'
+        return self.tag
+
+    # ── 테이블 (w:tbl) ──
+
+    @cached_property
+    def rows(self):
+        """w:tr 노드 목록"""
+        return self.node.findall(W_TR)
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+    @cached_property
+    def col_count(self):
+        """첫 행의 셀 수"""
+        return len(self.rows[0].findall(W_TC)) if self.rows else 0
+
+    @cached_property
+    def shading(self):
+        """첫 셀 배경색 (원문 그대로, 없으면 '')"""
+        return get_table_shading(self.node)
+
+    @cached_property
+    def tbl_type(self):
+        """code_dark, code_light, info_box, warning_box, data_table"""
+        return classify_table_color(self.shading, self.col_count)
+
+    @cached_property
+    def header_paragraphs(self):
+        """첫 행의 셀별 단락 텍스트 — [[p_text, ...], ...]"""
+        return get_row_paragraphs(self.rows[0]) if self.rows else []
+
+    @cached_property
+    def row_paragraphs(self):
+        """모든 행의 셀별 단락 텍스트 — [row][cell][p_text]"""
+        return [get_row_paragraphs(tr) for tr in self.rows]
+
+    @cached_property
+    def row_cant_split(self):
+        """행별 trPr/cantSplit 여부 — 행이 페이지 경계에서 나뉘지 않음"""
+        flags = []
+        for tr in self.rows:
+            node = tr.find(W_TRPR_CANTSPLIT)
+            flags.append(node is not None and node.get(W_VAL, 'true') not in ('0', 'false', 'off'))
+        return flags
+
+    @cached_property
+    def cell_widths(self):
+        """모든 행의 셀별 tcW 너비 (DXA, 없으면 0) — [row][cell]"""
+        return [[get_cell_width(tc) for tc in tr.findall(W_TC)] for tr in self.rows]
+
+
+# ============================================================
+# 문서 모델
+# ============================================================
+
+def is_path_source(source):
+    """파일 경로 입력인지 (str / os.PathLike)"""
+    return isinstance(source, (str, os.PathLike))
+
+
+STDIN_ARG = '-'
+
+
+def cli_docx_source(arg):
+    """CLI 파일 인자 → load_docx 입력. '-'이면 stdin 바이트를 읽어 만든 DocxModel ('<stdin>')
+
+    변환기가 메모리의 DOCX 패키지를 파이프로 바로 넘길 수 있게 한다 (디스크 왕복 없음).
+    """
+    if arg == STDIN_ARG:
+        return DocxModel(sys.stdin.buffer)
+    return arg
+
+
+def read_docx_source(source):
+    """경로 / bytes / 바이너리 파일 객체 → (bytes, 경로 또는 None, 파일명 또는 None)
+
+    없는 경로는 FileNotFoundError, 지원하지 않는 입력은 TypeError.
+    """
+    if is_path_source(source):
+        path = os.fspath(source)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'파일을 찾을 수 없습니다: {path}')
+        with open(path, 'rb') as f:
+            return f.read(), path, os.path.basename(path)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source), None, None
+    if hasattr(source, 'read'):
+        data = source.read()
+        if not isinstance(data, bytes):
+            raise TypeError('DOCX 파일 객체는 바이너리 모드로 열어야 합니다')
+        name = getattr(source, 'name', None)
+        return data, None, os.path.basename(name) if isinstance(name, str) else None
+    raise TypeError(f'지원하지 않는 DOCX 입력: {type(source).__name__}')
+
+
+class DocxModel:
+    """DOCX 패키지 하나의 파싱 결과.
+
+    source는 파일 경로, bytes(bytearray/memoryview), 바이너리 모드 파일 객체 중 하나.
+    파일은 생성 시 한 번 메모리로 읽고 닫는다 (Windows에서 파일 잠금 방지).
+    XML 파트는 요청 시 한 번만 파싱되어 캐시된다.
+    name: 리포트에 쓸 파일명 (기본: 경로의 파일명, 파일 객체의 name, 없으면 DEFAULT_NAME)
+    given_name: 호출자가 name으로 지정한 이름 (없으면 None) — 경로 없는 입력을 구별하는 데 쓴다
+    """
+
+    DEFAULT_NAME = '<bytes>'
+
+    def __init__(self, source, name=None):
+        with phase('zip_open'):
+            data, path, source_name = read_docx_source(source)
+            self.path = path
+            self.name = name or source_name or self.DEFAULT_NAME
+            self.given_name = name or None
+            self.file_size = len(data)
+            self._data = data
+            self.zip = zipfile.ZipFile(io.BytesIO(data), 'r')
+            self.namelist = self.zip.namelist()
+        self._names = set(self.namelist)
+        self._parts = {}
+
+    def memory_estimate(self):
+        """모델이 잡고 있는 메모리 추정치 (바이트) — 패키지 바이트 + 파싱된 XML 트리
+
+        트리는 원본 XML 크기의 약 _TREE_BYTES_PER_XML_BYTE배를 쓴다.
+        """
+        parsed = sum(self.zip.getinfo(name).file_size for name, root in self._parts.items() if root is not None)
+        return self.file_size + parsed * _TREE_BYTES_PER_XML_BYTE
+
+    @cached_property
+    def sha256(self):
+        """패키지 바이트 SHA-256 (hex) — 경로 없는 입력의 리포트 캐시 키"""
+        return hashlib.sha256(self._data).hexdigest()
+
+    def has_part(self, name):
+        return name in self._names
+
+    def read(self, name):
+        """ZIP 파트 원본 바이트"""
+        return self.zip.read(name)
+
+    def part(self, name):
+        """ZIP 내 XML 파트 루트 (캐시). 없으면 None"""
+        if name not in self._parts:
+            if name not in self._names:
+                self._parts[name] = None
+            else:
+                with phase('xml_parse'), self.zip.open(name) as f:
+                    self._parts[name] = xml_backend.parse(f)
+        return self._parts[name]
+
+    @property
+    def document(self):
+        """word/document.xml 루트"""
+        return self.part('word/document.xml')
+
+    @property
+    def styles(self):
+        """word/styles.xml 루트 (없으면 None)"""
+        return self.part('word/styles.xml')
+
+    @cached_property
+    def body(self):
+        doc = self.document
+        return doc.find(W_BODY) if doc is not None else None
+
+    @cached_property
+    def elements(self):
+        """body 직계 자식을 순서대로 감싼 BodyElement 목록"""
+        if self.body is None:
+            return []
+        return [BodyElement(child, i) for i, child in enumerate(self.body)]
+
+    @cached_property
+    def element_fingerprints(self):
+        """elements와 같은 순서의 요소 지문 (XML 내용 해시) — 증분 재분석에서 바뀌지 않은 요소 판별용
+
+        w:p/w:tbl/w:sdt는 document.xml 원본 바이트에서 잘라 낸 구간을 해시하므로 트리를 다시
+        직렬화하지 않는다. 구간을 요소와 맞출 수 없으면 노드 직렬화 해시(node_fingerprint)로 대신한다.
+        """
+        elements = self.elements
+        spans = _body_child_spans(self.read('word/document.xml')) if elements else None
+        spanned = [el for el in elements if el.tag in _SPAN_TAGS]
+        if spans is None or [tag for tag, _ in spans] != [el.tag for el in spanned]:
+            return [node_fingerprint(el.node) for el in elements]
+        by_position = {el.position: fp for el, (_, fp) in zip(spanned, spans)}
+        return [by_position.get(el.position) or node_fingerprint(el.node) for el in elements]
+
+    @cached_property
+    def sect_pr(self):
+        """body 직계 w:sectPr (마지막 섹션 속성)"""
+        if self.body is None:
+            return None
+        return self.body.find(W_SECTPR)
+
+    def page_geometry(self):
+        """마지막 섹션의 페이지 크기/여백 (get_page_geometry 참조)"""
+        return get_page_geometry(self.sect_pr)
+
+    @cached_property
+    def section_sect_prs(self):
+        """섹션별 w:sectPr 목록 (문서 순서) — 단락 수준 sectPr들 + 마지막 섹션의 body 직계 sectPr(없으면 None)"""
+        return [el.section_pr for el in self.elements if el.section_pr is not None] + [self.sect_pr]
+
+    @cached_property
+    def default_run_font(self):
+        """문서 기본 글꼴 (docDefaults → 기본 단락 스타일 순으로 덮어씀) → (라틴, 동아시아, 크기 pt, 볼드)
+
+        styles.xml에 없으면 템플릿 기본값(font_metrics.DEFAULT_FONT / DEFAULT_SIZE_PT).
+        """
+        font, east_asia, size_pt, bold = None, None, None, None
+        styles = self.styles
+        if styles is not None:
+            layers = [styles.find(W_RPR_DEFAULT_PATH)]
+            for style in styles.findall(W_STYLE):
+                if style.get(W_TYPE) == 'paragraph' and style.get(W_DEFAULT) in ('1', 'true'):
+                    layers.append(style.find(W_RPR))
+                    break
+            for rpr in layers:
+                l_font, l_east_asia, l_size_pt, l_bold = _rpr_font(rpr)
+                font = l_font or font
+                east_asia = l_east_asia or east_asia
+                size_pt = l_size_pt or size_pt
+                bold = bold if l_bold is None else l_bold
+        font = font or DEFAULT_FONT
+        return font, east_asia or font, size_pt or DEFAULT_SIZE_PT, bool(bold)
+
+    @cached_property
+    def style_keep_props(self):
+        """단락 스타일 ID → basedOn 상속과 docDefaults까지 해석한 keep 속성 dict. '' 키는 기본 단락 스타일"""
+        styles = self.styles
+        if styles is None:
+            return {'': {}}
+        defaults = get_keep_props(styles.find(W_PPR_DEFAULT_PATH))
+        own, based_on = {}, {}
+        default_id = None
+        for style in styles.findall(W_STYLE):
+            if style.get(W_TYPE) != 'paragraph':
+                continue
+            style_id = style.get(W_STYLEID, '')
+            own[style_id] = get_keep_props(style.find(W_PPR))
+            parent = style.find(W_BASEDON)
+            if parent is not None:
+                based_on[style_id] = parent.get(W_VAL, '')
+            if style.get(W_DEFAULT) in ('1', 'true'):
+                default_id = style_id
+
+        resolved = {}
+
+        def resolve(style_id, seen=()):
+            if style_id in resolved:
+                return resolved[style_id]
+            parent = based_on.get(style_id)
+            base = resolve(parent, seen + (style_id,)) if parent in own and parent not in seen else defaults
+            resolved[style_id] = {**base, **own.get(style_id, {})}
+            return resolved[style_id]
+
+        for style_id in own:
+            resolve(style_id)
+        resolved[''] = resolved.get(default_id, defaults) if default_id else defaults
+        return resolved
+
+    def keep_props(self, el):
+        """단락의 keepNext/keepLines/widowControl (직접 지정 > 스타일 > docDefaults, 지정 없으면 False)"""
+        styles = self.style_keep_props
+        props = {**styles.get(el.style, styles['']), **el.direct_keep_props}
+        return tuple(props.get(name, False) for name in KEEP_PROPS)
+
+    # ── 스트리밍 접근 (대용량 문서) ──
+
+    def iter_body(self):
+        """word/document.xml을 iterparse로 훑으며 body 직계 자식을 BodyElement로 하나씩 내보낸다.
+
+        소비자가 다음 요소를 요청하는 시점에 직전 노드는 비워지고 body에서 제거되므로,
+        문서 크기와 무관하게 메모리에는 요소 하나 분량의 트리만 남는다.
+        내보낸 BodyElement를 다음 요소 이후까지 보관하면 안 된다 (필요하면 값만 복사).
+        """
+        if not self.has_part('word/document.xml'):
+            return
+        if xml_backend.USE_LXML:
+            yield from self._iter_body_lxml()
+            return
+        depth = 0
+        body = None
+        position = 0
+        with self.zip.open('word/document.xml') as f:
+            for event, node in xml_backend.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 2 and node.tag == W_BODY:
+                        body = node
+                    continue
+                depth -= 1
+                # body 직계 자식의 end (document=1, body=2, 자식=3 → 종료 후 2)
+                if depth == 2 and body is not None:
+                    yield BodyElement(node, position)
+                    position += 1
+                    node.clear()
+                    body.remove(node)
+
+    def _iter_body_lxml(self):
+        """iter_body()의 lxml 경로 — 본문 요소 태그의 end 이벤트만 받는다.
+
+        표 안의 w:p처럼 body 직계가 아닌 노드는 건너뛰고, 필터에 없는 body 직계 자식
+        (w:bookmarkStart 등)은 트리에 남아 있으므로 다음 직계 자식 앞이나 body 끝에서
+        문서 순서대로 함께 내보낸다. 내보내는 순서와 position은 ElementTree 경로와 같다.
+        """
+        position = 0
+        with self.zip.open('word/document.xml') as f:
+            for _, node in xml_backend.iterparse(f, tag=(W_P, W_TBL, W_SDT, W_SECTPR, W_BODY)):
+                if node.tag == W_BODY:
+                    body, last = node, None
+                else:
+                    body, last = node.getparent(), node
+                    if body is None or body.tag != W_BODY:
+                        continue
+                while len(body):
+                    child = body[0]
+                    yield BodyElement(child, position)
+                    position += 1
+                    child.clear()
+                    body.remove(child)
+                    if child is last:
+                        break
+
+    def scan_body_sect_pr(self):
+        """트리를 만들지 않고 body 직계 w:sectPr만 찾아 반환 (없으면 None).
+
+        body 직계 sectPr은 document.xml 맨 끝(</w:body> 직전)에 오므로 압축만 풀면서
+        꼬리 SECT_PR_TAIL_BYTES만 유지해 파싱한다. 꼬리에서 찾지 못하면 iter_body()
+        한 번으로 대체한다. 이미 전체 트리가 파싱되어 있으면 그것을 쓴다.
+        """
+        if 'word/document.xml' in self._parts:
+            return self.sect_pr
+        if not self.has_part('word/document.xml'):
+            return None
+
+        tail = b''
+        with self.zip.open('word/document.xml') as f:
+            while True:
+                chunk = f.read(_STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                tail = (tail + chunk)[-SECT_PR_TAIL_BYTES:]
+
+        sect_pr = _parse_tail_sect_pr(tail)
+        if sect_pr is not None:
+            return sect_pr
+
+        for el in self.iter_body():
+            if el.tag == 'sectPr':
+                sect_pr = copy.deepcopy(el.node)
+        return sect_pr
+
+    def scan_section_sect_prs(self):
+        """트리를 만들지 않고 section_sect_prs와 같은 목록을 구한다 (스트리밍 모드용).
+
+        섹션 속성은 그 섹션 끝에 오므로, 요소를 흘려보내기 전에 각 섹션의 페이지 기하를 알려면
+        미리 훑어야 한다. document.xml을 청크 단위로 풀면서 sectPr 조각만 파싱하므로 메모리는
+        청크 크기 정도만 쓴다. 이미 전체 트리가 파싱되어 있으면 그것을 쓴다.
+        """
+        if 'word/document.xml' in self._parts:
+            return self.section_sect_prs
+        if not self.has_part('word/document.xml'):
+            return [None]
+
+        found = []   # [(sectPr, body 직계 여부)]
+        buf = b''
+        with self.zip.open('word/document.xml') as f:
+            eof = False
+            while not eof:
+                chunk = f.read(_STREAM_CHUNK_BYTES)
+                eof = not chunk
+                buf += chunk
+                pos = 0
+                while True:
+                    m = _SECT_PR_START_RE.search(buf, pos)
+                    if m is None:
+                        pos = max(pos, len(buf) - 64)   # 청크 경계에 걸친 여는 태그 조각만 남김
+                        break
+                    end = _sect_pr_end(buf, m)
+                    # 닫는 태그와 그 뒤 body 닫힘 여부까지 보여야 판정 가능 (EOF면 있는 대로)
+                    if end is None or (not eof and len(buf) - end < 64):
+                        pos = m.start()
+                        break
+                    prefix = m.group(1) or b''
+                    is_body = buf[end:].lstrip().startswith(b'</' + prefix + b'body>')
+                    sect_pr = _parse_sect_pr_fragment(buf[m.start():end])
+                    if sect_pr is not None:
+                        found.append((sect_pr, is_body))
+                    pos = end
+                buf = buf[pos:]
+
+        sections = [sp for sp, is_body in found if not is_body]
+        body = [sp for sp, is_body in found if is_body]
+        return sections + [body[-1] if body else None]
+
+
+def node_fingerprint(node):
+    """노드 XML 전체(태그·속성·텍스트·하위 노드)의 해시"""
+    return hashlib.blake2b(xml_backend.tostring(node), digest_size=16).hexdigest()
+
+
+def _body_child_spans(data):
+    """document.xml 바이트 → body 직계 w:p/w:tbl/w:sdt의 [(태그, 원본 구간 해시)] (찾을 수 없으면 None)
+
+    W 네임스페이스 접두사를 루트 선언에서 읽고, 그 접두사의 p/tbl/sdt 여닫는 태그만 세어
+    깊이 0 요소의 바이트 구간을 자른다. 정규식은 C로 돌고 파이썬 반복은 태그 수만큼이다.
+    """
+    decl = re.search(rb'xmlns(?::([\w.-]+))?="' + re.escape(W.encode('ascii')) + b'"', data)
+    if decl is None:
+        return None
+    prefix = decl.group(1) + b':' if decl.group(1) else b''
+    body = re.compile(rb'<' + re.escape(prefix) + rb'body(?=[\s/>])[^>]*>').search(data)
+    if body is None:
+        return None
+    token = re.compile(rb'<(/?)' + re.escape(prefix) + rb'(p|tbl|sdt)(?=[\s/>])[^>]*>')
+    spans = []
+    depth = 0
+    begin = 0
+    for m in token.finditer(data, body.end()):
+        if m.group(1):
+            depth -= 1
+            if depth == 0:
+                spans.append((m.group(2).decode('ascii'),
+                              hashlib.blake2b(data[begin:m.end()], digest_size=16).hexdigest()))
+            elif depth < 0:
+                return None
+        elif m.group(0).endswith(b'/>'):
+            if depth == 0:
+                spans.append((m.group(2).decode('ascii'),
+                              hashlib.blake2b(m.group(0), digest_size=16).hexdigest()))
+        else:
+            if depth == 0:
+                begin = m.start()
+            depth += 1
+    return spans if depth == 0 else None
+
+
+def _sect_pr_token_re(prefix):
+    """접두사별 sectPr 여닫는 태그 정규식 (캐시)"""
+    token = _SECT_PR_TOKEN_RES.get(prefix)
+    if token is None:
+        token = _SECT_PR_TOKEN_RES[prefix] = re.compile(
+            rb'<(/?)' + re.escape(prefix) + rb'sectPr(?=[\s/>])[^>]*>')
+    return token
+
+
+def _sect_pr_end(data, m):
+    """_SECT_PR_START_RE 매치에서 sectPr 조각의 끝 위치. 닫는 태그가 아직 없으면 None
+
+    w:sectPrChange 안의 이전 w:sectPr처럼 중첩된 sectPr을 세어 바깥 sectPr의 닫는 태그를 찾는다.
+    """
+    open_tag_end = data.find(b'>', m.start())
+    if open_tag_end < 0:
+        return None
+    if data[open_tag_end - 1:open_tag_end] == b'/':
+        return open_tag_end + 1
+    depth = 1
+    for t in _sect_pr_token_re(m.group(1) or b'').finditer(data, open_tag_end + 1):
+        if t.group(1):
+            depth -= 1
+            if depth == 0:
+                return t.end()
+        elif not t.group(0).endswith(b'/>'):
+            depth += 1
+    return None
+
+
+def _parse_sect_pr_fragment(fragment):
+    """sectPr 조각 바이트 → 노드 (파싱 실패 시 None)"""
+    ns_decls = ' '.join(f'xmlns:{k}="{v}"' for k, v in NS.items())
+    wrapped = f'<fragment {ns_decls}>'.encode('utf-8') + fragment + b'</fragment>'
+    try:
+        root = xml_backend.fromstring(wrapped)
+    except xml_backend.ParseError:
+        return None
+    sect_pr = root[0]
+    return sect_pr if sect_pr.tag == W_SECTPR else None
+
+
+def _parse_tail_sect_pr(tail):
+    """document.xml 꼬리 바이트에서 body 직계 sectPr 조각을 파싱. 확신할 수 없으면 None"""
+    # 가장 바깥 sectPr 중 마지막 것 (앞 조각 안에 중첩된 sectPr은 건너뜀)
+    m = end = None
+    pos = 0
+    for candidate in _SECT_PR_START_RE.finditer(tail):
+        if candidate.start() < pos:
+            continue
+        candidate_end = _sect_pr_end(tail, candidate)
+        if candidate_end is None:
+            return None
+        m, end = candidate, candidate_end
+        pos = end
+    if m is None:
+        return None
+    prefix = m.group(1) or b''
+
+    # 단락 내부(pPr) sectPr이 아니라 body 마지막 자식인지 확인
+    if not tail[end:].lstrip().startswith(b'</' + prefix + b'body>'):
+        return None
+    return _parse_sect_pr_fragment(tail[m.start():end])
+
+
+# ============================================================
+# 프로세스 내 모델 캐시
+# ============================================================
+
+_MODEL_CACHE = OrderedDict()
+_MODEL_CACHE_SIZE = 8
+# 캐시가 잡는 메모리 상한 (DocxModel.memory_estimate 합계) — 상주 서버/배치 호스트에서 큰 문서가 쌓이지 않게
+_MODEL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _trim_model_cache():
+    """개수/메모리 상한을 넘으면 오래된 모델부터 버린다 (_MODEL_CACHE_LOCK 안에서 호출)
+
+    파트는 모델을 돌려준 뒤 요청 시 파싱되므로, 방금 쓴 모델의 트리 크기는 다음 load_docx에서 반영된다.
+    """
+    total = sum(model.memory_estimate() for model in _MODEL_CACHE.values())
+    while _MODEL_CACHE and (len(_MODEL_CACHE) > _MODEL_CACHE_SIZE or total > _MODEL_CACHE_MAX_BYTES):
+        _, model = _MODEL_CACHE.popitem(last=False)
+        total -= model.memory_estimate()
+
+
+def load_docx(source, name=None):
+    """DocxModel을 반환. 같은 파일(경로+mtime+크기)은 프로세스 안에서 한 번만 파싱한다.
+
+    validate와 review를 한 프로세스에서 연달아 돌리는 호스트(배치 등)가
+    같은 문서를 다시 파싱하지 않도록 최근 몇 개 모델을 LRU로 보관한다.
+    bytes/파일 객체 입력은 캐시하지 않는다 (이미 만든 DocxModel은 그대로 반환).
+    여러 스레드에서 호출해도 안전하다.
+    """
+    if isinstance(source, DocxModel):
+        return source
+    if not is_path_source(source):
+        return DocxModel(source, name)
+    path = os.fspath(source)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'파일을 찾을 수 없습니다: {path}')
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, name)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+            _trim_model_cache()
+            return model
+    model = DocxModel(path, name)
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE[key] = model
+        _trim_model_cache()
+    return model
+
+
+def clear_model_cache():
+    """프로세스 내 모델 캐시 비우기 (벤치마크 반복 측정, 장기 실행 호스트의 메모리 회수)"""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+# 종료 시 캐시에 남은 큰 트리를 인터프리터 정리 단계 전에 해제한다
+# (정리 단계에서 해제하면 xlarge 문서 두 개에 약 2초가 걸린다)
+atexit.register(clear_model_cache)
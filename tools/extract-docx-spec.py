@@ -7,6 +7,18 @@ DOCX 스타일 명세 추출 스크립트 (ZIP + XML 방식)
 
 사용법: python -X utf8 tools/extract-docx-spec.py output/문서.docx
         python -X utf8 tools/extract-docx-spec.py output/문서.docx --json
+        python -X utf8 tools/extract-docx-spec.py output/문서.docx --json --no-cache
+        python -X utf8 tools/extract-docx-spec.py - --json < 문서.docx   (stdin으로 DOCX 바이트)
+        python -X utf8 tools/extract-docx-spec.py 레퍼런스.docx --only styles,pageSetup
+
+--only: 고른 항목만 추출한다. 그 항목이 읽는 파트만 파싱하므로 styles/pageSetup만 고르면
+styles.xml과 document.xml 꼬리(sectPr)만 읽어 큰 레퍼런스에서도 바로 끝난다.
+  항목: pageSetup, docDefaults, headingStyles, elementInventory, spacingPatterns, tableStyles, runProperties
+  묶음: styles(docDefaults+headingStyles+tableStyles), document(요소/간격/런 속성)
+
+--json 결과는 DOCX 내용 해시로 .cache/reports에 캐시된다 (--no-cache로 끔).
+--timings: 단계별(zip_open, xml_parse, extract_*, serialization) 소요 시간/최대 메모리
+--profile <경로>: cProfile 결과(pstats) 저장
 """
 
 import sys
@@ -14,33 +26,22 @@ import os
 import io
 import json
 import argparse
-import zipfile
-import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from docx_model import (W, R, load_docx, cli_docx_source,
+                        W_BODY, W_P, W_PPR, W_PSTYLE, W_R, W_RPR, W_T, W_BR, W_RFONTS, W_SZ, W_B,
+                        W_TR, W_TC, W_TCPR, W_TCW, W_SHD, W_SECTPR, W_PGSZ, W_PGMAR, W_STYLE,
+                        W_STYLEID, W_BASEDON, W_VAL, W_TYPE, W_FILL, W_W, W_H, W_ORIENT,
+                        W_ASCII, W_HANSI, W_EASTASIA)
+from xml_backend import ParseError
+from report_cache import cached_report
+from timings import phase, TimingSession, add_timing_arguments
 
 # Windows 터미널 한글 출력 보장
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# ============================================================
-# XML 네임스페이스
-# ============================================================
-NS = {
-    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
-    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
-    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
-}
-
-W = NS['w']
-R = NS['r']
-WP = NS['wp']
-A = NS['a']
-PIC = NS['pic']
-EMU_TO_PT = 1 / 12700  # EMU → pt
-
 # Known paper sizes (width x height in DXA, portrait orientation)
 PAPER_SIZES = {
     (12240, 15840): 'US Letter',
@@ -51,21 +52,60 @@ PAPER_SIZES = {
     (11907, 16839): 'A4',
 }
 
+# 네임스페이스 태그/속성 이름 (Clark 표기) — 단락/런마다 f-string을 만들지 않도록 미리 계산
+W_DOCDEFAULTS = f'{{{W}}}docDefaults'
+W_RPRDEFAULT = f'{{{W}}}rPrDefault'
+W_PPRDEFAULT = f'{{{W}}}pPrDefault'
+W_NAME = f'{{{W}}}name'
+W_SZCS = f'{{{W}}}szCs'
+W_LANG = f'{{{W}}}lang'
+W_I = f'{{{W}}}i'
+W_CAPS = f'{{{W}}}caps'
+W_COLOR = f'{{{W}}}color'
+W_HIGHLIGHT = f'{{{W}}}highlight'
+W_SPACING = f'{{{W}}}spacing'
+W_BEFORE = f'{{{W}}}before'
+W_AFTER = f'{{{W}}}after'
+W_LINE = f'{{{W}}}line'
+W_SPACE = f'{{{W}}}space'
+W_OUTLINELVL = f'{{{W}}}outlineLvl'
+W_KEEPNEXT = f'{{{W}}}keepNext'
+W_KEEPLINES = f'{{{W}}}keepLines'
+W_DRAWING = f'{{{W}}}drawing'
+W_COLS = f'{{{W}}}cols'
+W_NUM = f'{{{W}}}num'
+W_TBLPR = f'{{{W}}}tblPr'
+W_TBLCELLMAR = f'{{{W}}}tblCellMar'
+W_TBLBORDERS = f'{{{W}}}tblBorders'
+W_TBLSTYLEPR = f'{{{W}}}tblStylePr'
+W_TCBORDERS = f'{{{W}}}tcBorders'
+R_ID = f'{{{R}}}id'
+
+# 이름 → 태그/속성 (결과 키는 로컬 이름)
+_FONT_ATTRS = {name: f'{{{W}}}{name}' for name in ('ascii', 'eastAsia', 'hAnsi', 'cs')}
+_LANG_ATTRS = {name: f'{{{W}}}{name}' for name in ('val', 'eastAsia', 'bidi')}
+_SPACING_ATTRS = {name: f'{{{W}}}{name}' for name in ('before', 'after', 'line', 'lineRule')}
+_PG_MAR_ATTRS = {name: f'{{{W}}}{name}'
+                 for name in ('top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter')}
+_CELL_MARGIN_TAGS = {name: f'{{{W}}}{name}' for name in ('top', 'start', 'left', 'bottom', 'end', 'right')}
+_BORDER_TAGS = {name: f'{{{W}}}{name}' for name in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV')}
+_HEADER_FOOTER_REF_TAGS = {'headerRef': f'{{{W}}}headerReference', 'footerRef': f'{{{W}}}footerReference'}
+
 
 # ============================================================
 # XML 파싱 유틸리티
 # ============================================================
 
-def _attr(el, attr_name):
-    """w: 네임스페이스 속성 값 추출 (없으면 None)"""
+def _attr(el, attr):
+    """w: 네임스페이스 속성 값 추출 (attr: W_* 상수, 없으면 None)"""
     if el is None:
         return None
-    return el.get(f'{{{W}}}{attr_name}')
+    return el.get(attr)
 
 
-def _int_attr(el, attr_name, default=None):
+def _int_attr(el, attr, default=None):
     """w: 네임스페이스 정수 속성 값 추출"""
-    v = _attr(el, attr_name)
+    v = _attr(el, attr)
     if v is None:
         return default
     try:
@@ -75,19 +115,19 @@ def _int_attr(el, attr_name, default=None):
 
 
 def _find(el, *path):
-    """w: 네임스페이스 경로로 하위 요소 탐색"""
+    """w: 네임스페이스 경로(W_* 상수)로 하위 요소 탐색"""
     cur = el
-    for p in path:
+    for tag in path:
         if cur is None:
             return None
-        cur = cur.find(f'{{{W}}}{p}')
+        cur = cur.find(tag)
     return cur
 
 
 def _extract_text(element):
     """w:p 요소에서 텍스트 추출"""
     texts = []
-    for t in element.iter(f'{{{W}}}t'):
+    for t in element.iter(W_T):
         if t.text:
             texts.append(t.text)
     return ''.join(texts).strip()
@@ -95,11 +135,11 @@ def _extract_text(element):
 
 def _get_paragraph_style(p):
     """w:p 요소에서 스타일명 추출"""
-    pPr = p.find(f'{{{W}}}pPr')
+    pPr = p.find(W_PPR)
     if pPr is not None:
-        pStyle = pPr.find(f'{{{W}}}pStyle')
+        pStyle = pPr.find(W_PSTYLE)
         if pStyle is not None:
-            return pStyle.get(f'{{{W}}}val', '')
+            return pStyle.get(W_VAL, '')
     return ''
 
 
@@ -116,13 +156,11 @@ def _get_heading_level(style_name):
     return 0
 
 
-def _parse_xml_from_zip(z, path):
-    """ZIP 내 XML 파일 파싱. 없으면 None"""
-    if path not in z.namelist():
-        return None
+def _parse_xml_part(model, path):
+    """문서 모델의 XML 파트 파싱. 없거나 깨졌으면 None"""
     try:
-        return ET.parse(z.open(path)).getroot()
-    except Exception:
+        return model.part(path)
+    except ParseError:
         return None
 
 
@@ -131,20 +169,20 @@ def _parse_borders(border_el):
     if border_el is None:
         return None
     borders = {}
-    for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
-        b = border_el.find(f'{{{W}}}{side}')
+    for side, tag in _BORDER_TAGS.items():
+        b = border_el.find(tag)
         if b is not None:
             entry = {}
-            val = _attr(b, 'val')
+            val = _attr(b, W_VAL)
             if val:
                 entry['style'] = val
-            sz = _int_attr(b, 'sz')
+            sz = _int_attr(b, W_SZ)
             if sz is not None:
                 entry['size'] = sz
-            color = _attr(b, 'color')
+            color = _attr(b, W_COLOR)
             if color:
                 entry['color'] = color
-            space = _int_attr(b, 'space')
+            space = _int_attr(b, W_SPACE)
             if space is not None:
                 entry['space'] = space
             if entry:
@@ -157,10 +195,10 @@ def _parse_cell_margins(margins_el):
     if margins_el is None:
         return None
     result = {}
-    for side in ('top', 'start', 'left', 'bottom', 'end', 'right'):
-        m = margins_el.find(f'{{{W}}}{side}')
+    for side, tag in _CELL_MARGIN_TAGS.items():
+        m = margins_el.find(tag)
         if m is not None:
-            w_val = _int_attr(m, 'w')
+            w_val = _int_attr(m, W_W)
             if w_val is not None:
                 # normalize start→left, end→right
                 key = side
@@ -178,28 +216,32 @@ def _parse_cell_margins(margins_el):
 
 def extract_page_setup(doc_root):
     """word/document.xml의 w:sectPr에서 페이지 설정 추출"""
-    body = doc_root.find(f'{{{W}}}body')
+    body = doc_root.find(W_BODY)
     if body is None:
         return None
 
-    sect_pr = body.find(f'{{{W}}}sectPr')
+    sect_pr = body.find(W_SECTPR)
     if sect_pr is None:
         # 마지막 자식에서 찾기
         for child in reversed(list(body)):
-            sect_pr = child.find(f'{{{W}}}sectPr')
+            sect_pr = child.find(W_SECTPR)
             if sect_pr is not None:
                 break
     if sect_pr is None:
         return None
+    return _page_setup_from_sect_pr(sect_pr)
+
 
+def _page_setup_from_sect_pr(sect_pr):
+    """w:sectPr 노드 → 페이지 설정 dict"""
     result = {}
 
     # Page size
-    pg_sz = sect_pr.find(f'{{{W}}}pgSz')
+    pg_sz = sect_pr.find(W_PGSZ)
     if pg_sz is not None:
-        w = _int_attr(pg_sz, 'w')
-        h = _int_attr(pg_sz, 'h')
-        orient = _attr(pg_sz, 'orient')
+        w = _int_attr(pg_sz, W_W)
+        h = _int_attr(pg_sz, W_H)
+        orient = _attr(pg_sz, W_ORIENT)
         if w is not None:
             result['width'] = w
         if h is not None:
@@ -233,38 +275,51 @@ def extract_page_setup(doc_root):
             result['heightMm'] = round(h / 1440 * 25.4, 1)
 
     # Margins
-    pg_mar = sect_pr.find(f'{{{W}}}pgMar')
+    pg_mar = sect_pr.find(W_PGMAR)
     if pg_mar is not None:
         margins = {}
-        for side in ('top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter'):
-            v = _int_attr(pg_mar, side)
+        for side, attr in _PG_MAR_ATTRS.items():
+            v = _int_attr(pg_mar, attr)
             if v is not None:
                 margins[side] = v
         if margins:
             result['margins'] = margins
 
     # Header/footer references
-    for ref_type, tag in [('headerRef', 'headerReference'), ('footerRef', 'footerReference')]:
-        refs = sect_pr.findall(f'{{{W}}}{tag}')
+    for ref_type, tag in _HEADER_FOOTER_REF_TAGS.items():
+        refs = sect_pr.findall(tag)
         if refs:
             ref_list = []
             for ref in refs:
                 ref_list.append({
-                    'type': _attr(ref, 'type') or 'default',
-                    'rId': ref.get(f'{{{R}}}id', '')
+                    'type': _attr(ref, W_TYPE) or 'default',
+                    'rId': ref.get(R_ID, '')
                 })
             result[ref_type] = ref_list
 
     # Columns
-    cols = sect_pr.find(f'{{{W}}}cols')
+    cols = sect_pr.find(W_COLS)
     if cols is not None:
-        num = _int_attr(cols, 'num')
+        num = _int_attr(cols, W_NUM)
         if num and num > 1:
             result['columns'] = num
 
     return result
 
 
+def extract_page_setup_fast(model):
+    """document.xml 전체 트리 없이 페이지 설정 추출
+
+    body 직계 sectPr은 꼬리 스캔으로 얻는다 (이미 파싱된 트리가 있으면 그것을 쓴다).
+    body 직계 sectPr이 없는 문서만 전체 트리를 파싱해 extract_page_setup으로 찾는다.
+    """
+    sect_pr = model.scan_body_sect_pr()
+    if sect_pr is not None:
+        return _page_setup_from_sect_pr(sect_pr)
+    doc_root = _parse_xml_part(model, 'word/document.xml')
+    return extract_page_setup(doc_root) if doc_root is not None else None
+
+
 # ============================================================
 # 2. Document Defaults
 # ============================================================
@@ -274,21 +329,21 @@ def extract_doc_defaults(styles_root):
     if styles_root is None:
         return None
 
-    doc_defaults = styles_root.find(f'{{{W}}}docDefaults')
+    doc_defaults = styles_root.find(W_DOCDEFAULTS)
     if doc_defaults is None:
         return None
 
     result = {}
 
     # Run defaults (rPrDefault)
-    rpr_default = _find(doc_defaults, 'rPrDefault', 'rPr')
+    rpr_default = _find(doc_defaults, W_RPRDEFAULT, W_RPR)
     if rpr_default is not None:
         # Font
-        rfonts = rpr_default.find(f'{{{W}}}rFonts')
+        rfonts = rpr_default.find(W_RFONTS)
         if rfonts is not None:
             fonts = {}
-            for attr in ('ascii', 'eastAsia', 'hAnsi', 'cs'):
-                v = _attr(rfonts, attr)
+            for attr, qname in _FONT_ATTRS.items():
+                v = _attr(rfonts, qname)
                 if v:
                     fonts[attr] = v
             if fonts:
@@ -296,38 +351,38 @@ def extract_doc_defaults(styles_root):
                 result['fontDetails'] = fonts
 
         # Size
-        sz = rpr_default.find(f'{{{W}}}sz')
+        sz = rpr_default.find(W_SZ)
         if sz is not None:
-            v = _int_attr(sz, 'val')
+            v = _int_attr(sz, W_VAL)
             if v:
                 result['fontSize'] = v  # half-points
                 result['fontSizePt'] = v / 2
 
-        sz_cs = rpr_default.find(f'{{{W}}}szCs')
+        sz_cs = rpr_default.find(W_SZCS)
         if sz_cs is not None:
-            v = _int_attr(sz_cs, 'val')
+            v = _int_attr(sz_cs, W_VAL)
             if v:
                 result['fontSizeCs'] = v
 
         # Language
-        lang = rpr_default.find(f'{{{W}}}lang')
+        lang = rpr_default.find(W_LANG)
         if lang is not None:
             langs = {}
-            for attr in ('val', 'eastAsia', 'bidi'):
-                v = _attr(lang, attr)
+            for attr, qname in _LANG_ATTRS.items():
+                v = _attr(lang, qname)
                 if v:
                     langs[attr] = v
             if langs:
                 result['language'] = langs
 
     # Paragraph defaults (pPrDefault)
-    ppr_default = _find(doc_defaults, 'pPrDefault', 'pPr')
+    ppr_default = _find(doc_defaults, W_PPRDEFAULT, W_PPR)
     if ppr_default is not None:
-        spacing = ppr_default.find(f'{{{W}}}spacing')
+        spacing = ppr_default.find(W_SPACING)
         if spacing is not None:
             sp = {}
-            for attr in ('before', 'after', 'line', 'lineRule'):
-                v = _attr(spacing, attr)
+            for attr, qname in _SPACING_ATTRS.items():
+                v = _attr(spacing, qname)
                 if v is not None:
                     try:
                         sp[attr] = int(v)
@@ -350,9 +405,9 @@ def extract_heading_styles(styles_root):
 
     result = {}
 
-    for style_el in styles_root.findall(f'{{{W}}}style'):
-        style_id = style_el.get(f'{{{W}}}styleId', '')
-        style_type = style_el.get(f'{{{W}}}type', '')
+    for style_el in styles_root.findall(W_STYLE):
+        style_id = style_el.get(W_STYLEID, '')
+        style_type = style_el.get(W_TYPE, '')
 
         if style_type != 'paragraph':
             continue
@@ -364,28 +419,28 @@ def extract_heading_styles(styles_root):
         heading = {'styleId': style_id}
 
         # Display name
-        name_el = style_el.find(f'{{{W}}}name')
+        name_el = style_el.find(W_NAME)
         if name_el is not None:
-            heading['name'] = _attr(name_el, 'val') or ''
+            heading['name'] = _attr(name_el, W_VAL) or ''
 
         # Based on
-        based_on = style_el.find(f'{{{W}}}basedOn')
+        based_on = style_el.find(W_BASEDON)
         if based_on is not None:
-            heading['basedOn'] = _attr(based_on, 'val') or ''
+            heading['basedOn'] = _attr(based_on, W_VAL) or ''
 
         # Outline level
-        pPr = style_el.find(f'{{{W}}}pPr')
+        pPr = style_el.find(W_PPR)
         if pPr is not None:
-            outline = pPr.find(f'{{{W}}}outlineLvl')
+            outline = pPr.find(W_OUTLINELVL)
             if outline is not None:
-                heading['outlineLevel'] = _int_attr(outline, 'val')
+                heading['outlineLevel'] = _int_attr(outline, W_VAL)
 
             # Spacing
-            spacing = pPr.find(f'{{{W}}}spacing')
+            spacing = pPr.find(W_SPACING)
             if spacing is not None:
                 sp = {}
-                for attr in ('before', 'after', 'line', 'lineRule'):
-                    v = _attr(spacing, attr)
+                for attr, qname in _SPACING_ATTRS.items():
+                    v = _attr(spacing, qname)
                     if v is not None:
                         try:
                             sp[attr] = int(v)
@@ -395,20 +450,20 @@ def extract_heading_styles(styles_root):
                     heading['spacing'] = sp
 
             # Keep next/with next
-            if pPr.find(f'{{{W}}}keepNext') is not None:
+            if pPr.find(W_KEEPNEXT) is not None:
                 heading['keepNext'] = True
-            if pPr.find(f'{{{W}}}keepLines') is not None:
+            if pPr.find(W_KEEPLINES) is not None:
                 heading['keepLines'] = True
 
         # Run properties
-        rPr = style_el.find(f'{{{W}}}rPr')
+        rPr = style_el.find(W_RPR)
         if rPr is not None:
             # Font
-            rfonts = rPr.find(f'{{{W}}}rFonts')
+            rfonts = rPr.find(W_RFONTS)
             if rfonts is not None:
                 fonts = {}
-                for attr in ('ascii', 'eastAsia', 'hAnsi', 'cs'):
-                    v = _attr(rfonts, attr)
+                for attr, qname in _FONT_ATTRS.items():
+                    v = _attr(rfonts, qname)
                     if v:
                         fonts[attr] = v
                 if fonts:
@@ -417,37 +472,37 @@ def extract_heading_styles(styles_root):
                         heading['fontDetails'] = fonts
 
             # Size
-            sz = rPr.find(f'{{{W}}}sz')
+            sz = rPr.find(W_SZ)
             if sz is not None:
-                v = _int_attr(sz, 'val')
+                v = _int_attr(sz, W_VAL)
                 if v:
                     heading['size'] = v
                     heading['sizePt'] = v / 2
 
             # Color
-            color = rPr.find(f'{{{W}}}color')
+            color = rPr.find(W_COLOR)
             if color is not None:
-                c = _attr(color, 'val')
+                c = _attr(color, W_VAL)
                 if c:
                     heading['color'] = c
 
             # Bold
-            bold = rPr.find(f'{{{W}}}b')
+            bold = rPr.find(W_B)
             if bold is not None:
-                val = _attr(bold, 'val')
+                val = _attr(bold, W_VAL)
                 heading['bold'] = val != '0' and val != 'false'
             else:
                 # Headings are typically bold by default
                 heading['bold'] = True
 
             # Italic
-            italic = rPr.find(f'{{{W}}}i')
+            italic = rPr.find(W_I)
             if italic is not None:
-                val = _attr(italic, 'val')
+                val = _attr(italic, W_VAL)
                 heading['italic'] = val != '0' and val != 'false'
 
             # Caps
-            caps = rPr.find(f'{{{W}}}caps')
+            caps = rPr.find(W_CAPS)
             if caps is not None:
                 heading['caps'] = True
 
@@ -461,10 +516,9 @@ def extract_heading_styles(styles_root):
 # 4. Element Inventory
 # ============================================================
 
-def extract_element_inventory(doc_root):
-    """word/document.xml에서 요소 인벤토리 추출"""
-    body = doc_root.find(f'{{{W}}}body')
-    if body is None:
+def extract_element_inventory(model):
+    """문서 모델의 body 요소에서 요소 인벤토리 추출"""
+    if model.body is None:
         return None
 
     headings = {}
@@ -475,22 +529,23 @@ def extract_element_inventory(doc_root):
     page_breaks = 0
     empty_paragraphs = 0
 
-    for child in body:
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+    for el in model.elements:
+        tag = el.tag
+        child = el.node
 
         if tag == 'p':
-            text = _extract_text(child)
-            style = _get_paragraph_style(child)
+            text = el.text
+            style = el.style
             level = _get_heading_level(style)
 
             # Page break
-            for br in child.iter(f'{{{W}}}br'):
-                if br.get(f'{{{W}}}type') == 'page':
+            for br in child.iter(W_BR):
+                if br.get(W_TYPE) == 'page':
                     page_breaks += 1
 
             # Image
             has_image = False
-            for drawing in child.iter(f'{{{W}}}drawing'):
+            for drawing in child.iter(W_DRAWING):
                 has_image = True
                 images += 1
 
@@ -525,22 +580,22 @@ def extract_element_inventory(doc_root):
 
 def _extract_table_info(tbl):
     """단일 테이블의 상세 정보 추출"""
-    rows = list(tbl.findall(f'{{{W}}}tr'))
+    rows = list(tbl.findall(W_TR))
     row_count = len(rows)
 
     # Column count and widths from first row
     col_count = 0
     col_widths = []
     if rows:
-        first_row_cells = rows[0].findall(f'{{{W}}}tc')
+        first_row_cells = rows[0].findall(W_TC)
         col_count = len(first_row_cells)
         for tc in first_row_cells:
-            tc_pr = tc.find(f'{{{W}}}tcPr')
+            tc_pr = tc.find(W_TCPR)
             if tc_pr is not None:
-                tc_w = tc_pr.find(f'{{{W}}}tcW')
+                tc_w = tc_pr.find(W_TCW)
                 if tc_w is not None:
-                    w_val = _int_attr(tc_w, 'w')
-                    w_type = _attr(tc_w, 'type') or 'dxa'
+                    w_val = _int_attr(tc_w, W_W)
+                    w_type = _attr(tc_w, W_TYPE) or 'dxa'
                     col_widths.append({'width': w_val, 'type': w_type})
                 else:
                     col_widths.append(None)
@@ -550,9 +605,9 @@ def _extract_table_info(tbl):
     # Header row text
     header_text = []
     if rows:
-        for tc in rows[0].findall(f'{{{W}}}tc'):
+        for tc in rows[0].findall(W_TC):
             cell_texts = []
-            for p in tc.findall(f'{{{W}}}p'):
+            for p in tc.findall(W_P):
                 t = _extract_text(p)
                 if t:
                     cell_texts.append(t)
@@ -563,12 +618,12 @@ def _extract_table_info(tbl):
     header_fill = None
     body_fills = set()
     for i, tr in enumerate(rows):
-        for tc in tr.findall(f'{{{W}}}tc'):
-            tc_pr = tc.find(f'{{{W}}}tcPr')
+        for tc in tr.findall(W_TC):
+            tc_pr = tc.find(W_TCPR)
             if tc_pr is not None:
-                shd = tc_pr.find(f'{{{W}}}shd')
+                shd = tc_pr.find(W_SHD)
                 if shd is not None:
-                    fill = _attr(shd, 'fill')
+                    fill = _attr(shd, W_FILL)
                     if fill and fill.upper() != 'AUTO':
                         shading_colors.add(fill.upper())
                         if i == 0:
@@ -577,12 +632,12 @@ def _extract_table_info(tbl):
                             body_fills.add(fill.upper())
 
     # Cell margins (from tblPr)
-    tbl_pr = tbl.find(f'{{{W}}}tblPr')
+    tbl_pr = tbl.find(W_TBLPR)
     cell_margins = None
     tbl_borders = None
     if tbl_pr is not None:
-        cell_margins = _parse_cell_margins(tbl_pr.find(f'{{{W}}}tblCellMar'))
-        tbl_borders = _parse_borders(tbl_pr.find(f'{{{W}}}tblBorders'))
+        cell_margins = _parse_cell_margins(tbl_pr.find(W_TBLCELLMAR))
+        tbl_borders = _parse_borders(tbl_pr.find(W_TBLBORDERS))
 
     # Classify table type by shading
     table_type = 'data'
@@ -634,29 +689,29 @@ def _extract_table_info(tbl):
 
 def extract_spacing_patterns(doc_root):
     """문서 내 간격 패턴 분석"""
-    body = doc_root.find(f'{{{W}}}body')
+    body = doc_root.find(W_BODY)
     if body is None:
         return None
 
     spacing_combos = {}  # (before, after, line) → count
     spacer_paragraphs = 0  # empty paragraphs with only spacing
 
-    for p in body.iter(f'{{{W}}}p'):
+    for p in body.iter(W_P):
         text = _extract_text(p)
         style = _get_paragraph_style(p)
         level = _get_heading_level(style)
 
-        pPr = p.find(f'{{{W}}}pPr')
+        pPr = p.find(W_PPR)
         if pPr is None:
             continue
 
-        spacing = pPr.find(f'{{{W}}}spacing')
+        spacing = pPr.find(W_SPACING)
         if spacing is None:
             continue
 
-        before = _int_attr(spacing, 'before')
-        after = _int_attr(spacing, 'after')
-        line = _int_attr(spacing, 'line')
+        before = _int_attr(spacing, W_BEFORE)
+        after = _int_attr(spacing, W_AFTER)
+        line = _int_attr(spacing, W_LINE)
 
         # Spacer detection: empty paragraph with spacing
         if not text and not level:
@@ -700,57 +755,57 @@ def extract_table_styles(styles_root):
 
     result = []
 
-    for style_el in styles_root.findall(f'{{{W}}}style'):
-        style_type = style_el.get(f'{{{W}}}type', '')
+    for style_el in styles_root.findall(W_STYLE):
+        style_type = style_el.get(W_TYPE, '')
         if style_type != 'table':
             continue
 
-        style_id = style_el.get(f'{{{W}}}styleId', '')
-        name_el = style_el.find(f'{{{W}}}name')
-        name = _attr(name_el, 'val') if name_el is not None else style_id
+        style_id = style_el.get(W_STYLEID, '')
+        name_el = style_el.find(W_NAME)
+        name = _attr(name_el, W_VAL) if name_el is not None else style_id
 
         info = {'styleId': style_id, 'name': name}
 
         # Table properties
-        tbl_pr = style_el.find(f'{{{W}}}tblPr')
+        tbl_pr = style_el.find(W_TBLPR)
         if tbl_pr is not None:
-            borders = _parse_borders(tbl_pr.find(f'{{{W}}}tblBorders'))
+            borders = _parse_borders(tbl_pr.find(W_TBLBORDERS))
             if borders:
                 info['borders'] = borders
 
-            cell_mar = _parse_cell_margins(tbl_pr.find(f'{{{W}}}tblCellMar'))
+            cell_mar = _parse_cell_margins(tbl_pr.find(W_TBLCELLMAR))
             if cell_mar:
                 info['cellMargins'] = cell_mar
 
         # Conditional formats (firstRow, etc.)
         conditionals = {}
-        for tc_style in style_el.findall(f'{{{W}}}tblStylePr'):
-            cond_type = _attr(tc_style, 'type')
+        for tc_style in style_el.findall(W_TBLSTYLEPR):
+            cond_type = _attr(tc_style, W_TYPE)
             if not cond_type:
                 continue
 
             cond = {}
             # Run properties (font, color, bold)
-            rPr = tc_style.find(f'{{{W}}}rPr')
+            rPr = tc_style.find(W_RPR)
             if rPr is not None:
-                bold = rPr.find(f'{{{W}}}b')
+                bold = rPr.find(W_B)
                 if bold is not None:
                     cond['bold'] = True
-                color = rPr.find(f'{{{W}}}color')
+                color = rPr.find(W_COLOR)
                 if color is not None:
-                    c = _attr(color, 'val')
+                    c = _attr(color, W_VAL)
                     if c:
                         cond['fontColor'] = c
 
             # Table cell properties (fill)
-            tc_pr = tc_style.find(f'{{{W}}}tcPr')
+            tc_pr = tc_style.find(W_TCPR)
             if tc_pr is not None:
-                shd = tc_pr.find(f'{{{W}}}shd')
+                shd = tc_pr.find(W_SHD)
                 if shd is not None:
-                    fill = _attr(shd, 'fill')
+                    fill = _attr(shd, W_FILL)
                     if fill:
                         cond['fill'] = fill.upper()
-                borders = _parse_borders(tc_pr.find(f'{{{W}}}tcBorders'))
+                borders = _parse_borders(tc_pr.find(W_TCBORDERS))
                 if borders:
                     cond['borders'] = borders
 
@@ -771,7 +826,7 @@ def extract_table_styles(styles_root):
 
 def extract_run_properties(doc_root):
     """문서 내 모든 런의 폰트/크기/색상/볼드 조합을 컨텍스트별 분류"""
-    body = doc_root.find(f'{{{W}}}body')
+    body = doc_root.find(W_BODY)
     if body is None:
         return None
 
@@ -786,9 +841,9 @@ def extract_run_properties(doc_root):
     }
 
     def _process_runs(element, context):
-        for r in element.findall(f'{{{W}}}r'):
-            rPr = r.find(f'{{{W}}}rPr')
-            t = r.find(f'{{{W}}}t')
+        for r in element.findall(W_R):
+            rPr = r.find(W_RPR)
+            t = r.find(W_T)
             if t is None or not t.text or not t.text.strip():
                 continue
 
@@ -796,51 +851,51 @@ def extract_run_properties(doc_root):
 
             if rPr is not None:
                 # Font
-                rfonts = rPr.find(f'{{{W}}}rFonts')
+                rfonts = rPr.find(W_RFONTS)
                 if rfonts is not None:
-                    f = _attr(rfonts, 'ascii') or _attr(rfonts, 'hAnsi') or _attr(rfonts, 'eastAsia')
+                    f = _attr(rfonts, W_ASCII) or _attr(rfonts, W_HANSI) or _attr(rfonts, W_EASTASIA)
                     if f:
                         props['font'] = f
 
                 # Size
-                sz = rPr.find(f'{{{W}}}sz')
+                sz = rPr.find(W_SZ)
                 if sz is not None:
-                    v = _int_attr(sz, 'val')
+                    v = _int_attr(sz, W_VAL)
                     if v:
                         props['size'] = v
                         props['sizePt'] = v / 2
 
                 # Color
-                color = rPr.find(f'{{{W}}}color')
+                color = rPr.find(W_COLOR)
                 if color is not None:
-                    c = _attr(color, 'val')
+                    c = _attr(color, W_VAL)
                     if c:
                         props['color'] = c.upper()
 
                 # Bold
-                bold = rPr.find(f'{{{W}}}b')
+                bold = rPr.find(W_B)
                 if bold is not None:
-                    val = _attr(bold, 'val')
+                    val = _attr(bold, W_VAL)
                     if val != '0' and val != 'false':
                         props['bold'] = True
 
                 # Italic
-                italic = rPr.find(f'{{{W}}}i')
+                italic = rPr.find(W_I)
                 if italic is not None:
-                    val = _attr(italic, 'val')
+                    val = _attr(italic, W_VAL)
                     if val != '0' and val != 'false':
                         props['italic'] = True
 
                 # Highlight / shading on run
-                highlight = rPr.find(f'{{{W}}}highlight')
+                highlight = rPr.find(W_HIGHLIGHT)
                 if highlight is not None:
-                    h = _attr(highlight, 'val')
+                    h = _attr(highlight, W_VAL)
                     if h:
                         props['highlight'] = h
 
-                shd = rPr.find(f'{{{W}}}shd')
+                shd = rPr.find(W_SHD)
                 if shd is not None:
-                    fill = _attr(shd, 'fill')
+                    fill = _attr(shd, W_FILL)
                     if fill and fill.upper() != 'AUTO':
                         props['bgColor'] = fill.upper()
 
@@ -869,23 +924,23 @@ def extract_run_properties(doc_root):
                 _process_runs(child, 'bodyText')
 
         elif tag == 'tbl':
-            rows = list(child.findall(f'{{{W}}}tr'))
+            rows = list(child.findall(W_TR))
             for i, tr in enumerate(rows):
                 # Detect code block table (single column, dark shading)
                 is_code = False
-                for tc in tr.findall(f'{{{W}}}tc'):
-                    tc_pr = tc.find(f'{{{W}}}tcPr')
+                for tc in tr.findall(W_TC):
+                    tc_pr = tc.find(W_TCPR)
                     if tc_pr is not None:
-                        shd = tc_pr.find(f'{{{W}}}shd')
+                        shd = tc_pr.find(W_SHD)
                         if shd is not None:
-                            fill = (_attr(shd, 'fill') or '').upper()
+                            fill = (_attr(shd, W_FILL) or '').upper()
                             if fill in ('1E1E1E', '2D2D2D', '1E1F1E'):
                                 is_code = True
                     break
 
                 ctx = 'codeBlock' if is_code else ('tableHeader' if i == 0 else 'tableBody')
-                for tc in tr.findall(f'{{{W}}}tc'):
-                    for p in tc.findall(f'{{{W}}}p'):
+                for tc in tr.findall(W_TC):
+                    for p in tc.findall(W_P):
                         _process_runs(p, ctx)
 
     # Convert to sorted lists
@@ -903,49 +958,108 @@ def extract_run_properties(doc_root):
 # Main extraction
 # ============================================================
 
-def extract_spec(docx_path):
-    """DOCX 파일에서 종합 스타일 명세 추출"""
-    if not os.path.exists(docx_path):
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}", file=sys.stderr)
+def _open_docx(source):
+    """load_docx + 없는 파일이면 오류 출력 후 종료"""
+    try:
+        return load_docx(source)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(1)
 
-    spec = {'file': os.path.basename(docx_path)}
 
-    with zipfile.ZipFile(docx_path, 'r') as z:
-        # Parse core XML files
-        doc_root = _parse_xml_from_zip(z, 'word/document.xml')
-        styles_root = _parse_xml_from_zip(z, 'word/styles.xml')
+SPEC_SECTIONS = ('pageSetup', 'docDefaults', 'headingStyles', 'elementInventory',
+                 'spacingPatterns', 'tableStyles', 'runProperties')
 
+# --only에 쓸 수 있는 묶음 이름 — styles는 word/styles.xml만 읽는 항목
+SECTION_GROUPS = {
+    'styles': ('docDefaults', 'headingStyles', 'tableStyles'),
+    'document': ('elementInventory', 'spacingPatterns', 'runProperties'),
+}
+
+
+def parse_sections(value):
+    """--only 값 ('styles,pageSetup' 등, 쉼표 구분) → SPEC_SECTIONS 순서의 항목 튜플
+
+    모르는 이름이 있거나 비어 있으면 ValueError.
+    """
+    selected = set()
+    for name in (n.strip() for n in value.split(',')):
+        if not name:
+            continue
+        if name in SECTION_GROUPS:
+            selected.update(SECTION_GROUPS[name])
+        elif name in SPEC_SECTIONS:
+            selected.add(name)
+        else:
+            choices = ', '.join(SPEC_SECTIONS + tuple(SECTION_GROUPS))
+            raise ValueError(f'알 수 없는 항목: {name} (선택: {choices})')
+    if not selected:
+        raise ValueError('항목이 비어 있습니다')
+    return tuple(name for name in SPEC_SECTIONS if name in selected)
+
+
+def extract_spec(source, sections=None):
+    """DOCX 파일에서 종합 스타일 명세 추출
+
+    source: 경로, bytes, 바이너리 파일 객체 또는 DocxModel (load_docx 참조)
+    sections: 추출할 항목 (기본: 전체, parse_sections 참조). 고른 항목이 읽는 파트만 파싱하므로
+    스타일/페이지 설정만 고르면 document.xml 전체 트리를 만들지 않는다.
+    """
+    sections = tuple(sections or SPEC_SECTIONS)
+    model = _open_docx(source)
+
+    spec = {'file': model.name}
+
+    # Parse core XML files (고른 항목에 필요한 파트만)
+    doc_root = styles_root = None
+    if not set(sections).isdisjoint(SECTION_GROUPS['document']):
+        doc_root = _parse_xml_part(model, 'word/document.xml')
         if doc_root is None:
             print("[ERROR] word/document.xml을 파싱할 수 없습니다.", file=sys.stderr)
             sys.exit(1)
+    if not set(sections).isdisjoint(SECTION_GROUPS['styles']):
+        styles_root = _parse_xml_part(model, 'word/styles.xml')
 
-        # 1. Page Setup
-        page_setup = extract_page_setup(doc_root)
+    # 1. Page Setup
+    if 'pageSetup' in sections:
+        with phase('extract_page_setup'):
+            page_setup = extract_page_setup_fast(model)
         spec['pageSetup'] = page_setup or 'not found'
 
-        # 2. Document Defaults
-        doc_defaults = extract_doc_defaults(styles_root)
+    # 2. Document Defaults
+    if 'docDefaults' in sections:
+        with phase('extract_doc_defaults'):
+            doc_defaults = extract_doc_defaults(styles_root)
         spec['docDefaults'] = doc_defaults or 'not found (styles.xml missing or no docDefaults)'
 
-        # 3. Heading Styles
-        heading_styles = extract_heading_styles(styles_root)
+    # 3. Heading Styles
+    if 'headingStyles' in sections:
+        with phase('extract_heading_styles'):
+            heading_styles = extract_heading_styles(styles_root)
         spec['headingStyles'] = heading_styles or 'not found'
 
-        # 4. Element Inventory
-        elem_inv = extract_element_inventory(doc_root)
+    # 4. Element Inventory
+    if 'elementInventory' in sections:
+        with phase('extract_element_inventory'):
+            elem_inv = extract_element_inventory(model)
         spec['elementInventory'] = elem_inv or 'not found'
 
-        # 5. Spacing Patterns
-        spacing = extract_spacing_patterns(doc_root)
+    # 5. Spacing Patterns
+    if 'spacingPatterns' in sections:
+        with phase('extract_spacing_patterns'):
+            spacing = extract_spacing_patterns(doc_root)
         spec['spacingPatterns'] = spacing or 'not found'
 
-        # 6. Table Styles
-        table_styles = extract_table_styles(styles_root)
+    # 6. Table Styles
+    if 'tableStyles' in sections:
+        with phase('extract_table_styles'):
+            table_styles = extract_table_styles(styles_root)
         spec['tableStyles'] = table_styles or 'not found (no table styles in styles.xml)'
 
-        # 7. Run Properties Summary
-        run_props = extract_run_properties(doc_root)
+    # 7. Run Properties Summary
+    if 'runProperties' in sections:
+        with phase('extract_run_properties'):
+            run_props = extract_run_properties(doc_root)
         spec['runProperties'] = run_props or 'not found'
 
     return spec
@@ -965,183 +1079,190 @@ def print_text_report(spec):
     print(sep)
 
     # 1. Page Setup
-    print(f'\n{"1. Page Setup":}')
-    print(sub_sep)
-    ps = spec.get('pageSetup')
-    if isinstance(ps, str):
-        print(f'  {ps}')
-    elif ps:
-        print(f'  Size:        {ps.get("width", "?")} x {ps.get("height", "?")} DXA', end='')
-        if 'widthMm' in ps:
-            print(f'  ({ps["widthMm"]}mm x {ps["heightMm"]}mm)', end='')
-        print()
-        print(f'  Paper:       {ps.get("paperSize", "Unknown")}')
-        print(f'  Orientation: {ps.get("orientation", "Unknown")}')
-        margins = ps.get('margins', {})
-        if margins:
-            print(f'  Margins (DXA):')
-            for side in ('top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter'):
-                if side in margins:
-                    print(f'    {side:10s} {margins[side]:>6d}  ({margins[side] / 20:.1f}pt)')
-        if ps.get('headerRef'):
-            print(f'  Headers:     {len(ps["headerRef"])} reference(s)')
-        if ps.get('footerRef'):
-            print(f'  Footers:     {len(ps["footerRef"])} reference(s)')
+    if 'pageSetup' in spec:
+        print(f'\n{"1. Page Setup":}')
+        print(sub_sep)
+        ps = spec.get('pageSetup')
+        if isinstance(ps, str):
+            print(f'  {ps}')
+        elif ps:
+            print(f'  Size:        {ps.get("width", "?")} x {ps.get("height", "?")} DXA', end='')
+            if 'widthMm' in ps:
+                print(f'  ({ps["widthMm"]}mm x {ps["heightMm"]}mm)', end='')
+            print()
+            print(f'  Paper:       {ps.get("paperSize", "Unknown")}')
+            print(f'  Orientation: {ps.get("orientation", "Unknown")}')
+            margins = ps.get('margins', {})
+            if margins:
+                print(f'  Margins (DXA):')
+                for side in ('top', 'right', 'bottom', 'left', 'header', 'footer', 'gutter'):
+                    if side in margins:
+                        print(f'    {side:10s} {margins[side]:>6d}  ({margins[side] / 20:.1f}pt)')
+            if ps.get('headerRef'):
+                print(f'  Headers:     {len(ps["headerRef"])} reference(s)')
+            if ps.get('footerRef'):
+                print(f'  Footers:     {len(ps["footerRef"])} reference(s)')
 
     # 2. Document Defaults
-    print(f'\n{"2. Document Defaults":}')
-    print(sub_sep)
-    dd = spec.get('docDefaults')
-    if isinstance(dd, str):
-        print(f'  {dd}')
-    elif dd:
-        if 'font' in dd:
-            print(f'  Default font:  {dd["font"]}')
-        if 'fontDetails' in dd:
-            for k, v in dd['fontDetails'].items():
-                print(f'    {k:10s} → {v}')
-        if 'fontSizePt' in dd:
-            print(f'  Default size:  {dd["fontSizePt"]}pt (half-pt: {dd["fontSize"]})')
-        if 'language' in dd:
-            print(f'  Language:      {dd["language"]}')
-        if 'paragraphSpacing' in dd:
-            sp = dd['paragraphSpacing']
-            print(f'  Para spacing:  before={sp.get("before", 0)}, after={sp.get("after", 0)}, line={sp.get("line", 0)}')
+    if 'docDefaults' in spec:
+        print(f'\n{"2. Document Defaults":}')
+        print(sub_sep)
+        dd = spec.get('docDefaults')
+        if isinstance(dd, str):
+            print(f'  {dd}')
+        elif dd:
+            if 'font' in dd:
+                print(f'  Default font:  {dd["font"]}')
+            if 'fontDetails' in dd:
+                for k, v in dd['fontDetails'].items():
+                    print(f'    {k:10s} → {v}')
+            if 'fontSizePt' in dd:
+                print(f'  Default size:  {dd["fontSizePt"]}pt (half-pt: {dd["fontSize"]})')
+            if 'language' in dd:
+                print(f'  Language:      {dd["language"]}')
+            if 'paragraphSpacing' in dd:
+                sp = dd['paragraphSpacing']
+                print(f'  Para spacing:  before={sp.get("before", 0)}, after={sp.get("after", 0)}, line={sp.get("line", 0)}')
 
     # 3. Heading Styles
-    print(f'\n{"3. Heading Styles":}')
-    print(sub_sep)
-    hs = spec.get('headingStyles')
-    if isinstance(hs, str):
-        print(f'  {hs}')
-    elif hs:
-        for key in sorted(hs.keys()):
-            h = hs[key]
-            print(f'  {key}:')
-            if 'font' in h:
-                print(f'    Font:    {h["font"]}')
-            if 'sizePt' in h:
-                print(f'    Size:    {h["sizePt"]}pt')
-            if 'color' in h:
-                print(f'    Color:   #{h["color"]}')
-            if 'bold' in h:
-                print(f'    Bold:    {h["bold"]}')
-            if 'italic' in h:
-                print(f'    Italic:  {h["italic"]}')
-            if 'spacing' in h:
-                sp = h['spacing']
-                print(f'    Spacing: before={sp.get("before", 0)}, after={sp.get("after", 0)}')
+    if 'headingStyles' in spec:
+        print(f'\n{"3. Heading Styles":}')
+        print(sub_sep)
+        hs = spec.get('headingStyles')
+        if isinstance(hs, str):
+            print(f'  {hs}')
+        elif hs:
+            for key in sorted(hs.keys()):
+                h = hs[key]
+                print(f'  {key}:')
+                if 'font' in h:
+                    print(f'    Font:    {h["font"]}')
+                if 'sizePt' in h:
+                    print(f'    Size:    {h["sizePt"]}pt')
+                if 'color' in h:
+                    print(f'    Color:   #{h["color"]}')
+                if 'bold' in h:
+                    print(f'    Bold:    {h["bold"]}')
+                if 'italic' in h:
+                    print(f'    Italic:  {h["italic"]}')
+                if 'spacing' in h:
+                    sp = h['spacing']
+                    print(f'    Spacing: before={sp.get("before", 0)}, after={sp.get("after", 0)}')
 
     # 4. Element Inventory
-    print(f'\n{"4. Element Inventory":}')
-    print(sub_sep)
-    ei = spec.get('elementInventory')
-    if isinstance(ei, str):
-        print(f'  {ei}')
-    elif ei:
-        print(f'  Headings:          {ei.get("totalHeadings", 0)}', end='')
-        if ei.get('headings'):
-            parts = [f'{k}={v}' for k, v in sorted(ei['headings'].items())]
-            print(f'  ({", ".join(parts)})', end='')
-        print()
-        print(f'  Tables:            {ei.get("totalTables", 0)}')
-        print(f'  Paragraphs:        {ei.get("paragraphs", 0)}')
-        print(f'  List items:        {ei.get("listItems", 0)}')
-        print(f'  Images:            {ei.get("images", 0)}')
-        print(f'  Page breaks:       {ei.get("pageBreaks", 0)}')
-        print(f'  Empty paragraphs:  {ei.get("emptyParagraphs", 0)}')
-
-        tables = ei.get('tables', [])
-        if tables:
-            print(f'\n  Tables detail:')
-            for i, t in enumerate(tables):
-                hdr = ' | '.join(t.get('headerText', []))
-                if len(hdr) > 60:
-                    hdr = hdr[:57] + '...'
-                print(f'    [{i+1}] {t["type"]:16s} {t["rowCount"]:>3d} rows x {t["colCount"]:>2d} cols  [{hdr}]')
-                if t.get('colWidthsDxa'):
-                    widths_str = ', '.join(str(w) for w in t['colWidthsDxa'])
-                    print(f'        Widths (DXA): {widths_str}')
-                if t.get('headerFill'):
-                    print(f'        Header fill:  #{t["headerFill"]}')
-                if t.get('bodyFills'):
-                    print(f'        Body fills:   {", ".join("#"+f for f in t["bodyFills"])}')
+    if 'elementInventory' in spec:
+        print(f'\n{"4. Element Inventory":}')
+        print(sub_sep)
+        ei = spec.get('elementInventory')
+        if isinstance(ei, str):
+            print(f'  {ei}')
+        elif ei:
+            print(f'  Headings:          {ei.get("totalHeadings", 0)}', end='')
+            if ei.get('headings'):
+                parts = [f'{k}={v}' for k, v in sorted(ei['headings'].items())]
+                print(f'  ({", ".join(parts)})', end='')
+            print()
+            print(f'  Tables:            {ei.get("totalTables", 0)}')
+            print(f'  Paragraphs:        {ei.get("paragraphs", 0)}')
+            print(f'  List items:        {ei.get("listItems", 0)}')
+            print(f'  Images:            {ei.get("images", 0)}')
+            print(f'  Page breaks:       {ei.get("pageBreaks", 0)}')
+            print(f'  Empty paragraphs:  {ei.get("emptyParagraphs", 0)}')
+
+            tables = ei.get('tables', [])
+            if tables:
+                print(f'\n  Tables detail:')
+                for i, t in enumerate(tables):
+                    hdr = ' | '.join(t.get('headerText', []))
+                    if len(hdr) > 60:
+                        hdr = hdr[:57] + '...'
+                    print(f'    [{i+1}] {t["type"]:16s} {t["rowCount"]:>3d} rows x {t["colCount"]:>2d} cols  [{hdr}]')
+                    if t.get('colWidthsDxa'):
+                        widths_str = ', '.join(str(w) for w in t['colWidthsDxa'])
+                        print(f'        Widths (DXA): {widths_str}')
+                    if t.get('headerFill'):
+                        print(f'        Header fill:  #{t["headerFill"]}')
+                    if t.get('bodyFills'):
+                        print(f'        Body fills:   {", ".join("#"+f for f in t["bodyFills"])}')
 
     # 5. Spacing Patterns
-    print(f'\n{"5. Spacing Patterns":}')
-    print(sub_sep)
-    sp = spec.get('spacingPatterns')
-    if isinstance(sp, str):
-        print(f'  {sp}')
-    elif sp:
-        print(f'  Spacer paragraphs (empty + spacing): {sp.get("spacerParagraphs", 0)}')
-        patterns = sp.get('patterns', [])
-        if patterns:
-            print(f'  {"Context":10s} {"Before":>7s} {"After":>7s} {"Line":>7s} {"Count":>6s}')
-            for p in patterns[:15]:  # top 15
-                print(f'  {p["context"]:10s} {p["before"]:>7d} {p["after"]:>7d} {p["line"]:>7d} {p["count"]:>6d}')
-            if len(patterns) > 15:
-                print(f'  ... and {len(patterns) - 15} more unique combinations')
+    if 'spacingPatterns' in spec:
+        print(f'\n{"5. Spacing Patterns":}')
+        print(sub_sep)
+        sp = spec.get('spacingPatterns')
+        if isinstance(sp, str):
+            print(f'  {sp}')
+        elif sp:
+            print(f'  Spacer paragraphs (empty + spacing): {sp.get("spacerParagraphs", 0)}')
+            patterns = sp.get('patterns', [])
+            if patterns:
+                print(f'  {"Context":10s} {"Before":>7s} {"After":>7s} {"Line":>7s} {"Count":>6s}')
+                for p in patterns[:15]:  # top 15
+                    print(f'  {p["context"]:10s} {p["before"]:>7d} {p["after"]:>7d} {p["line"]:>7d} {p["count"]:>6d}')
+                if len(patterns) > 15:
+                    print(f'  ... and {len(patterns) - 15} more unique combinations')
 
     # 6. Table Styles
-    print(f'\n{"6. Table Styles (from styles.xml)":}')
-    print(sub_sep)
-    ts = spec.get('tableStyles')
-    if isinstance(ts, str):
-        print(f'  {ts}')
-    elif ts:
-        for s in ts:
-            print(f'  {s.get("styleId", "?")} ({s.get("name", "")})')
-            if s.get('borders'):
-                for side, b in s['borders'].items():
-                    print(f'    Border {side}: {b}')
-            if s.get('cellMargins'):
-                print(f'    Cell margins: {s["cellMargins"]}')
-            if s.get('conditionalFormats'):
-                for cond_type, cond in s['conditionalFormats'].items():
-                    parts = []
-                    if cond.get('fill'):
-                        parts.append(f'fill=#{cond["fill"]}')
-                    if cond.get('fontColor'):
-                        parts.append(f'font=#{cond["fontColor"]}')
-                    if cond.get('bold'):
-                        parts.append('bold')
-                    print(f'    {cond_type}: {", ".join(parts)}')
+    if 'tableStyles' in spec:
+        print(f'\n{"6. Table Styles (from styles.xml)":}')
+        print(sub_sep)
+        ts = spec.get('tableStyles')
+        if isinstance(ts, str):
+            print(f'  {ts}')
+        elif ts:
+            for s in ts:
+                print(f'  {s.get("styleId", "?")} ({s.get("name", "")})')
+                if s.get('borders'):
+                    for side, b in s['borders'].items():
+                        print(f'    Border {side}: {b}')
+                if s.get('cellMargins'):
+                    print(f'    Cell margins: {s["cellMargins"]}')
+                if s.get('conditionalFormats'):
+                    for cond_type, cond in s['conditionalFormats'].items():
+                        parts = []
+                        if cond.get('fill'):
+                            parts.append(f'fill=#{cond["fill"]}')
+                        if cond.get('fontColor'):
+                            parts.append(f'font=#{cond["fontColor"]}')
+                        if cond.get('bold'):
+                            parts.append('bold')
+                        print(f'    {cond_type}: {", ".join(parts)}')
 
     # 7. Run Properties
-    print(f'\n{"7. Run Properties Summary":}')
-    print(sub_sep)
-    rp = spec.get('runProperties')
-    if isinstance(rp, str):
-        print(f'  {rp}')
-    elif rp:
-        for context in ('heading', 'tableHeader', 'tableBody', 'codeBlock', 'bodyText', 'listItem'):
-            combos = rp.get(context)
-            if not combos:
-                continue
-            print(f'\n  [{context}] ({len(combos)} unique combinations)')
-            for c in combos[:5]:  # top 5
-                p = c['props']
-                parts = []
-                if 'font' in p:
-                    parts.append(p['font'])
-                if 'sizePt' in p:
-                    parts.append(f'{p["sizePt"]}pt')
-                if 'color' in p:
-                    parts.append(f'#{p["color"]}')
-                if p.get('bold'):
-                    parts.append('bold')
-                if p.get('italic'):
-                    parts.append('italic')
-                if 'bgColor' in p:
-                    parts.append(f'bg=#{p["bgColor"]}')
-                desc = ', '.join(parts) if parts else '(inherited defaults)'
-                sample = c.get('sample', '')
-                if sample:
-                    sample = f'  "{sample}"'
-                print(f'    x{c["count"]:>4d}  {desc}{sample}')
-            if len(combos) > 5:
-                print(f'    ... and {len(combos) - 5} more')
+    if 'runProperties' in spec:
+        print(f'\n{"7. Run Properties Summary":}')
+        print(sub_sep)
+        rp = spec.get('runProperties')
+        if isinstance(rp, str):
+            print(f'  {rp}')
+        elif rp:
+            for context in ('heading', 'tableHeader', 'tableBody', 'codeBlock', 'bodyText', 'listItem'):
+                combos = rp.get(context)
+                if not combos:
+                    continue
+                print(f'\n  [{context}] ({len(combos)} unique combinations)')
+                for c in combos[:5]:  # top 5
+                    p = c['props']
+                    parts = []
+                    if 'font' in p:
+                        parts.append(p['font'])
+                    if 'sizePt' in p:
+                        parts.append(f'{p["sizePt"]}pt')
+                    if 'color' in p:
+                        parts.append(f'#{p["color"]}')
+                    if p.get('bold'):
+                        parts.append('bold')
+                    if p.get('italic'):
+                        parts.append('italic')
+                    if 'bgColor' in p:
+                        parts.append(f'bg=#{p["bgColor"]}')
+                    desc = ', '.join(parts) if parts else '(inherited defaults)'
+                    sample = c.get('sample', '')
+                    if sample:
+                        sample = f'  "{sample}"'
+                    print(f'    x{c["count"]:>4d}  {desc}{sample}')
+                if len(combos) > 5:
+                    print(f'    ... and {len(combos) - 5} more')
 
     print(f'\n{sep}')
 
@@ -1150,21 +1271,47 @@ def print_text_report(spec):
 # Main
 # ============================================================
 
+def _sections_arg(value):
+    try:
+        return parse_sections(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='DOCX 스타일 명세 추출 — 레퍼런스 문서에서 페이지 설정, 폰트, 색상, 간격, 테이블 스타일 등을 종합 추출'
     )
-    parser.add_argument('docx_path', help='분석할 DOCX 파일 경로')
+    parser.add_argument('docx_path', help="분석할 DOCX 파일 경로 ('-'이면 stdin으로 DOCX 바이트)")
     parser.add_argument('--json', action='store_true', help='JSON 형식으로 출력')
+    parser.add_argument('--no-cache', action='store_true', help='리포트 캐시를 사용하지 않음 (항상 다시 추출)')
+    parser.add_argument('--only', type=_sections_arg, metavar='항목[,항목...]',
+                        help='고른 항목만 추출 (예: styles,pageSetup,headingStyles). 필요한 파트만 파싱한다')
+    add_timing_arguments(parser)
 
     args = parser.parse_args()
-
-    spec = extract_spec(args.docx_path)
+    options = {'only': list(args.only)} if args.only else None
+
+    with TimingSession(args.timings, args.profile) as session:
+        # 한 번 읽은 모델로 캐시 키(내용 해시)와 추출을 같이 처리한다
+        model = _open_docx(cli_docx_source(args.docx_path))
+        if args.json:
+            spec = cached_report(__file__, model, lambda: extract_spec(model, args.only),
+                                 options=options, use_cache=not args.no_cache)
+            with phase('serialization'):
+                output = json.dumps(spec, ensure_ascii=False, indent=2)
+        else:
+            spec = extract_spec(model, args.only)
+            with phase('serialization'):
+                print_text_report(spec)
 
     if args.json:
-        print(json.dumps(spec, ensure_ascii=False, indent=2))
+        if session.enabled:
+            spec['timings'] = session.report()
+            output = json.dumps(spec, ensure_ascii=False, indent=2)
+        print(output)
     else:
-        print_text_report(spec)
+        session.print_report()
 
 
 if __name__ == '__main__':
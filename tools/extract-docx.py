@@ -5,123 +5,38 @@ python-docx 의존성 없이, 내장 모듈만으로 DOCX 내용을 구조화하
 사용법: python -X utf8 tools/extract-docx.py output/문서.docx
         python -X utf8 tools/extract-docx.py output/문서.docx --json
         python -X utf8 tools/extract-docx.py output/문서.docx --extract-images output/images/
+        python -X utf8 tools/extract-docx.py output/문서.docx --json --timings [--profile out.prof]
+        python -X utf8 tools/extract-docx.py - --json < 문서.docx   (stdin으로 DOCX 바이트)
+
+--timings: 단계별 소요 시간/최대 메모리 (JSON 모드에서는 {"elements": [...], "timings": {...}}로 감싸서 출력)
+--profile <경로>: cProfile 결과(pstats) 저장
 """
 
 import sys
 import os
 import io
 import json
-import zipfile
-import xml.etree.ElementTree as ET
 
-# 동적 테마 색상 로드
+# 공유 문서 모델 (동적 테마 색상 포함)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from theme_colors import load_theme_color_sets
-_THEME_COLORS = load_theme_color_sets()
+from docx_model import NS, W, R, WP, A, EMU_TO_PT, load_docx, cli_docx_source
+from timings import phase, TimingSession, parse_timing_argv
 
 # Windows 터미널 한글 출력 보장
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# ============================================================
-# XML 네임스페이스
-# ============================================================
-NS = {
-    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
-    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
-    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
-}
-
-W = NS['w']
-R = NS['r']
-WP = NS['wp']
-A = NS['a']
-PIC = NS['pic']
-EMU_TO_PT = 1 / 12700  # EMU → pt 변환
-
-
 # ============================================================
 # XML 파싱 유틸리티
 # ============================================================
 
-def extract_text(element):
-    """w:p 요소에서 텍스트 추출"""
-    texts = []
-    for t in element.iter(f'{{{W}}}t'):
-        if t.text:
-            texts.append(t.text)
-    return ''.join(texts).strip()
-
-
-def get_paragraph_style(p):
-    """w:p 요소에서 스타일명 추출"""
-    pPr = p.find(f'{{{W}}}pPr')
-    if pPr is not None:
-        pStyle = pPr.find(f'{{{W}}}pStyle')
-        if pStyle is not None:
-            return pStyle.get(f'{{{W}}}val', '')
-    return ''
-
-
-def has_page_break(p):
-    """페이지 나누기 존재 여부"""
-    for br in p.iter(f'{{{W}}}br'):
-        if br.get(f'{{{W}}}type') == 'page':
-            return True
-    return False
-
-
-def get_table_shading(tbl):
-    """테이블 첫 번째 셀의 배경색"""
-    for tc in tbl.iter(f'{{{W}}}tc'):
-        tcPr = tc.find(f'{{{W}}}tcPr')
-        if tcPr is not None:
-            shd = tcPr.find(f'{{{W}}}shd')
-            if shd is not None:
-                return shd.get(f'{{{W}}}fill', '')
-        break
-    return ''
-
-
-def get_table_rows(tbl):
-    """테이블의 모든 행을 [row][col] 텍스트 배열로 추출"""
-    rows = []
-    for tr in tbl.findall(f'{{{W}}}tr'):
-        cells = []
-        for tc in tr.findall(f'{{{W}}}tc'):
-            cell_texts = []
-            for p in tc.findall(f'{{{W}}}p'):
-                t = extract_text(p)
-                if t:
-                    cell_texts.append(t)
-            cells.append('\n'.join(cell_texts))
-        rows.append(cells)
-    return rows
-
-
-def classify_table(tbl):
-    """테이블 유형 판별: code_dark, code_light, info_box, warning_box, data_table"""
-    bg = get_table_shading(tbl).upper()
-    rows = get_table_rows(tbl)
-    cols = len(rows[0]) if rows else 0
-
-    # 다크 코드블록 (동적 테마 색상)
-    if bg in _THEME_COLORS['dark_codes']:
-        return 'code_dark'
-    # 라이트 코드블록 / JSON
-    if cols == 1 and bg in _THEME_COLORS['light_codes']:
-        return 'code_light'
-    # 정보 박스
-    if cols == 1 and bg in _THEME_COLORS['info_boxes']:
-        return 'info_box'
-    # 경고 박스
-    if cols == 1 and bg in _THEME_COLORS['warning_boxes']:
-        return 'warning_box'
-    return 'data_table'
+def get_table_rows(el):
+    """테이블 요소(BodyElement)의 모든 행을 [row][col] 텍스트 배열로 추출"""
+    return [
+        ['\n'.join(t for t in cell if t) for cell in row]
+        for row in el.row_paragraphs
+    ]
 
 
 def get_heading_level(style_name):
@@ -144,17 +59,15 @@ def get_heading_level(style_name):
 # 이미지 관련
 # ============================================================
 
-def parse_relationships(z):
+def parse_relationships(model):
     """word/_rels/document.xml.rels에서 rId → 파일 경로 매핑 추출"""
     rels = {}
-    rels_path = 'word/_rels/document.xml.rels'
-    if rels_path not in z.namelist():
+    root = model.part('word/_rels/document.xml.rels')
+    if root is None:
         return rels
 
-    tree = ET.parse(z.open(rels_path))
-    root = tree.getroot()
     # rels 파일은 기본 네임스페이스가 다름
-    rel_ns = 'http://schemas.openxmlformats.org/package/2006/relationships'
+    rel_ns = NS['rel']
     for rel in root.findall(f'{{{rel_ns}}}Relationship'):
         rid = rel.get('Id', '')
         target = rel.get('Target', '')
@@ -210,12 +123,12 @@ def get_image_info(p, rels):
     return None
 
 
-def list_media_files(z):
+def list_media_files(model):
     """DOCX 내 word/media/ 에 있는 모든 파일 목록"""
-    return [n for n in z.namelist() if n.startswith('word/media/')]
+    return [n for n in model.namelist if n.startswith('word/media/')]
 
 
-def extract_images_to_dir(z, image_elements, output_dir):
+def extract_images_to_dir(model, image_elements, output_dir):
     """이미지 파일들을 지정 디렉토리에 추출"""
     os.makedirs(output_dir, exist_ok=True)
     extracted = []
@@ -226,7 +139,7 @@ def extract_images_to_dir(z, image_elements, output_dir):
         if not media_path:
             continue
         try:
-            data = z.read(media_path)
+            data = model.read(media_path)
             out_path = os.path.join(output_dir, el['filename'])
             with open(out_path, 'wb') as f:
                 f.write(data)
@@ -240,36 +153,40 @@ def extract_images_to_dir(z, image_elements, output_dir):
 # 메인 추출 로직
 # ============================================================
 
-def extract_document(docx_path, image_output_dir=None):
-    """DOCX에서 구조화된 콘텐츠 추출 (이미지 포함)"""
-    if not os.path.exists(docx_path):
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}", file=sys.stderr)
+def extract_document(source, image_output_dir=None):
+    """DOCX에서 구조화된 콘텐츠 추출 (이미지 포함)
+
+    source: 경로, bytes, 바이너리 파일 객체 또는 DocxModel (load_docx 참조)
+    """
+    try:
+        model = load_docx(source)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(1)
 
     elements = []
 
-    with zipfile.ZipFile(docx_path, 'r') as z:
-        # 릴레이션십 파싱 (rId → 이미지 파일 매핑)
-        rels = parse_relationships(z)
-        media_files = list_media_files(z)
-
-        # document.xml 파싱
-        tree = ET.parse(z.open('word/document.xml'))
-        root = tree.getroot()
-        body = root.find(f'{{{W}}}body')
-        if body is None:
-            print("[ERROR] document.xml에 body 요소가 없습니다.", file=sys.stderr)
-            sys.exit(1)
+    # 릴레이션십 파싱 (rId → 이미지 파일 매핑)
+    with phase('relationships'):
+        rels = parse_relationships(model)
+        media_files = list_media_files(model)
+
+    if model.body is None:
+        print("[ERROR] document.xml에 body 요소가 없습니다.", file=sys.stderr)
+        sys.exit(1)
 
-        for child in body:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+    body_elements = model.elements
+    with phase('classification'):
+        for body_el in body_elements:
+            tag = body_el.tag
+            child = body_el.node
 
             # ── 단락 (w:p) ──
             if tag == 'p':
-                text = extract_text(child)
-                style = get_paragraph_style(child)
+                text = body_el.text
+                style = body_el.style
                 level = get_heading_level(style)
-                is_break = has_page_break(child)
+                is_break = body_el.has_page_break
                 is_list = style.lower().startswith('list') if style else False
 
                 # 이미지 감지
@@ -294,8 +211,8 @@ def extract_document(docx_path, image_output_dir=None):
 
             # ── 테이블 (w:tbl) ──
             elif tag == 'tbl':
-                tbl_type = classify_table(child)
-                rows = get_table_rows(child)
+                tbl_type = body_el.tbl_type
+                rows = get_table_rows(body_el)
 
                 if tbl_type in ('code_dark', 'code_light'):
                     code_lines = []
@@ -323,11 +240,12 @@ def extract_document(docx_path, image_output_dir=None):
                             'rows': data
                         })
 
-        # 이미지 파일 추출
-        if image_output_dir:
-            extracted = extract_images_to_dir(z, elements, image_output_dir)
-            if extracted:
-                print(f"이미지 {len(extracted)}개 추출 → {image_output_dir}", file=sys.stderr)
+    # 이미지 파일 추출
+    if image_output_dir:
+        with phase('image_extract'):
+            extracted = extract_images_to_dir(model, elements, image_output_dir)
+        if extracted:
+            print(f"이미지 {len(extracted)}개 추출 → {image_output_dir}", file=sys.stderr)
 
     return elements, media_files
 
@@ -425,7 +343,7 @@ def print_stats(elements, media_files):
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("사용법: python -X utf8 tools/extract-docx.py <파일.docx> [--json] [--extract-images <출력폴더>]")
+        print("사용법: python -X utf8 tools/extract-docx.py <파일.docx> [--json] [--extract-images <출력폴더>] [--timings] [--profile <경로>]")
         sys.exit(1)
 
     docx_path = sys.argv[1]
@@ -441,11 +359,23 @@ if __name__ == '__main__':
             print("[ERROR] --extract-images 뒤에 출력 폴더를 지정하세요.", file=sys.stderr)
             sys.exit(1)
 
-    elements, media_files = extract_document(docx_path, image_output_dir)
+    timings, profile_path = parse_timing_argv(sys.argv)
+
+    with TimingSession(timings, profile_path) as session:
+        elements, media_files = extract_document(cli_docx_source(docx_path), image_output_dir)
+
+        with phase('serialization'):
+            if json_mode:
+                output = json.dumps(elements, ensure_ascii=False, indent=2)
+            else:
+                print_stats(elements, media_files)
+                print()
+                print_text(elements)
 
     if json_mode:
-        print_json(elements)
+        if session.enabled:
+            output = json.dumps({'elements': elements, 'timings': session.report()},
+                                ensure_ascii=False, indent=2)
+        print(output)
     else:
-        print_stats(elements, media_files)
-        print()
-        print_text(elements)
+        session.print_report()
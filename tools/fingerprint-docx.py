@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+DOCX 구조 지문 — 생성 문서 골든 파일 회귀 테스트용 압축 시그니처
+
+문서를 요소 유형·스타일·텍스트 해시·서식 해시·테이블 모양, 주요 스타일, 섹션 페이지 기하로
+정규화해 작은 JSON(골든 파일)으로 저장하고, 이후 빌드의 문서를 골든과 해시로만 비교한다.
+docProps(생성 시각 등)와 관계 ID(r:id, r:embed), 편집 세션 ID(w:rsid*, w14:paraId)는 빌드마다
+바뀌므로 지문에서 뺀다.
+
+확인 순서 (문서당):
+  1. docProps를 뺀 파트 바이트 해시가 골든과 같으면 XML을 파싱하지 않고 일치
+  2. 다르면 정규화 지문을 만들어 digest 비교 (관계 ID만 바뀐 경우 등은 일치)
+  3. 그래도 다르면 그때만 골든과 상세 비교 (바뀐 섹션/스타일, 요소 정렬 기반 추가·삭제·변경)
+
+사용법:
+  python -X utf8 tools/fingerprint-docx.py output/문서.docx                       # 지문 JSON 출력
+  python -X utf8 tools/fingerprint-docx.py "output/*.docx" --update tests/golden    # 골든 파일 작성/갱신
+  python -X utf8 tools/fingerprint-docx.py "output/*.docx" --check tests/golden     # 골든과 비교
+  python -X utf8 tools/fingerprint-docx.py "output/*.docx" --check tests/golden --workers 8 --jsonl
+
+골든 파일: <골든 폴더>/<문서 파일명>.fp.json (요소는 한 줄에 하나 — 변경 리뷰가 쉽도록)
+--check는 불일치/골든 없음/오류가 하나라도 있으면 exit 1.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import hashlib
+import argparse
+import zipfile
+
+# Windows 터미널 한글 출력 보장
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from docx_model import NS, W, load_docx, get_page_geometry
+from seq_diff import anchored_matches
+from batch_runner import VOLATILE_PART_PREFIXES, collect_docx_files, iter_results
+
+FINGERPRINT_VERSION = 1
+GOLDEN_SUFFIX = '.fp.json'
+
+# 빌드/편집마다 달라지는 속성: 관계 ID(r 네임스페이스 전체), rsid*, w14 단락/텍스트 ID
+_R_PREFIX = f'{{{NS["r"]}}}'
+_W14 = 'http://schemas.microsoft.com/office/word/2010/wordml'
+_VOLATILE_ATTRS = {f'{{{_W14}}}paraId', f'{{{_W14}}}textId'}
+
+_DIGEST = 16        # 파트/구성 요소 해시 (bytes)
+_ELEM_DIGEST = 6    # 요소별 텍스트/서식 해시 (bytes, hex 12자)
+
+# 요소 항목 [kind, style, textHash, formatHash, (shape)] 의 위치
+_KIND, _STYLE, _TEXT, _FORMAT, _SHAPE = range(5)
+
+_STYLE_REF_TAGS = tuple(f'{{{W}}}{name}' for name in ('pStyle', 'rStyle', 'tblStyle', 'numStyle'))
+
+
+# ============================================================
+# 정규화 해시
+# ============================================================
+
+_volatile_cache = {}
+
+
+def _is_volatile_attr(name):
+    volatile = _volatile_cache.get(name)
+    if volatile is None:
+        volatile = (name.startswith(_R_PREFIX) or name in _VOLATILE_ATTRS
+                    or name.rsplit('}', 1)[-1].startswith('rsid'))
+        _volatile_cache[name] = volatile
+    return volatile
+
+
+def _canonical_bytes(node):
+    """전위 순회로 태그·속성(정렬, 변동 속성 제외)·자식 수·잎 텍스트를 이어 붙인 바이트.
+
+    자식 수가 있으면 트리 모양이 하나로 정해지므로 닫는 표시가 필요 없다. 요소 사이 공백/꼬리
+    텍스트는 무시한다. 구분자는 XML에 올 수 없는 제어 문자라 값과 섞이지 않는다.
+    """
+    parts = []
+    append = parts.append
+    for n in node.iter():
+        append(n.tag)
+        attrib = n.attrib
+        if attrib:
+            for name in (sorted(attrib) if len(attrib) > 1 else attrib):
+                if not _is_volatile_attr(name):
+                    append('\x01' + name + '=' + attrib[name])
+        count = len(n)
+        if count:
+            append('\x03' + str(count))
+        elif n.text:
+            append('\x02' + n.text)
+    return '\x00'.join(parts).encode('utf-8')
+
+
+def canonical_digest(node, size=_DIGEST):
+    """노드의 정규화 해시 (hex). 백엔드(lxml/ElementTree)와 무관하게 같다"""
+    data = _canonical_bytes(node) if node is not None else b''
+    return hashlib.blake2b(data, digest_size=size).hexdigest()
+
+
+def _text_hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=_ELEM_DIGEST).hexdigest()
+
+
+def _json_digest(value):
+    data = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=_DIGEST).hexdigest()
+
+
+def parts_digest(zf):
+    """docProps를 뺀 모든 ZIP 파트(이름+내용)의 해시 — 같으면 지문도 같다 (파싱 없는 빠른 확인)"""
+    h = hashlib.blake2b(digest_size=_DIGEST)
+    for name in sorted(zf.namelist()):
+        if name.startswith(VOLATILE_PART_PREFIXES) or name.endswith('/'):
+            continue
+        h.update(name.encode('utf-8') + b'\x00')
+        h.update(hashlib.blake2b(zf.read(name), digest_size=_DIGEST).digest())
+    return h.hexdigest()
+
+
+# ============================================================
+# 지문 생성
+# ============================================================
+
+def _element_entries(model):
+    """body 요소별 [kind, style, textHash, formatHash, (테이블이면 'RxC')]"""
+    entries = []
+    for el in model.elements:
+        if el.tag == 'sectPr':
+            continue  # 섹션 기하로 따로 기록
+        if el.tag == 'tbl':
+            entries.append([el.tbl_type, '', _text_hash(el.text),
+                            canonical_digest(el.node, _ELEM_DIGEST), f'{el.row_count}x{el.col_count}'])
+        elif el.tag == 'p':
+            entries.append([el.kind, el.style, _text_hash(el.text), canonical_digest(el.node, _ELEM_DIGEST)])
+        else:
+            entries.append([el.tag, '', _text_hash(el.text), canonical_digest(el.node, _ELEM_DIGEST)])
+    return entries
+
+
+def _section_entries(model):
+    """섹션별 페이지 기하 + sectPr 정규화 해시 (머리글/바닥글 관계 ID 제외)"""
+    return [{'geometry': get_page_geometry(sp), 'digest': canonical_digest(sp)}
+            for sp in model.section_sect_prs]
+
+
+def _style_entries(model):
+    """주요 스타일 해시 — 본문이 참조하는 스타일과 그 basedOn 체인, 기본 스타일, docDefaults, 번호 매기기"""
+    styles = model.styles
+    result = {}
+    if styles is not None:
+        by_id = {st.get(f'{{{W}}}styleId', ''): st for st in styles.iter(f'{{{W}}}style')}
+        wanted = {sid for sid, st in by_id.items() if st.get(f'{{{W}}}default') in ('1', 'true')}
+        if model.document is not None:
+            for tag in _STYLE_REF_TAGS:
+                wanted.update(ref.get(f'{{{W}}}val', '') for ref in model.document.iter(tag))
+        pending = list(wanted)
+        while pending:
+            based = by_id.get(pending.pop())
+            parent = based.find(f'{{{W}}}basedOn') if based is not None else None
+            if parent is not None and parent.get(f'{{{W}}}val') not in wanted:
+                wanted.add(parent.get(f'{{{W}}}val'))
+                pending.append(parent.get(f'{{{W}}}val'))
+        for sid in sorted(wanted):
+            result[sid] = canonical_digest(by_id.get(sid)) if sid in by_id else None
+        result['@docDefaults'] = canonical_digest(styles.find(f'{{{W}}}docDefaults'))
+    result['@numbering'] = canonical_digest(model.part('word/numbering.xml'))
+    return result
+
+
+def fingerprint(source):
+    """DOCX 구조 지문 dict. source: 경로, bytes, 바이너리 파일 객체"""
+    model = load_docx(source)
+    sections = _section_entries(model)
+    styles = _style_entries(model)
+    elements = _element_entries(model)
+    digests = {
+        'sections': _json_digest(sections),
+        'styles': _json_digest(styles),
+        'elements': _json_digest(elements),
+    }
+    return {
+        'version': FINGERPRINT_VERSION,
+        'file': model.name,
+        'digest': _json_digest([FINGERPRINT_VERSION, digests]),
+        'parts': parts_digest(model.zip),
+        'digests': digests,
+        'sections': sections,
+        'styles': styles,
+        'elements': elements,
+    }
+
+
+def dumps_fingerprint(fp):
+    """골든 파일 텍스트 — 요소는 한 줄에 하나 (골든 갱신 diff를 읽기 쉽게)"""
+    lines = ['{']
+    items = list(fp.items())
+    for n, (key, value) in enumerate(items):
+        comma = ',' if n < len(items) - 1 else ''
+        if key == 'elements':
+            rows = ',\n'.join('  ' + json.dumps(e, ensure_ascii=False) for e in value)
+            lines.append(f' "elements": [\n{rows}\n ]{comma}' if rows else f' "elements": []{comma}')
+        else:
+            lines.append(f' {json.dumps(key)}: {json.dumps(value, ensure_ascii=False, sort_keys=True)}{comma}')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================================
+# 상세 비교 (digest 불일치 시에만)
+# ============================================================
+
+def _section_diffs(golden, current):
+    diffs = []
+    if len(golden) != len(current):
+        diffs.append({'field': 'sectionCount', 'golden': len(golden), 'current': len(current)})
+    for idx, (sg, sc) in enumerate(zip(golden, current)):
+        geo_g, geo_c = sg['geometry'] or {}, sc['geometry'] or {}
+        fields = [(k, geo_g.get(k), geo_c.get(k)) for k in ('width', 'height', 'orient')]
+        fields += [(f'margins.{k}', (geo_g.get('margins') or {}).get(k), (geo_c.get('margins') or {}).get(k))
+                   for k in ('top', 'bottom', 'left', 'right')]
+        changed = [{'section': idx, 'field': f, 'golden': g, 'current': c} for f, g, c in fields if g != c]
+        if not changed and sg['digest'] != sc['digest']:
+            changed.append({'section': idx, 'field': 'sectPr', 'golden': sg['digest'], 'current': sc['digest']})
+        diffs.extend(changed)
+    return diffs
+
+
+def _style_diffs(golden, current):
+    return {
+        'added': sorted(k for k in current if k not in golden),
+        'removed': sorted(k for k in golden if k not in current),
+        'changed': sorted(k for k in golden if k in current and golden[k] != current[k]),
+    }
+
+
+def _element_diffs(golden, current):
+    """요소 정렬(제목 앵커 + Myers) 기반 차이 — index는 removed/changed면 골든, added면 현재 위치"""
+    def keys(entries, width, ids):
+        return [ids.setdefault(tuple(e[:width]), len(ids)) for e in entries]
+
+    def headings(entries, lo, hi):
+        return [i - lo for i in range(lo, hi) if entries[i][_KIND] == 'heading']
+
+    def pair_diff(i, j):
+        eg, ec = golden[i], current[j]
+        if eg[_TEXT] != ec[_TEXT]:
+            return {'index': i, 'type': 'text_changed', 'element': eg[_KIND], 'style': eg[_STYLE]}
+        if eg[_SHAPE:] != ec[_SHAPE:]:
+            return {'index': i, 'type': 'table_shape', 'golden': eg[_SHAPE], 'current': ec[_SHAPE]}
+        if eg[_FORMAT] != ec[_FORMAT]:
+            return {'index': i, 'type': 'format_changed', 'element': eg[_KIND], 'style': eg[_STYLE]}
+        return None
+
+    ids = {}
+    full_g, full_c = keys(golden, _FORMAT, ids), keys(current, _FORMAT, ids)
+    matches = anchored_matches(full_g, full_c, headings(golden, 0, len(golden)),
+                               headings(current, 0, len(current)))
+    matches.append((len(golden), len(current)))
+
+    diffs = []
+    i = j = 0
+    for mi, mj in matches:
+        if mi > i or mj > j:
+            # 텍스트가 다른 구간 — 같은 유형·스타일끼리 다시 짝지어 text_changed, 나머지는 추가/삭제
+            kind_ids = {}
+            kg = keys(golden[i:mi], _TEXT, kind_ids)
+            kc = keys(current[j:mj], _TEXT, kind_ids)
+            pairs = [(i + a, j + b) for a, b in anchored_matches(kg, kc, headings(golden, i, mi),
+                                                                 headings(current, j, mj))]
+            pairs.append((mi, mj))
+            gi, gj = i, j
+            for pi, pj in pairs:
+                diffs.extend({'index': k, 'type': 'removed', 'element': golden[k][_KIND],
+                              'style': golden[k][_STYLE]} for k in range(gi, pi))
+                diffs.extend({'index': k, 'type': 'added', 'element': current[k][_KIND],
+                              'style': current[k][_STYLE]} for k in range(gj, pj))
+                if pi < mi:
+                    d = pair_diff(pi, pj)
+                    if d:
+                        diffs.append(d)
+                gi, gj = pi + 1, pj + 1
+        if mi < len(golden):
+            d = pair_diff(mi, mj)
+            if d:
+                diffs.append(d)
+        i, j = mi + 1, mj + 1
+    return diffs
+
+
+def compare_fingerprints(golden, current):
+    """골든과 현재 지문의 상세 차이 (구성 요소 digest가 다른 부분만)"""
+    details = {}
+    if golden.get('version') != current['version']:
+        details['version'] = {'golden': golden.get('version'), 'current': current['version']}
+        return details
+    if golden['digests']['sections'] != current['digests']['sections']:
+        details['sections'] = _section_diffs(golden['sections'], current['sections'])
+    if golden['digests']['styles'] != current['digests']['styles']:
+        details['styles'] = _style_diffs(golden['styles'], current['styles'])
+    if golden['digests']['elements'] != current['digests']['elements']:
+        details['elements'] = _element_diffs(golden['elements'], current['elements'])
+    return details
+
+
+# ============================================================
+# 골든 작성 / 확인 (워커)
+# ============================================================
+
+def golden_path_for(path, golden_dir):
+    return os.path.join(golden_dir, os.path.basename(path) + GOLDEN_SUFFIX)
+
+
+def _load_golden(golden_path):
+    with open(golden_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_one(path, golden_dir):
+    """문서 하나를 골든과 비교 → 결과 dict (status: match | mismatch | missing_golden | error)"""
+    start = time.perf_counter()
+    result = {'type': 'result', 'file': path}
+    golden_path = golden_path_for(path, golden_dir)
+    try:
+        if not os.path.isfile(golden_path):
+            result['status'] = 'missing_golden'
+        else:
+            golden = _load_golden(golden_path)
+            with zipfile.ZipFile(path) as zf:
+                fast = golden.get('version') == FINGERPRINT_VERSION and parts_digest(zf) == golden.get('parts')
+            if fast:
+                result['status'] = 'match'
+                result['fast'] = True
+            else:
+                current = fingerprint(path)
+                if current['digest'] == golden.get('digest'):
+                    result['status'] = 'match'
+                    result['fast'] = False
+                else:
+                    result['status'] = 'mismatch'
+                    result['details'] = compare_fingerprints(golden, current)
+    except zipfile.BadZipFile as e:
+        result['status'] = 'error'
+        result['error'] = f'Invalid DOCX: {e}'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def update_one(path, golden_dir):
+    """골든 파일 작성 — 내용이 같으면 다시 쓰지 않는다 (status: written | unchanged | error)"""
+    start = time.perf_counter()
+    result = {'type': 'result', 'file': path}
+    golden_path = golden_path_for(path, golden_dir)
+    try:
+        text = dumps_fingerprint(fingerprint(path))
+        old = None
+        if os.path.isfile(golden_path):
+            with open(golden_path, 'r', encoding='utf-8') as f:
+                old = f.read()
+        if old == text:
+            result['status'] = 'unchanged'
+        else:
+            with open(golden_path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(text)
+            result['status'] = 'written'
+    except zipfile.BadZipFile as e:
+        result['status'] = 'error'
+        result['error'] = f'Invalid DOCX: {e}'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _crashed(task, e):
+    """워커 프로세스 자체가 죽은 경우(BrokenProcessPool 등)의 결과 행"""
+    return {'type': 'result', 'file': task[0], 'status': 'error',
+            'error': f'{type(e).__name__}: {e}', 'seconds': None}
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _details_lines(details, limit=10):
+    lines = []
+    if 'version' in details:
+        lines.append(f"    fingerprint version: golden={details['version']['golden']} current={details['version']['current']}")
+    for d in details.get('sections', []):
+        lines.append(f"    section[{d.get('section', '-')}] {d['field']}: {d['golden']} → {d['current']}")
+    styles = details.get('styles')
+    if styles:
+        for key in ('changed', 'added', 'removed'):
+            if styles[key]:
+                lines.append(f"    styles {key}: {', '.join(styles[key][:limit])}")
+    elements = details.get('elements', [])
+    for d in elements[:limit]:
+        if d['type'] == 'table_shape':
+            lines.append(f"    [{d['index']}] table_shape: {d['golden']} → {d['current']}")
+        else:
+            style = f" ({d['style']})" if d.get('style') else ''
+            lines.append(f"    [{d['index']}] {d['type']}: {d['element']}{style}")
+    if len(elements) > limit:
+        lines.append(f'    ... and {len(elements) - limit} more element differences')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DOCX 구조 지문 (골든 파일 회귀 테스트)')
+    parser.add_argument('patterns', nargs='+', help='DOCX 파일 또는 glob 패턴')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--check', metavar='GOLDEN_DIR', help='골든 파일과 비교 (불일치가 있으면 exit 1)')
+    mode.add_argument('--update', metavar='GOLDEN_DIR', help='골든 파일 작성/갱신')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='워커 프로세스 수 (기본: CPU 코어 수, 1이면 순차 실행)')
+    parser.add_argument('--jsonl', action='store_true', help='결과를 JSON Lines로 출력 (마지막 줄은 요약)')
+    args = parser.parse_args()
+
+    files = collect_docx_files(args.patterns)
+    if not files:
+        print('ERROR: no DOCX files matched')
+        sys.exit(1)
+
+    if not args.check and not args.update:
+        for path in files:
+            try:
+                sys.stdout.write(dumps_fingerprint(fingerprint(path)))
+            except (FileNotFoundError, zipfile.BadZipFile) as e:
+                print(f'ERROR: {path}: {e}')
+                sys.exit(1)
+        return
+
+    golden_dir = args.check or args.update
+    func = check_one if args.check else update_one
+    if args.update:
+        os.makedirs(golden_dir, exist_ok=True)
+    workers = max(1, min(args.workers, len(files)))
+
+    start = time.perf_counter()
+    counts = {}
+    for r in iter_results(func, [(path, golden_dir) for path in files], workers, _crashed):
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+        if args.jsonl:
+            print(json.dumps(r, ensure_ascii=False), flush=True)
+            continue
+        if r['status'] in ('match', 'unchanged'):
+            continue
+        detail = f" {r['error']}" if r['status'] == 'error' else ''
+        print(f"{r['status'].upper():<15} {r['file']}{detail}", flush=True)
+        for line in _details_lines(r.get('details', {})):
+            print(line)
+
+    summary = {'type': 'summary', 'files': len(files), 'byStatus': counts,
+               'workers': workers, 'wallSeconds': round(time.perf_counter() - start, 3)}
+    if args.jsonl:
+        print(json.dumps(summary, ensure_ascii=False), flush=True)
+    else:
+        by_status = ', '.join(f'{k}={v}' for k, v in sorted(counts.items()))
+        print(f"\n  {len(files)} files: {by_status} ({summary['wallSeconds']:.2f}s, workers: {workers})")
+
+    ok = ('match',) if args.check else ('written', 'unchanged')
+    sys.exit(0 if all(k in ok for k in counts) else 1)
+
+
+if __name__ == '__main__':
+    main()
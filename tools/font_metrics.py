@@ -0,0 +1,631 @@
+"""
+글꼴 메트릭 기반 텍스트 너비/줄바꿈 추정 — validate/review 도구가 공유하는 모듈.
+
+사용법:
+    from font_metrics import text_width_dxa, count_lines
+    w = text_width_dxa('주문 API request', 'Malgun Gothic', 9)       # 렌더링 너비 (DXA)
+    n = count_lines(text, 12720, 'Malgun Gothic', 10)                 # 콘텐츠 폭에서 줄 수
+    n = count_lines(text, 4000, 'Arial', 9, east_asia='Malgun Gothic') # 라틴/동아시아 글꼴 분리
+    ws = text_widths_pt(cell_texts, 'Malgun Gothic', 9)                # 여러 텍스트 한 번에 (pt 목록)
+
+글꼴 파일(TTF/OTF/TTC)의 cmap/hmtx 테이블에서 실제 advance width를 읽어, 코드포인트 256개
+단위 블록의 배열(1/1000 em, uint16)로 컴파일한다. 결과는 .cache/fonts/에 바이너리로 저장하고,
+다음 실행은 글꼴 파일의 mtime/크기가 같으면 파싱 없이 배열만 읽는다. 너비는 글꼴 조합별 글자 폭 표
+(처음 나온 글자만 배열에서 찾아 채움)의 합이고, 줄바꿈 시뮬레이션은 한 줄을 넘는 텍스트만
+(텍스트, 폭, 글꼴) 단위로 메모이즈한다.
+
+글꼴 파일을 찾지 못하면 내장 근사 메트릭을 쓴다 — 한글·CJK는 전각 1em, 라틴은 Helvetica 계열
+폭, 고정폭 글꼴은 0.55em. 이전 고정 상수(9pt 기준 한글 180 / 라틴 90 DXA)와 같은 척도다.
+글꼴에 없는 글자(예: Consolas의 한글)는 Word처럼 대체 글꼴로 그리는 것으로 보고 내장 폭을 쓴다.
+
+글꼴 검색 위치: OS 기본 글꼴 폴더 + GENDOCS_FONT_DIRS (os.pathsep 구분)
+캐시 위치: GENDOCS_FONT_CACHE_DIR (기본: <프로젝트>/.cache/fonts)
+
+    python -X utf8 tools/font_metrics.py                  # 테마 글꼴의 메트릭 출처 확인 + 캐시 생성
+    python -X utf8 tools/font_metrics.py "Malgun Gothic" "측정할 텍스트"
+"""
+
+import os
+import sys
+import json
+import glob
+import struct
+import hashlib
+import tempfile
+import threading
+from array import array
+from functools import lru_cache
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TOOLS_DIR)
+
+DEFAULT_FONT = 'Malgun Gothic'    # 템플릿 기본 글꼴 (themes/*.json fonts.default)
+DEFAULT_SIZE_PT = 10.0            # 템플릿 본문 크기 (sizes.body = 20 half-pt)
+DEFAULT_FONT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'fonts')
+
+# 캐시 파일 형식 — 바꾸면 이전 캐시는 자연히 무시된다
+_MAGIC = b'GDFM'
+_FORMAT_VERSION = 1
+_BLOCK = 256
+
+EM = 1000                         # 내부 단위: 1/1000 em
+BOLD_SYNTH_FACTOR = 1.05          # 볼드 글꼴 파일이 없을 때 라틴 글자 폭 보정
+
+# 글꼴 이름 → (일반, 볼드) 파일명 후보. 목록에 없으면 이름으로 파일을 추정한다
+_FONT_FILES = {
+    'malgun gothic': (['malgun.ttf'], ['malgunbd.ttf']),
+    'consolas': (['consola.ttf'], ['consolab.ttf']),
+    'arial': (['arial.ttf', 'LiberationSans-Regular.ttf'], ['arialbd.ttf', 'LiberationSans-Bold.ttf']),
+    'calibri': (['calibri.ttf', 'Carlito-Regular.ttf'], ['calibrib.ttf', 'Carlito-Bold.ttf']),
+    'segoe ui': (['segoeui.ttf'], ['segoeuib.ttf']),
+    'courier new': (['cour.ttf', 'LiberationMono-Regular.ttf'], ['courbd.ttf', 'LiberationMono-Bold.ttf']),
+    'times new roman': (['times.ttf', 'LiberationSerif-Regular.ttf'], ['timesbd.ttf', 'LiberationSerif-Bold.ttf']),
+    'nanum gothic': (['NanumGothic.ttf'], ['NanumGothicBold.ttf']),
+    'nanumgothiccoding': (['NanumGothicCoding.ttf'], ['NanumGothicCoding-Bold.ttf']),
+    'd2coding': (['D2Coding.ttf', 'D2Coding-Ver1.3.2-20180524.ttf'], ['D2CodingBold.ttf']),
+    'noto sans kr': (['NotoSansKR-Regular.otf', 'NotoSansKR-Regular.ttf', 'NotoSansCJKkr-Regular.otf',
+                      'NotoSansCJK-Regular.ttc'],
+                     ['NotoSansKR-Bold.otf', 'NotoSansKR-Bold.ttf', 'NotoSansCJKkr-Bold.otf',
+                      'NotoSansCJK-Bold.ttc']),
+    'apple sd gothic neo': (['AppleSDGothicNeo.ttc'], []),
+}
+
+# rFonts에 한글 이름으로 들어오는 글꼴
+_FONT_ALIASES = {
+    '맑은 고딕': 'malgun gothic',
+    '나눔고딕': 'nanum gothic',
+    '나눔고딕코딩': 'nanumgothiccoding',
+}
+
+# 파일이 없을 때 고정폭 내장 메트릭을 쓰는 글꼴
+MONOSPACE_FONTS = frozenset({
+    'consolas', 'courier new', 'courier', 'd2coding', 'nanumgothiccoding', 'cascadia code',
+    'cascadia mono', 'menlo', 'monaco', 'source code pro', 'jetbrains mono', 'lucida console',
+    'liberation mono', 'dejavu sans mono', 'monospace',
+})
+
+# Helvetica / Helvetica-Bold AFM 폭 (U+0020..U+007E, 1/1000 em)
+_HELVETICA = (
+    '278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 '
+    '556 556 278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 '
+    '667 778 722 667 611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 '
+    '556 222 222 500 222 833 556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584')
+_HELVETICA_BOLD = (
+    '278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 '
+    '556 556 333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 '
+    '667 778 722 667 611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 '
+    '611 278 278 556 278 889 611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584')
+_LATIN_DEFAULT = 556              # ASCII 밖 비동아시아 글자 (라틴 확장, 기호 ...)
+_MONO_WIDTH = 550                 # Consolas 1126/2048 em
+_WIDE_WIDTH = EM                  # 한글·CJK·전각
+
+
+def is_east_asian(cp):
+    """동아시아 글꼴(rFonts eastAsia)로 그리는 전각 글자인지"""
+    return (0x1100 <= cp <= 0x11FF or     # 한글 자모
+            0x2E80 <= cp <= 0x9FFF or     # CJK 부수·기호·가나·한글 호환 자모·한자
+            0xAC00 <= cp <= 0xD7AF or     # 한글 음절
+            0xF900 <= cp <= 0xFAFF or     # CJK 호환 한자
+            0xFE30 <= cp <= 0xFE4F or     # CJK 호환 형태
+            0xFF00 <= cp <= 0xFF60 or     # 전각 ASCII
+            0xFFE0 <= cp <= 0xFFE6)
+
+
+def normalize_font_name(name):
+    name = (name or '').strip().lower()
+    return _FONT_ALIASES.get(name, name)
+
+
+# ============================================================
+# 메트릭
+# ============================================================
+
+class FontMetrics:
+    """코드포인트 → advance width (1/1000 em). blocks: {cp >> 8: array('H', 256)}, 0 = 글자 없음"""
+
+    def __init__(self, name, bold, blocks, source):
+        self.name = name
+        self.bold = bold
+        self.blocks = blocks
+        self.source = source          # 글꼴 파일 경로 또는 'builtin'
+        self.monospace = normalize_font_name(name) in MONOSPACE_FONTS
+
+    def advance(self, cp):
+        block = self.blocks.get(cp >> 8)
+        if block is not None:
+            width = block[cp & 0xFF]
+            if width:
+                return width
+        return builtin_advance(cp, self.bold, self.monospace)
+
+
+def builtin_advance(cp, bold=False, monospace=False):
+    """글꼴 파일 없이 쓰는 근사 폭 (1/1000 em)"""
+    if is_east_asian(cp):
+        return _WIDE_WIDTH
+    if monospace:
+        return _MONO_WIDTH
+    if 0x20 <= cp <= 0x7E:
+        return (_HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS)[cp - 0x20]
+    if cp < 0x20 or 0x300 <= cp <= 0x36F or cp in (0x200B, 0x200C, 0x200D, 0xFEFF):
+        return 0                      # 제어 문자 / 결합 문자 / 폭 없는 공백
+    return _LATIN_DEFAULT
+
+
+_HELVETICA_WIDTHS = tuple(int(w) for w in _HELVETICA.split())
+_HELVETICA_BOLD_WIDTHS = tuple(int(w) for w in _HELVETICA_BOLD.split())
+
+
+# ============================================================
+# 글꼴 파일 (SFNT: TrueType / OpenType / TTC)
+# ============================================================
+
+def _cmap_subtable(data, cmap_off):
+    """유니코드 cmap 서브테이블 오프셋 (format 12 우선, 없으면 format 4). 없으면 None"""
+    num = struct.unpack_from('>H', data, cmap_off + 2)[0]
+    found = {}
+    for i in range(num):
+        platform, encoding, offset = struct.unpack_from('>HHI', data, cmap_off + 4 + 8 * i)
+        sub = cmap_off + offset
+        fmt = struct.unpack_from('>H', data, sub)[0]
+        if (platform == 3 and encoding in (1, 10)) or platform == 0:
+            found.setdefault(fmt, sub)
+    return found.get(12) or found.get(4)
+
+
+def _cmap_entries(data, sub):
+    """(코드포인트, glyph id) — BMP만"""
+    fmt = struct.unpack_from('>H', data, sub)[0]
+    if fmt == 12:
+        groups = struct.unpack_from('>I', data, sub + 12)[0]
+        for i in range(groups):
+            start, end, gid = struct.unpack_from('>III', data, sub + 16 + 12 * i)
+            for cp in range(start, min(end, 0xFFFF) + 1):
+                yield cp, gid + cp - start
+        return
+    seg_x2 = struct.unpack_from('>H', data, sub + 6)[0]
+    seg = seg_x2 // 2
+    ends = struct.unpack_from(f'>{seg}H', data, sub + 14)
+    starts = struct.unpack_from(f'>{seg}H', data, sub + 16 + seg_x2)
+    deltas = struct.unpack_from(f'>{seg}h', data, sub + 16 + 2 * seg_x2)
+    range_pos = sub + 16 + 3 * seg_x2
+    range_offsets = struct.unpack_from(f'>{seg}H', data, range_pos)
+    for i in range(seg):
+        start, end, delta, ro = starts[i], ends[i], deltas[i], range_offsets[i]
+        for cp in range(start, end + 1):
+            if cp == 0xFFFF:
+                break
+            if ro == 0:
+                gid = (cp + delta) & 0xFFFF
+            else:
+                addr = range_pos + 2 * i + ro + 2 * (cp - start)
+                gid = struct.unpack_from('>H', data, addr)[0]
+                if gid:
+                    gid = (gid + delta) & 0xFFFF
+            if gid:
+                yield cp, gid
+
+
+def read_font_blocks(path):
+    """글꼴 파일 → {블록: array('H')} (1/1000 em). TTC는 첫 번째 글꼴. 읽을 수 없으면 ValueError"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        base = 0
+        if data[:4] == b'ttcf':
+            base = struct.unpack_from('>I', data, 12)[0]
+        num_tables = struct.unpack_from('>H', data, base + 4)[0]
+        tables = {}
+        for i in range(num_tables):
+            tag, _, offset, _ = struct.unpack_from('>4sIII', data, base + 12 + 16 * i)
+            tables[tag] = offset
+        units_per_em = struct.unpack_from('>H', data, tables[b'head'] + 18)[0]
+        n_metrics = struct.unpack_from('>H', data, tables[b'hhea'] + 34)[0]
+        advances = struct.unpack_from(f'>{2 * n_metrics}H', data, tables[b'hmtx'])[::2]
+        sub = _cmap_subtable(data, tables[b'cmap'])
+    except (KeyError, struct.error) as e:
+        raise ValueError(f'글꼴 테이블을 읽을 수 없습니다: {path} ({e})')
+    if sub is None or not units_per_em or not advances:
+        raise ValueError(f'유니코드 cmap이 없습니다: {path}')
+
+    blocks = {}
+    last = advances[-1]
+    for cp, gid in _cmap_entries(data, sub):
+        adv = advances[gid] if gid < n_metrics else last
+        block = blocks.get(cp >> 8)
+        if block is None:
+            block = blocks[cp >> 8] = array('H', bytes(2 * _BLOCK))
+        # 0은 '글자 없음' 표시라서 폭 0 글자(결합 문자)는 1로 둔다
+        block[cp & 0xFF] = max(1, min(0xFFFF, round(adv * EM / units_per_em)))
+    return blocks
+
+
+def _synthesize_bold(blocks):
+    """볼드 파일이 없을 때 — 라틴 글자 폭만 BOLD_SYNTH_FACTOR 배 (동아시아 전각 폭은 그대로)"""
+    out = {}
+    for index, block in blocks.items():
+        scaled = array('H', block)
+        for i, w in enumerate(block):
+            if w and not is_east_asian((index << 8) | i):
+                scaled[i] = min(0xFFFF, round(w * BOLD_SYNTH_FACTOR))
+        out[index] = scaled
+    return out
+
+
+# ============================================================
+# 디스크 캐시 (.cache/fonts/*.bin)
+# ============================================================
+
+def font_cache_dir():
+    return os.environ.get('GENDOCS_FONT_CACHE_DIR') or DEFAULT_FONT_CACHE_DIR
+
+
+def _cache_path(font_path):
+    st = os.stat(font_path)
+    key = f'{os.path.abspath(font_path)}|{st.st_mtime_ns}|{st.st_size}|{_FORMAT_VERSION}'
+    stem = os.path.splitext(os.path.basename(font_path))[0]
+    return os.path.join(font_cache_dir(), f'{stem}-{hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]}.bin')
+
+
+def _pack_blocks(blocks):
+    out = [_MAGIC, struct.pack('<HH', _FORMAT_VERSION, len(blocks))]
+    for index in sorted(blocks):
+        block = array('H', blocks[index])
+        if sys.byteorder == 'big':
+            block.byteswap()
+        out.append(struct.pack('<H', index))
+        out.append(block.tobytes())
+    return b''.join(out)
+
+
+def _unpack_blocks(data):
+    if data[:4] != _MAGIC:
+        raise ValueError('캐시 형식 아님')
+    version, count = struct.unpack_from('<HH', data, 4)
+    if version != _FORMAT_VERSION or len(data) != 8 + count * (2 + 2 * _BLOCK):
+        raise ValueError('캐시 버전/크기 불일치')
+    blocks = {}
+    pos = 8
+    for _ in range(count):
+        index = struct.unpack_from('<H', data, pos)[0]
+        block = array('H')
+        block.frombytes(data[pos + 2:pos + 2 + 2 * _BLOCK])
+        if sys.byteorder == 'big':
+            block.byteswap()
+        blocks[index] = block
+        pos += 2 + 2 * _BLOCK
+    return blocks
+
+
+def load_font_blocks(font_path):
+    """캐시된 블록 배열을 읽고, 없거나 깨졌으면 글꼴 파일을 파싱해 저장"""
+    cache_path = _cache_path(font_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            return _unpack_blocks(f.read())
+    except (OSError, ValueError, struct.error):
+        pass
+
+    blocks = read_font_blocks(font_path)
+    _write_cache_file(cache_path, _pack_blocks(blocks))
+    return blocks
+
+
+def _write_cache_file(path, data):
+    """임시 파일 + os.replace로 캐시 파일 저장. 실패는 결과에 영향 없으므로 무시"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+# ============================================================
+# 글꼴 찾기
+# ============================================================
+
+def font_dirs():
+    """글꼴 검색 폴더 (GENDOCS_FONT_DIRS 우선)"""
+    dirs = [d for d in os.environ.get('GENDOCS_FONT_DIRS', '').split(os.pathsep) if d]
+    home = os.path.expanduser('~')
+    if sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        dirs.append(os.path.join(windir, 'Fonts'))
+        local = os.environ.get('LOCALAPPDATA')
+        if local:
+            dirs.append(os.path.join(local, 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        dirs += ['/Library/Fonts', '/System/Library/Fonts', '/System/Library/Fonts/Supplemental',
+                 os.path.join(home, 'Library', 'Fonts')]
+    else:
+        dirs += ['/usr/share/fonts', '/usr/local/share/fonts',
+                 os.path.join(home, '.fonts'), os.path.join(home, '.local', 'share', 'fonts')]
+    return dirs
+
+
+_FONT_EXTS = ('.ttf', '.otf', '.ttc')
+_FILE_INDEX = None
+_LOCK = threading.Lock()
+
+
+_INDEX_NAME = 'font-index.json'
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_font_dirs(roots):
+    """폴더를 훑어 (소문자 파일명 → 경로, 훑은 폴더 → mtime). 없는 검색 폴더도 mtime None으로 기록"""
+    index, dirs = {}, {}
+    for base in roots:
+        dirs[base] = _mtime_ns(base)
+        for root, _, files in os.walk(base):
+            dirs[root] = _mtime_ns(root)
+            for name in files:
+                if name.lower().endswith(_FONT_EXTS):
+                    index.setdefault(name.lower(), os.path.join(root, name))
+    return index, dirs
+
+
+def _file_index():
+    """소문자 파일명 → 경로 (앞선 폴더 우선)
+
+    훑은 결과는 폴더별 mtime과 함께 .cache/fonts/font-index.json에 저장한다. 다음 프로세스는
+    기록된 폴더의 mtime만 확인하고(파일 추가/삭제는 그 폴더의 mtime을 바꾼다) 같으면 다시 훑지 않는다.
+    """
+    global _FILE_INDEX
+    if _FILE_INDEX is None:
+        roots = font_dirs()
+        path = os.path.join(font_cache_dir(), _INDEX_NAME)
+        index = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if (saved.get('version') == _FORMAT_VERSION and saved.get('roots') == roots
+                    and all(_mtime_ns(d) == m for d, m in saved['dirs'].items())):
+                index = saved['files']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        if index is None:
+            index, dirs = _scan_font_dirs(roots)
+            data = {'version': _FORMAT_VERSION, 'roots': roots, 'dirs': dirs, 'files': index}
+            _write_cache_file(path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        _FILE_INDEX = index
+    return _FILE_INDEX
+
+
+def find_font_file(name, bold=False):
+    """글꼴 이름 → 파일 경로. 없으면 None"""
+    key = normalize_font_name(name)
+    regular, bold_files = _FONT_FILES.get(key, ([], []))
+    candidates = list(bold_files if bold else regular)
+    stem = key.replace(' ', '')
+    for ext in _FONT_EXTS:
+        if bold:
+            candidates += [f'{stem}-bold{ext}', f'{stem}bold{ext}', f'{stem}bd{ext}']
+        else:
+            candidates += [f'{stem}{ext}', f'{stem}-regular{ext}', f'{stem}regular{ext}']
+    index = _file_index()
+    for filename in candidates:
+        path = index.get(filename.lower())
+        if path:
+            return path
+    return None
+
+
+_METRICS = {}
+
+
+def get_font_metrics(name=None, bold=False):
+    """글꼴 이름 → FontMetrics (프로세스 안에서 메모이즈, 스레드 안전)"""
+    name = name or DEFAULT_FONT
+    key = (normalize_font_name(name), bold)
+    metrics = _METRICS.get(key)
+    if metrics is not None:
+        return metrics
+    with _LOCK:
+        metrics = _METRICS.get(key)
+        if metrics is None:
+            metrics = _resolve_metrics(name, bold)
+            _METRICS[key] = metrics
+    return metrics
+
+
+def _resolve_metrics(name, bold):
+    path = find_font_file(name, bold)
+    if path:
+        try:
+            return FontMetrics(name, bold, load_font_blocks(path), path)
+        except (OSError, ValueError):
+            pass
+    if bold:
+        regular = find_font_file(name)
+        if regular:
+            try:
+                return FontMetrics(name, bold, _synthesize_bold(load_font_blocks(regular)),
+                                   f'{regular} (synthetic bold)')
+            except (OSError, ValueError):
+                pass
+    return FontMetrics(name, bold, {}, 'builtin')
+
+
+def clear_font_cache():
+    """프로세스 내 메트릭/너비 메모 비우기 (글꼴 설치 후 장기 실행 호스트, 테스트)"""
+    global _FILE_INDEX
+    with _LOCK:
+        _METRICS.clear()
+        _FILE_INDEX = None
+    _face_width.cache_clear()
+    _count_lines.cache_clear()
+    _advance_map.cache_clear()
+
+
+# ============================================================
+# 너비 / 줄바꿈
+# ============================================================
+
+class _AdvanceMap(dict):
+    """글자 → advance (1/1000 em). 처음 나온 글자만 메트릭에서 찾아 채운다 (글꼴 조합별 하나)"""
+
+    __slots__ = ('latin', 'wide')
+
+    def __init__(self, latin, wide):
+        super().__init__()
+        self.latin = latin
+        self.wide = wide
+
+    def __missing__(self, ch):
+        cp = ord(ch)
+        width = self[ch] = (self.wide if is_east_asian(cp) else self.latin).advance(cp)
+        return width
+
+
+@lru_cache(maxsize=64)
+def _advance_map(font, east_asia, bold):
+    """동아시아 글자는 east_asia 글꼴, 나머지는 font로 재는 글자별 폭 표"""
+    latin = get_font_metrics(font, bold)
+    wide = get_font_metrics(east_asia, bold) if east_asia != font else latin
+    return _AdvanceMap(latin, wide)
+
+
+@lru_cache(maxsize=65536)
+def _face_width(text, font, east_asia, bold):
+    """텍스트 advance 합 (1/1000 em)"""
+    return sum(map(_advance_map(font, east_asia, bold).__getitem__, text))
+
+
+def text_width_pt(text, font=None, size_pt=None, bold=False, east_asia=None):
+    """텍스트 한 줄 렌더링 너비 (pt)"""
+    if not text:
+        return 0.0
+    font = font or DEFAULT_FONT
+    size_pt = size_pt or DEFAULT_SIZE_PT
+    return _face_width(text, font, east_asia or font, bold) * size_pt / EM
+
+
+def text_widths_pt(texts, font=None, size_pt=None, bold=False, east_asia=None):
+    """여러 텍스트의 한 줄 너비 (pt) 목록 — 큰 테이블의 셀 텍스트처럼 대부분 한 번씩만 나오는 문자열용
+
+    글자별 폭 표에서 바로 더하고, 문자열별 메모이즈(_face_width)는 거치지 않는다.
+    """
+    font = font or DEFAULT_FONT
+    size_pt = size_pt or DEFAULT_SIZE_PT
+    advances = _advance_map(font, east_asia or font, bold).__getitem__
+    return [sum(map(advances, text)) * size_pt / EM for text in texts]
+
+
+def text_width_dxa(text, font=None, size_pt=None, bold=False, east_asia=None):
+    """텍스트 한 줄 렌더링 너비 (DXA, 정수)"""
+    return round(text_width_pt(text, font, size_pt, bold, east_asia) * 20)
+
+
+@lru_cache(maxsize=65536)
+def _count_lines(text, limit, font, east_asia, bold):
+    """limit(1/1000 em) 폭에 단어 단위 greedy 줄바꿈 → 줄 수. 한 줄보다 긴 단어는 글자 단위로 끊는다"""
+    advance = _advance_map(font, east_asia, bold).__getitem__
+    space = advance(' ')
+    lines = 1
+    x = 0
+    for word in text.split(' '):
+        w = sum(map(advance, word))
+        need = w if x == 0 else x + space + w
+        if need <= limit:
+            x = need
+            continue
+        if x > 0:
+            lines += 1
+            x = 0
+        if w <= limit:
+            x = w
+            continue
+        for ch in word:
+            cw = advance(ch)
+            if x + cw > limit and x > 0:
+                lines += 1
+                x = cw
+            else:
+                x += cw
+    return lines
+
+
+def count_lines(text, width_dxa, font=None, size_pt=None, bold=False, east_asia=None):
+    """width_dxa 폭에서 텍스트가 차지하는 줄 수 (최소 1)
+
+    한 줄에 들어가는 텍스트(대부분의 셀)는 글자 폭 합만 보고 1을 돌려주고, 넘치는 텍스트만
+    (텍스트, 폭, 글꼴) 단위로 메모이즈한 줄바꿈 시뮬레이션을 한다.
+    """
+    if not text or width_dxa <= 0:
+        return 1
+    font = font or DEFAULT_FONT
+    size_pt = size_pt or DEFAULT_SIZE_PT
+    east_asia = east_asia or font
+    limit = width_dxa / 20 / size_pt * EM
+    if sum(map(_advance_map(font, east_asia, bold).__getitem__, text)) <= limit:
+        return 1
+    return _count_lines(text, limit, font, east_asia, bold)
+
+
+# ============================================================
+# 테마 글꼴 / 캐시 스탬프
+# ============================================================
+
+def theme_font_names(themes_dir=None):
+    """themes/*.json의 fonts 값 (정렬, 중복 제거). 테마가 없으면 [DEFAULT_FONT]"""
+    themes_dir = themes_dir or os.path.join(PROJECT_ROOT, 'themes')
+    names = set()
+    for path in glob.glob(os.path.join(themes_dir, '*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fonts = json.load(f).get('fonts') or {}
+        except (OSError, ValueError, AttributeError):
+            continue
+        names.update(v for v in fonts.values() if isinstance(v, str) and v)
+    return sorted(names) or [DEFAULT_FONT]
+
+
+_STAMP = None
+
+
+def metrics_stamp():
+    """테마 글꼴이 어떤 메트릭(파일 경로·mtime·크기 / builtin)으로 풀리는지의 해시 (프로세스당 1회)
+
+    리포트 캐시 키에 넣어, 글꼴을 설치/교체하면 이전 리포트가 무효가 되게 한다. 글꼴 폴더는
+    저장된 파일 목록(font-index.json)을 폴더 mtime으로 확인해 재사용하므로 캐시 적중 경로에서 훑지 않는다.
+    """
+    global _STAMP
+    if _STAMP is None:
+        h = hashlib.sha256()
+        for name in theme_font_names():
+            for bold in (False, True):
+                path = find_font_file(name, bold)
+                h.update(f'{normalize_font_name(name)}|{bold}|'.encode('utf-8'))
+                try:
+                    st = os.stat(path) if path else None
+                except OSError:
+                    st = None
+                if st:
+                    h.update(f'{path}|{st.st_mtime_ns}|{st.st_size}'.encode('utf-8'))
+                else:
+                    h.update(b'builtin')
+        _STAMP = h.hexdigest()
+    return _STAMP
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 3:
+        font, text = sys.argv[1], sys.argv[2]
+        print(f"{font}: {get_font_metrics(font).source}")
+        for size in (9, 10, 11):
+            print(f"  {size}pt: {text_width_dxa(text, font, size)} DXA ({text_width_pt(text, font, size):.1f} pt)")
+    else:
+        for name in theme_font_names():
+            for bold in (False, True):
+                print(f"{name:<20} {'bold' if bold else 'regular':<8} {get_font_metrics(name, bold).source}")
+        print(f"\n캐시: {font_cache_dir()}")
@@ -0,0 +1,274 @@
+"""
+레이아웃 높이 계수 프로필 — validate/review/calibrate-layout 도구가 공유하는 모듈.
+
+요소별 추정 높이는 "항 × 계수"의 합이다:
+  제목 H2 → h2 × 1, 단락 → paragraph × 줄 수, 코드 블록 → code_row × 행 수 + code_pad,
+  데이터 테이블 → table_header + table_row × (행 수 - 1) + table_line × (줄바꿈으로 늘어난 줄 수),
+  이미지 → 실제 높이 + image_spacing ...
+element_terms()가 요소 dict를 항으로 바꾸고, estimate_height()가 계수를 곱해 더한다.
+테이블의 늘어난 줄 수는 table_wrap_lines()가 셀 텍스트 너비와 셀 폭(tcW)으로 계산한다.
+계수 기본값(DEFAULT_COEFFICIENTS)은 손으로 맞춘 값이고, calibrate-layout.py가 실제 렌더링
+페이지 경계에 최소제곱으로 맞춘 값을 테마·방향별 프로필로 저장한다.
+
+프로필 파일 (profiles/layout-profile.json):
+  {"profiles": {"office-modern/landscape": {"coefficients": {...}, ...},
+                "*/landscape": {...}}}
+조회 순서: "<테마>/<방향>" → "*/<방향>" → 기본값. 프로필에 없는 계수는 기본값을 쓴다.
+
+사용법:
+    from layout_profile import layout_coefficients, element_terms, estimate_height
+    coeffs = layout_coefficients('office-modern', 'landscape')
+    est_h = estimate_height(element_terms(elem), coeffs)
+
+환경 변수:
+    GENDOCS_LAYOUT_PROFILE   프로필 경로 (기본: <프로젝트>/profiles/layout-profile.json)
+"""
+
+import os
+import json
+import tempfile
+import threading
+
+from font_metrics import count_lines
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TOOLS_DIR)
+
+DEFAULT_PROFILE_PATH = os.path.join(PROJECT_ROOT, 'profiles', 'layout-profile.json')
+ANY_THEME = '*'
+
+# 요소별 추정 높이 계수 (pt) — 프로필이 없을 때의 손 조정 값
+DEFAULT_COEFFICIENTS = {
+    'h2': 42,             # H2 제목 (18pt 폰트 + before/after spacing)
+    'h3': 34,             # H3 제목
+    'h4': 28,             # H4 제목
+    'paragraph': 22,      # 일반 단락 한 줄
+    'bullet': 20,         # 불릿 항목
+    'empty': 8,           # 빈 단락 / spacer
+    'table_header': 28,   # 테이블 헤더 행
+    'table_row': 22,      # 테이블 데이터 행 (한 줄)
+    'table_line': 12,     # 테이블 셀 줄바꿈으로 늘어나는 줄 하나 (9pt 텍스트 줄 간격)
+    'code_row': 16,       # 코드 블록 행
+    'code_pad': 20,       # 코드 블록 위아래 여백
+    'info_box': 45,       # 정보/경고 박스
+    'image_spacing': 30,  # 이미지 전후 spacing
+}
+COEFFICIENT_KEYS = tuple(DEFAULT_COEFFICIENTS)
+
+TABLE_TEXT_SIZE_PT = 9   # 런에 크기가 없을 때 테이블 셀 텍스트 크기 (템플릿 sizes.small)
+CELL_PADDING_DXA = 240   # 셀 좌우 패딩 합계 (left:120 + right:120)
+
+_CODE_TYPES = ('code_dark', 'code_light')
+
+
+# ============================================================
+# 요소 → 높이 항
+# ============================================================
+
+def element_terms(elem):
+    """요소 dict → ({계수 이름: 배수}, 고정 높이 pt)
+
+    elem은 validate-docx가 만드는 요소 dict (type, level, lines, rows, tbl_type, height_pt).
+    """
+    etype = elem['type']
+    if etype == 'heading':
+        level = elem.get('level')
+        if level in (2, 3, 4):
+            return {f'h{level}': 1}, 0
+        return {'paragraph': 1}, 0
+    if etype == 'paragraph':
+        return {'paragraph': elem.get('lines', 1)}, 0
+    if etype == 'bullet':
+        return {'bullet': 1}, 0
+    if etype == 'empty':
+        return {'empty': 1}, 0
+    if etype == 'image':
+        return {'image_spacing': 1}, elem.get('height_pt', 0)
+    if etype == 'table':
+        rows = elem.get('rows', 0)
+        tbl_type = elem.get('tbl_type')
+        if tbl_type in _CODE_TYPES:
+            return {'code_row': rows, 'code_pad': 1}, 0
+        if tbl_type == 'info_box':
+            return {'info_box': 1}, 0
+        return {'table_header': 1, 'table_row': rows - 1, 'table_line': elem.get('wrap_lines', 0)}, 0
+    return {}, 0
+
+
+def table_wrap_lines(row_paragraphs, cell_widths, fonts, content_width_dxa):
+    """행별 줄 수 — 행 높이는 가장 많이 줄바꿈되는 셀이 정한다
+
+    row_paragraphs: [row][cell][p_text] (BodyElement.row_paragraphs)
+    cell_widths: [row][cell] tcW DXA (BodyElement.cell_widths, 0이면 첫 행 같은 열 → 균등 분할)
+    fonts: (헤더 글꼴, 데이터 글꼴) — 각각 (라틴, 동아시아, 크기 pt, 볼드) (docx_model.get_table_fonts)
+    셀 줄 수는 단락별 줄 수의 합(빈 셀은 1). 셀 폭에 들어가는 단락은 글자 폭 합만 비교하고,
+    넘치는 단락만 단어 단위 줄바꿈을 센다 (font_metrics.count_lines, 텍스트·폭별 메모이즈).
+    """
+    header_widths = cell_widths[0] if cell_widths else []
+    row_lines = []
+    for r, cells in enumerate(row_paragraphs):
+        font, east_asia, size_pt, bold = fonts[0 if r == 0 else 1]
+        widths = cell_widths[r] if r < len(cell_widths) else []
+        n_cols = len(cells) or 1
+        most = 1
+        for c, paragraphs in enumerate(cells):
+            w = widths[c] if c < len(widths) else 0
+            if w <= 0:
+                w = header_widths[c] if c < len(header_widths) and header_widths[c] > 0 else content_width_dxa // n_cols
+            usable = max(w - CELL_PADDING_DXA, 1)
+            lines = sum(count_lines(text, usable, font, size_pt, bold, east_asia) for text in paragraphs if text)
+            if lines > most:
+                most = lines
+        row_lines.append(most)
+    return row_lines
+
+
+def estimate_height(terms, coefficients):
+    """(항, 고정 높이) + 계수 → 추정 높이 (pt)"""
+    counts, base = terms
+    return base + sum(coefficients[key] * n for key, n in counts.items())
+
+
+# ============================================================
+# 프로필 로드/저장
+# ============================================================
+
+def profile_path():
+    """GENDOCS_LAYOUT_PROFILE > 기본 경로"""
+    return os.environ.get('GENDOCS_LAYOUT_PROFILE') or DEFAULT_PROFILE_PATH
+
+
+_LOCK = threading.Lock()
+_LOADED = {}   # 경로 → ((mtime_ns, size), 프로필 dict)
+
+
+def load_layout_profile(path=None):
+    """프로필 파일 → dict (없거나 깨졌으면 빈 dict). 파일이 바뀌지 않았으면 메모이즈된 값"""
+    path = path or profile_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        cached = _LOADED.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+        if not isinstance(profile, dict):
+            profile = {}
+    except (OSError, ValueError):
+        profile = {}
+    with _LOCK:
+        _LOADED[path] = (stamp, profile)
+    return profile
+
+
+def profile_key(theme, orientation):
+    return f'{theme or ANY_THEME}/{orientation}'
+
+
+def layout_coefficients(theme=None, orientation='landscape', path=None):
+    """테마·방향의 계수 dict (프로필 값 → 기본값 순으로 채움)"""
+    profiles = load_layout_profile(path).get('profiles', {})
+    entry = profiles.get(profile_key(theme, orientation)) or profiles.get(profile_key(None, orientation)) or {}
+    coefficients = dict(DEFAULT_COEFFICIENTS)
+    for key, value in entry.get('coefficients', {}).items():
+        if key in coefficients and isinstance(value, (int, float)) and value > 0:
+            coefficients[key] = value
+    return coefficients
+
+
+def save_layout_profile(profile, path=None):
+    """프로필 저장 (임시 파일 → rename으로 원자적 교체)"""
+    path = path or profile_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def clear_layout_profile_cache():
+    with _LOCK:
+        _LOADED.clear()
+
+
+# ============================================================
+# 최소제곱 맞춤
+# ============================================================
+
+def _solve(matrix, vector):
+    """가우스 소거 (부분 피벗) — 작은 정규방정식용. 특이하면 None"""
+    n = len(vector)
+    a = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        for r in range(col + 1, n):
+            f = a[r][col] / a[col][col]
+            if f:
+                for c in range(col, n + 1):
+                    a[r][c] -= f * a[col][c]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (a[r][n] - sum(a[r][c] * x[c] for c in range(r + 1, n))) / a[r][r]
+    return x
+
+
+def fit_coefficients(samples, prior=None, ridge=10.0, min_value=1.0):
+    """페이지 관측값에 맞춘 계수 — 능선(ridge) 최소제곱, 관측이 없는 계수는 prior 유지
+
+    samples: [({계수 이름: 배수}, 목표 높이 pt), ...]
+        목표 높이 = 가용 높이 - 그 페이지 요소들의 고정 높이 (calibrate-layout.py가 만든다)
+    prior: 기본 계수 (없으면 DEFAULT_COEFFICIENTS). ridge: prior 쪽으로 당기는 세기
+    min: ||A·c - b||² + ridge·||c - prior||²  →  (AᵀA + ridge·I) c = Aᵀb + ridge·prior
+    """
+    prior = dict(prior or DEFAULT_COEFFICIENTS)
+    keys = [k for k in COEFFICIENT_KEYS if any(counts.get(k) for counts, _ in samples)]
+    if not keys:
+        return prior
+    n = len(keys)
+    ata = [[0.0] * n for _ in range(n)]
+    atb = [0.0] * n
+    for counts, target in samples:
+        row = [float(counts.get(k, 0)) for k in keys]
+        for i in range(n):
+            if row[i]:
+                atb[i] += row[i] * target
+                for j in range(n):
+                    ata[i][j] += row[i] * row[j]
+    for i, k in enumerate(keys):
+        ata[i][i] += ridge
+        atb[i] += ridge * prior[k]
+    solution = _solve(ata, atb)
+    if solution is None:
+        return prior
+    fitted = dict(prior)
+    for k, value in zip(keys, solution):
+        fitted[k] = round(max(min_value, value), 1)
+    return fitted
+
+
+def fit_error(samples, coefficients):
+    """샘플별 (추정 - 목표) 잔차의 RMSE (pt)"""
+    if not samples:
+        return 0.0
+    total = 0.0
+    for counts, target in samples:
+        diff = estimate_height((counts, 0), coefficients) - target
+        total += diff * diff
+    return (total / len(samples)) ** 0.5
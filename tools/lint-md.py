@@ -19,6 +19,9 @@ gendocs MD 구조 린트 도구 — 변환 전 MD 파일의 구조적 이슈를
   python -X utf8 tools/lint-md.py source/문서.md --json
   python -X utf8 tools/lint-md.py source/*.md              # 배치 모드
   python -X utf8 tools/lint-md.py source/*.md --json       # 배치 JSON
+  python -X utf8 tools/lint-md.py source/문서.md --json --timings [--profile out.prof]
+
+--timings: 검사별 소요 시간/최대 메모리 (JSON 모드에서는 timings 블록, 텍스트는 stderr)
 """
 
 import sys
@@ -28,6 +31,9 @@ import re
 import json
 import glob
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from timings import phase, TimingSession, add_timing_arguments
+
 # Windows 터미널 한글 출력 보장
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -39,43 +45,54 @@ def lint_md(md_path):
     if not os.path.exists(md_path):
         return {'file': md_path, 'error': '파일 없음', 'issues': [], 'summary': {}}
 
-    with open(md_path, 'r', encoding='utf-8') as f:
+    with phase('read'), open(md_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
 
     issues = []
 
     # === 1. 메타데이터 블록쿼트 검사 ===
-    check_metadata(lines, issues)
+    with phase('check_metadata'):
+        check_metadata(lines, issues)
 
     # === 2. 구분선(---) 검사 ===
-    check_separators(lines, issues)
+    with phase('check_separators'):
+        check_separators(lines, issues)
 
     # === 3. 변경 이력 용어 검사 ===
-    check_change_history(lines, issues)
+    with phase('check_change_history'):
+        check_change_history(lines, issues)
 
     # === 4. 코드블록 균형 검사 ===
-    check_code_block_balance(lines, issues)
+    with phase('check_code_block_balance'):
+        check_code_block_balance(lines, issues)
 
     # === 5. 목차-본문 일치 검사 ===
-    check_toc_consistency(lines, issues)
+    with phase('check_toc_consistency'):
+        check_toc_consistency(lines, issues)
 
     # === 6. HTML 아티팩트 검사 ===
-    check_html_artifacts(lines, issues)
+    with phase('check_html_artifacts'):
+        check_html_artifacts(lines, issues)
 
     # === 7. 중첩 불릿 검사 ===
-    check_nested_bullets(lines, issues)
+    with phase('check_nested_bullets'):
+        check_nested_bullets(lines, issues)
 
     # === 8. 테이블 컬럼 수 검사 ===
-    check_table_column_count(lines, issues)
+    with phase('check_table_column_count'):
+        check_table_column_count(lines, issues)
 
     # === 9. 이미지 참조 검사 ===
-    check_image_references(lines, issues, md_path)
+    with phase('check_image_references'):
+        check_image_references(lines, issues, md_path)
 
     # === 10. 코드블록 언어 태그 검사 ===
-    check_code_language_tag(lines, issues)
+    with phase('check_code_language_tag'):
+        check_code_language_tag(lines, issues)
 
     # === 11. 섹션 분량 균형 검사 ===
-    check_section_balance(lines, issues)
+    with phase('check_section_balance'):
+        check_section_balance(lines, issues)
 
     # 심각도별 집계
     summary = {}
@@ -658,6 +675,7 @@ def main():
     parser = argparse.ArgumentParser(description='gendocs MD 구조 린트 도구')
     parser.add_argument('files', nargs='+', help='검사할 MD 파일 (글로빙 지원)')
     parser.add_argument('--json', action='store_true', help='JSON 형식 출력')
+    add_timing_arguments(parser)
     args = parser.parse_args()
 
     # 글로빙 확장 (Windows에서 셸이 글로빙 안 할 수 있음)
@@ -669,30 +687,39 @@ def main():
         else:
             md_files.append(pattern)
 
-    # 린트 실행
-    results = [lint_md(f) for f in md_files]
+    with TimingSession(args.timings, args.profile) as session:
+        # 린트 실행
+        results = [lint_md(f) for f in md_files]
+
+        with phase('serialization'):
+            if args.json:
+                if len(results) == 1:
+                    output = results[0]
+                else:
+                    # 배치: 요약 + 개별 결과
+                    total_issues = sum(len(r['issues']) for r in results)
+                    all_sev = {}
+                    for r in results:
+                        for sev, cnt in r.get('summary', {}).items():
+                            all_sev[sev] = all_sev.get(sev, 0) + cnt
+                    output = {
+                        'totalFiles': len(results),
+                        'totalIssues': total_issues,
+                        'passCount': sum(1 for r in results if not r['issues'] and not r.get('error')),
+                        'severityCounts': all_sev,
+                        'results': results,
+                    }
+                text = json.dumps(output, ensure_ascii=False, indent=2)
+            else:
+                print_text_report(results)
 
     if args.json:
-        if len(results) == 1:
-            print(json.dumps(results[0], ensure_ascii=False, indent=2))
-        else:
-            # 배치: 요약 + 개별 결과
-            total_issues = sum(len(r['issues']) for r in results)
-            all_sev = {}
-            for r in results:
-                for sev, cnt in r.get('summary', {}).items():
-                    all_sev[sev] = all_sev.get(sev, 0) + cnt
-            output = {
-                'totalFiles': len(results),
-                'totalIssues': total_issues,
-                'passCount': sum(1 for r in results if not r['issues'] and not r.get('error')),
-                'severityCounts': all_sev,
-                'results': results,
-            }
-            print(json.dumps(output, ensure_ascii=False, indent=2))
+        if session.enabled:
+            output['timings'] = session.report()
+            text = json.dumps(output, ensure_ascii=False, indent=2)
+        print(text)
     else:
-        print_text_report(results)
-
+        session.print_report()
 
 if __name__ == '__main__':
     main()
@@ -10,6 +10,8 @@
  *   node tools/pipeline-audit.js --batch                            # 전체 진단
  *   node tools/pipeline-audit.js --batch --json                     # 전체 JSON
  *   node tools/pipeline-audit.js --batch --skip-convert             # 전체, 기존 DOCX
+ *
+ * lint/validate/review는 Python 분석 서버(lib/analysis-client.js) 하나로 처리한다.
  */
 
 const fs = require('fs');
@@ -17,6 +19,7 @@ const path = require('path');
 const { execSync } = require('child_process');
 const { scoreDocument, runValidate, runReview, resolveOutputPath, getConfigName } = require('./score-docx');
 const scoring = require('../lib/scoring');
+const { withAnalysisClient } = require('../lib/analysis-client');
 
 const PROJECT_ROOT = path.resolve(__dirname, '..');
 const DOC_CONFIGS_DIR = path.join(PROJECT_ROOT, 'doc-configs');
@@ -235,17 +238,26 @@ function buildActionable(rootCauses) {
 // 단일 문서 진단
 // ============================================================
 
-function auditDocument(configPath, options = {}) {
+/**
+ * 단일 문서 진단
+ * @param {string} configPath
+ * @param {object} [options] - { skipConvert, analysis }
+ *   analysis: AnalysisClient (배치에서 공유). 없으면 execSync로 도구를 직접 실행
+ */
+async function auditDocument(configPath, options = {}) {
   const name = getConfigName(configPath);
   const config = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
   const sourcePath = path.join(PROJECT_ROOT, config.source);
   const outputPath = resolveOutputPath(config);
 
   const stages = {};
+  const analysis = options.analysis;
 
   // ① lint-md
   if (fs.existsSync(sourcePath)) {
-    stages.lint = runLint(sourcePath);
+    stages.lint = analysis
+      ? await analysis.lint(sourcePath).catch(() => null)
+      : runLint(sourcePath);
   } else {
     stages.lint = { error: `소스 파일 없음: ${config.source}`, issues: [], summary: {} };
   }
@@ -275,7 +287,9 @@ function auditDocument(configPath, options = {}) {
 
   // ③ validate
   if (stages.convert && stages.convert.success) {
-    stages.validate = runValidate(outputPath);
+    stages.validate = analysis
+      ? await analysis.validate(outputPath).catch(() => null)
+      : runValidate(outputPath);
     if (!stages.validate) {
       stages.validate = { error: '레이아웃 검증 실패', issues: [], stats: {} };
     }
@@ -285,7 +299,9 @@ function auditDocument(configPath, options = {}) {
 
   // ④ review
   if (stages.convert && stages.convert.success) {
-    stages.review = runReview(outputPath, configPath);
+    stages.review = analysis
+      ? await analysis.review(outputPath, configPath).catch(() => null)
+      : runReview(outputPath, configPath);
     if (!stages.review) {
       stages.review = { error: 'AI 셀프리뷰 실패', issues: [] };
     }
@@ -359,7 +375,7 @@ function auditDocument(configPath, options = {}) {
 // 배치 진단
 // ============================================================
 
-function auditBatch(options) {
+async function auditBatch(options) {
   const configFiles = fs.readdirSync(DOC_CONFIGS_DIR)
     .filter(f => f.endsWith('.json'))
     .map(f => path.join(DOC_CONFIGS_DIR, f));
@@ -371,19 +387,21 @@ function auditBatch(options) {
 
   const results = [];
 
-  for (const configPath of configFiles) {
-    const name = getConfigName(configPath);
-    process.stderr.write(`  진단: ${name}...`);
-
-    try {
-      const result = auditDocument(configPath, options);
-      results.push(result);
-      process.stderr.write(` ${result.health}\n`);
-    } catch (err) {
-      results.push({ docConfig: name, health: 'BROKEN', error: err.message.split('\n')[0] });
-      process.stderr.write(` ERROR\n`);
+  await withAnalysisClient(async (analysis) => {
+    for (const configPath of configFiles) {
+      const name = getConfigName(configPath);
+      process.stderr.write(`  진단: ${name}...`);
+
+      try {
+        const result = await auditDocument(configPath, { ...options, analysis });
+        results.push(result);
+        process.stderr.write(` ${result.health}\n`);
+      } catch (err) {
+        results.push({ docConfig: name, health: 'BROKEN', error: err.message.split('\n')[0] });
+        process.stderr.write(` ERROR\n`);
+      }
     }
-  }
+  }, { quiet: true });
 
   return results;
 }
@@ -588,7 +606,7 @@ function printBatchJson(results) {
 // main
 // ============================================================
 
-function main() {
+async function main() {
   const args = process.argv.slice(2);
 
   if (args.length === 0 || args[0] === '--help') {
@@ -608,7 +626,7 @@ function main() {
   const options = { skipConvert };
 
   if (isBatch) {
-    const results = auditBatch(options);
+    const results = await auditBatch(options);
     if (isJson) {
       printBatchJson(results);
     } else {
@@ -622,7 +640,10 @@ function main() {
       process.exit(1);
     }
 
-    const result = auditDocument(configPath, options);
+    const result = await withAnalysisClient(
+      analysis => auditDocument(configPath, { ...options, analysis }),
+      { quiet: true }
+    );
 
     if (isJson) {
       printSingleJson(result);
@@ -635,7 +656,10 @@ function main() {
 }
 
 if (require.main === module) {
-  main();
+  main().catch(err => {
+    console.error('[ERROR]', err.message);
+    process.exit(1);
+  });
 }
 
 module.exports = { auditDocument, auditBatch, classifyHealth, mapRootCauses, ROOT_CAUSE_MAP };
@@ -0,0 +1,329 @@
+"""
+분석 리포트 디스크 캐시 — validate/review/spec 도구가 공유하는 모듈.
+
+리포트는 입력 내용으로 주소를 매긴다 (content-addressed):
+  키 = SHA-256(도구 버전 스탬프 + DOCX 파일명·바이트 해시 + 부가 입력(config/MD) 해시 + 옵션
+             + 색상 허용 오차 + 글꼴 메트릭 스탬프)
+도구 버전 스탬프는 도구 소스와 공유 모듈(docx_model, xml_backend, theme_colors, font_metrics,
+layout_profile, report_cache), themes/*.json 내용으로 만든다. 코드나 테마가 바뀌면 이전 리포트는
+자연히 무효가 된다.
+
+변경되지 않은 DOCX를 다시 분석하면 파싱 없이 저장된 JSON을 돌려준다.
+캐시 디렉토리 전체 크기가 상한을 넘으면 가장 오래 쓰이지 않은 리포트부터 지운다 (LRU).
+전체 크기는 <캐시>/index.json에 누적해 두므로 저장할 때마다 캐시 폴더를 훑지 않는다.
+상한을 넘었을 때와 _RESCAN_EVERY번 저장마다만 폴더를 훑어 정리하고 누적값을 실제 크기로 맞춘다.
+
+내용이 바뀐 문서의 증분 재분석용 상태(요소 지문 + 분류 결과)는 내용이 아니라 문서 이름(slot)으로
+주소를 매겨 <캐시>/state/에 둔다 (load_state / save_state). 같은 LRU 상한을 따른다.
+
+사용법:
+    from report_cache import cached_report
+    result = cached_report(__file__, docx_path, lambda: build_json(...),
+                           extra_files=[config_path], use_cache=not no_cache)
+
+환경 변수:
+    GENDOCS_CACHE_DIR      캐시 디렉토리 (기본: <프로젝트>/.cache/reports)
+    GENDOCS_CACHE_MAX_MB   캐시 최대 크기 MB (기본: 256)
+"""
+
+import os
+import json
+import glob
+import hashlib
+import tempfile
+
+from timings import phase
+from theme_colors import color_tolerance
+from font_metrics import metrics_stamp
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(TOOLS_DIR)
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'reports')
+DEFAULT_MAX_MB = 256
+
+# 모든 도구 리포트에 영향을 주는 공유 소스
+_SHARED_SOURCES = ('docx_model.py', 'xml_backend.py', 'theme_colors.py', 'font_metrics.py', 'layout_profile.py',
+                   'report_cache.py')
+
+_HASH_CHUNK = 1 << 20
+
+# 크기 인덱스: {"bytes": 누적 크기, "stores": 마지막 재집계 후 저장 횟수}
+_INDEX_NAME = 'index.json'
+# 여러 프로세스가 동시에 저장하면 누적값이 어긋날 수 있으므로 이 횟수마다 실제 크기로 다시 센다
+_RESCAN_EVERY = 256
+
+
+# ============================================================
+# 해시 유틸리티
+# ============================================================
+
+def file_sha256(path):
+    """파일 내용 SHA-256 (hex)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+_STAMPS = {}
+
+
+def tool_stamp(tool_file):
+    """도구 버전 스탬프 — 도구 소스 + 공유 모듈 + 테마 JSON 내용의 해시 (프로세스당 1회)"""
+    tool_file = os.path.abspath(tool_file)
+    stamp = _STAMPS.get(tool_file)
+    if stamp is None:
+        h = hashlib.sha256()
+        sources = [tool_file] + [os.path.join(TOOLS_DIR, name) for name in _SHARED_SOURCES]
+        sources += sorted(glob.glob(os.path.join(PROJECT_ROOT, 'themes', '*.json')))
+        for path in sources:
+            h.update(os.path.basename(path).encode('utf-8'))
+            try:
+                h.update(file_sha256(path).encode('ascii'))
+            except OSError:
+                h.update(b'missing')
+        stamp = h.hexdigest()
+        _STAMPS[tool_file] = stamp
+    return stamp
+
+
+# ============================================================
+# 캐시
+# ============================================================
+
+class ReportCache:
+    """SHA-256 키 → JSON 리포트 파일 (<dir>/<key[:2]>/<key>.json)
+
+    적중 시 파일 mtime을 갱신하고, 저장 후 인덱스의 전체 크기가 max_bytes를 넘으면
+    mtime이 가장 오래된 파일부터 지운다.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        if cache_dir is None:
+            cache_dir = os.environ.get('GENDOCS_CACHE_DIR') or DEFAULT_CACHE_DIR
+        if max_bytes is None:
+            try:
+                max_mb = float(os.environ.get('GENDOCS_CACHE_MAX_MB', DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, tool_file, docx, extra_files=(), options=None):
+        """리포트 키. docx는 경로 또는 DocxModel(bytes/파일 객체 입력). 읽을 수 없으면 OSError"""
+        h = hashlib.sha256()
+        h.update(os.path.basename(tool_file).encode('utf-8'))
+        h.update(tool_stamp(tool_file).encode('ascii'))
+        # 리포트의 'file' 필드가 파일명이므로 같은 내용이라도 이름이 다르면 다른 키
+        if isinstance(docx, (str, os.PathLike)):
+            h.update(os.path.basename(docx).encode('utf-8'))
+            h.update(file_sha256(docx).encode('ascii'))
+        else:
+            h.update(docx.name.encode('utf-8'))
+            h.update(docx.sha256.encode('ascii'))
+        for path in extra_files:
+            # 부가 입력은 없을 수도 있음 (config의 source MD 누락 등) — 없음 자체를 키에 반영
+            if path and os.path.isfile(path):
+                h.update(file_sha256(path).encode('ascii'))
+            else:
+                h.update(b'missing')
+        if options:
+            h.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+        # 근사 색상 허용 오차(GENDOCS_COLOR_TOLERANCE)에 따라 테이블 분류가 달라진다
+        h.update(f'tolerance={color_tolerance():g}'.encode('ascii'))
+        # 줄바꿈 추정은 설치된 글꼴 파일(없으면 내장 메트릭)에 따라 달라진다
+        h.update(f'metrics={metrics_stamp()}'.encode('ascii'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def _state_path(self, key):
+        return os.path.join(self.cache_dir, 'state', f'{key}.json')
+
+    def state_key(self, tool_file, slot):
+        """증분 상태 키 — 도구 버전 + 문서 이름(slot) + 색상 허용 오차 + 글꼴 메트릭 (내용 해시 없음)"""
+        h = hashlib.sha256()
+        h.update(os.path.basename(tool_file).encode('utf-8'))
+        h.update(tool_stamp(tool_file).encode('ascii'))
+        h.update(json.dumps(slot, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        h.update(f'tolerance={color_tolerance():g}'.encode('ascii'))
+        h.update(f'metrics={metrics_stamp()}'.encode('ascii'))
+        return h.hexdigest()
+
+    def get_state(self, key):
+        """저장된 증분 상태 dict. 없거나 깨졌으면 None"""
+        return self._load(self._state_path(key))
+
+    def put_state(self, key, state):
+        """증분 상태 저장 (같은 slot의 이전 상태를 덮어씀)"""
+        self._store(self._state_path(key), state)
+
+    def get(self, key):
+        """저장된 리포트 dict. 없거나 깨졌으면 None"""
+        return self._load(self._path(key))
+
+    def put(self, key, report):
+        """리포트 저장 (임시 파일 → rename으로 원자적 교체) 후 크기 상한 적용"""
+        self._store(self._path(key), report)
+
+    def _load(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            os.utime(path)  # LRU: 최근 사용 표시
+            return report
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path, report):
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        # json.dumps는 C 인코더로 한 번에 직렬화한다 (json.dump는 조각마다 write)
+        _write_atomic(path, json.dumps(report, ensure_ascii=False))
+        self._account(os.path.getsize(path) - old_size)
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, _INDEX_NAME)
+
+    def _read_index(self):
+        """(누적 크기, 재집계 후 저장 횟수). 인덱스가 없거나 깨졌으면 None"""
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            return int(index['bytes']), int(index['stores'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_index(self, total, stores):
+        try:
+            _write_atomic(self._index_path(), json.dumps({'bytes': total, 'stores': stores}))
+        except OSError:
+            pass
+
+    def _account(self, delta):
+        """저장으로 늘어난 크기를 인덱스에 더한다. 상한을 넘었거나 재집계 주기가 되면 evict()"""
+        index = self._read_index()
+        if index is None:
+            self.evict()
+            return
+        total, stores = index[0] + delta, index[1] + 1
+        if total > self.max_bytes or stores >= _RESCAN_EVERY:
+            self.evict()
+        else:
+            self._write_index(total, stores)
+
+    def evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래된 리포트 삭제 후 인덱스를 실제 크기로 갱신"""
+        entries = []
+        total = 0
+        for path in glob.glob(os.path.join(self.cache_dir, '*', '*.json')):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._write_index(total, 0)
+
+
+def _write_atomic(path, text):
+    """임시 파일 → rename으로 원자적 교체 (동시에 읽는 프로세스가 반쯤 쓴 파일을 보지 않게)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+_CACHE = None
+
+
+def get_cache():
+    """프로세스 공용 ReportCache"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ReportCache()
+    return _CACHE
+
+
+def cached_report(tool_file, docx, compute, extra_files=(), options=None, use_cache=True):
+    """캐시된 리포트를 반환하고, 없으면 compute()로 만들어 저장한다.
+
+    tool_file: 호출 도구의 __file__ (버전 스탬프용)
+    docx: DOCX 경로, 또는 경로 없는 입력을 미리 읽어 둔 DocxModel (내용 해시로 키)
+    compute: 인자 없는 함수 → JSON 직렬화 가능한 dict
+    캐시 읽기/쓰기 실패는 분석 결과에 영향을 주지 않는다 (그냥 compute 결과 반환).
+    """
+    if not use_cache:
+        return compute()
+
+    cache = get_cache()
+    with phase('cache_lookup'):
+        try:
+            key = cache.key(tool_file, docx, extra_files, options)
+        except OSError:
+            key = None
+        report = cache.get(key) if key is not None else None
+    if key is None:
+        # 입력 파일 문제는 도구 자체의 오류 처리에 맡긴다
+        return compute()
+    if report is not None:
+        return report
+
+    report = compute()
+    with phase('cache_store'):
+        try:
+            cache.put(key, report)
+        except (OSError, TypeError, ValueError):
+            pass
+    return report
+
+
+def load_state(tool_file, slot):
+    """증분 재분석 상태 (save_state로 저장한 dict). 없거나 읽을 수 없으면 None
+
+    slot: 문서를 식별하는 JSON 직렬화 가능한 값 (경로, 이름, 옵션 등). 내용이 바뀌어도 같은 slot이다.
+    도구 소스/공유 모듈이 바뀌면 키가 달라져 이전 상태는 쓰이지 않는다.
+    """
+    cache = get_cache()
+    with phase('state_load'):
+        try:
+            return cache.get_state(cache.state_key(tool_file, slot))
+        except OSError:
+            return None
+
+
+def save_state(tool_file, slot, state):
+    """증분 재분석 상태 저장. 실패는 무시한다 (다음 실행이 전체 분석을 할 뿐)"""
+    cache = get_cache()
+    with phase('state_store'):
+        try:
+            cache.put_state(cache.state_key(tool_file, slot), state)
+        except (OSError, TypeError, ValueError):
+            pass
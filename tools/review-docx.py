@@ -5,6 +5,11 @@ DOCX AI 셀프리뷰 스크립트 — 컬럼 너비 불균형, 콘텐츠 정합
   python -X utf8 tools/review-docx.py output/문서.docx --json
   python -X utf8 tools/review-docx.py output/문서.docx --config doc-configs/문서.json --json
   python -X utf8 tools/review-docx.py output/문서.docx --config doc-configs/문서.json
+  python -X utf8 tools/review-docx.py output/문서.docx --config doc-configs/문서.json --json --no-cache
+
+--json 결과는 DOCX + config + 소스 MD 내용 해시로 .cache/reports에 캐시된다 (--no-cache로 끔).
+--timings: 단계별(zip_open, xml_parse, walk, check_*, serialization) 소요 시간/최대 메모리
+--profile <경로>: cProfile 결과(pstats) 저장
 """
 
 import sys
@@ -12,54 +17,31 @@ import os
 import io
 import re
 import json
-import zipfile
-import xml.etree.ElementTree as ET
 
-# 동적 테마 색상 로드
+# 공유 문서 모델 (단일 파싱 + 동적 테마 색상 분류)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from theme_colors import load_theme_color_sets
-_THEME_COLORS = load_theme_color_sets()
+from docx_model import W, load_docx, cli_docx_source, get_page_geometry, get_table_fonts, resolve_run_font
+from font_metrics import DEFAULT_FONT, DEFAULT_SIZE_PT, text_width_dxa, count_lines
+from layout_profile import (DEFAULT_COEFFICIENTS, TABLE_TEXT_SIZE_PT, CELL_PADDING_DXA, layout_coefficients,
+                            table_wrap_lines, profile_path as layout_profile_path)
+from report_cache import cached_report
+from timings import phase, timed, TimingSession, parse_timing_argv
 
 # Windows 터미널 한글 출력 보장
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# ============================================================
-# XML 네임스페이스
-# ============================================================
-NS = {
-    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
-    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-}
-W = NS['w']
-
 # ============================================================
 # 상수
 # ============================================================
-# 기본값 (Landscape A4) — detect_content_width()가 실제 값으로 갱신
+# 기본값 (Landscape A4) — 문서별 실제 값은 detect_content_width()로 구해 인자로 넘긴다
 TOTAL_TABLE_WIDTH_DXA = 12960
 USABLE_HEIGHT_PT = 457
 
-# Malgun Gothic 9pt 기준 글자 너비 추정 (DXA)
-DXA_PER_HANGUL = 180     # 한글 1글자 ~180 DXA
-DXA_PER_LATIN = 90       # 라틴/숫자 1글자 ~90 DXA
-CELL_PADDING_DXA = 240   # 셀 좌우 패딩 합계 (left:120 + right:120)
-BOLD_WIDTH_FACTOR = 1.15 # 볼드 텍스트 너비 보정 (헤더용)
-EST_H2 = 42
-EST_H3 = 34
-EST_H4 = 28
-EST_PARAGRAPH = 22
-EST_BULLET = 20
-EST_TABLE_HEADER = 28
-EST_TABLE_ROW = 22
-EST_CODE_ROW = 16
-EST_INFO_BOX = 45
-EST_IMAGE_SPACING = 30
-EST_EMPTY = 8
-EMU_TO_PT = 1 / 12700
+# 글자 너비는 font_metrics (글꼴 파일의 advance width, 없으면 내장 근사치)로 계산
+DEFAULT_RUN_FONT = (DEFAULT_FONT, DEFAULT_FONT, DEFAULT_SIZE_PT, False)
+# 요소별 추정 높이 계수는 layout_profile (config의 theme + 페이지 방향으로 프로필 조회)
 
 # 임계값
 WIDTH_IMBALANCE_UTIL_LOW = 0.50    # 인접 컬럼 활용률 50% 미만
@@ -75,151 +57,204 @@ MIN_IMAGE_HEIGHT_PT = 80           # 이미지 최소 높이 80pt (약 28mm, 이
 
 
 # ============================================================
-# XML 파싱 유틸리티 (validate-docx.py 재사용 패턴)
+# 페이지 크기 자동 감지
 # ============================================================
 
-def extract_text(element):
-    """w:p 요소에서 텍스트 추출"""
-    texts = []
-    for t in element.iter(f'{{{W}}}t'):
-        if t.text:
-            texts.append(t.text)
-    return ''.join(texts).strip()
+def detect_orientation(model):
+    """pgSz 기준 페이지 방향 (크기 정보가 없으면 landscape)"""
+    geometry = get_page_geometry(model.sect_pr)
+    if geometry is None:
+        return 'landscape'
+    return 'portrait' if geometry['width'] <= geometry['height'] else 'landscape'
 
 
-def get_paragraph_style(p):
-    """w:p 요소에서 스타일명 추출"""
-    pPr = p.find(f'{{{W}}}pPr')
-    if pPr is not None:
-        pStyle = pPr.find(f'{{{W}}}pStyle')
-        if pStyle is not None:
-            return pStyle.get(f'{{{W}}}val', '')
-    return ''
+def detect_content_width(model):
+    """DOCX pgSz에서 콘텐츠 너비(DXA)와 가용 높이(pt)를 계산"""
+    try:
+        geometry = get_page_geometry(model.sect_pr)
+        if geometry is None:
+            return 12960, 457
 
+        margins = geometry['margins']
+        content_width = geometry['width'] - margins['left'] - margins['right']
+        page_height_pt = geometry['height'] / 20  # DXA → pt
+        usable_height = page_height_pt - (margins['top'] / 20) - (margins['bottom'] / 20) - 30  # 30pt header/footer
 
-def has_page_break(p):
-    for br in p.iter(f'{{{W}}}br'):
-        if br.get(f'{{{W}}}type') == 'page':
-            return True
-    return False
+        return content_width, round(usable_height)
+    except Exception:
+        return 12960, 457
 
 
-def get_table_shading(tbl):
-    """테이블 첫 번째 셀의 배경색"""
-    for tc in tbl.iter(f'{{{W}}}tc'):
-        tcPr = tc.find(f'{{{W}}}tcPr')
-        if tcPr is not None:
-            shd = tcPr.find(f'{{{W}}}shd')
-            if shd is not None:
-                return shd.get(f'{{{W}}}fill', '')
-        break
-    return ''
-
-
-def classify_table(tbl):
-    """테이블 유형: code_dark, code_light, info_box, warning_box, data_table"""
-    bg = get_table_shading(tbl).upper()
-    first_row = tbl.find(f'{{{W}}}tr')
-    cols = len(first_row.findall(f'{{{W}}}tc')) if first_row is not None else 0
-
-    # 다크 코드블록 (동적 테마 색상)
-    if bg in _THEME_COLORS['dark_codes']:
-        return 'code_dark'
-    # 라이트 코드블록 / JSON
-    if cols == 1 and bg in _THEME_COLORS['light_codes']:
-        return 'code_light'
-    # 정보 박스
-    if cols == 1 and bg in _THEME_COLORS['info_boxes']:
-        return 'info_box'
-    # 경고 박스
-    if cols == 1 and bg in _THEME_COLORS['warning_boxes']:
-        return 'warning_box'
-    return 'data_table'
-
-
-def get_image_size_pt(p):
-    for extent in p.iter(f'{{{NS["wp"]}}}extent'):
-        cx = int(extent.get('cx', '0'))
-        cy = int(extent.get('cy', '0'))
-        if cx > 0 and cy > 0:
-            return (cx * EMU_TO_PT, cy * EMU_TO_PT)
-    return None
+def _cell_text(paragraphs, sep=' '):
+    """셀 단락 텍스트 중 비어있지 않은 것만 연결"""
+    return sep.join(t for t in paragraphs if t)
 
 
 # ============================================================
-# 페이지 크기 자동 감지
+# 단일 순회 (방문자)
 # ============================================================
+# 검사는 ReviewVisitor로 구현해 walk_body() 한 번에 함께 등록한다.
+# 요소별 파생 값(텍스트, 스타일, 테이블 분류)은 BodyElement가 처음 접근할 때 한 번만
+# 계산해 두므로, 방문자가 늘어도 body 순회와 분류는 한 번뿐이다.
+
+class WalkContext:
+    """순회 중 방문자들이 공유하는 문서별 상태 (페이지 기하 + 위치 정보)"""
+    __slots__ = ('content_width_dxa', 'usable_height_pt', 'default_font', 'est',
+                 'position', 'current_heading', 'data_table_index')
+
+    def __init__(self, content_width_dxa=TOTAL_TABLE_WIDTH_DXA, usable_height_pt=USABLE_HEIGHT_PT,
+                 default_font=DEFAULT_RUN_FONT, est=None):
+        self.content_width_dxa = content_width_dxa
+        self.usable_height_pt = usable_height_pt
+        self.default_font = default_font          # DocxModel.default_run_font
+        self.est = est or DEFAULT_COEFFICIENTS    # 요소별 높이 계수 (layout_coefficients)
+        self.position = 0                     # 흐름 요소 인덱스 (p/tbl만 셈)
+        self.current_heading = '(문서 시작)'   # 직전 제목 텍스트
+        self.data_table_index = 0             # 현재까지 데이터 테이블 수 (1부터)
 
-def detect_content_width(docx_path):
-    """DOCX pgSz에서 콘텐츠 너비(DXA)와 가용 높이(pt)를 계산"""
-    try:
-        with zipfile.ZipFile(docx_path, 'r') as z:
-            tree = ET.parse(z.open('word/document.xml'))
-            root = tree.getroot()
-            body = root.find(f'{{{W}}}body')
-            if body is None:
-                return 12960, 457
-
-            sect_pr = body.find(f'{{{W}}}sectPr')
-            if sect_pr is None:
-                return 12960, 457
-
-            pg_sz = sect_pr.find(f'{{{W}}}pgSz')
-            if pg_sz is None:
-                return 12960, 457
-
-            w = int(pg_sz.get(f'{{{W}}}w', '15840'))
-            h = int(pg_sz.get(f'{{{W}}}h', '12240'))
-
-            pg_mar = sect_pr.find(f'{{{W}}}pgMar')
-            margin_left = 1440
-            margin_right = 1440
-            margin_top = 1080
-            margin_bottom = 1080
-            if pg_mar is not None:
-                margin_left = int(pg_mar.get(f'{{{W}}}left', '1440'))
-                margin_right = int(pg_mar.get(f'{{{W}}}right', '1440'))
-                margin_top = int(pg_mar.get(f'{{{W}}}top', '1080'))
-                margin_bottom = int(pg_mar.get(f'{{{W}}}bottom', '1080'))
-
-            content_width = w - margin_left - margin_right
-            page_height_pt = h / 20  # DXA → pt
-            usable_height = page_height_pt - (margin_top / 20) - (margin_bottom / 20) - 30  # 30pt header/footer
-
-            return content_width, round(usable_height)
-    except Exception:
-        return 12960, 457
+
+class ReviewVisitor:
+    """body 순회에 등록되는 검사. 필요한 visit_* 만 구현하고 finish()로 결과를 돌려준다"""
+
+    def visit_paragraph(self, el, ctx):
+        pass
+
+    def visit_table(self, el, ctx):
+        pass
+
+    def finish(self):
+        return None
+
+
+def _overrides(visitor, name):
+    return getattr(type(visitor), name) is not getattr(ReviewVisitor, name)
+
+
+def walk_body(body_elements, visitors, ctx=None):
+    """body 요소를 한 번 순회하며 등록된 방문자에 전달. 제목/데이터 테이블 위치는 ctx로 공유
+
+    --timings 실행에서는 방문자별 소요 시간을 '<현재 구간>/<방문자 클래스>'로 기록한다.
+    """
+    ctx = ctx or WalkContext()
+    on_paragraph = [timed(type(v).__name__, v.visit_paragraph)
+                    for v in visitors if _overrides(v, 'visit_paragraph')]
+    on_table = [timed(type(v).__name__, v.visit_table)
+                for v in visitors if _overrides(v, 'visit_table')]
+
+    for el in body_elements:
+        tag = el.tag
+        if tag == 'p':
+            if el.is_heading and el.text:
+                ctx.current_heading = el.text
+            for visit in on_paragraph:
+                visit(el, ctx)
+            ctx.position += 1
+        elif tag == 'tbl':
+            if el.tbl_type == 'data_table':
+                ctx.data_table_index += 1
+            for visit in on_table:
+                visit(el, ctx)
+            ctx.position += 1
+    return ctx
+
+
+class FlowVisitor(ReviewVisitor):
+    """요소 흐름 (페이지 분포 + 제목 구조 검사 입력): type/est_height/elem_index dict 목록"""
+
+    def __init__(self):
+        self.elements = []
+
+    def visit_paragraph(self, el, ctx):
+        elements = self.elements
+        elem_idx = ctx.position
+        kind = el.kind
+        est = ctx.est
+
+        if el.has_page_break:
+            elements.append({'type': 'page_break', 'est_height': 0, 'elem_index': elem_idx})
+
+        if kind == 'image':
+            elements.append({
+                'type': 'image', 'est_height': el.image_size_pt[1] + est['image_spacing'],
+                'elem_index': elem_idx,
+            })
+        elif kind == 'heading':
+            level = el.heading_level
+            est_h = est[f'h{level}'] if level in (2, 3, 4) else est['paragraph']
+            elements.append({
+                'type': 'heading', 'level': level, 'text': el.text,
+                'est_height': est_h, 'elem_index': elem_idx,
+            })
+        elif kind == 'bullet':
+            elements.append({'type': 'bullet', 'est_height': est['bullet'], 'elem_index': elem_idx})
+        elif kind == 'empty':
+            elements.append({'type': 'empty', 'est_height': est['empty'], 'elem_index': elem_idx})
+        else:
+            font, east_asia, size_pt, bold = resolve_run_font(el.run_font, ctx.default_font)
+            line_count = count_lines(el.text, ctx.content_width_dxa, font, size_pt, bold, east_asia)
+            elements.append({
+                'type': 'paragraph', 'est_height': round(est['paragraph'] * line_count, 1),
+                'elem_index': elem_idx,
+            })
+
+    def visit_table(self, el, ctx):
+        tbl_type = el.tbl_type
+        rows_count = el.row_count
+        est = ctx.est
+
+        if tbl_type in ('code_dark', 'code_light'):
+            est_h = rows_count * est['code_row'] + est['code_pad']
+        elif tbl_type == 'info_box':
+            est_h = est['info_box']
+        elif tbl_type == 'warning_box':
+            est_h = est['info_box']
+        else:
+            est_h = est['table_header'] + max(0, rows_count - 1) * est['table_row']
+            if rows_count:
+                # 셀 텍스트 줄바꿈으로 늘어난 줄 (validate-docx와 같은 행 높이 모델)
+                fonts = get_table_fonts(el.rows, ctx.default_font, TABLE_TEXT_SIZE_PT)
+                row_lines = table_wrap_lines(el.row_paragraphs, el.cell_widths, fonts, ctx.content_width_dxa)
+                est_h += (sum(row_lines) - rows_count) * est['table_line']
+
+        self.elements.append({
+            'type': 'table', 'tbl_type': tbl_type, 'est_height': est_h,
+            'elem_index': ctx.position,
+        })
+
+    def finish(self):
+        return self.elements
 
 
 # ============================================================
 # 텍스트 너비 추정
 # ============================================================
 
-def estimate_text_width_dxa(text):
-    """한글/라틴 혼합 텍스트의 렌더링 너비를 DXA로 추정 (보수적)"""
-    if not text:
-        return 0
-    width = 0
-    for ch in text:
-        cp = ord(ch)
-        # CJK (한글, 한자 등) — 넓은 글자
-        if (0xAC00 <= cp <= 0xD7AF or   # 한글 음절
-            0x3000 <= cp <= 0x9FFF or   # CJK
-            0xF900 <= cp <= 0xFAFF):    # CJK 호환
-            width += DXA_PER_HANGUL
-        else:
-            width += DXA_PER_LATIN
-    return width
+def estimate_text_width_dxa(text, font=None, size_pt=TABLE_TEXT_SIZE_PT, bold=False, east_asia=None):
+    """한글/라틴 혼합 텍스트의 한 줄 렌더링 너비 (DXA, 글꼴 메트릭 기준)"""
+    return text_width_dxa(text, font, size_pt, bold, east_asia)
+
+
+def _cell_lines(paragraphs, usable, fonts):
+    """셀 단락들이 usable 폭에서 차지하는 줄 수 (단락마다 새 줄)"""
+    font, east_asia, size_pt, bold = fonts
+    texts = [t for t in paragraphs if t]
+    if not texts:
+        return 1
+    return sum(count_lines(t, usable, font, size_pt, bold, east_asia) for t in texts)
 
 
 # ============================================================
 # 1. 컬럼 너비 불균형 분석
 # ============================================================
 
-def analyze_table_widths(tbl, table_index, section_heading):
-    """단일 데이터 테이블의 컬럼 너비 불균형 분석"""
+def analyze_table_widths(el, table_index, section_heading, content_width_dxa=TOTAL_TABLE_WIDTH_DXA,
+                         default_font=DEFAULT_RUN_FONT):
+    """단일 데이터 테이블의 컬럼 너비 불균형 분석 (el: 테이블 BodyElement, 너비: 콘텐츠 폭 DXA)
+
+    default_font: 런에 글꼴/크기가 없을 때 쓰는 문서 기본 글꼴 (크기는 TABLE_TEXT_SIZE_PT)
+    """
     issues = []
-    rows_xml = tbl.findall(f'{{{W}}}tr')
+    rows_xml = el.rows
     if len(rows_xml) < 2:
         return None  # 헤더만 있는 테이블은 건너뜀
 
@@ -240,39 +275,26 @@ def analyze_table_widths(tbl, table_index, section_heading):
                 if span > 1:
                     return None  # 병합된 테이블은 분석 건너뜀
 
-    # 컬럼별 실제 할당 너비 추출 (w:tcW)
-    allocated = []
-    for tc in header_cells:
-        tcPr = tc.find(f'{{{W}}}tcPr')
-        w_val = 0
-        if tcPr is not None:
-            tcW = tcPr.find(f'{{{W}}}tcW')
-            if tcW is not None:
-                try:
-                    w_val = int(tcW.get(f'{{{W}}}w', '0'))
-                except ValueError:
-                    w_val = 0
-        allocated.append(w_val)
+    # 컬럼별 실제 할당 너비 (w:tcW)
+    allocated = el.cell_widths[0]
 
     if not any(a > 0 for a in allocated):
         return None  # 너비 정보 없음
 
     # 헤더 텍스트 추출
-    headers = []
-    for tc in header_cells:
-        cell_texts = []
-        for p in tc.findall(f'{{{W}}}p'):
-            t = extract_text(p)
-            if t:
-                cell_texts.append(t)
-        headers.append(' '.join(cell_texts))
-
-    # 각 셀의 텍스트 너비 추정 (모든 행)
+    row_texts = el.row_paragraphs
+    headers = [_cell_text(cell) for cell in row_texts[0]]
+    header_font, data_font = get_table_fonts(rows_xml, default_font, TABLE_TEXT_SIZE_PT)
+    usable_widths = [max((allocated[i] if allocated[i] > 0 else content_width_dxa // num_cols)
+                         - CELL_PADDING_DXA, 1) for i in range(num_cols)]
+
+    # 각 셀의 텍스트 너비 + 줄바꿈 줄 수 추정 (모든 행)
     col_max_text_width = [0] * num_cols
+    col_max_lines = [1] * num_cols
     col_all_empty_count = [0] * num_cols
     data_row_count = len(rows_xml) - 1  # 헤더 제외
 
-    for row_xml in rows_xml[1:]:  # 데이터 행만
+    for row_xml, row_cells in zip(rows_xml[1:], row_texts[1:]):  # 데이터 행만
         cells = row_xml.findall(f'{{{W}}}tc')
         for col_idx in range(min(len(cells), num_cols)):
             tc = cells[col_idx]
@@ -282,26 +304,23 @@ def analyze_table_widths(tbl, table_index, section_heading):
                 gs = tcPr.find(f'{{{W}}}gridSpan')
                 if gs is not None and int(gs.get(f'{{{W}}}val', '1')) > 1:
                     continue
-            cell_text = []
-            for p in tc.findall(f'{{{W}}}p'):
-                t = extract_text(p)
-                if t:
-                    cell_text.append(t)
-            full_text = ' '.join(cell_text)
-            tw = estimate_text_width_dxa(full_text)
+            full_text = _cell_text(row_cells[col_idx])
+            tw = estimate_text_width_dxa(full_text, data_font[0], data_font[2], data_font[3], data_font[1])
             if tw > col_max_text_width[col_idx]:
                 col_max_text_width[col_idx] = tw
+            lines = _cell_lines(row_cells[col_idx], usable_widths[col_idx], data_font)
+            if lines > col_max_lines[col_idx]:
+                col_max_lines[col_idx] = lines
             if not full_text.strip():
                 col_all_empty_count[col_idx] += 1
 
     # 컬럼별 메트릭 계산
     columns = []
     for i in range(num_cols):
-        alloc = allocated[i] if allocated[i] > 0 else (TOTAL_TABLE_WIDTH_DXA // num_cols)
-        usable = max(alloc - CELL_PADDING_DXA, 1)
+        alloc = allocated[i] if allocated[i] > 0 else (content_width_dxa // num_cols)
         max_tw = col_max_text_width[i]
         utilization = max_tw / alloc if alloc > 0 else 0
-        est_lines = max(1, max_tw / usable) if usable > 0 else 1
+        est_lines = col_max_lines[i]
         empty_ratio = col_all_empty_count[i] / data_row_count if data_row_count > 0 else 0
 
         columns.append({
@@ -313,10 +332,12 @@ def analyze_table_widths(tbl, table_index, section_heading):
             'emptyRatio': round(empty_ratio, 2),
         })
 
-    # 헤더 텍스트 오버플로우 감지 (헤더는 볼드 → 폭 보정)
+    # 헤더 텍스트 오버플로우 감지 (헤더 런 글꼴, 기본 볼드)
+    header_widths = [estimate_text_width_dxa(col['header'], header_font[0], header_font[2], header_font[3],
+                                             header_font[1]) for col in columns]
     for i, col in enumerate(columns):
         header_text = col['header']
-        header_width = int(estimate_text_width_dxa(header_text) * BOLD_WIDTH_FACTOR)
+        header_width = header_widths[i]
         usable = max(col['allocatedWidth'] - CELL_PADDING_DXA, 1)
         if header_width > usable:
             overflow = header_width - usable
@@ -379,16 +400,16 @@ def analyze_table_widths(tbl, table_index, section_heading):
         for i, col in enumerate(columns):
             # 데이터 기반 ideal
             data_ideal = int(col['maxTextWidth'] * 1.2) + CELL_PADDING_DXA
-            # 헤더 기반 최소 (볼드 보정)
-            header_min = int(estimate_text_width_dxa(col['header']) * BOLD_WIDTH_FACTOR) + CELL_PADDING_DXA
+            # 헤더 기반 최소
+            header_min = header_widths[i] + CELL_PADDING_DXA
             ideal = max(MIN_READABLE_WIDTH_DXA, data_ideal, header_min)
             ideals.append(ideal)
         total_ideal = sum(ideals)
         if total_ideal > 0:
-            suggested_widths = [max(MIN_READABLE_WIDTH_DXA, round(ideal / total_ideal * TOTAL_TABLE_WIDTH_DXA))
+            suggested_widths = [max(MIN_READABLE_WIDTH_DXA, round(ideal / total_ideal * content_width_dxa))
                                 for ideal in ideals]
-            # 보정: 합계가 정확히 TOTAL_TABLE_WIDTH_DXA가 되도록
-            diff = TOTAL_TABLE_WIDTH_DXA - sum(suggested_widths)
+            # 보정: 합계가 정확히 콘텐츠 폭이 되도록
+            diff = content_width_dxa - sum(suggested_widths)
             if diff != 0 and suggested_widths:
                 # 가장 넓은 컬럼에서 보정
                 max_idx = suggested_widths.index(max(suggested_widths))
@@ -413,6 +434,23 @@ def analyze_table_widths(tbl, table_index, section_heading):
     }
 
 
+class TableWidthVisitor(ReviewVisitor):
+    """데이터 테이블마다 analyze_table_widths 실행 → 분석 결과 목록"""
+
+    def __init__(self):
+        self.analyses = []
+
+    def visit_table(self, el, ctx):
+        if el.tbl_type == 'data_table':
+            analysis = analyze_table_widths(el, ctx.data_table_index, ctx.current_heading,
+                                            ctx.content_width_dxa, ctx.default_font)
+            if analysis:
+                self.analyses.append(analysis)
+
+    def finish(self):
+        return self.analyses
+
+
 # ============================================================
 # 2. 콘텐츠 정합성 (소스 MD vs DOCX)
 # ============================================================
@@ -511,53 +549,55 @@ def count_md_elements(md_path, header_clean_until=None):
     return counts
 
 
-def count_docx_elements(body):
-    """DOCX body 요소에서 요소 수 카운트 (validate-docx.py 패턴)"""
-    counts = {
-        'h2': 0, 'h3': 0, 'h4': 0,
-        'tables': 0, 'codeBlocks': 0,
-        'images': 0, 'bullets': 0,
-        'infoBoxes': 0, 'warningBoxes': 0,
-    }
+class ElementCountVisitor(ReviewVisitor):
+    """DOCX 요소 수 카운트 (validate-docx.py 패턴)"""
 
-    for child in body:
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+    def __init__(self):
+        self.counts = {
+            'h2': 0, 'h3': 0, 'h4': 0,
+            'tables': 0, 'codeBlocks': 0,
+            'images': 0, 'bullets': 0,
+            'infoBoxes': 0, 'warningBoxes': 0,
+        }
 
-        if tag == 'p':
-            style = get_paragraph_style(child)
-
-            # 이미지
-            if get_image_size_pt(child):
-                counts['images'] += 1
-
-            # 제목
-            elif style.startswith('Heading'):
-                level_str = style.replace('Heading', '')
-                if level_str == '2':
-                    counts['h2'] += 1
-                elif level_str == '3':
-                    counts['h3'] += 1
-                elif level_str == '4':
-                    counts['h4'] += 1
-
-            # 불릿
-            elif child.find(f'{{{W}}}pPr') is not None:
-                pPr = child.find(f'{{{W}}}pPr')
-                if pPr.find(f'{{{W}}}numPr') is not None:
-                    counts['bullets'] += 1
+    def visit_paragraph(self, el, ctx):
+        counts = self.counts
+        kind = el.kind
 
-        elif tag == 'tbl':
-            tbl_type = classify_table(child)
-            if tbl_type in ('code_dark', 'code_light'):
-                counts['codeBlocks'] += 1
-            elif tbl_type == 'info_box':
-                counts['infoBoxes'] += 1
-            elif tbl_type == 'warning_box':
-                counts['warningBoxes'] += 1
-            elif tbl_type == 'data_table':
-                counts['tables'] += 1
+        # 이미지
+        if kind == 'image':
+            counts['images'] += 1
 
-    return counts
+        # 제목
+        elif kind == 'heading':
+            if el.heading_level in (2, 3, 4):
+                counts[f'h{el.heading_level}'] += 1
+
+        # 불릿
+        elif kind == 'bullet':
+            counts['bullets'] += 1
+
+    def visit_table(self, el, ctx):
+        counts = self.counts
+        tbl_type = el.tbl_type
+        if tbl_type in ('code_dark', 'code_light'):
+            counts['codeBlocks'] += 1
+        elif tbl_type == 'info_box':
+            counts['infoBoxes'] += 1
+        elif tbl_type == 'warning_box':
+            counts['warningBoxes'] += 1
+        elif tbl_type == 'data_table':
+            counts['tables'] += 1
+
+    def finish(self):
+        return self.counts
+
+
+def count_docx_elements(elements):
+    """DOCX body 요소(BodyElement 목록)에서 요소 수 카운트"""
+    visitor = ElementCountVisitor()
+    walk_body(elements, [visitor])
+    return visitor.finish()
 
 
 def compare_content(md_counts, docx_counts):
@@ -606,29 +646,22 @@ def compare_content(md_counts, docx_counts):
 # 3. 코드블록 무결성
 # ============================================================
 
-def check_code_integrity(body):
+class CodeIntegrityVisitor(ReviewVisitor):
     """코드블록(다크/라이트 테이블)의 무결성 검사"""
-    issues = []
-    code_index = 0
 
-    for child in body:
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-        if tag != 'tbl':
-            continue
+    def __init__(self):
+        self.issues = []
+        self.code_index = 0
 
-        tbl_type = classify_table(child)
-        if tbl_type not in ('code_dark', 'code_light'):
-            continue
+    def visit_table(self, el, ctx):
+        if el.tbl_type not in ('code_dark', 'code_light'):
+            return
 
-        code_index += 1
+        self.code_index += 1
+        code_index = self.code_index
+        issues = self.issues
         # 코드블록 텍스트 추출
-        code_text = []
-        for tr in child.findall(f'{{{W}}}tr'):
-            for tc in tr.findall(f'{{{W}}}tc'):
-                for p in tc.findall(f'{{{W}}}p'):
-                    t = extract_text(p)
-                    if t:
-                        code_text.append(t)
+        code_text = [t for row in el.row_paragraphs for cell in row for t in cell if t]
 
         full_code = '\n'.join(code_text).strip()
 
@@ -640,7 +673,7 @@ def check_code_integrity(body):
                 'message': f"코드블록 #{code_index}이 비어있음",
                 'codeIndex': code_index,
             })
-            continue
+            return
 
         # JSON 무결성 — { 로 시작하면 } 로 끝나야
         # 다이어그램/ASCII art 등 비-JSON 텍스트 제외: " 또는 : 포함 여부로 판별
@@ -664,14 +697,22 @@ def check_code_integrity(body):
                     'preview': trimmed[-60:],
                 })
 
-    return issues
+    def finish(self):
+        return self.issues
+
+
+def check_code_integrity(elements):
+    """코드블록(다크/라이트 테이블)의 무결성 검사"""
+    visitor = CodeIntegrityVisitor()
+    walk_body(elements, [visitor])
+    return visitor.finish()
 
 
 # ============================================================
 # 4. 제목 구조
 # ============================================================
 
-def check_heading_structure(elements):
+def check_heading_structure(elements, usable_height_pt=USABLE_HEIGHT_PT):
     """제목 구조 이상 감지"""
     issues = []
     headings = [e for e in elements if e['type'] == 'heading']
@@ -707,11 +748,11 @@ def check_heading_structure(elements):
             section_height = sum(
                 e.get('est_height', 0) for e in elements[start_idx:end_idx]
             )
-            if section_height > USABLE_HEIGHT_PT * 2:
+            if section_height > usable_height_pt * 2:
                 issues.append({
                     'type': 'LONG_SECTION_NO_SUBDIVISION',
                     'severity': 'INFO',
-                    'message': f"H2 \"{h['text'][:40]}\" 아래 H3 없이 ~{section_height:.0f}pt (약 {section_height/USABLE_HEIGHT_PT:.1f}페이지)",
+                    'message': f"H2 \"{h['text'][:40]}\" 아래 H3 없이 ~{section_height:.0f}pt (약 {section_height/usable_height_pt:.1f}페이지)",
                 })
 
     return issues
@@ -721,7 +762,7 @@ def check_heading_structure(elements):
 # 5. 페이지 분포 (validate-docx.py 데이터 활용)
 # ============================================================
 
-def check_page_distribution(elements):
+def check_page_distribution(elements, usable_height_pt=USABLE_HEIGHT_PT):
     """페이지 분포 분석 — 희소 페이지 감지"""
     # 간단한 페이지 시뮬레이션
     pages = []
@@ -733,7 +774,7 @@ def check_page_distribution(elements):
             pages.append(current_height)
             current_height = 0.0
             continue
-        if current_height + est_h > USABLE_HEIGHT_PT and current_height > 0:
+        if current_height + est_h > usable_height_pt and current_height > 0:
             pages.append(current_height)
             current_height = 0.0
         current_height += est_h
@@ -745,7 +786,7 @@ def check_page_distribution(elements):
     consecutive_sparse = 0
 
     for i, height in enumerate(pages):
-        fill_pct = (height / USABLE_HEIGHT_PT) * 100 if USABLE_HEIGHT_PT > 0 else 0
+        fill_pct = (height / usable_height_pt) * 100 if usable_height_pt > 0 else 0
         if fill_pct < SPARSE_PAGE_PCT:
             issues.append({
                 'type': 'SPARSE_PAGE',
@@ -786,81 +827,84 @@ def check_table_readability(table_analyses):
     return issues
 
 
-def check_image_aspect_ratio(body):
+class ImageAspectVisitor(ReviewVisitor):
     """이미지 비율 이슈 — 다이어그램이 너무 좁게 렌더링된 경우 감지"""
-    issues = []
-    current_heading = '(문서 시작)'
-    content_width_pt = TOTAL_TABLE_WIDTH_DXA / 20  # DXA → pt
-    min_width_pt = content_width_pt * MIN_IMAGE_WIDTH_PCT
-    img_index = 0
 
-    for child in body:
-        tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+    def __init__(self):
+        self.issues = []
+        self.img_index = 0
+
+    def visit_paragraph(self, el, ctx):
+        img_size = el.image_size_pt
+        if not img_size:
+            return
+        self.img_index += 1
+        img_index = self.img_index
+        current_heading = ctx.current_heading
+        content_width_pt = ctx.content_width_dxa / 20  # DXA → pt
+        w_pt, h_pt = img_size
+        ratio = w_pt / h_pt if h_pt > 0 else 1.0
+
+        if w_pt < content_width_pt * MIN_IMAGE_WIDTH_PCT:
+            pct = w_pt / content_width_pt * 100
+            self.issues.append({
+                'type': 'NARROW_IMAGE',
+                'severity': 'WARN',
+                'message': f'이미지 #{img_index} ({current_heading[:30]}): '
+                           f'폭 {w_pt:.0f}pt — 페이지 너비의 {pct:.0f}%로 가독성 부족 '
+                           f'(비율 {ratio:.2f})',
+                'imageIndex': img_index,
+                'section': current_heading,
+                'width_pt': round(w_pt, 1),
+                'height_pt': round(h_pt, 1),
+                'aspectRatio': round(ratio, 2),
+                'action': '다이어그램 방향 변경 (flowchart TD→LR) '
+                          '또는 노드 그룹핑으로 가로 비율 확보',
+            })
+        elif h_pt < MIN_IMAGE_HEIGHT_PT:
+            self.issues.append({
+                'type': 'FLAT_IMAGE',
+                'severity': 'WARN',
+                'message': f'이미지 #{img_index} ({current_heading[:30]}): '
+                           f'높이 {h_pt:.0f}pt — 최소 {MIN_IMAGE_HEIGHT_PT}pt 미만으로 '
+                           f'가독성 부족 (비율 {ratio:.2f})',
+                'imageIndex': img_index,
+                'section': current_heading,
+                'width_pt': round(w_pt, 1),
+                'height_pt': round(h_pt, 1),
+                'aspectRatio': round(ratio, 2),
+                'action': '노드를 복수 행으로 그룹핑 (composite state, subgraph) '
+                          '하여 높이 확보. 단순 LR 전환만으로는 해결 불가',
+            })
 
-        if tag == 'p':
-            style = get_paragraph_style(child)
-            if style.startswith('Heading'):
-                text = extract_text(child)
-                if text:
-                    current_heading = text
-
-            img_size = get_image_size_pt(child)
-            if img_size:
-                img_index += 1
-                w_pt, h_pt = img_size
-                ratio = w_pt / h_pt if h_pt > 0 else 1.0
-
-                if w_pt < min_width_pt:
-                    pct = w_pt / content_width_pt * 100
-                    issues.append({
-                        'type': 'NARROW_IMAGE',
-                        'severity': 'WARN',
-                        'message': f'이미지 #{img_index} ({current_heading[:30]}): '
-                                   f'폭 {w_pt:.0f}pt — 페이지 너비의 {pct:.0f}%로 가독성 부족 '
-                                   f'(비율 {ratio:.2f})',
-                        'imageIndex': img_index,
-                        'section': current_heading,
-                        'width_pt': round(w_pt, 1),
-                        'height_pt': round(h_pt, 1),
-                        'aspectRatio': round(ratio, 2),
-                        'action': '다이어그램 방향 변경 (flowchart TD→LR) '
-                                  '또는 노드 그룹핑으로 가로 비율 확보',
-                    })
-                elif h_pt < MIN_IMAGE_HEIGHT_PT:
-                    issues.append({
-                        'type': 'FLAT_IMAGE',
-                        'severity': 'WARN',
-                        'message': f'이미지 #{img_index} ({current_heading[:30]}): '
-                                   f'높이 {h_pt:.0f}pt — 최소 {MIN_IMAGE_HEIGHT_PT}pt 미만으로 '
-                                   f'가독성 부족 (비율 {ratio:.2f})',
-                        'imageIndex': img_index,
-                        'section': current_heading,
-                        'width_pt': round(w_pt, 1),
-                        'height_pt': round(h_pt, 1),
-                        'aspectRatio': round(ratio, 2),
-                        'action': '노드를 복수 행으로 그룹핑 (composite state, subgraph) '
-                                  '하여 높이 확보. 단순 LR 전환만으로는 해결 불가',
-                    })
+    def finish(self):
+        return self.issues
 
-    return issues
+
+def check_image_aspect_ratio(elements, content_width_dxa=TOTAL_TABLE_WIDTH_DXA):
+    """이미지 비율 이슈 — 다이어그램이 너무 좁게 렌더링된 경우 감지"""
+    visitor = ImageAspectVisitor()
+    walk_body(elements, [visitor], WalkContext(content_width_dxa))
+    return visitor.finish()
 
 
 # ============================================================
 # 메인 분석 파이프라인
 # ============================================================
 
-def analyze_docx(docx_path, config_path=None):
-    """DOCX 전체 분석 → 구조화된 결과"""
-    global TOTAL_TABLE_WIDTH_DXA, USABLE_HEIGHT_PT
-    if not os.path.exists(docx_path):
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}", file=sys.stderr)
-        sys.exit(1)
+def analyze_docx(source, config_path=None, name=None):
+    """DOCX 전체 분석 → 구조화된 결과
+
+    source: 경로, bytes, 바이너리 파일 객체 (load_docx 참조). 없는 경로는 FileNotFoundError.
+    페이지 기하는 문서별 WalkContext에 담기므로 여러 스레드에서 동시에 호출해도 된다.
+    """
+    model = load_docx(source, name)
 
     # 페이지 크기 자동 감지
-    TOTAL_TABLE_WIDTH_DXA, USABLE_HEIGHT_PT = detect_content_width(docx_path)
+    content_width, usable_height = detect_content_width(model)
 
     result = {
-        'file': os.path.basename(docx_path),
+        'file': model.name,
         'checks': {},
         'summary': {'WARN': 0, 'SUGGEST': 0, 'INFO': 0},
     }
@@ -876,175 +920,112 @@ def analyze_docx(docx_path, config_path=None):
             md_path = config['source']
         header_clean_until = config.get('headerCleanUntil')
 
-    with zipfile.ZipFile(docx_path, 'r') as z:
-        tree = ET.parse(z.open('word/document.xml'))
-        root = tree.getroot()
-        body = root.find(f'{{{W}}}body')
-        if body is None:
-            result['checks']['error'] = 'body 요소를 찾을 수 없음'
-            return result
-
-        # === 요소 흐름 파싱 (페이지 분포 + 제목 구조에 사용) ===
-        elements = []
-        last_heading_text = '(문서 시작)'
-        elem_idx = 0
-        data_table_index = 0
-
-        for child in body:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-
-            if tag == 'p':
-                style = get_paragraph_style(child)
-                text = extract_text(child)
-
-                if has_page_break(child):
-                    elements.append({'type': 'page_break', 'est_height': 0, 'elem_index': elem_idx})
-
-                img_size = get_image_size_pt(child)
-                if img_size:
-                    elements.append({
-                        'type': 'image', 'est_height': img_size[1] + EST_IMAGE_SPACING,
-                        'elem_index': elem_idx,
-                    })
-                elif style.startswith('Heading'):
-                    level_str = style.replace('Heading', '')
-                    level = int(level_str) if level_str.isdigit() else 0
-                    est_h = {2: EST_H2, 3: EST_H3, 4: EST_H4}.get(level, EST_PARAGRAPH)
-                    elements.append({
-                        'type': 'heading', 'level': level, 'text': text,
-                        'est_height': est_h, 'elem_index': elem_idx,
-                    })
-                    last_heading_text = text
-                elif child.find(f'{{{W}}}pPr') is not None and \
-                     child.find(f'{{{W}}}pPr').find(f'{{{W}}}numPr') is not None:
-                    elements.append({'type': 'bullet', 'est_height': EST_BULLET, 'elem_index': elem_idx})
-                elif not text:
-                    elements.append({'type': 'empty', 'est_height': EST_EMPTY, 'elem_index': elem_idx})
-                else:
-                    line_count = max(1, len(text) / 80) if text else 1
-                    elements.append({
-                        'type': 'paragraph', 'est_height': round(EST_PARAGRAPH * line_count, 1),
-                        'elem_index': elem_idx,
-                    })
-                elem_idx += 1
-
-            elif tag == 'tbl':
-                tbl_type = classify_table(child)
-                rows_count = len(child.findall(f'{{{W}}}tr'))
-
-                if tbl_type in ('code_dark', 'code_light'):
-                    est_h = rows_count * EST_CODE_ROW + 20
-                elif tbl_type == 'info_box':
-                    est_h = EST_INFO_BOX
-                elif tbl_type == 'warning_box':
-                    est_h = EST_INFO_BOX
-                else:
-                    est_h = EST_TABLE_HEADER + max(0, rows_count - 1) * EST_TABLE_ROW
-
-                elements.append({
-                    'type': 'table', 'tbl_type': tbl_type, 'est_height': est_h,
-                    'elem_index': elem_idx,
-                })
-                elem_idx += 1
-
-        # === 1. 컬럼 너비 분석 ===
-        table_analyses = []
-        data_table_index = 0
-        current_heading = '(문서 시작)'
-
-        for child in body:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if tag == 'p':
-                style = get_paragraph_style(child)
-                if style.startswith('Heading'):
-                    text = extract_text(child)
-                    if text:
-                        current_heading = text
-            elif tag == 'tbl':
-                tbl_type = classify_table(child)
-                if tbl_type == 'data_table':
-                    data_table_index += 1
-                    analysis = analyze_table_widths(child, data_table_index, current_heading)
-                    if analysis:
-                        table_analyses.append(analysis)
-
-        # tableWidths 결과 취합
-        tw_status = 'OK'
-        tw_issues_all = []
-        for ta in table_analyses:
-            tw_issues_all.extend(ta['issues'])
-        if any(iss['type'] == 'WIDTH_IMBALANCE' for iss in tw_issues_all):
-            tw_status = 'SUGGEST'
-
-        result['checks']['tableWidths'] = {
-            'status': tw_status,
-            'tables': [{
-                'index': ta['index'],
-                'headers': ta['headers'],
-                'section': ta['section'],
-                'rows': ta['rows'],
-                'cols': ta['cols'],
-                'columns': ta['columns'],
-                'issues': ta['issues'],
-                'suggestedWidths': ta.get('suggestedWidths'),
-            } for ta in table_analyses if ta['issues']],
-            'analyzedCount': len(table_analyses),
-        }
+    # 높이 계수: config의 theme + 페이지 방향으로 레이아웃 프로필 조회
+    est = layout_coefficients(config.get('theme') if config else None, detect_orientation(model))
+
+    if model.body is None:
+        result['checks']['error'] = 'body 요소를 찾을 수 없음'
+        return result
+    body_elements = model.elements
+
+    # === 단일 순회: 요소 흐름 + 검사 방문자 ===
+    # 새 검사는 ReviewVisitor로 만들어 여기에 등록한다 (body를 다시 순회하지 않음)
+    has_source = bool(md_path and os.path.exists(md_path))
+    flow = FlowVisitor()
+    widths = TableWidthVisitor()
+    code = CodeIntegrityVisitor()
+    images = ImageAspectVisitor()
+    counter = ElementCountVisitor() if has_source else None
+    visitors = [flow, widths, code, images] + ([counter] if counter else [])
+    with phase('walk'):
+        walk_body(body_elements, visitors, WalkContext(content_width, usable_height, model.default_run_font, est))
+    elements = flow.finish()
+
+    # === 1. 컬럼 너비 분석 ===
+    table_analyses = widths.finish()
+
+    # tableWidths 결과 취합
+    tw_status = 'OK'
+    tw_issues_all = []
+    for ta in table_analyses:
+        tw_issues_all.extend(ta['issues'])
+    if any(iss['type'] == 'WIDTH_IMBALANCE' for iss in tw_issues_all):
+        tw_status = 'SUGGEST'
+
+    result['checks']['tableWidths'] = {
+        'status': tw_status,
+        'tables': [{
+            'index': ta['index'],
+            'headers': ta['headers'],
+            'section': ta['section'],
+            'rows': ta['rows'],
+            'cols': ta['cols'],
+            'columns': ta['columns'],
+            'issues': ta['issues'],
+            'suggestedWidths': ta.get('suggestedWidths'),
+        } for ta in table_analyses if ta['issues']],
+        'analyzedCount': len(table_analyses),
+    }
 
-        # === 2. 콘텐츠 정합성 ===
-        if md_path and os.path.exists(md_path):
+    # === 2. 콘텐츠 정합성 ===
+    if has_source:
+        with phase('check_content_fidelity'):
             md_counts = count_md_elements(md_path, header_clean_until=header_clean_until)
-            docx_counts = count_docx_elements(body)
+            docx_counts = counter.finish()
             if md_counts:
                 comparison, content_issues = compare_content(md_counts, docx_counts)
-                cf_status = 'WARN' if any(i['severity'] == 'WARN' for i in content_issues) else 'OK'
-                result['checks']['contentFidelity'] = {
-                    'status': cf_status,
-                    'sourcePath': md_path,
-                    'comparison': comparison,
-                    'issues': content_issues,
-                }
-        else:
+        if md_counts:
+            cf_status = 'WARN' if any(i['severity'] == 'WARN' for i in content_issues) else 'OK'
             result['checks']['contentFidelity'] = {
-                'status': 'SKIP',
-                'message': '--config 없음 또는 소스 파일 없음',
+                'status': cf_status,
+                'sourcePath': md_path,
+                'comparison': comparison,
+                'issues': content_issues,
             }
+    else:
+        result['checks']['contentFidelity'] = {
+            'status': 'SKIP',
+            'message': '--config 없음 또는 소스 파일 없음',
+        }
 
-        # === 3. 테이블 가독성 ===
+    # === 3. 테이블 가독성 ===
+    with phase('check_table_readability'):
         readability_issues = check_table_readability(table_analyses)
-        result['checks']['tableReadability'] = {
-            'status': 'INFO' if readability_issues else 'OK',
-            'issues': readability_issues,
-        }
+    result['checks']['tableReadability'] = {
+        'status': 'INFO' if readability_issues else 'OK',
+        'issues': readability_issues,
+    }
 
-        # === 4. 코드블록 무결성 ===
-        code_issues = check_code_integrity(body)
-        result['checks']['codeIntegrity'] = {
-            'status': 'WARN' if any(i['severity'] == 'WARN' for i in code_issues) else 'OK',
-            'issues': code_issues,
-        }
+    # === 4. 코드블록 무결성 ===
+    code_issues = code.finish()
+    result['checks']['codeIntegrity'] = {
+        'status': 'WARN' if any(i['severity'] == 'WARN' for i in code_issues) else 'OK',
+        'issues': code_issues,
+    }
 
-        # === 5. 페이지 분포 ===
-        page_issues = check_page_distribution(elements)
-        result['checks']['pageDistribution'] = {
-            'status': 'INFO' if page_issues else 'OK',
-            'issues': page_issues,
-        }
+    # === 5. 페이지 분포 ===
+    with phase('check_page_distribution'):
+        page_issues = check_page_distribution(elements, usable_height)
+    result['checks']['pageDistribution'] = {
+        'status': 'INFO' if page_issues else 'OK',
+        'issues': page_issues,
+    }
 
-        # === 6. 제목 구조 ===
-        heading_issues = check_heading_structure(elements)
-        result['checks']['headingStructure'] = {
-            'status': 'WARN' if any(i['severity'] == 'WARN' for i in heading_issues) else (
-                'INFO' if heading_issues else 'OK'),
-            'issues': heading_issues,
-        }
+    # === 6. 제목 구조 ===
+    with phase('check_heading_structure'):
+        heading_issues = check_heading_structure(elements, usable_height)
+    result['checks']['headingStructure'] = {
+        'status': 'WARN' if any(i['severity'] == 'WARN' for i in heading_issues) else (
+            'INFO' if heading_issues else 'OK'),
+        'issues': heading_issues,
+    }
 
-        # === 7. 이미지 비율 ===
-        image_issues = check_image_aspect_ratio(body)
-        result['checks']['imageAspectRatio'] = {
-            'status': 'WARN' if image_issues else 'OK',
-            'issues': image_issues,
-        }
+    # === 7. 이미지 비율 ===
+    image_issues = images.finish()
+    result['checks']['imageAspectRatio'] = {
+        'status': 'WARN' if image_issues else 'OK',
+        'issues': image_issues,
+    }
 
     # === 전체 요약 ===
     for check_name, check_data in result['checks'].items():
@@ -1156,6 +1137,36 @@ def print_report(result):
     print()
 
 
+def _config_inputs(config_path):
+    """리뷰 결과에 영향을 주는 부가 입력 파일 — config JSON + config['source'] MD"""
+    if not config_path:
+        return []
+    files = [config_path]
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            source = json.load(f).get('source')
+    except (OSError, ValueError, AttributeError):
+        source = None
+    if source:
+        files.append(source)
+    return files
+
+
+def review_json(source, config_path=None, use_cache=True, name=None):
+    """--json 결과 dict — DOCX/config/MD가 그대로면 리포트 캐시에서 반환
+
+    source: 경로, bytes, 바이너리 파일 객체. 캐시 키는 이미 읽어 둔 바이트의 해시라서
+    캐시 조회와 분석이 파일을 한 번만 읽는다.
+    """
+    source = load_docx(source, name)
+    name = None
+    return cached_report(__file__, source,
+                         lambda: analyze_docx(source, config_path, name),
+                         extra_files=_config_inputs(config_path) + [layout_profile_path()],
+                         options={'config': bool(config_path)},
+                         use_cache=use_cache)
+
+
 # ============================================================
 # 메인
 # ============================================================
@@ -1164,6 +1175,9 @@ if __name__ == '__main__':
     if len(sys.argv) < 2:
         print('사용법: python -X utf8 tools/review-docx.py <파일.docx> [--config <config.json>] [--json]')
         print('예시:   python -X utf8 tools/review-docx.py output/문서.docx --config doc-configs/문서.json --json')
+        print('        --no-cache: 리포트 캐시 사용 안 함')
+        print('        <파일.docx> 대신 - : stdin으로 DOCX 바이트를 받음')
+        print('        --timings: 단계별 소요 시간/최대 메모리, --profile <경로>: cProfile 저장')
         sys.exit(1)
 
     docx_path = sys.argv[1]
@@ -1175,9 +1189,27 @@ if __name__ == '__main__':
         if idx + 1 < len(sys.argv):
             config_path = sys.argv[idx + 1]
 
-    result = analyze_docx(docx_path, config_path)
+    timings, profile_path = parse_timing_argv(sys.argv)
+
+    try:
+        with TimingSession(timings, profile_path) as session:
+            docx_path = cli_docx_source(docx_path)
+            if json_mode:
+                result = review_json(docx_path, config_path, use_cache='--no-cache' not in sys.argv)
+                with phase('serialization'):
+                    output = json.dumps(result, ensure_ascii=False, indent=2)
+            else:
+                result = analyze_docx(docx_path, config_path)
+                with phase('serialization'):
+                    print_report(result)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
 
     if json_mode:
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if session.enabled:
+            result['timings'] = session.report()
+            output = json.dumps(result, ensure_ascii=False, indent=2)
+        print(output)
     else:
-        print_report(result)
+        session.print_report()
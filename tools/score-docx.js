@@ -7,12 +7,16 @@
  *   node tools/score-docx.js --batch                              # 전체 문서
  *   node tools/score-docx.js --batch --save                       # 전체 + 저장
  *   node tools/score-docx.js --batch --skip-convert               # 기존 DOCX 사용
+ *
+ * validate/review는 Python 분석 서버(lib/analysis-client.js) 하나로 처리한다.
+ * 배치에서도 서버는 한 번만 뜨므로 문서당 인터프리터 시작 비용이 없다.
  */
 
 const fs = require('fs');
 const path = require('path');
 const { execSync } = require('child_process');
 const scoring = require('../lib/scoring');
+const { withAnalysisClient } = require('../lib/analysis-client');
 
 const PROJECT_ROOT = path.resolve(__dirname, '..');
 const DOC_CONFIGS_DIR = path.join(PROJECT_ROOT, 'doc-configs');
@@ -63,7 +67,13 @@ function runConvert(configPath) {
   });
 }
 
-function scoreDocument(configPath, options = {}) {
+/**
+ * 단일 문서 점수 산출
+ * @param {string} configPath
+ * @param {object} [options] - { skipConvert, analysis }
+ *   analysis: AnalysisClient (배치에서 공유). 없으면 execSync로 도구를 직접 실행
+ */
+async function scoreDocument(configPath, options = {}) {
   const name = getConfigName(configPath);
   const config = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
   const outputPath = resolveOutputPath(config);
@@ -78,8 +88,13 @@ function scoreDocument(configPath, options = {}) {
   }
 
   // 검증 실행
-  const validateJson = runValidate(outputPath);
-  const reviewJson = runReview(outputPath, configPath);
+  const analysis = options.analysis;
+  const validateJson = analysis
+    ? await analysis.validate(outputPath).catch(() => null)
+    : runValidate(outputPath);
+  const reviewJson = analysis
+    ? await analysis.review(outputPath, configPath).catch(() => null)
+    : runReview(outputPath, configPath);
 
   if (!validateJson) {
     return { name, error: '레이아웃 검증 실패' };
@@ -217,7 +232,7 @@ function printBatchSummary(results) {
   console.log(`\n  성공 ${valid.length} | 오류 ${errors.length} / 총 ${results.length}개`);
 }
 
-function main() {
+async function main() {
   const args = process.argv.slice(2);
 
   if (args.length === 0 || args[0] === '--help') {
@@ -247,24 +262,26 @@ function main() {
 
     const results = [];
 
-    for (const configPath of configFiles) {
-      const name = getConfigName(configPath);
-      process.stderr.write(`  채점: ${name}...`);
+    await withAnalysisClient(async (analysis) => {
+      for (const configPath of configFiles) {
+        const name = getConfigName(configPath);
+        process.stderr.write(`  채점: ${name}...`);
 
-      try {
-        const result = scoreDocument(configPath, { skipConvert });
-        results.push(result);
+        try {
+          const result = await scoreDocument(configPath, { skipConvert, analysis });
+          results.push(result);
 
-        if (doSave && !result.error) {
-          saveScore(result);
-        }
+          if (doSave && !result.error) {
+            saveScore(result);
+          }
 
-        process.stderr.write(result.error ? ` ERROR\n` : ` ${result.scores.overall}\n`);
-      } catch (err) {
-        results.push({ name, error: err.message.split('\n')[0] });
-        process.stderr.write(` ERROR\n`);
+          process.stderr.write(result.error ? ` ERROR\n` : ` ${result.scores.overall}\n`);
+        } catch (err) {
+          results.push({ name, error: err.message.split('\n')[0] });
+          process.stderr.write(` ERROR\n`);
+        }
       }
-    }
+    }, { quiet: true });
 
     printBatchSummary(results);
 
@@ -280,7 +297,10 @@ function main() {
       process.exit(1);
     }
 
-    const result = scoreDocument(configPath, { skipConvert });
+    const result = await withAnalysisClient(
+      analysis => scoreDocument(configPath, { skipConvert, analysis }),
+      { quiet: true }
+    );
     printSingleResult(result);
 
     if (doSave && !result.error) {
@@ -293,7 +313,10 @@ function main() {
 }
 
 if (require.main === module) {
-  main();
+  main().catch(err => {
+    console.error('[ERROR]', err.message);
+    process.exit(1);
+  });
 }
 
 module.exports = { scoreDocument, runValidate, runReview, runConvert, resolveOutputPath, getConfigName };
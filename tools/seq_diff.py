@@ -0,0 +1,123 @@
+"""
+시퀀스 정렬 — Myers O(ND) 차분으로 두 정수 시퀀스의 최소 편집 스크립트 일치 쌍을 구하는 공유 모듈.
+
+diff-docx(요소 순서 비교)와 fingerprint-docx(골든 지문 상세 비교)가 쓴다.
+요소를 시그니처 정수로 바꿔 넘기고, 제목처럼 문서를 나누는 위치는 앵커로 먼저 고정한다.
+
+사용법:
+    from seq_diff import diff_matches, anchored_matches
+    pairs = diff_matches([1, 2, 3, 4], [1, 3, 4, 5])           # [(0, 0), (2, 1), (3, 2)]
+    pairs = anchored_matches(a, b, heading_idx_a, heading_idx_b)  # 앵커 사이 구간만 따로 차분
+"""
+
+# 한 구간의 편집 거리가 이 값을 넘으면 가장 멀리 간 지점까지 확정하고 나머지를 새로 정렬한다
+# (trace 메모리 D² 상한. 보통 문서는 제목 앵커로 구간이 잘게 나뉘어 닿지 않는다)
+_MYERS_MAX_D = 1024
+
+
+def myers_matches(a, b):
+    """Myers O(ND) 차분 — 정수 시퀀스 a, b의 최소 편집 스크립트에서 일치 쌍 [(i, j)]."""
+    n, m = len(a), len(b)
+    matches = []
+    x0 = y0 = 0
+    while x0 < n and y0 < m:
+        sa, sb = a[x0:], b[y0:]
+        sn, sm = n - x0, m - y0
+        offset = sn + sm + 1
+        v = [0] * (2 * offset + 1)
+        trace = []
+        end = None
+        for d in range(sn + sm + 1):
+            for k in range(-d, d + 1, 2):
+                if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                    x = v[offset + k + 1]
+                else:
+                    x = v[offset + k - 1] + 1
+                y = x - k
+                while x < sn and y < sm and sa[x] == sb[y]:
+                    x += 1
+                    y += 1
+                v[offset + k] = x
+                if x >= sn and y >= sm:
+                    end = (x, y)
+                    break
+            trace.append(v[offset - d:offset + d + 1])
+            if end is not None:
+                break
+            if d >= _MYERS_MAX_D:
+                # 너무 비싼 구간: 가장 멀리 간 대각선까지만 확정
+                k = max(range(-d, d + 1, 2), key=lambda kk: 2 * v[offset + kk] - kk)
+                end = (v[offset + k], v[offset + k] - k)
+                break
+
+        # 역추적: 각 단계의 스네이크(대각선 일치)를 거꾸로 모은다
+        x, y = end
+        part = []
+        for d in range(len(trace) - 1, 0, -1):
+            prev = trace[d - 1]
+            k = x - y
+            if k == -d or (k != d and prev[k - 1 + d - 1] < prev[k + 1 + d - 1]):
+                pk = k + 1
+                px = prev[pk + d - 1]
+                sx, sy = px, px - k
+            else:
+                pk = k - 1
+                px = prev[pk + d - 1]
+                sx, sy = px + 1, px + 1 - k
+            while x > sx and y > sy:
+                x -= 1
+                y -= 1
+                part.append((x0 + x, y0 + y))
+            x, y = px, px - pk
+        while x > 0 and y > 0:
+            x -= 1
+            y -= 1
+            part.append((x0 + x, y0 + y))
+        part.reverse()
+        matches.extend(part)
+        if end[0] >= sn and end[1] >= sm:
+            break
+        x0, y0 = x0 + end[0], y0 + end[1]
+    return matches
+
+
+def diff_matches(a, b):
+    """a, b의 최소 편집 스크립트 일치 쌍 [(i, j)] — 공통 앞뒤와 상대편에 없는 값은 미리 덜어낸다."""
+    n, m = len(a), len(b)
+    pre = 0
+    while pre < n and pre < m and a[pre] == b[pre]:
+        pre += 1
+    suf = 0
+    while suf < n - pre and suf < m - pre and a[n - 1 - suf] == b[m - 1 - suf]:
+        suf += 1
+    matches = [(k, k) for k in range(pre)]
+
+    # 상대편에 한 번도 나오지 않는 값은 어떤 LCS에도 들지 않으므로 빼고 정렬해도 최소성이 유지된다
+    in_b = set(b[pre:m - suf])
+    in_a = set(a[pre:n - suf])
+    ia = [i for i in range(pre, n - suf) if a[i] in in_b]
+    jb = [j for j in range(pre, m - suf) if b[j] in in_a]
+    core = myers_matches([a[i] for i in ia], [b[j] for j in jb])
+    matches.extend((ia[i], jb[j]) for i, j in core)
+
+    matches.extend((n - suf + k, m - suf + k) for k in range(suf))
+    return matches
+
+
+def anchored_matches(a, b, anchor_a, anchor_b):
+    """앵커 위치(제목)끼리 먼저 차분해 고정하고, 앵커 사이 구간만 따로 차분한 일치 쌍 [(i, j)].
+
+    한 절이 끼어들거나 빠져도 정렬이 다른 절로 번지지 않고, 구간이 작아 차분도 빠르다.
+    """
+    anchors = [(anchor_a[i], anchor_b[j]) for i, j in
+               diff_matches([a[i] for i in anchor_a], [b[j] for j in anchor_b])]
+    anchors.append((len(a), len(b)))
+
+    matches = []
+    i0 = j0 = 0
+    for ai, aj in anchors:
+        matches.extend((i0 + i, j0 + j) for i, j in diff_matches(a[i0:ai], b[j0:aj]))
+        if ai < len(a):
+            matches.append((ai, aj))
+        i0, j0 = ai + 1, aj + 1
+    return matches
@@ -0,0 +1,369 @@
+"""
+합성 DOCX/MD 코퍼스 생성기 — 벤치마크·보정용 공유 모듈.
+
+변환기가 만드는 요소 패턴(제목 H2~H4, 데이터 테이블, 다크/라이트 코드 테이블,
+정보/경고 박스, 이미지, 불릿, 페이지 나누기)을 섹션 단위로 무작위 조합한 문서 구조(plan)를
+만들고, 같은 plan을 DOCX와 소스 MD로 각각 렌더링한다. 색상은 themes/*.json에서
+분류기가 쓰는 것과 같은 세트를 가져오므로 validate/review의 테이블 분류 경로가 그대로 실행된다.
+
+사용법:
+    from synth_corpus import generate_corpus, SCALES
+    manifest = generate_corpus('/tmp/bench-corpus', scales=['small', 'medium'])
+    # [{'scale', 'docx', 'md', 'config', 'peer', 'elements', 'mdElements', ...}, ...]
+
+    python -X utf8 tools/synth_corpus.py <출력폴더> [small medium large ...] [--seed N]
+"""
+
+import os
+import sys
+import json
+import argparse
+import random
+import struct
+import zipfile
+import zlib
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from theme_colors import load_theme_color_sets
+
+# 규모별 섹션 수 (섹션당 body 요소 ~20개)
+SCALES = {
+    'small': 5,
+    'medium': 40,
+    'large': 250,
+    'xlarge': 1000,
+}
+
+WORDS = ['데이터', '처리', 'API', 'request', 'response', '배치', '주문', 'status', '코드', '필드',
+         'timestamp', '사용자', 'value', '설정', 'config', 'JSON', '응답', '오류', 'error', '값']
+
+_HDR = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NSDECL = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+           'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+           'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+           'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+           'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"')
+_REL_BASE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+EMU_PER_PT = 12700
+TEXT_WIDTH_DXA = 12960   # 가로 A4 본문 폭 (16838 - 여백 1440*2 근사)
+
+
+# ============================================================
+# 문서 구조 (plan)
+# ============================================================
+
+def _sentence(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_plan(sections, seed=1):
+    """섹션 수와 시드로 결정되는 문서 블록 목록
+
+    블록: ('heading', level, text) / ('para', text) / ('bullet', text) / ('empty',)
+          ('page_break',) / ('table', rows) / ('code_dark', lines) / ('code_light', lines)
+          ('info', text) / ('warning', text) / ('image', width_pt, height_pt)
+    """
+    rng = random.Random(seed)
+    plan = [('heading', 2, '변경 이력'),
+            ('table', [['버전', '날짜', '작성자', '변경 내용'], ['v1.0', '2026-01-15', '개발팀', '초안 작성']])]
+
+    for s in range(1, sections + 1):
+        plan.append(('page_break',))
+        plan.append(('heading', 2, f'{s}. {_sentence(rng, 2)}'))
+        plan.append(('para', _sentence(rng, rng.randint(5, 60))))
+        for sub in range(1, rng.randint(3, 5)):
+            plan.append(('heading', 3, f'{s}.{sub} {_sentence(rng, 2)}'))
+            for _ in range(rng.randint(1, 3)):
+                plan.append(('para', _sentence(rng, rng.randint(3, 80))))
+            for _ in range(rng.randint(0, 4)):
+                plan.append(('bullet', _sentence(rng, rng.randint(2, 10))))
+
+            kind = rng.choice(['table', 'table', 'code_dark', 'code_light', 'info', 'warning', 'image', 'h4'])
+            if kind == 'table':
+                ncol = rng.randint(2, 7)
+                rows = [[f'항목{c + 1}' for c in range(ncol)]]
+                for _ in range(rng.randint(1, 20)):
+                    rows.append([_sentence(rng, rng.randint(1, 8)) for _ in range(ncol)])
+                plan.append(('table', rows))
+            elif kind == 'code_dark':
+                lines = ['{'] + [f'  "{rng.choice(WORDS)}": "{rng.choice(WORDS)}",'
+                                 for _ in range(rng.randint(2, 20))] + ['}']
+                plan.append(('code_dark', lines))
+            elif kind == 'code_light':
+                plan.append(('code_light', [_sentence(rng, 4) for _ in range(rng.randint(1, 10))]))
+            elif kind == 'info':
+                plan.append(('info', '참고: ' + _sentence(rng, 15)))
+            elif kind == 'warning':
+                plan.append(('warning', '주의: ' + _sentence(rng, 15)))
+            elif kind == 'image':
+                plan.append(('image', rng.choice([700, 400, 250]), rng.choice([300, 150, 400])))
+            else:
+                plan.append(('heading', 4, f'{s}.{sub}.1 {_sentence(rng, 2)}'))
+                plan.append(('para', _sentence(rng, 20)))
+            plan.append(('empty',))
+    return plan
+
+
+# ============================================================
+# DOCX 렌더링
+# ============================================================
+
+def _run(text):
+    return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _para(text='', style=None, numbered=False, page_break=False):
+    ppr = ''
+    if style or numbered:
+        inner = f'<w:pStyle w:val="{style}"/>' if style else ''
+        if numbered:
+            inner += '<w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>'
+        ppr = f'<w:pPr>{inner}</w:pPr>'
+    runs = '<w:r><w:br w:type="page"/></w:r>' if page_break else ''
+    if text:
+        runs += _run(text)
+    return f'<w:p>{ppr}{runs}</w:p>'
+
+
+def _table(rows, fill=None, header_fill=None):
+    ncol = max(len(r) for r in rows)
+    width = TEXT_WIDTH_DXA // ncol
+    out = (f'<w:tbl><w:tblPr><w:tblW w:w="{width * ncol}" w:type="dxa"/>'
+           '<w:tblBorders><w:top w:val="single" w:sz="4" w:color="BFBFBF"/>'
+           '<w:insideH w:val="single" w:sz="4" w:color="BFBFBF"/></w:tblBorders></w:tblPr>')
+    out += '<w:tblGrid>' + f'<w:gridCol w:w="{width}"/>' * ncol + '</w:tblGrid>'
+    for ri, row in enumerate(rows):
+        cell_fill = header_fill if ri == 0 and header_fill else fill
+        shd = f'<w:shd w:val="clear" w:color="auto" w:fill="{cell_fill}"/>' if cell_fill else ''
+        out += '<w:tr>'
+        for text in row:
+            paras = ''.join(_para(line) for line in text.split('\n')) if text else '<w:p/>'
+            out += f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{shd}</w:tcPr>{paras}</w:tc>'
+        out += '</w:tr>'
+    return out + '</w:tbl>'
+
+
+def _image(width_pt, height_pt, n):
+    cx, cy = width_pt * EMU_PER_PT, height_pt * EMU_PER_PT
+    return ('<w:p><w:r><w:drawing><wp:inline>'
+            f'<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{n}" name="Picture {n}"/>'
+            '<a:graphic><a:graphicData><pic:pic><pic:blipFill><a:blip r:embed="rIdImg1"/></pic:blipFill>'
+            '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>')
+
+
+def _png_1x1():
+    """유효한 1x1 흰색 PNG 바이트"""
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xFFFFFFFF)
+    ihdr = struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0)
+    idat = zlib.compress(b'\x00\xff\xff\xff')
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IDAT', idat) + chunk(b'IEND', b'')
+
+
+def _palette():
+    """분류기가 인식하는 테마 색상 (결정적 순서)"""
+    sets = load_theme_color_sets()
+
+    def pick(key, fallback, exclude=()):
+        # 테마에 따라 정보 박스와 라이트 코드 배경이 같은 색일 수 있어 겹치지 않는 값을 고른다
+        taken = set()
+        for other in exclude:
+            taken |= set(sets.get(other) or ())
+        values = sorted(set(sets.get(key) or ()) - taken)
+        return values[0] if values else fallback
+
+    return {
+        'header': pick('header_bgs', '1B3664'),
+        'code_dark': pick('dark_codes', '1E1E1E'),
+        'code_light': pick('light_codes', 'F5F5F5'),
+        'info': pick('info_boxes', 'E8F0F7', exclude=('light_codes', 'dark_codes')),
+        'warning': pick('warning_boxes', 'FEF6E6', exclude=('light_codes', 'dark_codes', 'info_boxes')),
+    }
+
+
+def _sect_pr(landscape, refs=False):
+    """w:sectPr XML — refs: 머릿글/바닥글 참조 포함 (body 직계 sectPr)"""
+    if landscape:
+        pg_sz = '<w:pgSz w:w="16838" w:h="11906" w:orient="landscape"/>'
+    else:
+        pg_sz = '<w:pgSz w:w="11906" w:h="16838"/>'
+    refs_xml = ('<w:headerReference w:type="default" r:id="rIdH"/>'
+                '<w:footerReference w:type="default" r:id="rIdF"/>') if refs else ''
+    return (f'<w:sectPr>{refs_xml}{pg_sz}<w:pgMar w:top="1080" w:right="1440" w:bottom="1080" w:left="1440" '
+            'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>')
+
+
+def render_docx(plan, path, landscape=True, section_every=0):
+    """plan → DOCX 파일. 반환: body 직계 요소 수
+
+    section_every: N이면 N번째 페이지 나누기마다 섹션 나누기(단락 pPr/sectPr)로 바꾸고
+    섹션마다 가로/세로 방향을 번갈아 쓴다 (다중 섹션 문서). 0이면 단일 섹션.
+    """
+    colors = _palette()
+    body = [_para('합성 문서', style='Title')]
+    pending_break = False
+    page_breaks = 0
+    image_n = 0
+    for block in plan:
+        kind = block[0]
+        if kind == 'page_break':
+            pending_break = True
+            continue
+        if pending_break:
+            page_breaks += 1
+            if section_every and page_breaks % section_every == 0:
+                body.append(f'<w:p><w:pPr>{_sect_pr(landscape)}</w:pPr></w:p>')
+                landscape = not landscape
+            else:
+                body.append(_para(page_break=True))
+            pending_break = False
+        if kind == 'heading':
+            body.append(_para(block[2], style=f'Heading{block[1]}'))
+        elif kind == 'para':
+            body.append(_para(block[1]))
+        elif kind == 'bullet':
+            body.append(_para(block[1], style='ListParagraph', numbered=True))
+        elif kind == 'empty':
+            body.append(_para())
+        elif kind == 'table':
+            body.append(_table(block[1], header_fill=colors['header']))
+        elif kind in ('code_dark', 'code_light'):
+            body.append(_table([['\n'.join(block[1])]], fill=colors[kind]))
+        elif kind in ('info', 'warning'):
+            body.append(_table([[block[1]]], fill=colors[kind]))
+        elif kind == 'image':
+            image_n += 1
+            body.append(_image(block[1], block[2], image_n))
+
+    body.append(_sect_pr(landscape, refs=True))
+
+    document = _HDR + f'<w:document {_NSDECL}><w:body>' + ''.join(body) + '</w:body></w:document>'
+    styles = _HDR + f'<w:styles {_NSDECL}><w:docDefaults><w:rPrDefault><w:rPr>' \
+        '<w:rFonts w:ascii="Malgun Gothic" w:eastAsia="Malgun Gothic" w:hAnsi="Malgun Gothic"/>' \
+        '<w:sz w:val="20"/></w:rPr></w:rPrDefault></w:docDefaults>'
+    for level, size in ((1, 32), (2, 28), (3, 24), (4, 22)):
+        styles += (f'<w:style w:type="paragraph" w:styleId="Heading{level}"><w:name w:val="heading {level}"/>'
+                   f'<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="120"/><w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+                   f'<w:rPr><w:b/><w:color w:val="{colors["header"]}"/><w:sz w:val="{size}"/></w:rPr></w:style>')
+    styles += '</w:styles>'
+    rels = _HDR + ('<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   f'<Relationship Id="rIdImg1" Type="{_REL_BASE}/image" Target="media/image1.png"/>'
+                   f'<Relationship Id="rIdH" Type="{_REL_BASE}/header" Target="header1.xml"/>'
+                   f'<Relationship Id="rIdF" Type="{_REL_BASE}/footer" Target="footer1.xml"/>'
+                   '</Relationships>')
+    core = _HDR + ('<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                   'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/">'
+                   '<dc:title>합성 문서</dc:title><dc:creator>synth_corpus</dc:creator></cp:coreProperties>')
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', _HDR + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        z.writestr('word/document.xml', document)
+        z.writestr('word/styles.xml', styles)
+        z.writestr('word/header1.xml', _HDR + f'<w:hdr {_NSDECL}>' + _para('머릿글') + '</w:hdr>')
+        z.writestr('word/footer1.xml', _HDR + f'<w:ftr {_NSDECL}>' + _para('바닥글') + '</w:ftr>')
+        z.writestr('word/_rels/document.xml.rels', rels)
+        z.writestr('docProps/core.xml', core)
+        z.writestr('word/media/image1.png', _png_1x1())
+    return len(body) - 1  # sectPr 제외
+
+
+# ============================================================
+# MD 렌더링
+# ============================================================
+
+def render_md(plan, path):
+    """plan → 소스 MD 파일 (변환기 입력 형식). 반환: 블록 수"""
+    out = ['# 합성 문서', '',
+           '> **프로젝트**: 합성 벤치마크', '> **버전**: v1.0',
+           '> **작성일**: 2026-01-15', '> **작성자**: 개발팀', '', '---', '']
+    for block in plan:
+        kind = block[0]
+        if kind == 'page_break':
+            out += ['---', '']
+        elif kind == 'heading':
+            out += ['#' * block[1] + ' ' + block[2], '']
+        elif kind == 'para':
+            out += [block[1], '']
+        elif kind == 'bullet':
+            out.append(f'- {block[1]}')
+        elif kind == 'empty':
+            out.append('')
+        elif kind == 'table':
+            rows = block[1]
+            out.append('| ' + ' | '.join(rows[0]) + ' |')
+            out.append('|' + '|'.join('------' for _ in rows[0]) + '|')
+            out += ['| ' + ' | '.join(r) + ' |' for r in rows[1:]]
+            out.append('')
+        elif kind in ('code_dark', 'code_light'):
+            out += ['```json' if kind == 'code_dark' else '```text'] + block[1] + ['```', '']
+        elif kind in ('info', 'warning'):
+            out += [f'> {block[1]}', '']
+        elif kind == 'image':
+            out += ['![다이어그램](image1.png)', '']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(out) + '\n')
+    return len(plan)
+
+
+# ============================================================
+# 코퍼스
+# ============================================================
+
+def generate_corpus(out_dir, scales=None, seed=1):
+    """규모별 DOCX + MD + doc-config + diff 비교용 변형 DOCX 생성 → manifest 목록"""
+    os.makedirs(out_dir, exist_ok=True)
+    png_path = os.path.join(out_dir, 'image1.png')
+    if not os.path.exists(png_path):
+        with open(png_path, 'wb') as f:
+            f.write(_png_1x1())
+
+    manifest = []
+    for scale in scales or list(SCALES):
+        sections = SCALES[scale]
+        plan = make_plan(sections, seed)
+        docx_path = os.path.join(out_dir, f'{scale}.docx')
+        peer_path = os.path.join(out_dir, f'{scale}.peer.docx')
+        md_path = os.path.join(out_dir, f'{scale}.md')
+        config_path = os.path.join(out_dir, f'{scale}.config.json')
+
+        elements = render_docx(plan, docx_path)
+        # diff 대상: 같은 규모, 다른 시드 (구조가 조금씩 어긋나는 문서)
+        render_docx(make_plan(sections, seed + 1), peer_path)
+        md_elements = render_md(plan, md_path)
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': md_path, 'output': docx_path}, f, ensure_ascii=False, indent=2)
+
+        manifest.append({
+            'scale': scale,
+            'sections': sections,
+            'docx': docx_path,
+            'peer': peer_path,
+            'md': md_path,
+            'config': config_path,
+            'elements': elements,
+            'mdElements': md_elements,
+            'docxBytes': os.path.getsize(docx_path),
+        })
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 DOCX/MD 코퍼스 생성 (벤치마크·보정용)')
+    parser.add_argument('out_dir', help='출력 폴더')
+    parser.add_argument('scales', nargs='*', metavar='규모',
+                        help=f'생성할 규모 (기본: 전체 — {", ".join(SCALES)})')
+    parser.add_argument('--seed', type=int, default=1, help='무작위 시드 (기본: 1)')
+    args = parser.parse_args()
+    unknown = [s for s in args.scales if s not in SCALES]
+    if unknown:
+        parser.error(f'알 수 없는 규모: {", ".join(unknown)} (가능: {", ".join(SCALES)})')
+
+    for entry in generate_corpus(args.out_dir, args.scales or None, seed=args.seed):
+        print(f"{entry['scale']:<8} {entry['elements']:>7} elements  {entry['docxBytes']:>10,} bytes  {entry['docx']}")
+
+
+if __name__ == '__main__':
+    main()
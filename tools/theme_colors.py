@@ -2,15 +2,34 @@
 테마 JSON에서 분류용 색상 세트를 동적으로 생성하는 공유 모듈.
 
 사용법:
-    from theme_colors import load_theme_color_sets
+    from theme_colors import load_theme_color_sets, load_theme_color_index
     colors = load_theme_color_sets()
     # colors['dark_codes'], colors['light_codes'], colors['info_boxes'],
     # colors['warning_boxes'], colors['header_bgs']
+    roles = load_theme_color_index().get('1E1E1E', ())   # ('dark_codes',)
+    roles = match_color_roles('1F1F1F')                  # 근사 색상 → ('dark_codes',)
+
+테마마다 JSON 파싱 + tint/shade 파생을 하는 대신, 결과를 색상 → 역할 인덱스로 컴파일해
+themes/.color-index.json에 저장해 둔다. 다음 실행은 테마 파일의 mtime/크기만 확인하고,
+바뀐 파일은 내용 해시가 달라졌을 때만 다시 파생한다. 프로세스 안에서는 첫 조회 때
+한 번 읽고 메모이즈하며, 장기 실행 호스트를 위해 RECHECK_SECONDS마다 stat만 다시 본다.
+
+match_color_roles()는 정확히 일치하는 색이 없을 때 CIELAB 공간에서 가장 가까운 인덱스 색상을
+찾아, 색차(ΔE76)가 허용 오차 이내이면 그 역할을 돌려준다 (고객 문서·구버전 테마의 근사 색상).
+흰색/검정은 역할 없는 기준점으로 넣어 무채색 배경이 코드 블록으로 끌려가지 않게 한다.
+결과는 hex 값별로 캐시되므로 같은 색의 테이블 수천 개도 조회는 한 번씩이다.
+허용 오차: 인자 > GENDOCS_COLOR_TOLERANCE 환경 변수 > DEFAULT_COLOR_TOLERANCE (0이면 정확 일치만)
 """
 
 import os
 import json
 import glob
+import time
+import hashlib
+import tempfile
+
+# numpy는 근사 색상 조회가 처음 필요할 때 import한다 (짧은 CLI 실행의 시작 비용 방지)
+_np = None
 
 
 def _tint(hex_color, factor):
@@ -80,75 +99,327 @@ def _get_colors_from_theme(theme):
     return None
 
 
+# ============================================================
+# 역할 정의
+# ============================================================
+
+# 역할 → 테마 colors 키. 역할 순서가 분류 우선순위 (docx_model.classify_table_color)
+_ROLE_KEYS = {
+    'dark_codes': ('codeDarkBg',),                                       # 다크 코드 배경 (고정값)
+    'light_codes': ('jsonBg', 'codeBlock', 'flowBoxBg', 'flowBlockBg'),  # 라이트 코드/JSON 배경
+    'info_boxes': ('infoBox',),                                          # 정보 박스
+    'warning_boxes': ('warningBox',),                                    # 경고 박스
+    'header_bgs': ('primary', 'secondary'),                              # 테이블 헤더 배경
+}
+ROLES = tuple(_ROLE_KEYS)
+
+# 하드코딩 폴백 (테마 파일 로드 실패 시에도 기본 감지 보장)
+_FALLBACK_COLORS = {
+    'dark_codes': ('1E1E1E', '2D2D2D', '1A1A1A'),
+    'light_codes': ('F5F5F5', 'EAEAEA', 'F0F0F0', 'FAFAFA'),
+    'info_boxes': ('E8F0F7', 'E8F4FD', 'DEEAF6'),
+    'warning_boxes': ('FEF6E6', 'FFF8E1'),
+    'header_bgs': (),
+}
+
+# 근사 조회 시 역할 없는 기준점 (가장 가까운 색이 이것이면 data_table)
+NEUTRAL_COLORS = ('FFFFFF', '000000')
+
+DEFAULT_COLOR_TOLERANCE = 5.0   # ΔE76 — 눈으로 겨우 구분되는 정도
+
+INDEX_FILENAME = '.color-index.json'
+INDEX_VERSION = 1
+RECHECK_SECONDS = 2.0
+
+
+def _default_themes_dir():
+    # tools/ 디렉토리 기준으로 프로젝트 루트 탐색
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(tools_dir), 'themes')
+
+
+def _theme_roles(path):
+    """테마 파일 하나 → {역할: [색상]} (읽기/형식 오류면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            theme = json.load(f)
+        colors = _get_colors_from_theme(theme)
+    except (json.JSONDecodeError, KeyError, OSError, AttributeError):
+        return None
+    if not colors:
+        return None
+    roles = {}
+    for role, keys in _ROLE_KEYS.items():
+        values = sorted({colors[key].upper() for key in keys if colors.get(key)})
+        if values:
+            roles[role] = values
+    return roles
+
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# ============================================================
+# 컴파일된 인덱스 (themes/.color-index.json)
+# ============================================================
+
+def _scan_themes(themes_dir):
+    """테마 파일명 → (mtime_ns, size). 디렉토리가 없으면 빈 dict"""
+    stats = {}
+    try:
+        for tf in glob.glob(os.path.join(themes_dir, '*.json')):
+            try:
+                st = os.stat(tf)
+            except OSError:
+                continue
+            stats[os.path.basename(tf)] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass
+    return stats
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('themes') or {}
+
+
+def _write_index(index_path, themes):
+    """원자적 저장. 테마 폴더가 읽기 전용이어도 분류에는 영향 없음"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'themes': themes}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _compile_themes(themes_dir, stats):
+    """저장된 인덱스를 검증하고 바뀐 테마만 다시 파생 → {파일명: 항목}
+
+    mtime/크기가 같으면 그대로 쓰고, 다르면 내용 해시를 비교해 같을 때는 stat만 갱신한다.
+    """
+    index_path = os.path.join(themes_dir, INDEX_FILENAME)
+    stored = _read_index(index_path)
+    themes = {}
+    changed = set(stored) != set(stats)
+    for name, (mtime_ns, size) in sorted(stats.items()):
+        entry = stored.get(name)
+        if entry and entry.get('mtimeNs') == mtime_ns and entry.get('size') == size:
+            themes[name] = entry
+            continue
+        path = os.path.join(themes_dir, name)
+        try:
+            digest = _file_sha256(path)
+        except OSError:
+            continue
+        changed = True
+        if entry and entry.get('sha256') == digest:
+            roles = entry.get('roles')
+        else:
+            roles = _theme_roles(path)
+        themes[name] = {'mtimeNs': mtime_ns, 'size': size, 'sha256': digest, 'roles': roles}
+    if changed:
+        _write_index(index_path, themes)
+    return themes
+
+
+def _build_index(themes):
+    """테마 항목 + 폴백 → 색상 → 역할 튜플 (ROLES 순서)"""
+    by_color = {}
+    for entry in themes.values():
+        for role, values in (entry.get('roles') or {}).items():
+            for color in values:
+                by_color.setdefault(color, set()).add(role)
+    for role, values in _FALLBACK_COLORS.items():
+        for color in values:
+            by_color.setdefault(color, set()).add(role)
+    return {color: tuple(r for r in ROLES if r in roles) for color, roles in by_color.items()}
+
+
+# ============================================================
+# 프로세스 내 메모이즈
+# ============================================================
+
+_LOADED = {}   # themes_dir → {'stats', 'checked', 'index', 'sets', 'matchers'}
+
+
+def _load(themes_dir):
+    themes_dir = os.path.abspath(themes_dir or _default_themes_dir())
+    loaded = _LOADED.get(themes_dir)
+    now = time.monotonic()
+    if loaded is not None:
+        if now - loaded['checked'] < RECHECK_SECONDS:
+            return loaded
+        stats = _scan_themes(themes_dir)
+        if stats == loaded['stats']:
+            loaded['checked'] = now
+            return loaded
+    else:
+        stats = _scan_themes(themes_dir)
+
+    index = _build_index(_compile_themes(themes_dir, stats))
+    sets = {role: set() for role in ROLES}
+    for color, roles in index.items():
+        for role in roles:
+            sets[role].add(color)
+    loaded = {
+        'stats': stats,
+        'checked': now,
+        'index': index,
+        'sets': {role: frozenset(values) for role, values in sets.items()},
+        'matchers': {},   # 허용 오차 → ColorMatcher (테마가 바뀌면 캐시째 교체)
+    }
+    _LOADED[themes_dir] = loaded
+    return loaded
+
+
+def load_theme_color_index(themes_dir=None):
+    """
+    색상 → 역할 인덱스 (분류기가 색상 하나당 dict 조회 한 번으로 끝나게).
+
+    Returns:
+        dict: uppercase hex → 역할 이름 튜플 (ROLES 순서, 예: ('light_codes', 'info_boxes'))
+    """
+    return _load(themes_dir)['index']
+
+
 def load_theme_color_sets(themes_dir=None):
     """
     themes/*.json에서 분류용 색상 세트를 동적으로 생성한다.
 
     Returns:
         dict with keys: dark_codes, light_codes, info_boxes, warning_boxes, header_bgs
-        각 값은 uppercase hex 문자열의 set.
+        각 값은 uppercase hex 문자열의 frozenset (프로세스 안에서 공유되므로 읽기 전용).
     """
-    if themes_dir is None:
-        # tools/ 디렉토리 기준으로 프로젝트 루트 탐색
-        tools_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(tools_dir)
-        themes_dir = os.path.join(project_root, 'themes')
-
-    dark_codes = set()
-    light_codes = set()
-    info_boxes = set()
-    warning_boxes = set()
-    header_bgs = set()
+    return _load(themes_dir)['sets']
+
+
+# ============================================================
+# 근사 색상 조회 (CIELAB 최근접)
+# ============================================================
+
+_HEX_DIGITS = frozenset('0123456789ABCDEF')
+
+
+def hex_to_lab(hex_color):
+    """sRGB hex (# 없이) → CIELAB (D65) 튜플"""
+    rgb = []
+    for i in (0, 2, 4):
+        c = int(hex_color[i:i + 2], 16) / 255
+        rgb.append(c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4)
+    r, g, b = rgb
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
 
+def _load_numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np
+
+
+class ColorMatcher:
+    """색상 인덱스 위의 최근접 역할 조회 (hex별 결과 캐시)"""
+
+    def __init__(self, index, tolerance):
+        self.index = index
+        self.tolerance = tolerance
+        self._memo = {}
+        self._table = None   # (색상 목록, Lab 배열) — 첫 근사 조회 때 한 번에 만들어 교체
+
+    def _lab_table(self):
+        table = self._table
+        if table is None:
+            colors = sorted(self.index) + [c for c in NEUTRAL_COLORS if c not in self.index]
+            labs = [hex_to_lab(c) for c in colors]
+            np = _load_numpy()
+            # 여러 스레드가 동시에 만들어도 완성된 튜플을 한 번에 대입하므로 안전하다
+            table = self._table = (colors, np.array(labs, dtype=float) if np else labs)
+        return table
+
+    def nearest(self, hex_color):
+        """(가장 가까운 인덱스 색상, ΔE76). hex_color는 대문자 6자리"""
+        colors, lab = self._lab_table()
+        q = hex_to_lab(hex_color)
+        np = _np
+        if np:
+            dist = np.sqrt(((lab - q) ** 2).sum(axis=1))
+            i = int(dist.argmin())
+            return colors[i], float(dist[i])
+        best_i, best_d = 0, float('inf')
+        for i, (L, a, b) in enumerate(lab):
+            d = (L - q[0]) ** 2 + (a - q[1]) ** 2 + (b - q[2]) ** 2
+            if d < best_d:
+                best_i, best_d = i, d
+        return colors[best_i], best_d ** 0.5
+
+    def roles(self, hex_color):
+        """hex → 역할 튜플 (일치/근사 없음이면 빈 튜플)"""
+        key = (hex_color or '').upper()
+        roles = self._memo.get(key)
+        if roles is None:
+            roles = self.index.get(key)
+            if roles is None:
+                roles = ()
+                if self.tolerance > 0 and len(key) == 6 and _HEX_DIGITS.issuperset(key):
+                    color, distance = self.nearest(key)
+                    if distance <= self.tolerance:
+                        roles = self.index.get(color, ())
+            self._memo[key] = roles
+        return roles
+
+
+def color_tolerance():
+    """GENDOCS_COLOR_TOLERANCE 환경 변수 (잘못된 값이면 기본값)"""
     try:
-        theme_files = glob.glob(os.path.join(themes_dir, '*.json'))
-        for tf in theme_files:
-            try:
-                with open(tf, 'r', encoding='utf-8') as f:
-                    theme = json.load(f)
-                colors = _get_colors_from_theme(theme)
-                if not colors:
-                    continue
-
-                # 다크 코드 배경 (고정값)
-                for key in ('codeDarkBg',):
-                    if key in colors:
-                        dark_codes.add(colors[key].upper())
-
-                # 라이트 코드/JSON 배경
-                for key in ('jsonBg', 'codeBlock', 'flowBoxBg', 'flowBlockBg'):
-                    if key in colors:
-                        light_codes.add(colors[key].upper())
-
-                # 정보 박스
-                for key in ('infoBox',):
-                    if key in colors:
-                        info_boxes.add(colors[key].upper())
-
-                # 경고 박스
-                for key in ('warningBox',):
-                    if key in colors:
-                        warning_boxes.add(colors[key].upper())
-
-                # 테이블 헤더 배경 (primary, secondary)
-                for key in ('primary', 'secondary'):
-                    if key in colors:
-                        header_bgs.add(colors[key].upper())
-            except (json.JSONDecodeError, KeyError, OSError):
-                continue
-    except OSError:
-        pass
+        return max(0.0, float(os.environ.get('GENDOCS_COLOR_TOLERANCE', DEFAULT_COLOR_TOLERANCE)))
+    except ValueError:
+        return DEFAULT_COLOR_TOLERANCE
 
-    # 하드코딩 폴백 추가 (테마 파일 로드 실패 시에도 기본 감지 보장)
-    dark_codes |= {'1E1E1E', '2D2D2D', '1A1A1A'}
-    light_codes |= {'F5F5F5', 'EAEAEA', 'F0F0F0', 'FAFAFA'}
-    info_boxes |= {'E8F0F7', 'E8F4FD', 'DEEAF6'}
-    warning_boxes |= {'FEF6E6', 'FFF8E1'}
-
-    return {
-        'dark_codes': dark_codes,
-        'light_codes': light_codes,
-        'info_boxes': info_boxes,
-        'warning_boxes': warning_boxes,
-        'header_bgs': header_bgs,
-    }
+
+def match_color_roles(hex_color, themes_dir=None, tolerance=None):
+    """
+    배경색 hex → 역할 튜플 (정확 일치 우선, 없으면 허용 오차 내 최근접 테마 색상의 역할).
+
+    Returns:
+        tuple: ROLES 순서의 역할 이름 (예: ('dark_codes',)), 해당 없으면 ()
+    """
+    if tolerance is None:
+        tolerance = color_tolerance()
+    loaded = _load(themes_dir)
+    matcher = loaded['matchers'].get(tolerance)
+    if matcher is None:
+        matcher = loaded['matchers'][tolerance] = ColorMatcher(loaded['index'], tolerance)
+    return matcher.roles(hex_color)
+
+
+def clear_theme_color_cache():
+    """프로세스 내 메모이즈 초기화 (다음 조회 때 디스크 인덱스를 다시 검증)"""
+    _LOADED.clear()
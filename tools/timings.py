@@ -0,0 +1,219 @@
+"""
+단계별 시간/메모리 측정 + cProfile — Python 도구 공용 (--timings, --profile)
+
+도구 코드는 측정 구간을 phase()로 감싸기만 한다. CLI에서 TimingSession을 열지 않으면
+phase()는 아무 일도 하지 않는 nullcontext를 돌려주므로 평소 실행에는 비용이 거의 없다.
+
+    from timings import phase, TimingSession
+
+    with phase('xml_parse'):
+        root = ET.fromstring(data)
+
+    visit = timed('TableWidthVisitor', visitor.visit_table)   # 요소마다 불리는 콜백
+
+    with TimingSession(timings=True, profile_path='out.prof') as session:
+        ...
+    session.report()   # {'totalSeconds', 'phases': [{'name', 'seconds', 'count', 'peakKB'}], 'maxRssKB'}
+
+같은 이름의 구간은 합산된다 (호출 횟수 count). 구간 안의 구간은 '상위/하위' 이름으로 기록한다.
+peakKB는 tracemalloc 기준 Python 할당 최대치이므로 --timings 실행은 평소보다 느리다.
+"""
+
+import sys
+import time
+import cProfile
+import contextlib
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ============================================================
+# 구간 타이머
+# ============================================================
+
+class PhaseTimer:
+    """이름 붙은 구간의 wall time + tracemalloc 최대 메모리를 누적"""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.phases = {}   # 경로 → {'seconds', 'count', 'peak'} (삽입 순서 = 처음 시작 순서)
+        self._stack = []   # [경로, 구간 내 최대 메모리]
+
+    def _peak_so_far(self):
+        """reset_peak 이후 최대치를 현재 열린 구간들에 반영하고 카운터를 초기화"""
+        if not self.memory:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        path = f'{self._stack[-1][0]}/{name}' if self._stack else name
+        entry = self.phases.get(path)
+        if entry is None:
+            entry = self.phases[path] = {'seconds': 0.0, 'count': 0, 'peak': 0}
+        self._peak_so_far()
+        self._stack.append([path, 0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            entry['count'] += 1
+            self._peak_so_far()
+            frame = self._stack.pop()
+            entry['peak'] = max(entry['peak'], frame[1])
+
+
+_ACTIVE = None
+_NULL = contextlib.nullcontext()
+
+
+def phase(name):
+    """활성 세션이 있으면 구간 측정, 없으면 no-op 컨텍스트"""
+    if _ACTIVE is None:
+        return _NULL
+    return _ACTIVE.phase(name)
+
+
+def timed(name, func):
+    """func 호출마다 name 구간으로 측정하는 래퍼. 활성 세션이 없으면 func를 그대로 돌려준다
+
+    요소마다 불리는 콜백(방문자 등)용 — 측정을 끈 실행에서는 호출당 비용이 전혀 없다.
+    """
+    timer = _ACTIVE
+    if timer is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        with timer.phase(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# ============================================================
+# 세션 (CLI 한 번 실행 단위)
+# ============================================================
+
+class TimingSession:
+    """--timings / --profile 옵션에 따라 구간 측정과 cProfile을 켜고 끈다"""
+
+    def __init__(self, timings=False, profile_path=None):
+        self.timings = timings
+        self.profile_path = profile_path
+        self.timer = PhaseTimer() if timings else None
+        self.total_seconds = None
+        self._profiler = None
+        self._start = None
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self):
+        return self.timer is not None
+
+    def __enter__(self):
+        global _ACTIVE
+        if self.timer is not None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            _ACTIVE = self.timer
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def stop(self):
+        """측정 종료 (여러 번 호출해도 안전) — 직렬화 구간 전에 부를 수 있게 분리"""
+        global _ACTIVE
+        if self._start is None:
+            return
+        self.total_seconds = time.perf_counter() - self._start
+        self._start = None
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_path)
+            print(f'[INFO] 프로파일 저장: {self.profile_path} (python -m pstats로 확인)', file=sys.stderr)
+            self._profiler = None
+        if self.timer is not None:
+            if _ACTIVE is self.timer:
+                _ACTIVE = None
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def report(self):
+        """JSON 'timings' 블록"""
+        if self.timer is None:
+            return None
+        if self._start is not None:
+            elapsed = time.perf_counter() - self._start
+        else:
+            elapsed = self.total_seconds or 0.0
+        result = {
+            'totalSeconds': round(elapsed, 4),
+            'phases': [{
+                'name': path,
+                'seconds': round(entry['seconds'], 4),
+                'count': entry['count'],
+                'peakKB': round(entry['peak'] / 1024, 1),
+            } for path, entry in self.timer.phases.items()],
+        }
+        if resource is not None:
+            # 프로세스 최대 RSS (Linux: KB, macOS: bytes)
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            result['maxRssKB'] = maxrss // 1024 if sys.platform == 'darwin' else maxrss
+        return result
+
+    def print_report(self, file=None):
+        """텍스트 표 (기본: stderr — 도구의 stdout 출력과 섞이지 않게)"""
+        data = self.report()
+        if data is None:
+            return
+        file = file or sys.stderr
+        print(f'\n{"=" * 60}', file=file)
+        print('  단계별 소요 시간 (--timings)', file=file)
+        print(f'{"=" * 60}', file=file)
+        print(f'  {"단계":<36} {"횟수":>5} {"시간(s)":>9} {"최대 KB":>10}', file=file)
+        for ph in data['phases']:
+            depth = ph['name'].count('/')
+            label = '  ' * depth + ph['name'].rsplit('/', 1)[-1]
+            print(f'  {label:<36} {ph["count"]:>5} {ph["seconds"]:>9.4f} {ph["peakKB"]:>10.1f}', file=file)
+        print(f'  {"합계":<36} {"":>5} {data["totalSeconds"]:>9.4f}', file=file)
+        if 'maxRssKB' in data:
+            print(f'  프로세스 최대 RSS: {data["maxRssKB"]} KB', file=file)
+        print(file=file)
+
+
+# ============================================================
+# CLI 옵션
+# ============================================================
+
+def add_timing_arguments(parser):
+    """argparse 도구용 --timings / --profile"""
+    parser.add_argument('--timings', action='store_true',
+                        help='단계별 소요 시간/최대 메모리 출력 (JSON 모드에서는 timings 블록)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='cProfile 결과(pstats)를 PATH에 저장')
+
+
+def parse_timing_argv(argv):
+    """sys.argv 도구용 → (timings, profile_path)"""
+    timings = '--timings' in argv
+    profile_path = None
+    if '--profile' in argv:
+        idx = argv.index('--profile')
+        if idx + 1 < len(argv):
+            profile_path = argv[idx + 1]
+    return timings, profile_path
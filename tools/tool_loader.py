@@ -0,0 +1,35 @@
+"""
+하이픈 이름 도구 스크립트(tools/validate-docx.py 등)를 모듈로 로드하는 공유 헬퍼.
+
+분석 서버, 일괄 검증, 벤치마크처럼 한 프로세스에서 도구 함수를 직접 호출하는 호스트가 쓴다.
+
+사용법:
+    from tool_loader import load_tool
+    vd = load_tool('validate-docx.py')
+    report = vd.analyze_document('output/문서.docx')
+"""
+
+import io
+import os
+import contextlib
+import importlib.util
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_MODULES = {}
+
+
+def load_tool(filename):
+    """tools/<filename>을 모듈로 로드 (프로세스당 1회, 캐시)"""
+    module = _MODULES.get(filename)
+    if module is None:
+        name = filename[:-3].replace('-', '_')
+        spec = importlib.util.spec_from_file_location(name, os.path.join(TOOLS_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        # Windows에서 도구 모듈은 import 시 sys.stdout/stderr를 UTF-8 래퍼로 교체한다.
+        # 버려질 더미 스트림을 감싸게 해서 실제 표준 스트림이 바뀌거나 닫히지 않게 한다.
+        sink = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+            spec.loader.exec_module(module)
+        _MODULES[filename] = module
+    return module
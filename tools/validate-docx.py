@@ -4,40 +4,64 @@ DOCX 구조 검증 + 레이아웃 분석 스크립트
 
 사용법: python -X utf8 tools/validate-docx.py output/문서.docx
         python -X utf8 tools/validate-docx.py output/문서.docx --json
+        python -X utf8 tools/validate-docx.py output/문서.docx --json --stream
+        python -X utf8 tools/validate-docx.py output/문서.docx --json --no-cache
+
+--stream: document.xml을 iterparse로 훑으며 요소를 하나씩 분류·시뮬레이션하고 바로
+          해제한다. 수십 MB XML에서도 메모리가 일정하며 JSON 결과는 기본 모드와 같다.
+요소가 아주 많은 문서는 numpy가 있으면 레이아웃 시뮬레이션을 배열 연산(VectorLayout)으로 수행한다 (결과 동일).
+단락 수준 w:sectPr(섹션 나누기)마다 섹션별 페이지 크기/방향으로 가용 높이와 본문 폭을 바꿔 시뮬레이션한다.
+--json 결과는 .cache/reports에 DOCX 내용 해시로 캐시된다 (tools/report_cache.py).
+          내용이 바뀐 같은 문서는 직전 실행의 요소 지문/분류/페이지 경계로 바뀐 요소만 다시 분류하고
+          영향받는 페이지부터 다시 쌓는다 (.cache/reports/state, 결과는 전체 분석과 같음).
+--no-cache: 캐시와 증분 상태를 읽지도 쓰지도 않고 항상 다시 분석한다.
+--theme <이름>: 레이아웃 프로필(profiles/layout-profile.json)에서 이 테마의 높이 계수를 쓴다
+          (없으면 방향별 공통 계수 → 기본값). 프로필은 tools/calibrate-layout.py가 만든다.
+--timings: 단계별(zip_open, xml_parse, classification, layout_simulation, check_issues,
+           serialization) 소요 시간/최대 메모리 — JSON에는 timings 블록, 텍스트는 stderr
+--profile <경로>: cProfile 결과(pstats) 저장
 """
 
 import sys
 import os
 import io
 import json
-import zipfile
-import xml.etree.ElementTree as ET
+import math
+import bisect
+import hashlib
 
-# 동적 테마 색상 로드
+# 공유 문서 모델 (단일 파싱 + 동적 테마 색상 분류)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from theme_colors import load_theme_color_sets
-_THEME_COLORS = load_theme_color_sets()
+from docx_model import (NS, W_T, W_TYPE, W_VAL, DXA_TO_PT, load_docx, cli_docx_source, get_page_geometry,
+                        get_table_fonts, resolve_run_font)
+from font_metrics import DEFAULT_FONT, DEFAULT_SIZE_PT, count_lines
+from layout_profile import layout_coefficients, element_terms, estimate_height, table_wrap_lines, TABLE_TEXT_SIZE_PT
+from layout_profile import profile_path as layout_profile_path
+from report_cache import cached_report, load_state, save_state
+from timings import phase, TimingSession, parse_timing_argv
+
+# numpy가 있으면 큰 문서의 레이아웃 시뮬레이션을 배열 연산으로 수행 — VectorLayout이 처음 필요할 때
+# import한다 (리포트 캐시 적중이나 작은 문서처럼 배열 연산을 쓰지 않는 실행의 시작 비용 방지)
+np = None
+
+
+def _load_numpy():
+    """numpy 모듈, 없으면 False"""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = False
+    return np
+
 
 # Windows 터미널 한글 출력 보장
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# ============================================================
-# XML 네임스페이스
-# ============================================================
-NS = {
-    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
-    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
-    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
-    'dc': 'http://purl.org/dc/elements/1.1/',
-    'dcterms': 'http://purl.org/dc/terms/',
-    'ap': 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties',
-}
-
 # ============================================================
 # 레이아웃 상수 (단위: pt)
 # ============================================================
@@ -45,198 +69,109 @@ MARGIN_TOP_PT = 54            # 상단 여백 (~19mm)
 MARGIN_BOTTOM_PT = 54         # 하단 여백
 HEADER_FOOTER_PT = 30         # 머릿글/바닥글 예약 공간
 
-# 기본값 (Landscape A4) — detect_orientation()이 실제 값으로 갱신
+# 기본값 (Landscape A4) — 문서별 실제 값은 page_setup()이 report['page']에 담는다
 USABLE_HEIGHT_PT = 457        # landscape 기본
 CHARS_PER_LINE = 100          # landscape 기본
+CONTENT_WIDTH_DXA = 12960     # landscape 기본 (본문 폭, 단락 줄바꿈 추정용)
 
-# 요소별 추정 높이 (pt)
-EST_H2 = 42        # H2 제목 (18pt 폰트 + before/after spacing)
-EST_H3 = 34        # H3 제목
-EST_H4 = 28        # H4 제목
-EST_PARAGRAPH = 22  # 일반 단락
-EST_BULLET = 20     # 불릿 항목
-EST_EMPTY = 8       # 빈 단락 / spacer
-EST_TABLE_HEADER = 28   # 테이블 헤더 행
-EST_TABLE_ROW = 22      # 테이블 데이터 행
-EST_CODE_ROW = 16       # 코드 블록 행
-EST_INFO_BOX = 45       # 정보/경고 박스
-EST_IMAGE_SPACING = 30  # 이미지 전후 spacing
-EMU_TO_PT = 1 / 12700   # EMU → pt 변환
-DXA_TO_PT = 1 / 20      # DXA → pt 변환
-
-
-def detect_orientation(docx_path):
-    """DOCX의 w:pgSz에서 페이지 크기를 읽어 orientation과 가용 높이를 계산"""
+# 요소별 추정 높이 계수는 layout_profile (기본값 + calibrate-layout.py 프로필)
+
+
+def detect_orientation(sect_pr):
+    """body 직계 w:sectPr의 w:pgSz에서 페이지 크기를 읽어 orientation과 가용 높이를 계산"""
     try:
-        with zipfile.ZipFile(docx_path, 'r') as z:
-            tree = ET.parse(z.open('word/document.xml'))
-            root = tree.getroot()
-            body = root.find(f'{{{NS["w"]}}}body')
-            if body is None:
-                return 'landscape', 457, 100
-
-            # sectPr은 body의 마지막 자식이거나 body 안에 있음
-            sect_pr = body.find(f'{{{NS["w"]}}}sectPr')
-            if sect_pr is None:
-                return 'landscape', 457, 100
-
-            pg_sz = sect_pr.find(f'{{{NS["w"]}}}pgSz')
-            if pg_sz is None:
-                return 'landscape', 457, 100
-
-            w = int(pg_sz.get(f'{{{NS["w"]}}}w', '15840'))
-            h = int(pg_sz.get(f'{{{NS["w"]}}}h', '12240'))
-
-            # margin 읽기
-            pg_mar = sect_pr.find(f'{{{NS["w"]}}}pgMar')
-            margin_top = 1080  # 기본값
-            margin_bottom = 1080
-            if pg_mar is not None:
-                margin_top = int(pg_mar.get(f'{{{NS["w"]}}}top', '1080'))
-                margin_bottom = int(pg_mar.get(f'{{{NS["w"]}}}bottom', '1080'))
-
-            # orientation 판정: w > h → landscape
-            orientation = 'portrait' if w <= h else 'landscape'
-
-            # 가용 높이 계산 (DXA → pt)
-            page_height_pt = h * DXA_TO_PT
-            margin_top_pt = margin_top * DXA_TO_PT
-            margin_bottom_pt = margin_bottom * DXA_TO_PT
-            usable = page_height_pt - margin_top_pt - margin_bottom_pt - HEADER_FOOTER_PT
-
-            # 글자 수/줄 추정 (콘텐츠 너비 기준)
-            content_width_dxa = w - 1440 - 1440  # 좌우 여백 각 1440 DXA
-            chars_per_line = max(40, int(content_width_dxa / 130))  # 약 130 DXA/글자
-
-            return orientation, round(usable), chars_per_line
+        geometry = get_page_geometry(sect_pr)
+        if geometry is None:
+            return 'landscape', 457, 100
+
+        w = geometry['width']
+        h = geometry['height']
+        margin_top = geometry['margins']['top']
+        margin_bottom = geometry['margins']['bottom']
+
+        # orientation 판정: w > h → landscape
+        orientation = 'portrait' if w <= h else 'landscape'
+
+        # 가용 높이 계산 (DXA → pt)
+        page_height_pt = h * DXA_TO_PT
+        margin_top_pt = margin_top * DXA_TO_PT
+        margin_bottom_pt = margin_bottom * DXA_TO_PT
+        usable = page_height_pt - margin_top_pt - margin_bottom_pt - HEADER_FOOTER_PT
+
+        # 글자 수/줄 추정 (콘텐츠 너비 기준)
+        content_width_dxa = w - 1440 - 1440  # 좌우 여백 각 1440 DXA
+        chars_per_line = max(40, int(content_width_dxa / 130))  # 약 130 DXA/글자
+
+        return orientation, round(usable), chars_per_line
     except Exception:
         return 'landscape', 457, 100
 
 
-# ============================================================
-# XML 파싱 유틸리티
-# ============================================================
+def page_setup(sect_pr, default_font=None, theme=None):
+    """섹션 하나의 페이지 컨텍스트 — 분석/레이아웃 함수는 모듈 전역 대신 이 dict를 쓴다
 
-def extract_text(element):
-    """w:p 요소에서 텍스트 추출"""
-    texts = []
-    for t in element.iter(f'{{{NS["w"]}}}t'):
-        if t.text:
-            texts.append(t.text)
-    return ''.join(texts).strip()
-
-
-def get_paragraph_style(p):
-    """w:p 요소에서 스타일명 추출"""
-    pPr = p.find(f'{{{NS["w"]}}}pPr')
-    if pPr is not None:
-        pStyle = pPr.find(f'{{{NS["w"]}}}pStyle')
-        if pStyle is not None:
-            return pStyle.get(f'{{{NS["w"]}}}val', '')
-    return ''
-
-
-def has_page_break_explicit(p):
-    """명시적 페이지 나누기 (스크립트가 넣은 것)만 감지"""
-    for br in p.iter(f'{{{NS["w"]}}}br'):
-        if br.get(f'{{{NS["w"]}}}type') == 'page':
-            return True
-    return False
+    content_width_dxa: 좌우 여백을 뺀 본문 폭, font: 문서 기본 글꼴 (DocxModel.default_run_font)
+    est: 테마·방향별 높이 계수 (layout_profile.layout_coefficients)
+    section_type: 섹션 시작 방식 (w:type — nextPage 기본, continuous, evenPage, oddPage)
+    """
+    orientation, usable_h, chars_line = detect_orientation(sect_pr)
+    geometry = get_page_geometry(sect_pr)
+    if geometry is not None:
+        margins = geometry['margins']
+        content_width = geometry['width'] - margins['left'] - margins['right']
+    else:
+        content_width = CONTENT_WIDTH_DXA
+    return {'orientation': orientation, 'usable_height_pt': usable_h, 'chars_per_line': chars_line,
+            'content_width_dxa': content_width,
+            'font': default_font or (DEFAULT_FONT, DEFAULT_FONT, DEFAULT_SIZE_PT, False),
+            'theme': theme, 'est': layout_coefficients(theme, orientation),
+            'section_type': _section_type(sect_pr)}
+
+
+def _section_type(sect_pr):
+    sect_type = sect_pr.find(W_TYPE) if sect_pr is not None else None
+    return sect_type.get(W_VAL, 'nextPage') if sect_type is not None else 'nextPage'
+
+
+def section_setups(sect_prs, default_font=None, theme=None):
+    """섹션별 sectPr 목록 (DocxModel.section_sect_prs) → 섹션별 page_setup 목록"""
+    return [page_setup(sect_pr, default_font, theme) for sect_pr in sect_prs]
+
+
+def _usable_height(report):
+    return report.get('page', {}).get('usable_height_pt', USABLE_HEIGHT_PT)
 
 
-def get_table_shading(tbl):
-    """테이블 첫 번째 셀의 배경색"""
-    for tc in tbl.iter(f'{{{NS["w"]}}}tc'):
-        tcPr = tc.find(f'{{{NS["w"]}}}tcPr')
-        if tcPr is not None:
-            shd = tcPr.find(f'{{{NS["w"]}}}shd')
-            if shd is not None:
-                return shd.get(f'{{{NS["w"]}}}fill', '')
-        break
-    return ''
-
-
-def count_table_rows(tbl):
-    return len(tbl.findall(f'{{{NS["w"]}}}tr'))
-
-
-def count_table_cols(tbl):
-    first_row = tbl.find(f'{{{NS["w"]}}}tr')
-    if first_row is not None:
-        return len(first_row.findall(f'{{{NS["w"]}}}tc'))
-    return 0
-
-
-def get_table_header_text(tbl):
-    first_row = tbl.find(f'{{{NS["w"]}}}tr')
-    if first_row is not None:
-        cells = []
-        for tc in first_row.findall(f'{{{NS["w"]}}}tc'):
-            cell_text = []
-            for p in tc.findall(f'{{{NS["w"]}}}p'):
-                cell_text.append(extract_text(p))
-            cells.append('|'.join(cell_text))
-        return cells
-    return []
-
-
-def classify_table(tbl):
-    bg = get_table_shading(tbl)
-    rows = count_table_rows(tbl)
-    cols = count_table_cols(tbl)
-    bg_upper = bg.upper() if bg else ''
-    # 다크 코드블록 (동적 테마 색상)
-    if bg_upper and bg_upper in _THEME_COLORS['dark_codes']:
-        return 'code_dark'
-    # 라이트 코드블록 / JSON
-    if cols == 1 and bg_upper and bg_upper in _THEME_COLORS['light_codes']:
-        return 'code_light'
-    # 정보 박스
-    if cols == 1 and bg_upper and bg_upper in _THEME_COLORS['info_boxes']:
-        return 'info_box'
-    # 경고 박스
-    if cols == 1 and bg_upper and bg_upper in _THEME_COLORS['warning_boxes']:
-        return 'warning_box'
-    if cols == 2 and rows <= 5:
-        headers = get_table_header_text(tbl)
+def classify_table(el):
+    """테이블 요소 유형 — 공유 분류 + 표지 메타 테이블(cover_meta) 감지"""
+    tbl_type = el.tbl_type
+    if tbl_type == 'data_table' and el.col_count == 2 and el.row_count <= 5:
+        headers = get_table_header_text(el)
         if any('버전' in h or '수정일' in h for h in headers):
             return 'cover_meta'
-    # 데이터 테이블 헤더 (동적 테마 색상)
-    if bg_upper and bg_upper in _THEME_COLORS['header_bgs']:
-        return 'data_table'
-    return 'data_table'
-
-
-def get_image_size_pt(p):
-    """단락에서 이미지 크기(pt) 추출. 없으면 None"""
-    for extent in p.iter(f'{{{NS["wp"]}}}extent'):
-        cx = int(extent.get('cx', '0'))
-        cy = int(extent.get('cy', '0'))
-        if cx > 0 and cy > 0:
-            return (cx * EMU_TO_PT, cy * EMU_TO_PT)
-    return None
+    return tbl_type
+
+
+def get_table_header_text(el):
+    """첫 행 셀 텍스트 (셀 내 단락은 '|'로 연결)"""
+    return ['|'.join(cell) for cell in el.header_paragraphs]
 
 
 # ============================================================
 # 문서 분석 (요소 흐름 + 구조 정보)
 # ============================================================
 
-def analyze_document(docx_path):
-    """DOCX 문서 분석 → 요소 흐름 리스트 + 메타 정보"""
-    global USABLE_HEIGHT_PT, CHARS_PER_LINE
-    if not os.path.exists(docx_path):
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}")
-        sys.exit(1)
-
-    # 페이지 크기 자동 감지
-    orientation, usable_h, chars_line = detect_orientation(docx_path)
-    USABLE_HEIGHT_PT = usable_h
-    CHARS_PER_LINE = chars_line
+def _new_report(model, sections):
+    """빈 분석 리포트 + 헤더/푸터/core.xml 메타 정보 (sections: section_setups() 결과)
 
+    report['page']는 첫 섹션 (레이아웃 시뮬레이션의 시작 페이지 기하).
+    """
     report = {
-        'file': os.path.basename(docx_path),
-        'file_size': os.path.getsize(docx_path),
-        'elements': [],       # 순서대로 모든 요소
+        'file': model.name,
+        'page': sections[0],
+        'sections': sections,
+        'file_size': model.file_size,
+        'elements': [],       # 순서대로 모든 요소 (스트리밍 모드는 구조 요소만)
         'headings': [],
         'page_breaks': [],
         'tables': [],
@@ -253,276 +188,1097 @@ def analyze_document(docx_path):
         'issues': [],
     }
 
-    with zipfile.ZipFile(docx_path, 'r') as z:
-        file_list = z.namelist()
-
-        # ── 헤더/푸터 확인 ──
-        for name in file_list:
-            if 'header' in name and name.endswith('.xml'):
-                report['has_header'] = True
-                tree = ET.parse(z.open(name))
-                root = tree.getroot()
-                texts = [t.text.strip() for t in root.iter(f'{{{NS["w"]}}}t') if t.text]
-                report['header_text'] = ' '.join(texts)
-            if 'footer' in name and name.endswith('.xml'):
-                report['has_footer'] = True
-                tree = ET.parse(z.open(name))
-                root = tree.getroot()
-                texts = [t.text.strip() for t in root.iter(f'{{{NS["w"]}}}t') if t.text]
-                report['footer_text'] = ' '.join(texts)
-
-        # ── core.xml (메타데이터) ──
-        if 'docProps/core.xml' in file_list:
-            tree = ET.parse(z.open('docProps/core.xml'))
-            root = tree.getroot()
-            title = root.find(f'{{{NS["dc"]}}}title')
-            creator = root.find(f'{{{NS["dc"]}}}creator')
-            if title is not None and title.text:
-                report['core_props']['title'] = title.text
-            if creator is not None and creator.text:
-                report['core_props']['creator'] = creator.text
-
-        # ── document.xml (본문) ──
-        tree = ET.parse(z.open('word/document.xml'))
-        root = tree.getroot()
-        body = root.find(f'{{{NS["w"]}}}body')
-        if body is None:
-            report['issues'].append('body 요소를 찾을 수 없음')
-            return report
-
-        idx = 0
-        last_heading = None
-        last_heading_text = None
-
-        for child in body:
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-
-            if tag == 'p':
-                report['paragraphs'] += 1
-                style = get_paragraph_style(child)
-                text = extract_text(child)
-
-                # 페이지 나누기
-                if has_page_break_explicit(child):
-                    elem = {'type': 'page_break', 'index': idx, 'after': last_heading or '(문서 시작)', 'est_height': 0}
-                    report['elements'].append(elem)
-                    report['page_breaks'].append(elem)
-
-                # 이미지
-                img_size = get_image_size_pt(child)
-                if img_size:
-                    report['images'] += 1
-                    img_h = img_size[1] + EST_IMAGE_SPACING
-                    elem = {
-                        'type': 'image', 'index': idx,
-                        'width_pt': round(img_size[0], 1),
-                        'height_pt': round(img_size[1], 1),
-                        'est_height': round(img_h, 1),
-                        'section': last_heading_text or '(문서 시작)',
-                    }
-                    report['elements'].append(elem)
-                    report['image_details'].append(elem)
-
-                # 제목
-                elif style.startswith('Heading'):
-                    level_str = style.replace('Heading', '')
-                    level = int(level_str) if level_str.isdigit() else 0
-                    est_h = {2: EST_H2, 3: EST_H3, 4: EST_H4}.get(level, EST_PARAGRAPH)
-                    elem = {'type': 'heading', 'level': level, 'text': text, 'index': idx, 'est_height': est_h}
-                    report['elements'].append(elem)
-                    report['headings'].append(elem)
-                    last_heading = f'H{level}: {text}'
-                    last_heading_text = text
-
-                # 불릿
-                elif child.find(f'{{{NS["w"]}}}pPr') is not None and \
-                     child.find(f'{{{NS["w"]}}}pPr').find(f'{{{NS["w"]}}}numPr') is not None:
-                    report['bullets'] += 1
-                    elem = {'type': 'bullet', 'text': text[:30], 'index': idx, 'est_height': EST_BULLET}
-                    report['elements'].append(elem)
+    # ── 헤더/푸터 확인 ──
+    for name in model.namelist:
+        if 'header' in name and name.endswith('.xml'):
+            report['has_header'] = True
+            root = model.part(name)
+            texts = [t.text.strip() for t in root.iter(W_T) if t.text]
+            report['header_text'] = ' '.join(texts)
+        if 'footer' in name and name.endswith('.xml'):
+            report['has_footer'] = True
+            root = model.part(name)
+            texts = [t.text.strip() for t in root.iter(W_T) if t.text]
+            report['footer_text'] = ' '.join(texts)
+
+    # ── core.xml (메타데이터) ──
+    root = model.part('docProps/core.xml')
+    if root is not None:
+        title = root.find(f'{{{NS["dc"]}}}title')
+        creator = root.find(f'{{{NS["dc"]}}}creator')
+        if title is not None and title.text:
+            report['core_props']['title'] = title.text
+        if creator is not None and creator.text:
+            report['core_props']['creator'] = creator.text
 
-                # 빈 단락
-                elif not text and not has_page_break_explicit(child):
-                    report['empty_paragraphs'] += 1
-                    elem = {'type': 'empty', 'index': idx, 'est_height': EST_EMPTY}
-                    report['elements'].append(elem)
+    return report
 
-                # 일반 텍스트
-                else:
-                    # 긴 텍스트는 줄바꿈 추정 (글자수/줄은 orientation에 따라 다름)
-                    line_count = max(1, len(text) / max(1, CHARS_PER_LINE * 0.8)) if text else 1
-                    est_h = EST_PARAGRAPH * line_count
-                    elem = {'type': 'paragraph', 'text': text[:40], 'index': idx, 'est_height': round(est_h, 1)}
+
+def _analyze_element(report, el, state):
+    """body 요소 하나를 분류해 report 통계/목록을 갱신하고, 레이아웃 요소 dict 목록을 반환
+
+    state: {'idx', 'last_heading', 'last_heading_text', 'page', 'section', 'sections', 'keep_props'}
+        — 요소 사이에 이어지는 상태 (page: 지금 요소가 속한 섹션의 page_setup)
+    단락 요소에는 keep_next/keep_lines/widow_control(참일 때만), 표에는 행 높이/cant_split을 담는다.
+    섹션 속성(pPr/sectPr)이 있는 단락 뒤에는 다음 섹션의 기하를 담은 section_break 요소를 낸다.
+    """
+    elems = _classify_element(el, state)
+    _record_elements(report, el.tag, elems, state)
+    return elems
+
+
+def _classify_element(el, state):
+    """body 요소 하나 → 레이아웃 요소 dict 목록 (state는 읽기만 한다)"""
+    elems = []
+    idx = state['idx']
+    est = state['page']['est']
+
+    if el.tag == 'p':
+        text = el.text
+        kind = el.kind
+
+        # 페이지 나누기
+        if el.has_page_break:
+            elems.append({'type': 'page_break', 'index': idx, 'after': state['last_heading'] or '(문서 시작)',
+                          'est_height': 0})
+
+        # 이미지
+        if kind == 'image':
+            img_size = el.image_size_pt
+            elem = {
+                'type': 'image', 'index': idx,
+                'width_pt': round(img_size[0], 1),
+                'height_pt': round(img_size[1], 1),
+                'section': state['last_heading_text'] or '(문서 시작)',
+            }
+            elem['est_height'] = round(img_size[1] + est['image_spacing'], 1)
+            elems.append(elem)
+
+        # 제목
+        elif kind == 'heading':
+            level = el.heading_level
+            elem = {'type': 'heading', 'level': level, 'text': text, 'index': idx}
+            elem['est_height'] = estimate_height(element_terms(elem), est)
+            elems.append(elem)
+
+        # 불릿
+        elif kind == 'bullet':
+            elems.append({'type': 'bullet', 'text': text[:30], 'index': idx, 'est_height': est['bullet']})
+
+        # 빈 단락
+        elif kind == 'empty' and not el.has_page_break:
+            elems.append({'type': 'empty', 'index': idx, 'est_height': est['empty']})
+
+        # 일반 텍스트
+        else:
+            # 긴 텍스트는 본문 폭과 런 글꼴의 글자 폭으로 줄바꿈 추정
+            page = state['page']
+            font, east_asia, size_pt, bold = resolve_run_font(el.run_font, page['font'])
+            line_count = count_lines(text, page['content_width_dxa'], font, size_pt, bold, east_asia)
+            elem = {'type': 'paragraph', 'text': text[:40], 'index': idx, 'lines': line_count}
+            elem['est_height'] = round(estimate_height(element_terms(elem), est), 1)
+            elems.append(elem)
+
+        # 페이지 나누기 규칙 (직접 지정 > 스타일 > docDefaults) — 이 단락의 레이아웃 요소에 표시
+        if elems and elems[-1]['type'] != 'page_break':
+            keep_next, keep_lines, widow_control = state['keep_props'](el)
+            if keep_next:
+                elems[-1]['keep_next'] = True
+            if keep_lines:
+                elems[-1]['keep_lines'] = True
+            if widow_control:
+                elems[-1]['widow_control'] = True
+
+        # 섹션 나누기 — 이 단락까지가 한 섹션, 다음 요소부터 다음 섹션의 페이지 기하
+        if el.section_pr is not None and state['section'] + 1 < len(state['sections']):
+            prev = state['page']
+            page = state['sections'][state['section'] + 1]
+            # 연속(continuous) 섹션도 용지 크기/방향이 바뀌면 Word는 새 페이지에서 시작한다
+            new_page = (page['section_type'] != 'continuous' or page['orientation'] != prev['orientation']
+                        or page['usable_height_pt'] != prev['usable_height_pt'])
+            elems.append({
+                'type': 'section_break', 'index': idx, 'section': state['section'] + 2,
+                'orientation': page['orientation'], 'usable_height_pt': page['usable_height_pt'],
+                'new_page': new_page, 'est_height': 0,
+            })
+
+    elif el.tag == 'tbl':
+        tbl_type = classify_table(el)
+        rows = el.row_count
+        cols = el.col_count
+        headers = get_table_header_text(el)
+
+        elem = {
+            'type': 'table', 'tbl_type': tbl_type,
+            'rows': rows, 'cols': cols,
+            'headers': headers[:5],
+            'index': idx,
+            'after': state['last_heading'] or '(문서 시작)',
+        }
+        if tbl_type == 'data_table' and rows:
+            # 셀 텍스트가 tcW 폭에서 줄바꿈되어 늘어난 줄 수 (행마다 가장 긴 셀 기준)
+            page = state['page']
+            fonts = get_table_fonts(el.rows, page['font'], TABLE_TEXT_SIZE_PT)
+            row_lines = table_wrap_lines(el.row_paragraphs, el.cell_widths, fonts, page['content_width_dxa'])
+            elem['wrap_lines'] = sum(row_lines) - len(row_lines)
+            # 행 단위 페이지 나누기용 행 높이 (합 = est_height), 여러 줄 행은 줄 단위로도 나뉠 수 있음
+            elem['row_heights'] = [est['table_header' if r == 0 else 'table_row'] + (n - 1) * est['table_line']
+                                   for r, n in enumerate(row_lines)]
+            if elem['wrap_lines']:
+                elem['row_lines'] = row_lines
+        if any(el.row_cant_split):
+            elem['cant_split'] = el.row_cant_split
+        # 높이 추정 (코드: 행 × code_row + code_pad, 박스: info_box, 그 외: 헤더 + 데이터 행 + 늘어난 줄)
+        elem['est_height'] = round(estimate_height(element_terms(elem), est), 1)
+        elems.append(elem)
+
+    return elems
+
+
+def _record_elements(report, tag, elems, state, refresh=False):
+    """분류된 레이아웃 요소를 report 통계/목록과 state에 반영
+
+    refresh: 이전 실행에서 재사용한 요소 — 앞 요소에 따라 달라지는 값(index, after, section)을 다시 채운다.
+    """
+    for elem in elems:
+        etype = elem['type']
+        if refresh:
+            elem['index'] = state['idx']
+            if etype in ('page_break', 'table'):
+                elem['after'] = state['last_heading'] or '(문서 시작)'
+            elif etype == 'image':
+                elem['section'] = state['last_heading_text'] or '(문서 시작)'
+
+        if etype == 'page_break':
+            report['page_breaks'].append(elem)
+        elif etype == 'image':
+            report['images'] += 1
+            report['image_details'].append(elem)
+        elif etype == 'heading':
+            report['headings'].append(elem)
+            state['last_heading'] = f'H{elem["level"]}: {elem["text"]}'
+            state['last_heading_text'] = elem['text']
+        elif etype == 'bullet':
+            report['bullets'] += 1
+        elif etype == 'empty':
+            report['empty_paragraphs'] += 1
+        elif etype == 'table':
+            report['tables'].append(elem)
+        elif etype == 'section_break':
+            state['section'] = elem['section'] - 1
+            state['page'] = state['sections'][state['section']]
+
+    if tag == 'p':
+        report['paragraphs'] += 1
+        state['idx'] += 1
+    elif tag == 'tbl':
+        state['idx'] += 1
+
+
+def _new_state(sections, model):
+    return {'idx': 0, 'last_heading': None, 'last_heading_text': None,
+            'page': sections[0], 'section': 0, 'sections': sections,
+            'keep_props': model.keep_props}
+
+
+def analyze_document(source, name=None, theme=None):
+    """DOCX 문서 분석 → 요소 흐름 리스트 + 메타 정보
+
+    source: 경로, bytes, 바이너리 파일 객체 (load_docx 참조). 없는 경로는 FileNotFoundError.
+    theme: 레이아웃 프로필에서 높이 계수를 고를 테마 이름 (None이면 방향별 공통 계수)
+    모듈 전역을 바꾸지 않으므로 여러 스레드에서 동시에 호출해도 된다.
+    """
+    model = load_docx(source, name)
+
+    # 섹션별 페이지 크기 자동 감지
+    sections = section_setups(model.section_sect_prs, model.default_run_font, theme)
+
+    report = _new_report(model, sections)
+
+    # ── document.xml (본문) ──
+    if model.body is None:
+        report['issues'].append('body 요소를 찾을 수 없음')
+        return report
+
+    state = _new_state(sections, model)
+    elements = model.elements
+    with phase('classification'):
+        for el in elements:
+            report['elements'].extend(_analyze_element(report, el, state))
+
+    return report
+
+
+# 스트리밍 모드에서 report['elements']에 남기는 요소 (텍스트 리포트의 문서 구조용)
+_STRUCTURE_TYPES = ('heading', 'page_break', 'section_break', 'table', 'image')
+
+
+def analyze_document_stream(source, name=None, theme=None):
+    """analyze_document + simulate_layout의 스트리밍 버전 → (report, layout)
+
+    body 자식을 iterparse로 하나씩 받아 분류한 즉시 LayoutSimulator에 넣고 노드를 해제한다.
+    전체 요소 목록 대신 제목/표/이미지/페이지 나누기만 보관하므로 메모리는 문서 크기와
+    거의 무관하며, JSON 결과는 기본 모드와 같다.
+    """
+    model = load_docx(source, name)
+
+    # 섹션별 페이지 크기 자동 감지 (섹션 속성은 섹션 끝에 오므로 sectPr 조각만 미리 훑음)
+    sections = section_setups(model.scan_section_sect_prs(), model.default_run_font, theme)
+
+    report = _new_report(model, sections)
+    simulator = LayoutSimulator(sections[0]['usable_height_pt'])
+
+    state = _new_state(sections, model)
+    found_body = False
+    # 스트리밍에서는 파싱·분류·레이아웃이 요소 단위로 맞물려 한 구간으로 잰다
+    with phase('stream_parse_classify_layout'):
+        for el in model.iter_body():
+            found_body = True
+            for elem in _analyze_element(report, el, state):
+                simulator.feed(elem)
+                if elem['type'] in _STRUCTURE_TYPES:
                     report['elements'].append(elem)
 
-                idx += 1
+    if not found_body and not _has_body(model):
+        report['issues'].append('body 요소를 찾을 수 없음')
 
-            elif tag == 'tbl':
-                tbl_type = classify_table(child)
-                rows = count_table_rows(child)
-                cols = count_table_cols(child)
-                headers = get_table_header_text(child)
+    return report, simulator.finish()
 
-                # 높이 추정
-                if tbl_type in ('code_dark', 'code_light'):
-                    est_h = rows * EST_CODE_ROW + 20
-                elif tbl_type == 'info_box':
-                    est_h = EST_INFO_BOX
-                else:
-                    est_h = EST_TABLE_HEADER + (rows - 1) * EST_TABLE_ROW
-
-                elem = {
-                    'type': 'table', 'tbl_type': tbl_type,
-                    'rows': rows, 'cols': cols,
-                    'headers': headers[:5],
-                    'index': idx, 'est_height': round(est_h, 1),
-                    'after': last_heading or '(문서 시작)',
-                }
-                report['elements'].append(elem)
-                report['tables'].append(elem)
-                idx += 1
 
-    return report
+def _has_body(model):
+    """iter_body가 아무것도 내보내지 않았을 때 빈 body와 body 없음 구분"""
+    if not model.has_part('word/document.xml'):
+        return False
+    return model.body is not None
 
 
 # ============================================================
 # 페이지 레이아웃 시뮬레이션
 # ============================================================
+# 높이는 0.1pt 단위 정수(tenths)로 누적한다. est_height가 0.1pt로 반올림된 값이라
+# 정수 누적이 정확하고, 순차 누적(LayoutSimulator)과 누적합(VectorLayout)이
+# 같은 페이지 경계를 낸다.
 
-def simulate_layout(report):
-    """요소 흐름을 순회하며 페이지 위치를 추정하고 레이아웃 문제를 감지"""
+def _tenths(height_pt):
+    return int(round(height_pt * 10))
 
-    pages = []         # 각 페이지의 요소 목록
-    current_page = []  # 현재 페이지에 쌓인 요소들
-    current_y = 0.0    # 현재 페이지에서 사용된 높이 (pt)
-    current_started_by_break = False  # 현재 페이지가 명시적 break로 시작되었는지
-    recommendations = []
 
-    for elem in report['elements']:
-        etype = elem['type']
+def _page_limit10(usable_height_pt):
+    """페이지 넘김 기준 (0.1pt 단위, 정수) — y10 > limit 이면 넘침"""
+    return int(math.floor(usable_height_pt * 10))
 
-        # 페이지 나누기 → 현재 페이지 닫고 새 페이지 시작
-        if etype == 'page_break':
-            current_page.append(elem)
-            pages.append({'elements': current_page, 'used_height': current_y, 'started_by_break': current_started_by_break})
-            current_page = []
-            current_y = 0.0
-            current_started_by_break = True  # 다음 페이지는 break로 시작
-            continue
 
-        est_h = elem.get('est_height', 0)
+def _image_rec_needs_break(elem, page_num):
+    section = elem.get('section', '?')
+    return {
+        'type': 'IMAGE_NEEDS_PAGE_BREAK',
+        'severity': 'WARN',
+        'page': page_num,
+        'index': elem['index'],
+        'message': f'이미지({elem["width_pt"]:.0f}x{elem["height_pt"]:.0f}pt)가 이전 콘텐츠와 같은 페이지에 배치됨',
+        'detail': f'섹션 "{section}" 앞에 페이지 나누기를 추가하면 이미지가 깔끔하게 표시됩니다',
+        'action': f'이미지 포함 섹션 앞에 pageBreak() 추가 권장',
+    }
 
-        # 자동 페이지 넘김 시뮬레이션 (Word가 자동으로 넘기는 것)
-        if current_y + est_h > USABLE_HEIGHT_PT and current_y > 0:
-            pages.append({'elements': current_page, 'used_height': current_y, 'started_by_break': current_started_by_break})
-            current_page = []
-            current_y = 0.0
-            current_started_by_break = False  # 자동 넘김은 break가 아님
 
-        current_page.append(elem)
-        current_y += est_h
+def _image_rec_overflow(elem, page_num, remaining):
+    return {
+        'type': 'IMAGE_OVERFLOW',
+        'severity': 'WARN',
+        'page': page_num,
+        'index': elem['index'],
+        'message': f'이미지가 페이지 경계를 넘김 (초과 {-remaining:.0f}pt)',
+        'detail': f'Word가 자동으로 다음 페이지로 밀 수 있으나, 앞에 빈 공간이 발생할 수 있음',
+        'action': f'이미지 섹션 앞에 pageBreak() 추가하여 의도적으로 배치 권장',
+    }
+
+
+def _orphan_heading_rec(elem, page_num, remaining):
+    return {
+        'type': 'ORPHAN_HEADING',
+        'severity': 'INFO',
+        'page': page_num,
+        'index': elem['index'],
+        'message': f'H{elem["level"]} "{elem["text"][:30]}" 이 페이지 하단에 위치 (남은 공간 {remaining:.0f}pt)',
+        'detail': f'제목만 현재 페이지에 남고 내용은 다음 페이지로 넘어갈 수 있음',
+        'action': f'제목 앞에 pageBreak() 추가 고려',
+    }
+
+
+def _table_split_rec(elem, page_num, remaining):
+    return {
+        'type': 'TABLE_SPLIT',
+        'severity': 'INFO',
+        'page': page_num,
+        'index': elem['index'],
+        'message': f'테이블({elem["rows"]}행)이 페이지 하단에서 잘릴 수 있음',
+        'detail': f'테이블 높이 ~{elem["est_height"]:.0f}pt, 남은 공간 ~{remaining:.0f}pt',
+        'action': f'테이블 앞에 pageBreak() 추가 또는 테이블 크기 조정 고려',
+    }
 
-    # 마지막 페이지
-    if current_page:
-        pages.append({'elements': current_page, 'used_height': current_y, 'started_by_break': current_started_by_break})
 
-    # ── 레이아웃 문제 감지 ──
+def _image_placed_by_break(elem, page_started_by_break, prev_page):
+    """이미지가 의도된 페이지 나누기 뒤에 놓였는지
+
+    오버플로우로 넘어온 경우: 이전 페이지가 break로 시작되었고
+    이전 페이지에 이 이미지의 섹션 제목이 있으면 의도된 배치
+    """
+    if page_started_by_break:
+        return True
+    if prev_page is not None and prev_page.get('started_by_break', False):
+        img_section = elem.get('section', '')
+        return any(
+            e.get('type') == 'heading' and img_section and img_section in e.get('text', '')
+            for e in prev_page['elements']
+        )
+    return False
 
-    for page_num, page in enumerate(pages, 1):
-        elems = page['elements']
-        y_accum = 0.0
 
-        for i, elem in enumerate(elems):
-            y_accum += elem.get('est_height', 0)
+def _row_weights(elem):
+    """데이터 테이블 → [(조각 무게, 앞 조각에 붙음)] — 행 단위, 여러 줄 행은 줄 단위 (cantSplit 행은 한 조각)"""
+    row_lines = elem.get('row_lines')
+    cant_split = elem.get('cant_split') or ()
+    weights = []
+    for r, h in enumerate(elem['row_heights']):
+        n = row_lines[r] if row_lines else 1
+        if n > 1 and not (r < len(cant_split) and cant_split[r]):
+            weights.extend((h / n, False) for _ in range(n))
+        else:
+            weights.append((h, False))
+    return weights
+
+
+def _element_pieces(elem, keep_with_prev=False):
+    """레이아웃 요소 → 페이지를 넘길 수 있는 조각 목록 [(높이 0.1pt, 앞 조각과 같은 페이지 유지)]
+
+    Word는 단락을 줄 단위로, 표를 행 단위로 넘긴다. 조각 높이는 est_height를 줄/행 무게대로
+    나눈 값이라 합이 항상 est_height와 같다. 같은 페이지 유지(glue)는
+      keepLines: 단락의 모든 줄 / widowControl: 첫 두 줄과 마지막 두 줄 /
+      cantSplit: 여러 줄 행의 모든 줄 / keep_with_prev: 앞 요소의 keepNext → 첫 조각
+    두 엔진(LayoutSimulator, VectorLayout)이 같은 조각을 쓰므로 결과가 같다.
+    """
+    h10 = _tenths(elem.get('est_height', 0))
+    etype = elem['type']
+    weights = None
+    if etype == 'paragraph' and elem.get('lines', 1) > 1:
+        n = elem['lines']
+        keep_lines = elem.get('keep_lines', False)
+        widow = elem.get('widow_control', False)
+        weights = [(1, k > 0 and (keep_lines or (widow and k in (1, n - 1)))) for k in range(n)]
+    elif etype == 'table' and len(elem.get('row_heights') or ()) > 1:
+        weights = _row_weights(elem)
+
+    if not weights:
+        return [(h10, keep_with_prev)]
+    total = sum(w for w, _ in weights)
+    if total <= 0:
+        return [(h10, keep_with_prev)]
+
+    # 누적 무게를 반올림해 나누므로 조각 합 = h10
+    pieces = []
+    acc = 0.0
+    prev10 = 0
+    for k, (w, glue) in enumerate(weights):
+        acc += w
+        cur10 = int(round(acc / total * h10)) if k < len(weights) - 1 else h10
+        pieces.append((cur10 - prev10, keep_with_prev if k == 0 else glue))
+        prev10 = cur10
+    return pieces
+
+
+class LayoutSimulator:
+    """요소를 하나씩 받아 페이지를 쌓는 레이아웃 시뮬레이터
+
+    페이지가 닫힐 때마다 그 페이지와 직전 페이지만 보고 레이아웃 규칙을 검사하므로,
+    스트리밍 모드에서도 요소 전체가 아니라 페이지 두 장 분량만 메모리에 남는다.
+    NumPy가 없을 때 simulate_layout()도 이 클래스를 쓴다.
+
+    section_break 요소는 다음 페이지부터 그 섹션의 가용 높이를 쓰게 하고, new_page면
+    page_break처럼 현재 페이지를 닫는다. 페이지의 가용 높이는 페이지가 시작될 때 정해진다.
+
+    요소는 줄/행 조각(_element_pieces)으로 쌓는다. 넘치는 조각이 앞 조각에 붙어 있으면
+    (keepNext/keepLines/widowControl/cantSplit) 붙은 묶음의 시작에서 페이지를 넘기고,
+    묶음이 페이지 첫 조각부터 시작하면(한 페이지보다 긴 묶음) 넘치는 조각 앞에서 넘긴다.
+    """
+
+    def __init__(self, usable_height_pt=USABLE_HEIGHT_PT):
+        self.usable_height_pt = usable_height_pt   # 다음에 시작하는 페이지의 가용 높이
+        self.page_summaries = []
+        self.recommendations = []
+        self._page_usable = usable_height_pt       # 현재 페이지의 가용 높이
+        self._limit10 = _page_limit10(usable_height_pt)
+        self._prev_page = None
+        self._page_num = 0
+        self.page_starts = []     # 페이지별 [첫 조각의 요소 위치, 요소의 첫 조각인지, break로 시작했는지]
+        self._current_page = []   # 현재 페이지에 쌓인 조각들 (요소, 높이 0.1pt, glue, 첫 조각, 끝 조각, 요소 위치)
+        self._current_y10 = 0     # 현재 페이지에서 사용된 높이 (0.1pt)
+        self._started_by_break = False  # 현재 페이지가 명시적 break로 시작되었는지
+        self._keep_next = False   # 직전 요소의 keepNext — 다음 요소 첫 조각을 붙임
+        self._position = 0        # 다음에 받을 요소의 위치
+
+    def feed(self, elem):
+        etype = elem['type']
+        position = self._position
+        self._position += 1
+
+        # 페이지 나누기 → 현재 페이지 닫고 새 페이지 시작
+        if etype == 'page_break':
+            self._current_page.append((elem, 0, False, True, True, position))
+            self._close_page()
+            self._started_by_break = True  # 다음 페이지는 break로 시작
+            self._keep_next = False
+            return
+
+        # 섹션 나누기 → 다음 페이지부터 새 섹션의 가용 높이 (다음 페이지로 넘기는 섹션이면 지금 닫음)
+        if etype == 'section_break':
+            self.usable_height_pt = elem['usable_height_pt']
+            self._current_page.append((elem, 0, False, True, True, position))
+            if elem.get('new_page', True):
+                self._close_page()
+                self._started_by_break = True
+            self._keep_next = False
+            return
+
+        pieces = _element_pieces(elem, self._keep_next)
+        last = len(pieces) - 1
+        for k, (h10, glue) in enumerate(pieces):
+            self._add_piece((elem, h10, glue, k == 0, k == last, position))
+        self._keep_next = elem.get('keep_next', False)
+
+    def _add_piece(self, piece):
+        h10 = piece[1]
+
+        # 자동 페이지 넘김 시뮬레이션 (Word가 자동으로 넘기는 것)
+        if self._current_y10 + h10 > self._limit10 and self._current_y10 > 0:
+            cut = len(self._current_page)
+            if piece[2]:
+                # 붙은 묶음의 시작(페이지 첫 조각 제외)에서 넘김
+                for b in range(len(self._current_page) - 1, 0, -1):
+                    if not self._current_page[b][2]:
+                        cut = b
+                        break
+            carry = self._current_page[cut:]
+            del self._current_page[cut:]
+            self._current_y10 -= sum(p[1] for p in carry)
+            self._close_page()
+            self._started_by_break = False  # 자동 넘김은 break가 아님
+            # 넘긴 묶음도 새 페이지의 가용 높이로 다시 쌓는다 (묶음이 새 페이지보다 길면 다시 나뉨)
+            for p in carry:
+                self._add_piece(p)
+            self._add_piece(piece)
+            return
+
+        self._current_page.append(piece)
+        self._current_y10 += h10
+
+    def finish(self):
+        """마지막 페이지를 닫고 layout dict 반환"""
+        if self._current_page:
+            self._close_page()
+        return {
+            'total_pages_estimated': self._page_num,
+            'pages': self.page_summaries,
+            'recommendations': self.recommendations,
+            'page_starts': self.page_starts,
+        }
+
+    # ── 증분 재시뮬레이션 ──
+
+    def restore(self, layout, page, prev_elements, position, keep_next=False):
+        """이전 layout의 page번째(0부터) 페이지 시작 직전 상태로 맞춘다 — 그 앞 페이지 결과는 그대로 쓴다
+
+        page번째 페이지는 요소 position의 첫 조각에서 시작해야 한다 (layout['page_starts'] 참조).
+        prev_elements: 직전 페이지에서 시작한 요소들 (이미지 규칙용), keep_next: position 직전 요소의 keepNext.
+        usable_height_pt는 생성자에서 그 페이지의 가용 높이로 준다.
+        """
+        starts = layout['page_starts']
+        self.page_summaries = layout['pages'][:page]
+        self.recommendations = [r for r in layout['recommendations'] if r['page'] <= page]
+        self.page_starts = [list(s) for s in starts[:page]]
+        self._page_num = page
+        self._started_by_break = starts[page][2]
+        self._prev_page = {'elements': prev_elements, 'started_by_break': starts[page - 1][2]} if page else None
+        self._keep_next = keep_next
+        self._position = position
+
+    def at_break_start(self):
+        """명시적 break 직후의 빈 페이지인지 — 다음 요소가 break로 시작한 페이지의 첫 요소"""
+        return not self._current_page and self._started_by_break and self._page_num > 0
+
+    def adopt_tail(self, layout, page, position_shift, index_shift):
+        """이전 layout의 page번째 페이지부터 끝까지를 이어 붙인다
+
+        break로 시작한 빈 페이지(at_break_start)에서, 그 뒤 요소가 이전 실행과 모두 같을 때만 쓴다.
+        페이지 번호와 요소 위치/본문 순번(index)만 옮겨 적는다.
+        """
+        page_shift = self._page_num - page
+        for summary in layout['pages'][page:]:
+            self.page_summaries.append(dict(summary, page=summary['page'] + page_shift))
+        for rec in layout['recommendations']:
+            if rec['page'] > page:
+                self.recommendations.append(dict(rec, page=rec['page'] + page_shift,
+                                                 index=rec['index'] + index_shift))
+        for pos, first, by_break in layout['page_starts'][page:]:
+            self.page_starts.append([pos + position_shift, first, by_break])
+        self._page_num += len(layout['pages']) - page
+        self._prev_page = None
+
+    def _close_page(self):
+        used_height = self._current_y10 / 10
+        page = {
+            'pieces': self._current_page,
+            'elements': [p[0] for p in self._current_page if p[3]],   # 이 페이지에서 시작한 요소
+            'used_height': used_height,
+            'usable_height': self._page_usable,
+            'started_by_break': self._started_by_break,
+        }
+        self._page_num += 1
+        head = self._current_page[0]
+        self.page_starts.append([head[5], head[3], self._started_by_break])
+        self._check_page(page, self._page_num)
+        self.page_summaries.append({
+            'page': self._page_num,
+            'used_height': round(used_height, 1),
+            'fill_pct': round(used_height / self._page_usable * 100, 1),
+            'has_image': any(e['type'] == 'image' for e in page['elements']),
+            'heading_count': sum(1 for e in page['elements'] if e['type'] == 'heading'),
+            'table_count': sum(1 for e in page['elements'] if e['type'] == 'table'),
+        })
+        del page['pieces']
+        self._prev_page = page
+        self._current_page = []
+        self._current_y10 = 0
+        self._page_usable = self.usable_height_pt
+        self._limit10 = _page_limit10(self.usable_height_pt)
+
+    def _check_page(self, page, page_num):
+        """레이아웃 문제 감지 (닫힌 페이지 + 직전 페이지 기준, 요소는 첫 조각 위치로 검사)"""
+        usable = page['usable_height']
+        pieces = page['pieces']
+        ends_here = {id(p[0]) for p in pieces if p[4]}
+        y_accum10 = 0
+
+        for k, (elem, h10, _glue, first, _last, _pos) in enumerate(pieces):
+            before10 = y_accum10
+            y_accum10 += h10
+            if not first:
+                continue
+            remaining = usable - y_accum10 / 10
 
             # 규칙 1: 이미지가 페이지 나누기 없이 이전 콘텐츠와 같이 배치됨
             if elem['type'] == 'image':
-                remaining = USABLE_HEIGHT_PT - y_accum
-                page_started_by_break = page.get('started_by_break', False)
-
-                # 오버플로우로 넘어온 경우: 이전 페이지가 break로 시작되었고
-                # 이전 페이지에 이 이미지의 섹션 제목이 있으면 의도된 배치
-                if not page_started_by_break and page_num > 1:
-                    prev_page = pages[page_num - 2]
-                    if prev_page.get('started_by_break', False):
-                        img_section = elem.get('section', '')
-                        prev_has_heading = any(
-                            e.get('type') == 'heading' and img_section and img_section in e.get('text', '')
-                            for e in prev_page['elements']
-                        )
-                        if prev_has_heading:
-                            page_started_by_break = True  # 의도된 배치로 간주
-
-                if not page_started_by_break and page_num > 1:
-                    section = elem.get('section', '?')
-                    recommendations.append({
-                        'type': 'IMAGE_NEEDS_PAGE_BREAK',
-                        'severity': 'WARN',
-                        'page': page_num,
-                        'index': elem['index'],
-                        'message': f'이미지({elem["width_pt"]:.0f}x{elem["height_pt"]:.0f}pt)가 이전 콘텐츠와 같은 페이지에 배치됨',
-                        'detail': f'섹션 "{section}" 앞에 페이지 나누기를 추가하면 이미지가 깔끔하게 표시됩니다',
-                        'action': f'이미지 포함 섹션 앞에 pageBreak() 추가 권장',
-                    })
+                if page_num > 1 and not _image_placed_by_break(
+                        elem, page.get('started_by_break', False), self._prev_page):
+                    self.recommendations.append(_image_rec_needs_break(elem, page_num))
 
                 # 이미지가 페이지 하단에 걸쳐 잘릴 수 있는지
                 if remaining < 0:
-                    recommendations.append({
-                        'type': 'IMAGE_OVERFLOW',
-                        'severity': 'WARN',
-                        'page': page_num,
-                        'index': elem['index'],
-                        'message': f'이미지가 페이지 경계를 넘김 (초과 {-remaining:.0f}pt)',
-                        'detail': f'Word가 자동으로 다음 페이지로 밀 수 있으나, 앞에 빈 공간이 발생할 수 있음',
-                        'action': f'이미지 섹션 앞에 pageBreak() 추가하여 의도적으로 배치 권장',
-                    })
+                    self.recommendations.append(_image_rec_overflow(elem, page_num, remaining))
 
             # 규칙 2: 제목이 페이지 맨 하단에 혼자 남음 (orphan heading)
-            if elem['type'] == 'heading':
-                remaining = USABLE_HEIGHT_PT - y_accum
-                if remaining < 60:  # 제목 아래 60pt 미만 공간 → 내용 들어갈 자리 없음
-                    recommendations.append({
-                        'type': 'ORPHAN_HEADING',
-                        'severity': 'INFO',
-                        'page': page_num,
-                        'index': elem['index'],
-                        'message': f'H{elem["level"]} "{elem["text"][:30]}" 이 페이지 하단에 위치 (남은 공간 {remaining:.0f}pt)',
-                        'detail': f'제목만 현재 페이지에 남고 내용은 다음 페이지로 넘어갈 수 있음',
-                        'action': f'제목 앞에 pageBreak() 추가 고려',
-                    })
-
-            # 규칙 3: 큰 테이블이 페이지 중간에서 잘림
-            if elem['type'] == 'table' and elem.get('tbl_type') == 'data_table':
-                remaining = USABLE_HEIGHT_PT - y_accum + elem['est_height']
-                if elem['est_height'] > remaining and remaining < USABLE_HEIGHT_PT * 0.4:
-                    recommendations.append({
-                        'type': 'TABLE_SPLIT',
-                        'severity': 'INFO',
-                        'page': page_num,
-                        'index': elem['index'],
-                        'message': f'테이블({elem["rows"]}행)이 페이지 하단에서 잘릴 수 있음',
-                        'detail': f'테이블 높이 ~{elem["est_height"]:.0f}pt, 남은 공간 ~{remaining:.0f}pt',
-                        'action': f'테이블 앞에 pageBreak() 추가 또는 테이블 크기 조정 고려',
-                    })
-
-    layout = {
-        'total_pages_estimated': len(pages),
-        'pages': [],
-        'recommendations': recommendations,
-    }
-
-    for i, page in enumerate(pages, 1):
-        page_summary = {
-            'page': i,
-            'used_height': round(page['used_height'], 1),
-            'fill_pct': round(page['used_height'] / USABLE_HEIGHT_PT * 100, 1),
-            'has_image': any(e['type'] == 'image' for e in page['elements']),
-            'heading_count': sum(1 for e in page['elements'] if e['type'] == 'heading'),
-            'table_count': sum(1 for e in page['elements'] if e['type'] == 'table'),
+            # 제목 아래 60pt 미만 공간 → 내용 들어갈 자리 없음
+            # keepNext 제목은 다음 조각이 같은 페이지에 함께 있으면 혼자 남지 않음
+            if elem['type'] == 'heading' and remaining < 60:
+                nxt = pieces[k + 1][0] if k + 1 < len(pieces) else None
+                if not elem.get('keep_next') or nxt is None or _type_code(nxt) == _T_BREAK:
+                    self.recommendations.append(_orphan_heading_rec(elem, page_num, remaining))
+
+            # 규칙 3: 큰 테이블이 페이지 중간에서 잘림 (마지막 행이 다음 페이지로 넘어감)
+            if elem['type'] == 'table' and elem.get('tbl_type') == 'data_table' and id(elem) not in ends_here:
+                remaining = usable - before10 / 10
+                if remaining < usable * 0.4:
+                    self.recommendations.append(_table_split_rec(elem, page_num, remaining))
+
+
+# 요소 타입 코드 (VectorLayout 마스크용) — _T_SECTION: 같은 페이지에서 이어지는 연속 section_break
+_T_OTHER, _T_BREAK, _T_IMAGE, _T_HEADING, _T_TABLE, _T_DATA_TABLE, _T_SECTION = range(7)
+
+
+def _type_code(elem):
+    etype = elem['type']
+    if etype == 'page_break':
+        return _T_BREAK
+    if etype == 'section_break':
+        return _T_BREAK if elem.get('new_page', True) else _T_SECTION
+    if etype == 'image':
+        return _T_IMAGE
+    if etype == 'heading':
+        return _T_HEADING
+    if etype == 'table':
+        return _T_DATA_TABLE if elem.get('tbl_type') == 'data_table' else _T_TABLE
+    return _T_OTHER
+
+
+class VectorLayout:
+    """요소 높이 배열 기반 레이아웃 시뮬레이션 (NumPy 필요)
+
+    높이 누적합(cumsum)에서 searchsorted로 페이지 경계를 찾으므로 반복은 요소 수가 아니라
+    페이지 수만큼이고, 규칙 검사는 요소별 페이지 내 위치 배열에 대한 마스크로 처리한다.
+    배열은 한 번만 만들어 두고 페이지 나누기를 가정해 여러 번 다시 시뮬레이션할 수 있다:
+
+        vl = VectorLayout(report['elements'], report['page']['usable_height_pt'])
+        base = vl.page_count()
+        h2 = [i for i, e in enumerate(vl.elements) if e['type'] == 'heading' and e['level'] == 2]
+        trial = vl.page_count(extra_breaks=[h2[3]])   # 4번째 H2 앞에 pageBreak() 가정
+
+    결과는 LayoutSimulator와 같다. section_break는 usable_height_pt(시작 섹션) 대신 그 뒤 요소들의
+    가용 높이를 정하며, 페이지의 가용 높이는 페이지 첫 요소가 속한 섹션의 값이다.
+    배열은 요소가 아니라 조각(_element_pieces) 단위이며, glue 조각에서 넘치면 누적 최댓값으로
+    미리 구한 '직전 glue 아닌 조각' 위치에서 페이지를 넘긴다.
+    """
+
+    def __init__(self, elements, usable_height_pt=USABLE_HEIGHT_PT):
+        if not _load_numpy():
+            raise RuntimeError('VectorLayout에는 numpy가 필요합니다 (pip install numpy)')
+        self.elements = list(elements)
+        self.usable_height_pt = usable_height_pt
+
+        # 요소 → 조각 (page_break/section_break는 높이 0 조각 하나, keepNext는 넘어가지 않음)
+        heights10, glue, owner = [], [], []
+        keep_next = False
+        for i, e in enumerate(self.elements):
+            if e['type'] in ('page_break', 'section_break'):
+                pieces = [(0, False)]
+                keep_next = False
+            else:
+                pieces = _element_pieces(e, keep_next)
+                keep_next = e.get('keep_next', False)
+            for h10, g in pieces:
+                heights10.append(h10)
+                glue.append(g)
+                owner.append(i)
+        self.heights10 = np.array(heights10, dtype=np.int64)
+        self.glue = np.array(glue, dtype=bool)
+        self.owner = np.array(owner, dtype=np.int64)
+        # 요소별 첫 조각 / 끝 조각 위치
+        self.first = np.searchsorted(self.owner, np.arange(len(self.elements)), side='left')
+        self.last = np.searchsorted(self.owner, np.arange(len(self.elements)), side='right') - 1
+        self.keep_next = np.array([bool(e.get('keep_next')) for e in self.elements], dtype=bool)
+        elem_types = np.array([_type_code(e) for e in self.elements], dtype=np.int8)
+        self.types = elem_types[self.owner]
+
+        # 요소별 가용 높이 — section_break 자신은 앞 섹션, 그다음 요소부터 새 섹션
+        section_pos = [i for i, e in enumerate(self.elements) if e['type'] == 'section_break']
+        section_usable = [usable_height_pt] + [self.elements[i]['usable_height_pt'] for i in section_pos]
+        which = np.searchsorted(np.asarray(section_pos, dtype=np.int64), np.arange(len(self.elements)), side='left')
+        elem_usables = np.asarray(section_usable, dtype=np.float64)[which]
+        self.usables = elem_usables[self.owner]
+
+    # ── 페이지 나누기 가정 ──
+
+    def _arrays(self, extra_breaks):
+        """extra_breaks(요소 위치)의 첫 조각 앞에 높이 0인 page_break를 끼운 조각 배열
+
+        → (heights10, types, glue, usables, order) — order: 원래 조각 위치 → 삽입 후 위치 (없으면 None)
+        """
+        if not len(extra_breaks):
+            return self.heights10, self.types, self.glue, self.usables, None
+        pos = np.sort(self.first[np.asarray(extra_breaks, dtype=np.int64)])
+        heights10 = np.insert(self.heights10, pos, 0)
+        types = np.insert(self.types, pos, _T_BREAK)
+        # break 뒤 조각은 앞 요소의 keepNext에 붙지 않음
+        glue = self.glue.copy()
+        glue[pos] = False
+        glue = np.insert(glue, pos, False)
+        # 끼운 break는 바로 앞 조각의 섹션에 속함
+        usables = np.insert(self.usables, pos, self.usables[np.maximum(pos - 1, 0)] if len(self.usables)
+                            else self.usable_height_pt)
+        count = len(self.heights10)
+        order = np.arange(count) + np.searchsorted(pos, np.arange(count), side='right')
+        return heights10, types, glue, usables, order
+
+    # ── 페이지 나누기 ──
+
+    def paginate(self, extra_breaks=()):
+        """→ (page_starts, started_by_break, cumsum10, types, usables, order) — 모두 조각 단위
+
+        page_starts[p]: p번째 페이지 첫 조각 위치, started_by_break[p]: 명시적 break로 시작 여부
+        usables: (삽입 후) 조각별 가용 높이 — 페이지 가용 높이는 usables[page_starts]
+        """
+        heights10, types, glue, usables, order = self._arrays(extra_breaks)
+        n = len(heights10)
+        cum10 = np.cumsum(heights10)
+        break_pos = np.flatnonzero(types == _T_BREAK)
+        # 조각 i 이하에서 glue가 아닌 마지막 조각 (붙은 묶음의 시작)
+        unglued = np.maximum.accumulate(np.where(glue, -1, np.arange(n))) if n else np.zeros(0, dtype=np.int64)
+
+        # 경계 탐색은 페이지당 한 번씩이라 numpy 스칼라 호출보다 리스트 + bisect가 빠르다
+        cum = cum10.tolist()
+        breaks = break_pos.tolist()
+        limits = np.floor(usables * 10).astype(np.int64).tolist()
+        glue_at = glue.tolist()
+        unglued = unglued.tolist()
+
+        starts = []
+        by_break = []
+        s = 0
+        started_by_break = False
+        while s < n:
+            base = cum[s - 1] if s else 0
+            # s 이후 첫 page_break까지가 한 구간 (page_break 요소는 현재 페이지에 포함)
+            k = bisect.bisect_left(breaks, s)
+            seg_end = breaks[k] + 1 if k < len(breaks) else n
+
+            # 현재 페이지 높이 + 조각 높이 > limit 인 첫 조각 j (limit: 페이지 시작 섹션의 가용 높이)
+            j = bisect.bisect_right(cum, base + limits[s], s)
+            if j < seg_end:
+                if j == s or cum[j - 1] == base:
+                    # 빈 페이지에는 넘치는 조각도 그대로 놓임 → 그다음 조각부터 넘김
+                    # (바로 뒤의 연속 section_break와 page_break는 feed()처럼 현재 페이지에 포함)
+                    j += 1
+                    while j < seg_end and types[j] == _T_SECTION:
+                        j += 1
+                    if j == seg_end - 1 and types[j] == _T_BREAK:
+                        j = seg_end
+                elif glue_at[j] and unglued[j] > s:
+                    # 앞 조각에 붙은 조각 → 붙은 묶음째 다음 페이지로
+                    j = unglued[j]
+                end = j
+            else:
+                end = seg_end
+
+            starts.append(s)
+            by_break.append(started_by_break)
+            started_by_break = end == seg_end and k < len(breaks)
+            s = end
+
+        return np.array(starts, dtype=np.int64), np.array(by_break, dtype=bool), cum10, types, usables, order
+
+    def page_count(self, extra_breaks=()):
+        """페이지 수만 계산 (가정 레이아웃 비교용)"""
+        return len(self.paginate(extra_breaks)[0])
+
+    # ── 전체 시뮬레이션 ──
+
+    def simulate(self, extra_breaks=()):
+        """LayoutSimulator.finish()와 같은 layout dict"""
+        starts, by_break, cum10, types, usables, order = self.paginate(extra_breaks)
+        n = len(types)
+        page_count = len(starts)
+        if page_count == 0:
+            return {'total_pages_estimated': 0, 'pages': [], 'recommendations': [], 'page_starts': []}
+
+        # 조각별 페이지 번호 / 페이지 내 누적 높이
+        page_end = np.append(starts[1:], n)
+        lengths = page_end - starts
+        page_of = np.repeat(np.arange(page_count), lengths)
+        base = np.where(starts > 0, cum10[np.maximum(starts - 1, 0)], 0)
+        y10 = cum10 - base[page_of]
+        heights10 = np.diff(cum10, prepend=0)
+        page_usable = usables[starts]
+        usable = page_usable[page_of]
+        remaining = usable - y10 / 10
+
+        # 원래 요소 → 삽입 후 첫/끝 조각 위치 (가정 break는 요소가 아님)
+        first = self.first if order is None else order[self.first]
+        last = self.last if order is None else order[self.last]
+        elems = self.elements
+        etypes = types[first]
+        epage = page_of[first]
+        erem = remaining[first]
+        eusable = usable[first]
+
+        # ── 페이지 요약 (요소는 첫 조각이 놓인 페이지에서 센다) ──
+        used10 = cum10[page_end - 1] - base
+        is_first = np.zeros(n, dtype=bool)
+        is_first[first] = True
+        is_image = is_first & (types == _T_IMAGE)
+        is_heading = is_first & (types == _T_HEADING)
+        is_table = is_first & ((types == _T_TABLE) | (types == _T_DATA_TABLE))
+        image_counts = np.add.reduceat(is_image.astype(np.int64), starts)
+        heading_counts = np.add.reduceat(is_heading.astype(np.int64), starts)
+        table_counts = np.add.reduceat(is_table.astype(np.int64), starts)
+
+        pages = []
+        page_usable = page_usable.tolist()
+        for p in range(page_count):
+            used_height = int(used10[p]) / 10
+            pages.append({
+                'page': p + 1,
+                'used_height': round(used_height, 1),
+                'fill_pct': round(used_height / page_usable[p] * 100, 1),
+                'has_image': bool(image_counts[p]),
+                'heading_count': int(heading_counts[p]),
+                'table_count': int(table_counts[p]),
+            })
+
+        # ── 규칙 마스크 ──
+        recs = []  # (요소 위치, 규칙 순서, rec)
+
+        # 규칙 1: 이미지 — 페이지 나누기 없이 배치 / 페이지 경계 넘김
+        for i in np.flatnonzero(etypes == _T_IMAGE).tolist():
+            p = int(epage[i])
+            if p > 0:
+                page_elems = None
+                if by_break[p - 1] and not by_break[p]:
+                    page_elems = self._page_elements(p - 1, starts, first, n)
+                prev_page = {'started_by_break': bool(by_break[p - 1]), 'elements': page_elems or []}
+                if not _image_placed_by_break(elems[i], bool(by_break[p]), prev_page):
+                    recs.append((i, 0, _image_rec_needs_break(elems[i], p + 1)))
+            if erem[i] < 0:
+                recs.append((i, 1, _image_rec_overflow(elems[i], p + 1, float(erem[i]))))
+
+        # 규칙 2: 제목 아래 60pt 미만 (orphan heading) — keepNext 제목은 다음 조각이 같은 페이지면 제외
+        nxt = np.minimum(first + 1, n - 1)
+        alone = (first + 1 >= page_end[epage]) | (types[nxt] == _T_BREAK)
+        orphan = (etypes == _T_HEADING) & (erem < 60) & (~self.keep_next | alone)
+        for i in np.flatnonzero(orphan).tolist():
+            recs.append((i, 2, _orphan_heading_rec(elems[i], int(epage[i]) + 1, float(erem[i]))))
+
+        # 규칙 3: 데이터 테이블이 페이지 하단에서 잘림 (끝 조각이 다른 페이지)
+        table_rem = eusable - (y10[first] - heights10[first]) / 10
+        split = ((etypes == _T_DATA_TABLE) & (page_of[last] != epage)
+                 & (table_rem < eusable * 0.4))
+        for i in np.flatnonzero(split).tolist():
+            recs.append((i, 3, _table_split_rec(elems[i], int(epage[i]) + 1, float(table_rem[i]))))
+
+        recs.sort(key=lambda r: (r[0], r[1]))
+
+        # 페이지 첫 조각의 원래 요소 위치 (가정 break 조각은 -1)
+        owner = self.owner
+        if order is not None:
+            owner = np.full(n, -1, dtype=np.int64)
+            owner[order] = self.owner
+        page_starts = [[pos, first_piece, started] for pos, first_piece, started in
+                       zip(owner[starts].tolist(), is_first[starts].tolist(), by_break.tolist())]
+        return {
+            'total_pages_estimated': page_count,
+            'pages': pages,
+            'recommendations': [r[2] for r in recs],
+            'page_starts': page_starts,
         }
-        layout['pages'].append(page_summary)
 
-    return layout
+    def _page_elements(self, p, starts, first, n):
+        """p번째 페이지에서 시작한 원래 요소 목록"""
+        lo = starts[p]
+        hi = starts[p + 1] if p + 1 < len(starts) else n
+        idx = np.flatnonzero((first >= lo) & (first < hi))
+        return [self.elements[i] for i in idx.tolist()]
+
+
+# VectorLayout을 쓰는 최소 요소 수. 배열 연산은 순차 계산보다 10~40% 빠를 뿐이라 (xlarge 2.5만 요소:
+# 0.10s vs 0.11s) numpy import 비용(0.1~0.2s)을 되찾으려면 수십만 요소가 필요하다. numpy가 이미
+# import된 프로세스에서는 그 비용이 없으므로 배열 연산이 앞서기 시작하는 크기부터 쓴다.
+VECTOR_LAYOUT_MIN_ELEMENTS = 200_000
+VECTOR_LAYOUT_MIN_ELEMENTS_LOADED = 2_000
+
+
+def _vector_layout_threshold():
+    if np or (np is None and 'numpy' in sys.modules):
+        return VECTOR_LAYOUT_MIN_ELEMENTS_LOADED
+    return VECTOR_LAYOUT_MIN_ELEMENTS
+
+
+def simulate_layout(report):
+    """요소 흐름을 순회하며 페이지 위치를 추정하고 레이아웃 문제를 감지
+
+    요소가 VectorLayout 임계값 이상이고 NumPy가 있으면 VectorLayout(배열 연산), 아니면
+    LayoutSimulator(순차)로 같은 결과를 낸다.
+    """
+    usable = _usable_height(report)
+    elements = report['elements']
+    with phase('layout_simulation'):
+        if len(elements) >= _vector_layout_threshold() and _load_numpy():
+            return VectorLayout(elements, usable).simulate()
+        simulator = LayoutSimulator(usable)
+        for elem in elements:
+            simulator.feed(elem)
+        return simulator.finish()
+
+
+# ============================================================
+# 증분 재검증 (self-improve 반복)
+# ============================================================
+# 반복 사이에 바뀌는 요소는 페이지 나누기나 표 너비 몇 개뿐이다. 실행마다 요소 지문
+# (DocxModel.element_fingerprints)과 분류된 레이아웃 요소, 페이지 시작 위치를 상태로 남겨 두고,
+# 다음 실행에서는
+#   - 지문과 섹션이 같은 요소는 분류를 건너뛰고 저장된 레이아웃 요소를 다시 쓰며
+#   - 바뀐 첫 요소가 영향을 주는 페이지부터만 다시 쌓다가, 바뀐 구간 뒤의 명시적 break에서
+#     이전 페이지 경계와 다시 맞으면 나머지 페이지는 이전 결과를 옮겨 적는다.
+# 결과는 analyze_document + simulate_layout과 같다.
+
+INCREMENTAL_STATE_VERSION = 1
+
+
+def _incremental_slot(model, theme):
+    """상태를 찾는 문서 식별자 — 경로 입력은 절대 경로, 경로 없는 입력은 호출자가 준 이름
+
+    이름 없는 bytes/stdin/파일 객체는 서로 다른 문서가 한 슬롯을 덮어쓰게 되므로 None (증분 안 함).
+    """
+    if model.path:
+        return {'file': os.path.abspath(model.path), 'theme': theme}
+    if model.given_name:
+        return {'file': model.given_name, 'theme': theme}
+    return None
+
+
+def _incremental_context(model, sections):
+    """요소 지문 밖에서 분류/높이에 영향을 주는 입력의 해시 (스타일, 섹션별 페이지 기하와 높이 계수)"""
+    h = hashlib.sha256()
+    h.update(model.read('word/styles.xml') if model.has_part('word/styles.xml') else b'missing')
+    h.update(json.dumps(sections, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _page_headings(elements, page_starts):
+    """페이지마다 첫 조각 앞의 마지막 제목 텍스트 (이미지 요소의 section 값과 같음)"""
+    headings = []
+    heading = None
+    k = 0
+    for pos, elem in enumerate(elements):
+        while k < len(page_starts) and page_starts[k][0] <= pos:
+            headings.append(heading)
+            k += 1
+        if elem['type'] == 'heading':
+            heading = elem['text']
+    headings.extend([heading] * (len(page_starts) - k))
+    return headings
+
+
+def analyze_incremental(source, name=None, theme=None):
+    """analyze_document + simulate_layout의 증분 버전 → (report, layout)
+
+    같은 문서(경로, 경로 없는 입력은 name)의 직전 실행 상태를 리포트 캐시 디렉토리에서 읽어
+    바뀌지 않은 요소의 분류와 바뀐 곳 앞뒤의 페이지 결과를 다시 쓰고, 이번 상태를 저장한다.
+    상태가 없거나 스타일/섹션/높이 계수가 달라졌으면 전체 분석과 같은 일을 한다.
+    문서를 식별할 슬롯이 없으면(이름 없는 bytes) 상태를 읽지도 저장하지도 않고 전체 분석만 한다.
+    """
+    model = load_docx(source, name)
+    slot = _incremental_slot(model, theme)
+    if slot is None:
+        report = analyze_document(model, theme=theme)
+        return report, simulate_layout(report)
+    sections = section_setups(model.section_sect_prs, model.default_run_font, theme)
+    report = _new_report(model, sections)
+    if model.body is None:
+        report['issues'].append('body 요소를 찾을 수 없음')
+        return report, simulate_layout(report)
+
+    context = _incremental_context(model, sections)
+    previous = load_state(__file__, slot)
+    if (not isinstance(previous, dict) or previous.get('version') != INCREMENTAL_STATE_VERSION
+            or previous.get('context') != context):
+        previous = None
+    reuse = {(fp, section): elems for fp, section, elems in previous['records']} if previous else {}
+
+    state = _new_state(sections, model)
+    records = []   # body 요소별 [지문, 섹션, 레이아웃 요소들]
+    with phase('classification'):
+        for el, fingerprint in zip(model.elements, model.element_fingerprints):
+            section = state['section']
+            cached = reuse.get((fingerprint, section))
+            if cached is not None:
+                elems = [dict(e) for e in cached]
+                _record_elements(report, el.tag, elems, state, refresh=True)
+            else:
+                elems = _analyze_element(report, el, state)
+            report['elements'].extend(elems)
+            records.append([fingerprint, section, elems])
+
+    with phase('layout_simulation'):
+        layout = _incremental_layout(report, records, previous, state['idx'])
+
+    save_state(__file__, slot, {
+        'version': INCREMENTAL_STATE_VERSION,
+        'context': context,
+        'records': records,
+        'idx': state['idx'],
+        'layout': layout,
+        'headings': _page_headings(report['elements'], layout['page_starts']),
+    })
+    return report, layout
+
+
+def _incremental_layout(report, records, previous, idx_total):
+    """이전 상태와 앞뒤로 같은 요소 구간을 찾아 바뀐 구간만 다시 시뮬레이션"""
+    elements = report['elements']
+    if previous is None or not previous['layout']['page_starts']:
+        return simulate_layout(report)
+
+    old_records = previous['records']
+    n_new, n_old = len(records), len(old_records)
+    common = min(n_new, n_old)
+    head = 0
+    while head < common and records[head][:2] == old_records[head][:2]:
+        head += 1
+    if head == n_new == n_old:
+        return previous['layout']
+    tail = 0
+    while tail < common - head and records[n_new - 1 - tail][:2] == old_records[n_old - 1 - tail][:2]:
+        tail += 1
+
+    # 레이아웃 요소 위치: 바뀐 구간 [first_changed, changed_end), 그 뒤 요소의 이전 위치와의 차이
+    first_changed = sum(len(r[2]) for r in records[:head])
+    changed_end = len(elements) - sum(len(r[2]) for r in records[n_new - tail:])
+    shift = len(elements) - sum(len(r[2]) for r in old_records)
+    return _resume_layout(elements, _usable_height(report), previous, first_changed, changed_end,
+                          shift, idx_total - previous['idx'])
+
+
+def _glue_reaches(elements, pos, end):
+    """요소 pos의 첫 조각에서 시작한 붙은 묶음이 요소 end의 첫 조각까지 이어지는지
+
+    사이 요소가 모두 keepNext이고 요소 안의 조각도 모두 앞 조각에 붙어 있어야 한다 (pos == end면 참).
+    """
+    for elem in elements[pos:end]:
+        if not elem.get('keep_next') or elem['type'] in ('page_break', 'section_break'):
+            return False
+        if not all(glue for _, glue in _element_pieces(elem)[1:]):
+            return False
+    return True
+
+
+def _resume_layout(elements, usable, previous, first_changed, changed_end, shift, index_shift):
+    """바뀐 첫 요소가 영향을 주는 페이지부터 LayoutSimulator로 다시 쌓는다
+
+    바뀐 첫 요소의 첫 조각이 놓였던 페이지에서 시작하되, 자동 넘김으로 시작한 페이지는 직전 페이지의
+    끝이 이 페이지 조각의 넘침으로 정해졌으므로 한 장 앞에서, 요소 중간에서 시작한 페이지는 요소 경계가
+    나올 때까지 앞에서 시작한다. 자동 넘김으로 시작한 페이지의 첫 조각에서 붙은 묶음(keepNext 등)이 바뀐
+    요소까지 이어지면 그 경계도 바뀐 요소의 넘침으로 정해졌을 수 있으므로 한 장씩 더 앞에서 시작한다. 바뀐 구간 뒤 명시적 break로 시작하는 페이지가 이전 실행에도 같은 요소에서
+    (같은 제목 아래) 시작했으면 그 뒤는 이전 결과와 같으므로 옮겨 적고 끝낸다.
+    """
+    layout = previous['layout']
+    starts = layout['page_starts']
+    page = 0
+    for k, (pos, first, _) in enumerate(starts):
+        if pos < first_changed or (pos == first_changed and first):
+            page = k
+    if page and not starts[page][2]:
+        page -= 1
+    while page and (not starts[page][1] or (not starts[page][2]
+                                           and _glue_reaches(elements, starts[page][0], first_changed))):
+        page -= 1
+    position = starts[page][0] if page else 0
+
+    # 그 페이지의 가용 높이 (직전 section_break), 직전 요소의 keepNext, 직전 제목
+    page_usable = usable
+    for elem in reversed(elements[:position]):
+        if elem['type'] == 'section_break':
+            page_usable = elem['usable_height_pt']
+            break
+    prev = elements[position - 1] if position else None
+    keep_next = bool(prev and prev['type'] not in ('page_break', 'section_break') and prev.get('keep_next'))
+    heading = next((e['text'] for e in reversed(elements[:position]) if e['type'] == 'heading'), None)
+    prev_elements = []
+    if page:
+        prev_pos, prev_first, _ = starts[page - 1]
+        prev_elements = elements[prev_pos + (0 if prev_first else 1):position]
+
+    simulator = LayoutSimulator(page_usable)
+    simulator.restore(layout, page, prev_elements, position, keep_next)
+    break_pages = {pos: k for k, (pos, _, by_break) in enumerate(starts) if by_break}
+    old_headings = previous['headings']
+    for pos in range(position, len(elements)):
+        if pos >= changed_end and simulator.at_break_start():
+            k = break_pages.get(pos - shift)
+            if k is not None and old_headings[k] == heading:
+                simulator.adopt_tail(layout, k, shift, index_shift)
+                break
+        elem = elements[pos]
+        simulator.feed(elem)
+        if elem['type'] == 'heading':
+            heading = elem['text']
+    return simulator.finish()
 
 
 # ============================================================
@@ -530,6 +1286,11 @@ def simulate_layout(report):
 # ============================================================
 
 def check_issues(report):
+    with phase('check_issues'):
+        return _check_issues(report)
+
+
+def _check_issues(report):
     issues = report['issues']
 
     if not report['has_header']:
@@ -613,6 +1374,8 @@ def print_report(report, layout):
             events.append(('heading', e['index'], e))
         elif e['type'] == 'page_break':
             events.append(('pagebreak', e['index'], e))
+        elif e['type'] == 'section_break':
+            events.append(('sectionbreak', e['index'], e))
         elif e['type'] == 'table' and e.get('tbl_type') == 'data_table':
             events.append(('table', e['index'], e))
         elif e['type'] == 'image':
@@ -625,6 +1388,11 @@ def print_report(report, layout):
         if event_type == 'pagebreak':
             print(f'  {"---":>6} ── 페이지 나누기 ── (p.{page} → p.{page+1})')
             page += 1
+        elif event_type == 'sectionbreak':
+            print(f'  {"===":>6} ── 섹션 {data["section"]} ({data["orientation"]}, '
+                  f'가용 높이 {data["usable_height_pt"]:.0f}pt) ──')
+            if data['new_page']:
+                page += 1
         elif event_type == 'heading':
             indent = '  ' * data['level']
             print(f'  [{idx_val:>4}] {indent}H{data["level"]}: {data["text"][:45]}')
@@ -636,7 +1404,9 @@ def print_report(report, layout):
 
     # ── 페이지 레이아웃 분석 ──
     print(f'\n{sep}')
-    print(f'  페이지 레이아웃 분석 (추정, 가용 높이 {USABLE_HEIGHT_PT:.0f}pt)')
+    sections = report.get('sections') or [report['page']]
+    usable_str = ' / '.join(sorted({f'{sec["usable_height_pt"]:.0f}pt' for sec in sections}))
+    print(f'  페이지 레이아웃 분석 (추정, 가용 높이 {usable_str}, 섹션 {len(sections)}개)')
     print(f'{sep}')
 
     for pg in layout['pages']:
@@ -748,9 +1518,46 @@ def build_json_output(report, layout):
         'pages': pages,
     }
 
+    # 섹션이 여러 개면 섹션별 페이지 기하 (한 섹션 문서는 출력 형식 그대로)
+    sections = report.get('sections') or []
+    if len(sections) > 1:
+        result['sections'] = [{
+            'section': n,
+            'orientation': sec['orientation'],
+            'type': sec['section_type'],
+            'usableHeightPt': sec['usable_height_pt'],
+            'contentWidthDxa': sec['content_width_dxa'],
+        } for n, sec in enumerate(sections, 1)]
+
     return result
 
 
+def validate_json(source, stream=False, use_cache=True, name=None, theme=None):
+    """--json 결과 dict — 같은 DOCX면 리포트 캐시에서 파싱 없이 반환
+
+    source: 경로, bytes, 바이너리 파일 객체. 캐시 키는 이미 읽어 둔 바이트의 해시라서
+    캐시 조회와 분석이 파일을 한 번만 읽는다 (ZIP도 한 번만 연다).
+    캐시에 없으면 같은 문서(경로 또는 name)의 직전 실행 상태로 증분 분석한다 (analyze_incremental, 스트리밍 제외).
+    theme: 레이아웃 프로필 테마 (analyze_document 참조)
+    """
+    source = load_docx(source, name)
+    name = None
+
+    def compute():
+        if stream:
+            report, layout = analyze_document_stream(source, name, theme)
+        elif use_cache:
+            report, layout = analyze_incremental(source, name, theme)
+        else:
+            report = analyze_document(source, name, theme)
+            layout = simulate_layout(report)
+        return build_json_output(report, layout)
+
+    # --stream은 같은 결과를 내므로 키에 넣지 않는다. 프로필이 바뀌면 추정 높이가 달라진다
+    return cached_report(__file__, source, compute, extra_files=[layout_profile_path()],
+                         options={'theme': theme} if theme else None, use_cache=use_cache)
+
+
 # ============================================================
 # 메인
 # ============================================================
@@ -758,17 +1565,49 @@ if __name__ == '__main__':
     if len(sys.argv) < 2:
         print('사용법: python -X utf8 tools/validate-docx.py <파일.docx>')
         print('        python -X utf8 tools/validate-docx.py <파일.docx> --json')
+        print('        python -X utf8 tools/validate-docx.py <파일.docx> --json --stream')
+        print('        python -X utf8 tools/validate-docx.py <파일.docx> --json --no-cache')
+        print('        python -X utf8 tools/validate-docx.py <파일.docx> --json --theme office-modern')
+        print('        python -X utf8 tools/validate-docx.py <파일.docx> --json --timings [--profile out.prof]')
+        print('        python -X utf8 tools/validate-docx.py - --json < 문서.docx   (stdin으로 DOCX 바이트)')
         print('예시:   python -X utf8 tools/validate-docx.py output/gendocs_프로젝트_소개서_v0.1.0.docx')
         sys.exit(1)
 
     docx_path = sys.argv[1]
     json_mode = '--json' in sys.argv
+    stream_mode = '--stream' in sys.argv
+    timings, profile_path = parse_timing_argv(sys.argv)
+
+    theme = None
+    if '--theme' in sys.argv:
+        idx = sys.argv.index('--theme')
+        if idx + 1 < len(sys.argv):
+            theme = sys.argv[idx + 1]
 
-    report = analyze_document(docx_path)
-    layout = simulate_layout(report)
+    try:
+        with TimingSession(timings, profile_path) as session:
+            docx_path = cli_docx_source(docx_path)
+            if json_mode:
+                result = validate_json(docx_path, stream=stream_mode, use_cache='--no-cache' not in sys.argv,
+                                       theme=theme)
+                with phase('serialization'):
+                    output = json.dumps(result, ensure_ascii=False, indent=2)
+            else:
+                if stream_mode:
+                    report, layout = analyze_document_stream(docx_path, theme=theme)
+                else:
+                    report = analyze_document(docx_path, theme=theme)
+                    layout = simulate_layout(report)
+                with phase('serialization'):
+                    print_report(report, layout)
+    except FileNotFoundError as e:
+        print(f'[ERROR] {e}')
+        sys.exit(1)
 
     if json_mode:
-        result = build_json_output(report, layout)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if session.enabled:
+            result['timings'] = session.report()
+            output = json.dumps(result, ensure_ascii=False, indent=2)
+        print(output)
     else:
-        print_report(report, layout)
+        session.print_report()
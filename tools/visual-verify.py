@@ -9,6 +9,9 @@ LibreOffice headless + pdf2image(Poppler) 필요.
   python -X utf8 tools/visual-verify.py output/문서.docx
   python -X utf8 tools/visual-verify.py output/문서.docx --json
   python -X utf8 tools/visual-verify.py output/문서.docx --save-images
+  python -X utf8 tools/visual-verify.py output/문서.docx --json --timings [--profile out.prof]
+
+--timings: 단계별(LibreOffice 렌더링, PDF → 이미지, 페이지 분석 등) 소요 시간/최대 메모리
 
 단계:
   4a. 페이지 수 비교 (validate 추정 vs 실제 렌더링)
@@ -29,6 +32,9 @@ import subprocess
 import tempfile
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from timings import phase, TimingSession, parse_timing_argv
+
 # 의존성 체크 플래그
 HAS_PDF2IMAGE = False
 HAS_PIL = False
@@ -142,19 +148,8 @@ def load_validate_report(docx_path):
     return None
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("사용법: python -X utf8 tools/visual-verify.py <docx_path> [--json] [--save-images]")
-        sys.exit(1)
-
-    docx_path = sys.argv[1]
-    output_json = "--json" in sys.argv
-    save_images = "--save-images" in sys.argv
-
-    if not os.path.exists(docx_path):
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}", file=sys.stderr)
-        sys.exit(1)
-
+def verify(docx_path, output_json=False, save_images=False):
+    """DOCX 렌더링 + 페이지 분석 → report dict (의존성/변환 실패 시 오류 출력 후 종료)"""
     # 결과 구조
     report = {
         "file": docx_path,
@@ -168,7 +163,8 @@ def main():
     }
 
     # validate 리포트에서 estimatedPages 로드
-    validate_report = load_validate_report(docx_path)
+    with phase('load_validate_report'):
+        validate_report = load_validate_report(docx_path)
     if validate_report:
         report["estimatedPages"] = validate_report.get("stats", {}).get("estimatedPages", 0)
 
@@ -208,7 +204,8 @@ def main():
         # 4a. DOCX → PDF
         if not output_json:
             print(f"[1/3] DOCX → PDF 변환 중...")
-        pdf_path, error = convert_docx_to_pdf(docx_path, tmpdir)
+        with phase('libreoffice_render'):
+            pdf_path, error = convert_docx_to_pdf(docx_path, tmpdir)
         if error:
             report["errors"].append(error)
             if output_json:
@@ -221,7 +218,8 @@ def main():
         if not output_json:
             print(f"[2/3] PDF → 이미지 변환 중...")
         try:
-            images = convert_from_path(pdf_path, dpi=150)
+            with phase('pdf_to_images'):
+                images = convert_from_path(pdf_path, dpi=150)
         except Exception as e:
             report["errors"].append(f"PDF → 이미지 변환 실패: {e}")
             if output_json:
@@ -243,39 +241,40 @@ def main():
             image_save_dir = str(docx_path).replace(".docx", "_visual")
             os.makedirs(image_save_dir, exist_ok=True)
 
-        for idx, img in enumerate(images):
-            page_num = idx + 1
-            analysis = analyze_page_image(img)
-
-            page_info = {
-                "page": page_num,
-                "fillRatio": analysis["fillRatio"],
-                "isBlank": analysis["isBlank"],
-            }
-            report["pages"].append(page_info)
+        with phase('page_analysis'):
+            for idx, img in enumerate(images):
+                page_num = idx + 1
+                analysis = analyze_page_image(img)
 
-            # 플래그 조건
-            if analysis["isBlank"]:
-                flag = {
-                    "type": "BLANK_PAGE",
-                    "severity": "WARN",
+                page_info = {
                     "page": page_num,
-                    "message": f"p.{page_num}: 빈 페이지 감지 (흰색 {analysis['whiteRatio']:.1%})",
+                    "fillRatio": analysis["fillRatio"],
+                    "isBlank": analysis["isBlank"],
                 }
-                report["flags"].append(flag)
-
-            # 이미지 저장 (플래그된 페이지 또는 전체)
-            if save_images:
-                img_path = os.path.join(image_save_dir, f"page_{page_num:03d}.png")
-                img.save(img_path, "PNG")
-                report["pageImages"].append(img_path)
-            elif analysis["isBlank"]:
-                # 플래그된 페이지만 저장
-                flagged_dir = str(docx_path).replace(".docx", "_flagged")
-                os.makedirs(flagged_dir, exist_ok=True)
-                img_path = os.path.join(flagged_dir, f"page_{page_num:03d}.png")
-                img.save(img_path, "PNG")
-                report["pageImages"].append(img_path)
+                report["pages"].append(page_info)
+
+                # 플래그 조건
+                if analysis["isBlank"]:
+                    flag = {
+                        "type": "BLANK_PAGE",
+                        "severity": "WARN",
+                        "page": page_num,
+                        "message": f"p.{page_num}: 빈 페이지 감지 (흰색 {analysis['whiteRatio']:.1%})",
+                    }
+                    report["flags"].append(flag)
+
+                # 이미지 저장 (플래그된 페이지 또는 전체)
+                if save_images:
+                    img_path = os.path.join(image_save_dir, f"page_{page_num:03d}.png")
+                    img.save(img_path, "PNG")
+                    report["pageImages"].append(img_path)
+                elif analysis["isBlank"]:
+                    # 플래그된 페이지만 저장
+                    flagged_dir = str(docx_path).replace(".docx", "_flagged")
+                    os.makedirs(flagged_dir, exist_ok=True)
+                    img_path = os.path.join(flagged_dir, f"page_{page_num:03d}.png")
+                    img.save(img_path, "PNG")
+                    report["pageImages"].append(img_path)
 
         # 페이지 수 차이 플래그
         if report["estimatedPages"] > 0 and abs(report["pageDiff"]) > 2:
@@ -287,7 +286,11 @@ def main():
             }
             report["flags"].append(flag)
 
-    # 출력
+    return report
+
+
+def print_result(report, docx_path, output_json=False):
+    """verify() 결과 출력 (JSON 또는 텍스트)"""
     if output_json:
         # pageImages는 절대경로로 변환
         report["pageImages"] = [os.path.abspath(p) for p in report["pageImages"]]
@@ -325,5 +328,30 @@ def main():
                 print(f"    ... 외 {len(report['pageImages']) - 5}장")
 
 
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용법: python -X utf8 tools/visual-verify.py <docx_path> [--json] [--save-images] [--timings] [--profile <경로>]")
+        sys.exit(1)
+
+    docx_path = sys.argv[1]
+    output_json = "--json" in sys.argv
+    save_images = "--save-images" in sys.argv
+    timings, profile_path = parse_timing_argv(sys.argv)
+
+    if not os.path.exists(docx_path):
+        print(f"[ERROR] 파일을 찾을 수 없습니다: {docx_path}", file=sys.stderr)
+        sys.exit(1)
+
+    with TimingSession(timings, profile_path) as session:
+        report = verify(docx_path, output_json, save_images)
+
+    if session.enabled:
+        report["timings"] = session.report()
+    print_result(report, docx_path, output_json)
+    if not output_json:
+        session.print_report()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+"""
+XML 파서 백엔드 — docx_model이 쓰는 파싱/직렬화/XPath를 한곳에서 고른다.
+
+기본은 표준 xml.etree.ElementTree이고, GENDOCS_XML_BACKEND=lxml이면 (설치되어 있을 때) lxml(libxml2)을 쓴다.
+lxml은 파싱 자체는 빠르지만 find/iter/get마다 파이썬 프록시 객체를 만들어, 트리를 훑는 도구
+(validate/review/diff, --stream)에서는 전체 시간이 더 길다
+(xlarge 기준 lxml vs etree — validate 3.87s vs 3.30s, --stream 4.15s vs 3.07s, review 3.80s vs 2.48s).
+두 백엔드는 find/findall/iter/get/text 같은 ElementTree API가 같으므로 도구 코드는 그대로이고,
+결과도 같다 (lxml 파서는 ElementTree처럼 주석/처리 명령을 트리에 넣지 않는다).
+
+lxml에서만 쓰는 가속:
+  - xpath(): 미리 컴파일한 XPath (ElementTree에서는 같은 결과를 내는 대체 함수)
+  - iterparse(tag=...): 지정한 태그의 end 이벤트만 파이썬으로 올라온다
+
+사용법:
+    from xml_backend import parse, fromstring, iterparse, tostring, xpath, ParseError, BACKEND
+
+환경 변수:
+    GENDOCS_XML_BACKEND   etree | lxml — 백엔드 선택 (기본: etree. lxml이 없으면 etree로 동작)
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+# lxml은 요청했을 때만 import한다 (기본 백엔드에서는 import 비용도 들지 않게)
+HAS_LXML = False
+_lxml = None
+
+if os.environ.get('GENDOCS_XML_BACKEND', '').strip().lower() == 'lxml':
+    try:
+        from lxml import etree as _lxml
+        HAS_LXML = True
+    except ImportError:
+        pass
+
+USE_LXML = HAS_LXML
+BACKEND = 'lxml' if USE_LXML else 'etree'
+
+if USE_LXML:
+    # ElementTree와 같은 트리: 주석/PI 제외. 외부 엔티티/네트워크 접근 없음, 큰 문서 허용
+    _PARSER = _lxml.XMLParser(remove_comments=True, remove_pis=True, resolve_entities=False,
+                              no_network=True, huge_tree=True)
+    ParseError = (ET.ParseError, _lxml.XMLSyntaxError)
+else:
+    _PARSER = None
+    ParseError = (ET.ParseError,)
+
+
+def parse(f):
+    """바이너리 파일 객체 → 루트 요소"""
+    if USE_LXML:
+        return _lxml.parse(f, _PARSER).getroot()
+    return ET.parse(f).getroot()
+
+
+def fromstring(data):
+    """XML 바이트 → 루트 요소"""
+    if USE_LXML:
+        return _lxml.fromstring(data, _PARSER)
+    return ET.fromstring(data)
+
+
+def tostring(node):
+    """요소 → XML 바이트 (같은 백엔드 안에서만 비교할 것 — 접두사 표기가 백엔드마다 다르다)"""
+    if USE_LXML:
+        return _lxml.tostring(node)
+    return ET.tostring(node)
+
+
+def iterparse(f, events=('end',), tag=None):
+    """(event, node) 이터레이터. tag를 주면 lxml은 그 태그 이벤트만 내보낸다
+
+    ElementTree는 태그 필터가 없으므로 이 함수가 같은 조건으로 걸러 낸다.
+    tag: '{ns}name' 또는 그 목록/튜플
+    """
+    if USE_LXML:
+        return _lxml.iterparse(f, events=events, tag=tag, remove_comments=True, remove_pis=True,
+                               resolve_entities=False, no_network=True, huge_tree=True)
+    if tag is None:
+        return ET.iterparse(f, events=events)
+    tags = {tag} if isinstance(tag, str) else set(tag)
+    return ((event, node) for event, node in ET.iterparse(f, events=events) if node.tag in tags)
+
+
+def xpath(expr, namespaces, fallback):
+    """컴파일된 XPath 함수 (lxml) 또는 같은 결과를 내는 fallback(node) (ElementTree)
+
+    expr는 모듈 로드 시 한 번만 컴파일된다. 문자열 결과는 부모 참조 없는 일반 str로 돌려준다.
+    """
+    if USE_LXML:
+        return _lxml.XPath(expr, namespaces=namespaces, smart_strings=False)
+    return fallback
+